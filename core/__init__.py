@@ -1 +1,8 @@
-from . import scan
+import importlib
+
+
+def __getattr__(name):
+    # Legacy scan modes pull in matplotlib; load them on first use only.
+    if name == "scan":
+        return importlib.import_module(".scan", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
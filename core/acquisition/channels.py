@@ -2,8 +2,9 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Protocol
+from typing import Protocol, Sequence
 
+from core.education.surface_models import surface_heights
 from core.education.synthetic_signal import synthetic_surface_signal
 
 
@@ -41,6 +42,25 @@ class SimulatedSurfaceChannel:
             unit=self.unit,
         )
 
+    def read_samples(self, *, points: Sequence[tuple[float, float]], z: float) -> list[SensorSample]:
+        """Samples for many positions; the surface is evaluated in one vectorized call."""
+        xs = [float(x) for x, _y in points]
+        ys = [float(y) for _x, y in points]
+        values = surface_heights("educational_bump", xs, ys).tolist()
+        timestamp = datetime.now().isoformat(timespec="seconds")
+        return [
+            SensorSample(
+                timestamp=timestamp,
+                x=x,
+                y=y,
+                z=float(z),
+                channel=self.name,
+                value=round(value, 4),
+                unit=self.unit,
+            )
+            for x, y, value in zip(xs, ys, values)
+        ]
+
 
 def available_default_channels() -> list[AcquisitionChannel]:
     return [SimulatedSurfaceChannel()]
@@ -0,0 +1,278 @@
+"""In-process configured raster scan engine.
+
+This is the verified raster path of ``tools/run_configured_raster_scan.py``
+as an importable function, so callers (the CLI tool, the desktop GUI) can
+run it without spawning an interpreter. Progress is streamed through
+callbacks: ``on_log`` receives each log line, ``on_point`` each completed
+raster row (the CSV columns plus ``line_index``, ``point_index`` and
+``point_count``). Stop and pause are module-level flags, as for the web
+real-scan runners, and are safe to set from any thread.
+"""
+
+from __future__ import annotations
+
+from dataclasses import asdict
+import csv
+import json
+from pathlib import Path
+from threading import Event
+from typing import Any, Callable
+
+from core.acquisition.channels import SimulatedSurfaceChannel
+from core.acquisition.scan_dataset import dataset_path_for_output, write_scan_dataset_from_rows
+from core.acquisition.scan_session import metadata_path_for_output, write_scan_session_metadata
+from core.education.config_loader import get_prusa_backend_kwargs, load_config
+from core.education.safe_raster import generate_bidirectional_grid_from_scan_area, make_raster_row
+from core.education.scan_profile import MotionLimits, ScanProfile, validate_scan_profile
+from core.education.synthetic_signal import synthetic_surface_signal
+from core.z_control.z_driver_simulated import SimulatedZDriver
+
+HARDWARE_POINT_DWELL_S = 0.3
+PAUSE_POLL_S = 0.1
+
+_RASTER_STOP = Event()
+_RASTER_PAUSE = Event()
+
+
+def request_raster_stop() -> None:
+    _RASTER_STOP.set()
+
+
+def clear_raster_stop() -> None:
+    _RASTER_STOP.clear()
+
+
+def raster_stop_requested() -> bool:
+    return _RASTER_STOP.is_set()
+
+
+def request_raster_pause() -> None:
+    _RASTER_PAUSE.set()
+
+
+def clear_raster_pause() -> None:
+    _RASTER_PAUSE.clear()
+
+
+def raster_paused() -> bool:
+    return _RASTER_PAUSE.is_set()
+
+
+def build_motion_limits(config: dict) -> MotionLimits:
+    motion_limits = config["motion_limits"]
+
+    return MotionLimits(
+        x_min=motion_limits["x"][0],
+        x_max=motion_limits["x"][1],
+        y_min=motion_limits["y"][0],
+        y_max=motion_limits["y"][1],
+        z_min=motion_limits["z"][0],
+        z_max=motion_limits["z"][1],
+    )
+
+
+def scan_area_from_profile(profile: ScanProfile) -> dict:
+    return {
+        "x_min": profile.x_min,
+        "x_max": profile.x_max,
+        "y_min": profile.y_min,
+        "y_max": profile.y_max,
+        "z": profile.z,
+        "x_resolution": profile.x_resolution,
+        "y_resolution": profile.y_resolution,
+    }
+
+
+def build_simulated_raster_data(profile: ScanProfile, active_scan_area: dict) -> list[dict]:
+    data = []
+    points = generate_bidirectional_grid_from_scan_area(active_scan_area)
+    samples = SimulatedSurfaceChannel().read_samples(points=[(x, y) for x, y, _direction in points], z=profile.z)
+
+    for (x, y, direction), sample in zip(points, samples):
+        state = {
+            "position": {
+                "x": x,
+                "y": y,
+                "z": profile.z,
+            }
+        }
+        row = make_raster_row(x, y, state, sample.value, scan_direction=direction)
+        data.append(asdict(row))
+
+    return data
+
+
+def write_raster_csv(output_file: str, data: list[dict]) -> None:
+    if not data:
+        raise ValueError("No raster data to write.")
+
+    output_path = Path(output_file)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    with output_path.open("w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=data[0].keys())
+        writer.writeheader()
+        writer.writerows(data)
+
+    # Columnar copy for fast reloads; embeds the metadata sidecar when present.
+    metadata_path = metadata_path_for_output(output_file)
+    metadata = json.loads(metadata_path.read_text(encoding="utf-8")) if metadata_path.exists() else {}
+    write_scan_dataset_from_rows(dataset_path_for_output(output_file), data, metadata)
+
+
+def _raster_lines(points: list[tuple[float, float, str]]) -> list[int]:
+    """Line index per raster point: a line is one pass in one direction."""
+    indices: list[int] = []
+    line_index = -1
+    previous: tuple[str, float] | None = None
+    for x, y, direction in points:
+        fixed = y if direction in ("forward", "backward") else x
+        if (direction, fixed) != previous:
+            line_index += 1
+            previous = (direction, fixed)
+        indices.append(line_index)
+    return indices
+
+
+def _point_payload(row: dict, line_index: int, point_index: int, point_count: int) -> dict[str, Any]:
+    return {**row, "line_index": line_index, "point_index": point_index, "point_count": point_count}
+
+
+def _wait_while_paused(log: Callable[[str], None]) -> None:
+    if not _RASTER_PAUSE.is_set():
+        return
+    log("Raster scan paused.")
+    while _RASTER_PAUSE.is_set() and not _RASTER_STOP.is_set():
+        _RASTER_STOP.wait(PAUSE_POLL_S)
+    if not _RASTER_STOP.is_set():
+        log("Raster scan resumed.")
+
+
+def run_configured_raster(
+    profile: ScanProfile,
+    output_file: str,
+    *,
+    dry_run: bool,
+    config: dict | None = None,
+    on_point: Callable[[dict[str, Any]], None] | None = None,
+    on_log: Callable[[str], None] | None = None,
+    dwell_s: float = HARDWARE_POINT_DWELL_S,
+    motion: Any | None = None,
+    z_driver: Any | None = None,
+) -> dict[str, Any]:
+    """Validate ``profile`` and run the bidirectional raster, writing CSV + metadata.
+
+    ``dry_run`` produces the synthetic raster without touching hardware.
+    ``motion`` / ``z_driver`` default to the configured Prusa backend and the
+    simulated Z driver. A stop request ends the scan after the current point
+    and still saves the rows collected so far.
+    """
+    log_lines: list[str] = []
+
+    def log(line: str) -> None:
+        log_lines.append(line)
+        if on_log is not None:
+            on_log(line)
+
+    def payload(ok: bool, status: str, message: str, **extra: Any) -> dict[str, Any]:
+        return {"ok": ok, "status": status, "message": message, "output_file": output_file, "log_lines": log_lines, **extra}
+
+    config = config if config is not None else load_config()
+    try:
+        validate_scan_profile(profile, build_motion_limits(config))
+    except ValueError as error:
+        log("Validation: FAIL")
+        log(f"Reason: {error}")
+        return payload(False, "invalid", str(error), point_count=0)
+
+    active_scan_area = scan_area_from_profile(profile)
+    clear_raster_stop()
+    log("Validated configured raster scan")
+    log("Validation: PASS")
+    log(f"Scan profile: {profile}")
+    log(f"Output file: {output_file}")
+
+    if dry_run:
+        log("Dry run only. No hardware movement.")
+        data = build_simulated_raster_data(profile, active_scan_area)
+        lines = _raster_lines([(row["target_x"], row["target_y"], row["scan_direction"]) for row in data])
+        if on_point is not None:
+            for index, (row, line_index) in enumerate(zip(data, lines)):
+                on_point(_point_payload(row, line_index, index, len(data)))
+        metadata_path = write_scan_session_metadata(
+            profile=profile,
+            output_file=output_file,
+            point_count=len(data),
+            execution_mode="DRY_RUN",
+            channel="simulated_surface",
+        )
+        write_raster_csv(output_file, data)
+        log(f"Saved dry-run synthetic raster: {output_file}")
+        log(f"Saved scan metadata: {metadata_path}")
+        return payload(True, "complete", "Dry-run raster complete.", point_count=len(data), metadata_path=str(metadata_path))
+
+    if motion is None:
+        from core.motion.prusa_gcode_backend import PrusaGcodeBackend
+
+        motion = PrusaGcodeBackend(**get_prusa_backend_kwargs(config))
+    z_driver = z_driver if z_driver is not None else SimulatedZDriver()
+
+    points = generate_bidirectional_grid_from_scan_area(active_scan_area)
+    lines = _raster_lines(points)
+    data: list[dict] = []
+    status = "complete"
+    try:
+        motion.connect()
+        log(f"Connected: {motion.get_state()}")
+
+        log(f"Moving to safe scan height Z{profile.z}...")
+        motion.move_to(z=profile.z, feedrate=profile.feedrate_z)
+
+        log("Starting educational raster scan...")
+
+        for index, ((x, y, direction), line_index) in enumerate(zip(points, lines)):
+            _wait_while_paused(log)
+            if _RASTER_STOP.is_set():
+                status = "stopped"
+                log(f"Raster scan stopped by operator after {len(data)} of {len(points)} points.")
+                break
+            log(f"Point {direction} X{x} Y{y}")
+            motion.move_to(x=x, y=y, feedrate=profile.feedrate_xy)
+
+            z_driver.move_to(synthetic_surface_signal(x, y))
+            z_value = z_driver.get_position()
+
+            state = motion.get_state()
+            row = asdict(make_raster_row(x, y, state, z_value, scan_direction=direction))
+            data.append(row)
+
+            log(str(row))
+            if on_point is not None:
+                on_point(_point_payload(row, line_index, index, len(points)))
+            # Waiting on the stop flag keeps the dwell while letting STOP cut it short.
+            _RASTER_STOP.wait(dwell_s)
+
+        if not data:
+            return payload(False, status, "Raster scan stopped before the first point.", point_count=0)
+
+        metadata_path = write_scan_session_metadata(
+            profile=profile,
+            output_file=output_file,
+            point_count=len(data),
+            execution_mode="HARDWARE",
+            channel="simulated_surface",
+        )
+        write_raster_csv(output_file, data)
+
+        log(f"Saved: {output_file}")
+        log(f"Saved scan metadata: {metadata_path}")
+    except Exception as error:
+        log(f"Raster scan failed: {error}")
+        return payload(False, "failed", str(error), point_count=len(data))
+    finally:
+        motion.disconnect()
+        z_driver.close()
+        log("Disconnected")
+
+    message = "Hardware raster complete." if status == "complete" else "Hardware raster stopped; partial data saved."
+    return payload(status == "complete", status, message, point_count=len(data), metadata_path=str(metadata_path))
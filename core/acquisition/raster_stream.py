@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-import csv
 
-from tools.plot_safe_raster import load_raster_csv
+import numpy as np
+
+from core.acquisition.scan_dataset import ScanDataset, fresh_dataset_for, open_scan_dataset
+from tools.plot_safe_raster import GRID_SNAP_TOLERANCE, load_raster_grid, snap_grid_axis
 
 MAX_TEXT_PREVIEW_WIDTH = 80
 
@@ -93,17 +95,49 @@ class RasterAcquisitionFrame:
 
 
 def load_raster_frame(input_file: str) -> RasterAcquisitionFrame:
-    x_values, y_values, z_matrix = load_raster_csv(input_file)
-    direction_counts: dict[str, int] = {}
-    with open(input_file, newline="", encoding="utf-8") as csvfile:
-        reader = csv.DictReader(csvfile)
-        for row in reader:
-            direction = row.get("scan_direction", "forward")
-            direction_counts[direction] = direction_counts.get(direction, 0) + 1
+    dataset_path = fresh_dataset_for(input_file)
+    if dataset_path is not None:
+        return raster_frame_from_dataset(open_scan_dataset(dataset_path))
+    grid = load_raster_grid(input_file)
+    return RasterAcquisitionFrame(
+        x_values=grid.x_values.tolist(),
+        y_values=grid.y_values.tolist(),
+        z_matrix=grid.height_map.tolist(),
+        direction_counts=dict(grid.direction_counts),
+    )
+
+
+def raster_frame_from_dataset(dataset: ScanDataset) -> RasterAcquisitionFrame:
+    """Build the frame straight from memory-mapped columns, without a CSV parse."""
+    if dataset.point_count == 0:
+        raise ValueError(f"No data rows found in scan dataset: {dataset.path}")
+    missing_columns = {"actual_x", "actual_y", "simulated_z_signal"} - set(dataset.column_names)
+    if missing_columns:
+        raise ValueError(f"Scan dataset is missing required columns: {sorted(missing_columns)}")
+
+    x = np.asarray(dataset.column("actual_x"))
+    y = np.asarray(dataset.column("actual_y"))
+    x_values, column_index = snap_grid_axis(x, GRID_SNAP_TOLERANCE)
+    y_values, row_index = snap_grid_axis(y, GRID_SNAP_TOLERANCE)
+    z_matrix = np.zeros((len(y_values), len(x_values)))
+    filled = np.zeros(z_matrix.shape, dtype=bool)
+    z_matrix[row_index, column_index] = dataset.column("simulated_z_signal")
+    filled[row_index, column_index] = True
+    if not filled.all():
+        missing_row, missing_column = np.argwhere(~filled)[0]
+        raise ValueError(f"Missing raster point for X={x_values[missing_column]}, Y={y_values[missing_row]}")
+
+    if "scan_direction" in dataset:
+        counts = np.bincount(dataset.column("scan_direction"), minlength=len(dataset.categories("scan_direction")))
+        direction_counts = {
+            direction: int(count) for direction, count in zip(dataset.categories("scan_direction"), counts) if count
+        }
+    else:
+        direction_counts = {"forward": dataset.point_count}
     return RasterAcquisitionFrame(
-        x_values=x_values,
-        y_values=y_values,
-        z_matrix=z_matrix,
+        x_values=x_values.tolist(),
+        y_values=y_values.tolist(),
+        z_matrix=z_matrix.tolist(),
         direction_counts=direction_counts,
     )
 
@@ -0,0 +1,267 @@
+"""Columnar binary scan dataset (``.spmscan``) with memory-mapped access.
+
+Layout::
+
+    b"SPMSCAN1"                  8-byte magic
+    uint32 little-endian         header length in bytes
+    JSON header                  metadata + column table, padded to 64 bytes
+    column 0 .. column N-1       contiguous little-endian arrays, 64-byte aligned
+
+Each column is one channel stored as a typed array. ``kind`` is:
+
+* ``float``: ``<f8`` values (positions, signals, contact flags).
+* ``int``: ``<i8`` values (line / pass counters).
+* ``timestamp``: ``<f8`` POSIX seconds parsed from ISO timestamps (naive
+  timestamps are local time, as written by the scan tools).
+* ``category``: ``<u2`` codes into the header's ``categories`` list
+  (scan direction and other text channels).
+
+``open_scan_dataset`` maps every column with ``numpy.memmap``; nothing is
+parsed until a column is read. CSV converters keep the existing raster CSV
+files as the interchange format.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from pathlib import Path
+import csv
+import json
+import re
+import struct
+from typing import Any, Iterable, Mapping, Sequence
+
+import numpy as np
+
+from core.acquisition.scan_session import metadata_path_for_output
+
+DATASET_MAGIC = b"SPMSCAN1"
+DATASET_VERSION = 1
+DATASET_SUFFIX = ".spmscan"
+_ALIGN = 64
+_DTYPES = {"float": "<f8", "int": "<i8", "timestamp": "<f8", "category": "<u2"}
+_INT_TEXT = re.compile(r"-?(0|[1-9]\d*)")
+# Zero-padded digits ("007") are identifiers; parsing them as numbers drops the padding.
+_ZERO_PADDED_TEXT = re.compile(r"[+-]?0\d+")
+
+
+def dataset_path_for_output(output_file: str | Path) -> Path:
+    return Path(output_file).with_suffix(DATASET_SUFFIX)
+
+
+def _aligned(offset: int) -> int:
+    return (offset + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def _parse_float(value: Any) -> float | None:
+    if isinstance(value, str) and _ZERO_PADDED_TEXT.fullmatch(value.strip()):
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_timestamp(value: Any) -> float | None:
+    try:
+        return datetime.fromisoformat(str(value)).timestamp()
+    except ValueError:
+        return None
+
+
+def _encode_column(name: str, values: Sequence[Any]) -> tuple[dict[str, Any], np.ndarray]:
+    """Pick the narrowest kind that represents every value losslessly."""
+    if all(isinstance(value, (int, np.integer)) and not isinstance(value, bool) for value in values) or all(
+        isinstance(value, str) and _INT_TEXT.fullmatch(value.strip()) for value in values
+    ):
+        return {"name": name, "kind": "int"}, np.asarray([int(value) for value in values], dtype=_DTYPES["int"])
+    floats = [_parse_float(value) for value in values]
+    if all(value is not None for value in floats):
+        return {"name": name, "kind": "float"}, np.asarray(floats, dtype=_DTYPES["float"])
+    stamps = [_parse_timestamp(value) for value in values]
+    if values and all(value is not None for value in stamps):
+        whole = all(float(stamp).is_integer() for stamp in stamps)
+        column = {"name": name, "kind": "timestamp", "timespec": "seconds" if whole else "microseconds"}
+        return column, np.asarray(stamps, dtype=_DTYPES["timestamp"])
+    categories: dict[str, int] = {}
+    codes = [categories.setdefault(str(value), len(categories)) for value in values]
+    if len(categories) > np.iinfo(np.uint16).max:
+        raise ValueError(f"Column {name!r} has too many distinct text values for a category channel.")
+    return {"name": name, "kind": "category", "categories": list(categories)}, np.asarray(codes, dtype=_DTYPES["category"])
+
+
+def write_scan_dataset(
+    path: str | Path,
+    columns: Mapping[str, Sequence[Any]],
+    metadata: Mapping[str, Any] | None = None,
+) -> Path:
+    """Write ``columns`` (channel name -> values) as a ``.spmscan`` file."""
+    lengths = {len(values) for values in columns.values()}
+    if len(lengths) > 1:
+        raise ValueError("All scan dataset columns must have the same length.")
+    point_count = lengths.pop() if lengths else 0
+
+    encoded = [_encode_column(name, list(values)) for name, values in columns.items()]
+    table: list[dict[str, Any]] = []
+    relative = 0
+    for column, array in encoded:
+        relative = _aligned(relative)
+        table.append({**column, "dtype": array.dtype.str, "offset": relative, "nbytes": int(array.nbytes)})
+        relative += array.nbytes
+
+    header = {
+        "version": DATASET_VERSION,
+        "point_count": point_count,
+        "metadata": dict(metadata or {}),
+        "columns": table,
+    }
+    # Column offsets are relative to the data start; the header is padded so
+    # the data start (and therefore every column) is 64-byte aligned.
+    header_bytes = json.dumps(header, sort_keys=True).encode("utf-8")
+    data_start = _aligned(len(DATASET_MAGIC) + 4 + len(header_bytes))
+    header_bytes = header_bytes.ljust(data_start - len(DATASET_MAGIC) - 4, b" ")
+
+    output = Path(path)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with output.open("wb") as handle:
+        handle.write(DATASET_MAGIC)
+        handle.write(struct.pack("<I", len(header_bytes)))
+        handle.write(header_bytes)
+        for column, (_, array) in zip(table, encoded):
+            handle.seek(data_start + column["offset"])
+            handle.write(array.tobytes())
+    return output
+
+
+class ScanDataset:
+    """Read-only view of a ``.spmscan`` file; columns are ``numpy.memmap``."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        with self.path.open("rb") as handle:
+            if handle.read(len(DATASET_MAGIC)) != DATASET_MAGIC:
+                raise ValueError(f"{self.path} is not an SPM scan dataset.")
+            (header_length,) = struct.unpack("<I", handle.read(4))
+            self.header: dict[str, Any] = json.loads(handle.read(header_length).decode("utf-8"))
+        if self.header.get("version") != DATASET_VERSION:
+            raise ValueError(f"{self.path} has unsupported dataset version {self.header.get('version')!r}.")
+        self._data_start = len(DATASET_MAGIC) + 4 + header_length
+        self._columns = {column["name"]: column for column in self.header["columns"]}
+        self._arrays: dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return self.point_count
+
+    @property
+    def point_count(self) -> int:
+        return int(self.header["point_count"])
+
+    @property
+    def metadata(self) -> dict[str, Any]:
+        return self.header["metadata"]
+
+    @property
+    def column_names(self) -> list[str]:
+        return [column["name"] for column in self.header["columns"]]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._columns
+
+    def column_info(self, name: str) -> dict[str, Any]:
+        return self._columns[name]
+
+    def column(self, name: str) -> np.ndarray:
+        """Raw typed array for ``name`` (category codes for text channels)."""
+        if name not in self._arrays:
+            column = self._columns[name]
+            if self.point_count == 0:
+                self._arrays[name] = np.empty(0, dtype=column["dtype"])
+            else:
+                self._arrays[name] = np.memmap(
+                    self.path,
+                    dtype=column["dtype"],
+                    mode="r",
+                    offset=self._data_start + int(column["offset"]),
+                    shape=(self.point_count,),
+                )
+        return self._arrays[name]
+
+    def categories(self, name: str) -> list[str]:
+        return list(self._columns[name].get("categories", []))
+
+    def decoded(self, name: str) -> list[Any]:
+        """Column values as Python objects, in the form the CSV carried them."""
+        column = self._columns[name]
+        values = self.column(name)
+        if column["kind"] == "category":
+            categories = column["categories"]
+            return [categories[code] for code in values.tolist()]
+        if column["kind"] == "timestamp":
+            timespec = column.get("timespec", "seconds")
+            return [datetime.fromtimestamp(stamp).isoformat(timespec=timespec) for stamp in values.tolist()]
+        return values.tolist()
+
+    def to_records(self) -> list[dict[str, Any]]:
+        decoded = {name: self.decoded(name) for name in self.column_names}
+        return [{name: decoded[name][index] for name in self.column_names} for index in range(self.point_count)]
+
+
+def open_scan_dataset(path: str | Path) -> ScanDataset:
+    return ScanDataset(path)
+
+
+def rows_to_columns(rows: Iterable[Mapping[str, Any]]) -> dict[str, list[Any]]:
+    columns: dict[str, list[Any]] = {}
+    for index, row in enumerate(rows):
+        if index == 0:
+            columns = {name: [] for name in row}
+        for name, values in columns.items():
+            values.append(row[name])
+    return columns
+
+
+def write_scan_dataset_from_rows(
+    path: str | Path,
+    rows: Sequence[Mapping[str, Any]],
+    metadata: Mapping[str, Any] | None = None,
+) -> Path:
+    return write_scan_dataset(path, rows_to_columns(rows), metadata)
+
+
+def csv_to_scan_dataset(csv_path: str | Path, dataset_path: str | Path | None = None) -> Path:
+    """Convert a raster CSV; its ``.metadata.json`` sidecar becomes the header metadata."""
+    source = Path(csv_path)
+    with source.open(newline="", encoding="utf-8") as handle:
+        reader = csv.DictReader(handle)
+        columns: dict[str, list[str]] = {name: [] for name in reader.fieldnames or []}
+        for row in reader:
+            for name, values in columns.items():
+                values.append(row[name])
+    sidecar = metadata_path_for_output(str(source))
+    metadata = json.loads(sidecar.read_text(encoding="utf-8")) if sidecar.exists() else {}
+    return write_scan_dataset(dataset_path or dataset_path_for_output(source), columns, metadata)
+
+
+def scan_dataset_to_csv(dataset_path: str | Path, csv_path: str | Path) -> Path:
+    dataset = open_scan_dataset(dataset_path)
+    output = Path(csv_path)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with output.open("w", newline="", encoding="utf-8") as handle:
+        writer = csv.DictWriter(handle, fieldnames=dataset.column_names)
+        writer.writeheader()
+        writer.writerows(dataset.to_records())
+    return output
+
+
+def fresh_dataset_for(csv_path: str | Path) -> Path | None:
+    """Sibling ``.spmscan`` of a CSV when it exists and is not older than the CSV."""
+    source = Path(csv_path)
+    if source.suffix == DATASET_SUFFIX:
+        return source
+    candidate = dataset_path_for_output(source)
+    try:
+        if candidate.stat().st_mtime >= source.stat().st_mtime:
+            return candidate
+    except OSError:
+        return None
+    return None
@@ -0,0 +1,222 @@
+"""Append-only, crash-safe checkpoint journal for real hardware scans.
+
+A journal is a JSON-lines file with one record per line:
+
+* ``plan``: scan kind, profile, options; always the first record.
+* ``position``: last commanded/known XYZ (retracts, pre-positioning).
+* ``point``: one completed pixel payload exactly as emitted to ``on_point``.
+* ``resume``: a later run picked the journal up again.
+* ``end``: final status of a run that returned normally.
+
+Records are flushed to the OS on every write and ``fsync``-ed in batches, so
+a USB drop or a crash loses at most one batch of points. Reopening a journal
+cuts a torn last line off before appending, and the loader skips any line it
+cannot decode. A journal without a ``complete`` end record can be resumed.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+import json
+import os
+import time
+from typing import Any
+
+JOURNAL_VERSION = 1
+DEFAULT_FSYNC_EVERY = 16
+DEFAULT_FSYNC_INTERVAL_S = 2.0
+_TAIL_CHUNK_BYTES = 64 * 1024
+
+
+def scan_journal_dir() -> Path:
+    path = Path(__file__).resolve().parents[2] / "docs" / "scan_journals"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def default_scan_journal_path(kind: str) -> Path:
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return scan_journal_dir() / f"SCAN_{stamp}_{kind}.journal.jsonl"
+
+
+@dataclass
+class ScanJournalState:
+    path: Path
+    plan: dict[str, Any]
+    points: dict[tuple[int, int], dict[str, Any]] = field(default_factory=dict)
+    last_position: dict[str, float] | None = None
+    status: str = "open"
+
+    @property
+    def kind(self) -> str:
+        return str(self.plan.get("kind", ""))
+
+    @property
+    def resumable(self) -> bool:
+        return self.status != "complete"
+
+    def completed(self) -> set[tuple[int, int]]:
+        return set(self.points)
+
+    def rows_by_line(self) -> dict[int, list[dict[str, Any]]]:
+        """Completed points grouped by line, each line in scan order."""
+        rows: dict[int, list[dict[str, Any]]] = {}
+        for (line_index, _point_index), point in sorted(self.points.items()):
+            rows.setdefault(line_index, []).append(point)
+        return rows
+
+    def rows(self) -> list[list[dict[str, Any]]]:
+        by_line = self.rows_by_line()
+        return [by_line[line_index] for line_index in sorted(by_line)]
+
+
+class ScanJournal:
+    """Append-only writer. Not thread-safe; one scan runner owns it."""
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        fsync_every: int = DEFAULT_FSYNC_EVERY,
+        fsync_interval_s: float = DEFAULT_FSYNC_INTERVAL_S,
+    ) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.fsync_every = max(1, int(fsync_every))
+        self.fsync_interval_s = float(fsync_interval_s)
+        self._repair_torn_tail()
+        self._handle = self.path.open("a", encoding="utf-8")
+        self._pending = 0
+        self._last_sync = time.monotonic()
+        self.fsync_count = 0
+
+    def _repair_torn_tail(self) -> None:
+        """Make sure appended records start on a line of their own.
+
+        A crash mid-write leaves a last line without its newline. A complete
+        record just gets the newline; a partial one is cut off, since
+        appending onto it would corrupt the next record too.
+        """
+        if not self.path.exists():
+            return
+        with self.path.open("rb+") as handle:
+            size = handle.seek(0, os.SEEK_END)
+            if size == 0:
+                return
+            handle.seek(size - 1)
+            if handle.read(1) == b"\n":
+                return
+            line_start = 0
+            position = size
+            while position > 0:
+                chunk_start = max(0, position - _TAIL_CHUNK_BYTES)
+                handle.seek(chunk_start)
+                newline = handle.read(position - chunk_start).rfind(b"\n")
+                if newline >= 0:
+                    line_start = chunk_start + newline + 1
+                    break
+                position = chunk_start
+            handle.seek(line_start)
+            try:
+                json.loads(handle.read().decode("utf-8"))
+            except (UnicodeDecodeError, json.JSONDecodeError):
+                handle.truncate(line_start)
+            else:
+                handle.write(b"\n")
+            handle.flush()
+            os.fsync(handle.fileno())
+
+    @property
+    def closed(self) -> bool:
+        return self._handle.closed
+
+    def _write(self, record: dict[str, Any], *, sync: bool = False) -> None:
+        self._handle.write(json.dumps(record, sort_keys=True) + "\n")
+        self._handle.flush()
+        self._pending += 1
+        if sync or self._pending >= self.fsync_every or time.monotonic() - self._last_sync >= self.fsync_interval_s:
+            self.sync()
+
+    def sync(self) -> None:
+        if self._handle.closed or self._pending == 0:
+            return
+        self._handle.flush()
+        os.fsync(self._handle.fileno())
+        self._pending = 0
+        self._last_sync = time.monotonic()
+        self.fsync_count += 1
+
+    def record_plan(self, kind: str, plan: dict[str, Any]) -> None:
+        self._write(
+            {
+                "type": "plan",
+                "version": JOURNAL_VERSION,
+                "kind": kind,
+                "created_at": datetime.now().isoformat(timespec="seconds"),
+                **plan,
+            },
+            sync=True,
+        )
+
+    def record_resume(self, completed_points: int) -> None:
+        self._write(
+            {
+                "type": "resume",
+                "resumed_at": datetime.now().isoformat(timespec="seconds"),
+                "completed_points": int(completed_points),
+            },
+            sync=True,
+        )
+
+    def record_position(self, x: float, y: float, z: float) -> None:
+        self._write({"type": "position", "x": float(x), "y": float(y), "z": float(z)})
+
+    def record_point(self, point: dict[str, Any]) -> None:
+        self._write({"type": "point", "point": point})
+
+    def record_end(self, status: str) -> None:
+        self._write({"type": "end", "status": status, "ended_at": datetime.now().isoformat(timespec="seconds")}, sync=True)
+
+    def close(self) -> None:
+        if self._handle.closed:
+            return
+        self.sync()
+        self._handle.close()
+
+
+def load_scan_journal(path: str | Path) -> ScanJournalState:
+    """Replay a journal. Raises ValueError when it has no plan record."""
+    journal_path = Path(path)
+    state: ScanJournalState | None = None
+    with journal_path.open(encoding="utf-8") as handle:
+        for raw in handle:
+            try:
+                record = json.loads(raw)
+            except json.JSONDecodeError:
+                # Torn write from a crash; records on later lines are intact.
+                continue
+            kind = record.get("type")
+            if kind == "plan":
+                state = ScanJournalState(path=journal_path, plan=record)
+                continue
+            if state is None:
+                continue
+            if kind == "point":
+                point = record["point"]
+                state.points[(int(point["line_index"]), int(point["point_index"]))] = point
+                state.last_position = {
+                    "x": float(point["x"]),
+                    "y": float(point["y"]),
+                    "z": float(point.get("retract_z", point["measured_z"])),
+                }
+            elif kind == "position":
+                state.last_position = {axis: float(record[axis]) for axis in ("x", "y", "z")}
+            elif kind == "resume":
+                state.status = "open"
+            elif kind == "end":
+                state.status = str(record.get("status", "open"))
+    if state is None:
+        raise ValueError(f"{journal_path} is not a scan journal: no plan record.")
+    return state
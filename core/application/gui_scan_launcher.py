@@ -1,13 +1,15 @@
 from __future__ import annotations
 
+import os
 import subprocess
 import sys
 import re
 import socket
-import math
 import csv
 from datetime import datetime
+from functools import partial
 from pathlib import Path
+from typing import Callable
 
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 if str(PROJECT_ROOT) not in sys.path:
@@ -34,9 +36,19 @@ from PyQt5.QtWidgets import (
     QGridLayout,
 )
 from PyQt5.QtGui import QPixmap
-from PyQt5.QtCore import Qt, QTimer
-
+from PyQt5.QtCore import Qt, QThread, QTimer, pyqtSignal
+
+from core.acquisition.raster_engine import (
+    clear_raster_pause,
+    raster_paused,
+    request_raster_pause,
+    request_raster_stop,
+    run_configured_raster,
+)
 from core.acquisition.raster_stream import load_raster_frame
+from core.acquisition.scan_dataset import dataset_path_for_output, write_scan_dataset_from_rows
+from core.application.plot_service import PlotService
+from core.application.refresh_scheduler import RefreshScheduler
 from core.application.workstation_status import WorkstationStatus
 from core.education.config_loader import load_config, get_safe_feedrates, get_scan_mode_preset
 from core.education.scan_profile import (
@@ -46,13 +58,11 @@ from core.education.scan_profile import (
     validate_scan_profile,
     MAX_SCAN_RESOLUTION,
 )
-from core.system.hardware_diagnostics import run_hardware_communication_report
+from core.education.surface_models import SurfaceArea, height_map
 from core.system.hardware_profile import SPMHardwareProfile
-from core.system.mk4s_z_auto_approach import confirmed_approach_reference, run_mk4s_z_auto_approach, run_mk4s_z_manual_step, run_mk4s_z_safe_retract
-from core.system.workstation_initializer import run_workstation_initialization
-from core.motion.prusa_gcode_backend import PrusaGcodeBackend
-from core.motion.parking import park_mk4s
 
+# Hardware actions (diagnostics, MK4S motion, Z approach) import their
+# modules when first used to keep launcher startup short.
 from core.z_control.crtouch_probe_plan import CRTouchProbePlan
 from core.z_control.z_driver_arduino_safe import ZDriverArduino
 
@@ -65,9 +75,43 @@ APP_VERSION = "v0.25.0"
 APP_PHASE = "Focused SPM Workflow - Connection, Approach, Measurement"
 APP_BUILD_DATE = "2026-06-12"
 APP_TITLE = f"Educational SPM {APP_VERSION} - Operator Workspace - Prusa MK4S"
+# Set to "subprocess" to run hardware scans and plots through the blocking CLI path.
+SCAN_ENGINE_ENV = "SPM_SCAN_ENGINE"
+
+
+def use_subprocess_engine() -> bool:
+    return os.environ.get(SCAN_ENGINE_ENV, "").strip().lower() == "subprocess"
+
+
+class HardwareScanWorker(QThread):
+    point = pyqtSignal(dict)
+    log_line = pyqtSignal(str)
+    finished_payload = pyqtSignal(dict)
+
+    def __init__(self, profile: ScanProfile, output_file: str, config: dict):
+        super().__init__()
+        self.profile = profile
+        self.output_file = output_file
+        self.config = config
+
+    def run(self) -> None:
+        try:
+            result = run_configured_raster(
+                self.profile,
+                self.output_file,
+                dry_run=False,
+                config=self.config,
+                on_point=lambda point: self.point.emit(dict(point)),
+                on_log=self.log_line.emit,
+            )
+            self.finished_payload.emit(result)
+        except Exception as exc:  # pragma: no cover - exercised manually with hardware
+            self.finished_payload.emit({"ok": False, "status": "failed", "message": repr(exc), "log_lines": [repr(exc)]})
 
 
 class ScanGUI(QWidget):
+    plot_rendered = pyqtSignal(dict)
+
     # ------------------------------------------------------------
     # GUI constructor
     # ------------------------------------------------------------
@@ -86,6 +130,10 @@ class ScanGUI(QWidget):
         self.current_position = {"x": None, "y": None, "z": None}
         self.shutdown_complete = False
         self.last_plot_path = ""
+        self.last_plot_csv_path = ""
+        self.plot_service = PlotService()
+        self.plot_service.warm_up()
+        self.plot_rendered.connect(self.apply_rendered_plot)
         self.scan_viewers = []
         self.direction_viewers = {}
         self.direction_preview_labels = {}
@@ -93,9 +141,12 @@ class ScanGUI(QWidget):
         self.z_approached = False
         self.scan_stop_requested = False
         self.scan_pause_requested = False
+        self.refresh_scheduler = RefreshScheduler(self)
+        self.hardware_scan_worker = None
         self.live_scan_timer = QTimer(self)
         self.live_scan_timer.timeout.connect(self.advance_live_scan)
         self.live_scan_points = []
+        self.live_scan_point_count = 0
         self.live_scan_index = 0
         self.live_scan_rows = []
         self.live_scan_current_line = []
@@ -589,6 +640,8 @@ class ScanGUI(QWidget):
         z_feedback_layout.addWidget(self.z_probe_safety_label)
         z_feedback_tab.setLayout(z_feedback_layout)
         # feedback_tabs.addTab(z_feedback_tab, "Z / Probe")
+        # The tab is not shown, but its labels are still updated; keep it alive.
+        self.z_feedback_tab = z_feedback_tab
 
         line_view_group = QGroupBox("Live Line Scan - Current X Sweep")
         line_view_layout = QVBoxLayout()
@@ -872,6 +925,8 @@ class ScanGUI(QWidget):
         viewer.activateWindow()
 
     def run_hardware_check_only(self) -> None:
+        from core.system.hardware_diagnostics import run_hardware_communication_report
+
         self.append_log("[HARDWARE CHECK] Running operator-requested hardware check")
         report = run_hardware_communication_report(self.config)
         for line in report.summary_lines():
@@ -924,6 +979,32 @@ class ScanGUI(QWidget):
     def update_color_map(self, color_map: str) -> None:
         self.color_map = color_map
         self.append_log(f"Plot color map selected: {self.color_map}")
+        if not self.last_plot_path or not Path(self.last_plot_csv_path).exists() or use_subprocess_engine():
+            return
+        future = self.plot_service.submit(self.last_plot_csv_path, self.last_plot_path, color_map)
+        future.add_done_callback(self.emit_rendered_plot)
+
+    def emit_rendered_plot(self, future, on_rendered: Callable[[dict], None] | None = None) -> None:
+        # Runs on the plot worker; the signal hands the result to the GUI thread.
+        if future.cancelled():
+            return
+        error = future.exception()
+        result = {"error": str(error)} if error else dict(future.result())
+        if on_rendered is not None:
+            result["on_rendered"] = on_rendered
+        self.plot_rendered.emit(result)
+
+    def apply_rendered_plot(self, result: dict) -> None:
+        if result.get("on_rendered") is not None:
+            result["on_rendered"](result)
+            return
+        if result.get("error"):
+            self.append_log(f"Plot re-render failed: {result['error']}")
+            return
+        if result.get("color_map") != self.color_map:
+            return
+        self.refresh_plot_preview(result["output_file"])
+        self.append_log(f"Plot re-rendered with {result['color_map']}{' (cached)' if result.get('cached') else ''}")
 
     def documentation_markdown(self) -> str:
         parking = self.config["parking_position"]
@@ -1306,6 +1387,8 @@ class ScanGUI(QWidget):
                 self.main_z_status_label.setStyleSheet("border: 1px solid #90a4ae; background: #fffde7; padding: 8px;")
 
     def query_mk4s_position(self) -> None:
+        from core.motion.prusa_gcode_backend import PrusaGcodeBackend
+
         if not self.require_initialized("MK4S position query"):
             return
 
@@ -1332,6 +1415,8 @@ class ScanGUI(QWidget):
         self.append_log(f"[MK4S] No-motion position query: {state}")
 
     def park_workstation(self) -> bool:
+        from core.motion.parking import park_mk4s
+
         if not self.require_initialized("Park MK4S"):
             return False
 
@@ -1364,6 +1449,8 @@ class ScanGUI(QWidget):
         return True
 
     def power_off_workstation(self) -> bool:
+        from core.motion.parking import park_mk4s
+
         self.stop_live_scan_runtime("power off requested")
         parking = self.config["parking_position"]
         if not self.confirm_critical_action(
@@ -1430,6 +1517,9 @@ class ScanGUI(QWidget):
         self.close()
 
     def stop_live_scan_runtime(self, reason: str) -> None:
+        if self.hardware_scan_worker is not None:
+            request_raster_stop()
+            self.append_log(f"[HARDWARE] Stop requested for running hardware scan: {reason}")
         if self.live_scan_timer.isActive():
             self.live_scan_timer.stop()
             self.append_log(f"[LIVE SCAN] Runtime stopped: {reason}")
@@ -1455,6 +1545,7 @@ class ScanGUI(QWidget):
         self.live_scan_rows = []
         self.live_scan_current_line = []
         self.live_scan_points = self.build_live_scan_points(profile)
+        self.live_scan_point_count = len(self.live_scan_points)
         self.live_scan_index = 0
         self.live_scan_active = True
         self.pause_scan_btn.setEnabled(True)
@@ -1494,15 +1585,14 @@ class ScanGUI(QWidget):
         return [float(start) + step * index for index in range(count)]
 
     def synthetic_regulated_height(self, x: float, y: float, profile: ScanProfile) -> float:
-        x_span = max(1e-9, profile.x_max - profile.x_min)
-        y_span = max(1e-9, profile.y_max - profile.y_min)
-        nx = (x - profile.x_min) / x_span
-        ny = (y - profile.y_min) / y_span
-        terrace = 0.55 if nx > 0.58 and ny > 0.32 else 0.0
-        lattice = 0.18 * math.sin(nx * math.pi * 18.0) * math.cos(ny * math.pi * 14.0)
-        slope = 0.28 * nx + 0.16 * ny
-        ridge = 0.45 * math.exp(-((nx - 0.72) ** 2 + (ny - 0.68) ** 2) / 0.012)
-        return profile.z + slope + terrace + lattice + ridge
+        # One cached height map per scan grid; live points fall on its nodes.
+        surface = height_map(
+            "regulated_terrace",
+            SurfaceArea(profile.x_min, profile.x_max, profile.y_min, profile.y_max),
+            max(2, int(profile.x_resolution)),
+            max(2, int(profile.y_resolution)),
+        )
+        return profile.z + surface.sample(x, y)
 
     def advance_live_scan(self) -> None:
         if self.scan_stop_requested:
@@ -1543,7 +1633,11 @@ class ScanGUI(QWidget):
             self.live_scan_current_line.append(sample)
             self.live_scan_index += 1
 
-        progress = int((self.live_scan_index / max(1, len(self.live_scan_points))) * 100)
+        # Ingestion runs at the timer rate; the views repaint at the scheduler's frame rate.
+        self.refresh_scheduler.schedule("live_scan_views", self.refresh_live_scan_views)
+
+    def refresh_live_scan_views(self) -> None:
+        progress = int((self.live_scan_index / max(1, self.live_scan_point_count)) * 100)
         current = self.live_scan_current_line[-1] if self.live_scan_current_line else {}
         self.set_scan_progress(progress, f"live scan line {current.get('line', '?')} {current.get('scan_direction', '')}")
         self.live_scan_status_label.setText(
@@ -1554,6 +1648,7 @@ class ScanGUI(QWidget):
 
     def finish_live_scan(self, cancelled: bool) -> None:
         self.live_scan_timer.stop()
+        self.refresh_scheduler.flush()
         if self.live_scan_current_line:
             self.live_scan_rows.append(self.live_scan_current_line)
             self.live_scan_current_line = []
@@ -1574,7 +1669,9 @@ class ScanGUI(QWidget):
             "Live scan complete: Z retracted to safe setpoint and XY return/park is ready for the shutdown sequence."
         )
         self.append_log(f"[LIVE SCAN] Complete. Saved regulated demo raster to {self.output_file.text()}")
-        plot_exit_code, plot_path = self.generate_plot()
+        self.generate_plot(self.finish_live_scan_plot)
+
+    def finish_live_scan_plot(self, plot_exit_code: int, plot_path: str) -> None:
         if plot_exit_code == 0:
             self.refresh_acquisition_preview(self.output_file.text(), plot_path)
 
@@ -1601,6 +1698,7 @@ class ScanGUI(QWidget):
             )
             writer.writeheader()
             writer.writerows(rows)
+        write_scan_dataset_from_rows(dataset_path_for_output(path), rows, {"source": "gui_live_scan"})
 
     def redraw_live_scan_views(self) -> None:
         self.draw_live_line_scan()
@@ -1700,12 +1798,25 @@ class ScanGUI(QWidget):
         self.run_hardware_scan()
 
     def pause_scan(self) -> None:
+        if self.hardware_scan_worker is not None:
+            # PAUSE toggles the in-process hardware raster between points.
+            if raster_paused():
+                clear_raster_pause()
+                self.append_log("[SCAN] Resume requested")
+                self.set_scan_progress(self.scan_progress_bar.value(), "resumed")
+            else:
+                request_raster_pause()
+                self.append_log("[SCAN] Pause requested; press PAUSE again to resume")
+                self.set_scan_progress(self.scan_progress_bar.value(), "pause requested")
+            return
         self.scan_pause_requested = True
         self.append_log("[SCAN] Pause requested")
         self.set_scan_progress(self.scan_progress_bar.value(), "pause requested")
 
     def stop_scan(self) -> None:
         self.scan_stop_requested = True
+        if self.hardware_scan_worker is not None:
+            request_raster_stop()
         self.append_log("[SCAN] Stop requested")
         self.set_scan_progress(self.scan_progress_bar.value(), "stop requested")
 
@@ -2070,6 +2181,8 @@ class ScanGUI(QWidget):
         self.append_log("[APPROACH] Service manual move complete")
 
     def run_main_z_manual_step(self, direction: str) -> None:
+        from core.system.mk4s_z_auto_approach import run_mk4s_z_manual_step
+
         if not self.require_initialized("Manual approach move"):
             return
         try:
@@ -2103,6 +2216,8 @@ class ScanGUI(QWidget):
         self.append_log(f"[APPROACH] {result.message}")
 
     def run_main_z_auto_approach(self) -> None:
+        from core.system.mk4s_z_auto_approach import confirmed_approach_reference, run_mk4s_z_auto_approach
+
         if not self.require_initialized("Auto approach"):
             return
         try:
@@ -2167,6 +2282,8 @@ class ScanGUI(QWidget):
         self.append_log(f"[Z AUTO APPROACH] {result.message}")
 
     def run_main_z_retract(self) -> None:
+        from core.system.mk4s_z_auto_approach import run_mk4s_z_safe_retract
+
         if not self.require_initialized("Z retract"):
             return
         if not self.confirm_critical_action(
@@ -2347,11 +2464,29 @@ class ScanGUI(QWidget):
     # ------------------------------------------------------------
     # Generate PNG plot from saved CSV output
     # ------------------------------------------------------------
-    def generate_plot(self) -> tuple[int, str]:
+    def generate_plot(self, on_done: Callable[[int, str], None]) -> None:
+        """Render the output CSV, then call ``on_done(exit_code, plot_path)`` on the GUI thread.
+
+        The in-process renderer runs on the plot worker so the window stays
+        responsive; the subprocess engine still runs inline.
+        """
         plot_path = self.build_plot_output_path()
-        command = self.build_plot_command()
-        exit_code = self.run_command(command, "plot")
-        return exit_code, plot_path
+        if use_subprocess_engine():
+            command = self.build_plot_command()
+            on_done(self.run_command(command, "plot"), plot_path)
+            return
+        future = self.plot_service.submit(self.output_file.text(), plot_path, self.color_map)
+        future.add_done_callback(
+            partial(self.emit_rendered_plot, on_rendered=partial(self.finish_generated_plot, plot_path, on_done))
+        )
+
+    def finish_generated_plot(self, plot_path: str, on_done: Callable[[int, str], None], result: dict) -> None:
+        if result.get("error"):
+            self.append_log(f"Plot generation failed: {result['error']}")
+            on_done(1, plot_path)
+            return
+        self.append_log(f"Saved plot: {plot_path}{' (cached)' if result.get('cached') else ''}")
+        on_done(0, plot_path)
 
     def refresh_acquisition_preview(self, csv_path: str, plot_path: str) -> None:
         try:
@@ -2370,6 +2505,7 @@ class ScanGUI(QWidget):
         self.set_scan_progress(100, f"{frame.point_count} raster points loaded")
         self.refresh_plot_preview(plot_path)
         self.last_plot_path = plot_path
+        self.last_plot_csv_path = csv_path
         self.open_scan_viewer_btn.setEnabled(True)
         self.line_scan_placeholder.setText(frame.line_scan_summary())
         self.topography_placeholder.setText(frame.topography_summary())
@@ -2461,33 +2597,7 @@ class ScanGUI(QWidget):
 
         if exit_code == 0:
             self.set_scan_progress(75, "generating raster plot")
-            plot_exit_code, plot_path = self.generate_plot()
-
-            if plot_exit_code == 0:
-                self.refresh_acquisition_preview(self.output_file.text(), plot_path)
-                self.append_log(f"Demo scan plot generated: {plot_path}")
-                self.operator_step_label.setText(
-                    "Current step: dry-run completed. Inspect line/topography/Z feedback, then enable real motion only if the MK4S path is clear."
-                )
-                QMessageBox.information(
-                    self,
-                    "Demo Scan",
-                    (
-                        "Demo scan completed successfully.\n\n"
-                        "No hardware movement was performed.\n\n"
-                        f"Plot saved to:\n{plot_path}"
-                    ),
-                )
-            else:
-                self.append_log(f"Plot generation failed with exit code {plot_exit_code}")
-                QMessageBox.warning(
-                    self,
-                    "Demo Scan",
-                    (
-                        "Demo scan completed successfully, but plot generation failed.\n\n"
-                        "Check the status log for details."
-                    ),
-                )
+            self.generate_plot(self.finish_dry_scan_plot)
         else:
             self.append_log(f"Demo scan failed with exit code {exit_code}")
             QMessageBox.critical(
@@ -2497,10 +2607,39 @@ class ScanGUI(QWidget):
             )
         self.pause_scan_btn.setEnabled(False)
         self.stop_scan_btn.setEnabled(False)
+
+    def finish_dry_scan_plot(self, plot_exit_code: int, plot_path: str) -> None:
+        if plot_exit_code == 0:
+            self.refresh_acquisition_preview(self.output_file.text(), plot_path)
+            self.append_log(f"Demo scan plot generated: {plot_path}")
+            self.operator_step_label.setText(
+                "Current step: dry-run completed. Inspect line/topography/Z feedback, then enable real motion only if the MK4S path is clear."
+            )
+            QMessageBox.information(
+                self,
+                "Demo Scan",
+                (
+                    "Demo scan completed successfully.\n\n"
+                    "No hardware movement was performed.\n\n"
+                    f"Plot saved to:\n{plot_path}"
+                ),
+            )
+        else:
+            self.append_log(f"Plot generation failed with exit code {plot_exit_code}")
+            QMessageBox.warning(
+                self,
+                "Demo Scan",
+                (
+                    "Demo scan completed successfully, but plot generation failed.\n\n"
+                    "Check the status log for details."
+                ),
+            )
     # ------------------------------------------------------------
     # System readiness check
     # ------------------------------------------------------------
     def initiate_system_check(self) -> None:
+        from core.system.workstation_initializer import run_workstation_initialization
+
         if not self.confirm_critical_action(
             "Connect to SPM",
             (
@@ -2639,6 +2778,10 @@ class ScanGUI(QWidget):
             self.append_log("[SAFETY] Hardware scan blocked because hardware is DISARMED")
             return
 
+        if self.hardware_scan_worker is not None:
+            self.append_log("[HARDWARE] Hardware scan already running")
+            return
+
         profile = self.validate_profile()
 
         if profile is None:
@@ -2657,104 +2800,179 @@ class ScanGUI(QWidget):
             self.append_log("[HARDWARE] Hardware scan cancelled by operator")
             return
 
+        use_subprocess = use_subprocess_engine()
         self.append_log(f"Hardware scan using color map: {self.color_map}")
         self.scan_pause_requested = False
         self.scan_stop_requested = False
         self.pause_scan_btn.setEnabled(True)
         self.stop_scan_btn.setEnabled(True)
         self.workstation_status.record_scan_start("HARDWARE", self.output_file.text())
-        self.set_scan_progress(
-            10,
-            "hardware scan starting; hardware scan starting; REAL MK4S motion running via blocking CLI; preview updates after CSV/plot generation",
-        )
-        self.live_scan_status_label.setText(
-            "Real scan: MK4S motion is active through the verified CLI path. "
-            "This Phase 1 stabilizer updates the main preview after the scan output CSV and plot are generated."
-        )
+        if use_subprocess:
+            self.set_scan_progress(
+                10,
+                "hardware scan starting; hardware scan starting; REAL MK4S motion running via blocking CLI; preview updates after CSV/plot generation",
+            )
+            self.live_scan_status_label.setText(
+                "Real scan: MK4S motion is active through the verified CLI path. "
+                "This Phase 1 stabilizer updates the main preview after the scan output CSV and plot are generated."
+            )
+        else:
+            self.set_scan_progress(0, "hardware scan starting; REAL MK4S motion running in-process; preview streams point by point")
+            self.live_scan_status_label.setText(
+                "Real scan: MK4S motion is active through the verified raster engine. "
+                "Line and topography views update as points arrive."
+            )
         self.z_condition_placeholder.setText(
             "Real scan status\n\n"
             "Motion: REAL MK4S X/Y/Z command path\n"
             "Measurement values: configured raster pipeline / simulated surface unless a real sensor backend is active\n"
-            "Live point-by-point hardware visualization: planned for the next integration phase\n"
-            f"Output CSV: {self.output_file.text()}"
+            + (
+                "Live point-by-point hardware visualization: available with the in-process engine\n"
+                if use_subprocess
+                else "Live point-by-point hardware visualization: streaming\n"
+            )
+            + f"Output CSV: {self.output_file.text()}"
         )
         self.append_log(
             "[HARDWARE] Real MK4S scan started. Main preview will refresh after CSV/plot generation."
+            if use_subprocess
+            else "[HARDWARE] Real MK4S scan started in-process. Preview streams live; the UI stays responsive."
         )
         self.refresh_workstation_status_ui()
 
-        command = self.build_cli_command(profile, execute_hardware=True)
-        exit_code = self.run_command(command, "scan")
+        if use_subprocess:
+            command = self.build_cli_command(profile, execute_hardware=True)
+            exit_code = self.run_command(command, "scan")
+            self.finish_hardware_scan(exit_code == 0, f"blocking CLI returned exit code {exit_code}")
+            return
 
-        if exit_code == 0:
+        self.live_scan_rows = []
+        self.live_scan_current_line = []
+        self.live_scan_points = []
+        self.live_scan_point_count = 0
+        self.live_scan_index = 0
+        self.redraw_live_scan_views()
+        clear_raster_pause()
+        worker = HardwareScanWorker(profile, self.output_file.text(), self.config)
+        worker.point.connect(self.render_hardware_scan_point)
+        worker.log_line.connect(lambda line: self.refresh_scheduler.post_log(self.append_log, line))
+        worker.finished_payload.connect(self.render_hardware_scan_result)
+        # finished_payload arrives while run() is still returning; only drop
+        # the last reference once the thread itself has finished.
+        worker.finished.connect(lambda: self.release_hardware_scan_worker(worker))
+        self.hardware_scan_worker = worker
+        self.execute_btn.setEnabled(False)
+        worker.start()
+
+    def render_hardware_scan_point(self, point: dict) -> None:
+        direction = str(point["scan_direction"])
+        sample = {
+            **point,
+            "line": int(point["line_index"]) + 1,
+            "y_pass": direction if direction in ("upward", "downward") else "upward",
+            "regulated_height": float(point["simulated_z_signal"]),
+        }
+        if self.live_scan_current_line and self.live_scan_current_line[-1]["line"] != sample["line"]:
+            self.live_scan_rows.append(self.live_scan_current_line)
+            self.live_scan_current_line = []
+        self.live_scan_current_line.append(sample)
+        self.live_scan_index = int(point["point_index"]) + 1
+        self.live_scan_point_count = int(point["point_count"])
+        self.refresh_scheduler.schedule("live_scan_views", self.refresh_live_scan_views)
+
+    def release_hardware_scan_worker(self, worker: HardwareScanWorker) -> None:
+        if self.hardware_scan_worker is worker:
+            self.hardware_scan_worker = None
+        worker.deleteLater()
+        self.execute_btn.setEnabled(self.hardware_armed)
+
+    def render_hardware_scan_result(self, result: dict) -> None:
+        self.refresh_scheduler.flush()
+        if self.live_scan_current_line:
+            self.live_scan_rows.append(self.live_scan_current_line)
+            self.live_scan_current_line = []
+        if result.get("status") == "stopped":
+            self.set_scan_progress(self.scan_progress_bar.value(), "hardware scan stopped")
+            self.live_scan_status_label.setText(f"Real scan stopped by operator: {result.get('message', '')}")
+            self.append_log(f"[HARDWARE] {result.get('message', '')} Output: {self.output_file.text()}")
+            self.pause_scan_btn.setEnabled(False)
+            self.stop_scan_btn.setEnabled(False)
+            return
+        self.finish_hardware_scan(bool(result.get("ok")), str(result.get("message", "")))
+
+    def finish_hardware_scan(self, succeeded: bool, failure_detail: str) -> None:
+        if succeeded:
             self.set_scan_progress(75, "generating raster plot")
-            plot_exit_code, plot_path = self.generate_plot()
-
-            if plot_exit_code == 0:
-                self.refresh_acquisition_preview(self.output_file.text(), plot_path)
-                self.append_log(f"Hardware scan plot generated: {plot_path}")
-                self.live_scan_status_label.setText(
-                    "Real scan complete: output CSV and raster preview were refreshed. "
-                    "Inspect the generated preview before retracting/disconnecting."
-                )
-                self.z_condition_placeholder.setText(
-                    "Real scan complete\n\n"
-                    "Motion: REAL MK4S motion path completed\n"
-                    "Preview: refreshed from generated CSV/plot\n"
-                    f"CSV: {self.output_file.text()}\n"
-                    f"Plot: {plot_path}"
-                )
-                self.operator_step_label.setText(
-                    "Current step: hardware scan completed and safe park requested. Inspect output before deinitializing."
-                )
-                try:
-                    state = park_mk4s(self.config)
-                    self.update_position_display(state.get("position", {}), "post-scan safe park")
-                    self.z_approached = False
-                    self.append_log(f"[HARDWARE] Post-scan safe park complete: {state}")
-                except Exception as error:
-                    self.append_log(f"[HARDWARE] Post-scan safe park failed: {error}")
-                    QMessageBox.critical(
-                        self,
-                        "Post-scan safe park failed",
-                        f"Scan completed, but safe park failed. Keep the software open and recover manually.\n\n{error}",
-                    )
-                QMessageBox.information(
-                    self,
-                    "Hardware Scan",
-                    (
-                        "Hardware scan completed successfully.\n\n"
-                        f"Plot saved to:\n{plot_path}"
-                    ),
-                )
-            else:
-                self.append_log(f"Plot generation failed with exit code {plot_exit_code}")
-                QMessageBox.warning(
-                    self,
-                    "Hardware Scan",
-                    (
-                        "Hardware scan completed successfully, but plot generation failed.\n\n"
-                        "Check the status log for details."
-                    ),
-                )
+            self.generate_plot(self.finish_hardware_scan_plot)
         else:
             self.live_scan_status_label.setText(
-                f"Real scan failed: blocking CLI returned exit code {exit_code}."
+                f"Real scan failed: {failure_detail}"
             )
             self.z_condition_placeholder.setText(
                 "Real scan failed\n\n"
-                f"Exit code: {exit_code}\n"
-                "Check the status log and raw CLI output before moving hardware again."
+                f"Reason: {failure_detail}\n"
+                "Check the status log and raw scan output before moving hardware again."
             )
-            self.append_log(f"Hardware scan failed with exit code {exit_code}")
+            self.append_log(f"Hardware scan failed: {failure_detail}")
             QMessageBox.critical(
                 self,
                 "Hardware Scan",
-                f"Hardware scan failed with exit code {exit_code}",
+                f"Hardware scan failed: {failure_detail}",
             )
         self.pause_scan_btn.setEnabled(False)
         self.stop_scan_btn.setEnabled(False)
 
+    def finish_hardware_scan_plot(self, plot_exit_code: int, plot_path: str) -> None:
+        from core.motion.parking import park_mk4s
+
+        if plot_exit_code == 0:
+            self.refresh_acquisition_preview(self.output_file.text(), plot_path)
+            self.append_log(f"Hardware scan plot generated: {plot_path}")
+            self.live_scan_status_label.setText(
+                "Real scan complete: output CSV and raster preview were refreshed. "
+                "Inspect the generated preview before retracting/disconnecting."
+            )
+            self.z_condition_placeholder.setText(
+                "Real scan complete\n\n"
+                "Motion: REAL MK4S motion path completed\n"
+                "Preview: refreshed from generated CSV/plot\n"
+                f"CSV: {self.output_file.text()}\n"
+                f"Plot: {plot_path}"
+            )
+            self.operator_step_label.setText(
+                "Current step: hardware scan completed and safe park requested. Inspect output before deinitializing."
+            )
+            try:
+                state = park_mk4s(self.config)
+                self.update_position_display(state.get("position", {}), "post-scan safe park")
+                self.z_approached = False
+                self.append_log(f"[HARDWARE] Post-scan safe park complete: {state}")
+            except Exception as error:
+                self.append_log(f"[HARDWARE] Post-scan safe park failed: {error}")
+                QMessageBox.critical(
+                    self,
+                    "Post-scan safe park failed",
+                    f"Scan completed, but safe park failed. Keep the software open and recover manually.\n\n{error}",
+                )
+            QMessageBox.information(
+                self,
+                "Hardware Scan",
+                (
+                    "Hardware scan completed successfully.\n\n"
+                    f"Plot saved to:\n{plot_path}"
+                ),
+            )
+        else:
+            self.append_log(f"Plot generation failed with exit code {plot_exit_code}")
+            QMessageBox.warning(
+                self,
+                "Hardware Scan",
+                (
+                    "Hardware scan completed successfully, but plot generation failed.\n\n"
+                    "Check the status log for details."
+                ),
+            )
+
     def closeEvent(self, event) -> None:
         self.stop_live_scan_runtime("window close requested")
         if not self.shutdown_complete:
@@ -2772,6 +2990,7 @@ class ScanGUI(QWidget):
             return
 
         self.append_log("[GUI] Close confirmed after safe power-off")
+        self.plot_service.shutdown()
         event.accept()
 
 
@@ -2790,6 +3009,10 @@ def acquire_single_instance_socket():
 
 
 if __name__ == "__main__":
+    if "--profile-startup" in sys.argv[1:]:
+        from core.system.startup_profile import print_startup_profile
+
+        raise SystemExit(print_startup_profile("core.application.gui_scan_launcher"))
     instance_guard = acquire_single_instance_socket()
     app = QApplication(sys.argv)
     if instance_guard is None:
@@ -2,17 +2,17 @@ from __future__ import annotations
 
 import os
 import sys
-import math
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Callable
+from typing import TYPE_CHECKING, Any, Callable
 
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-from PyQt5.QtCore import QThread, QTimer, Qt, pyqtSignal
-from PyQt5.QtGui import QColor, QPainter, QPen
+import numpy as np
+from PyQt5.QtCore import QPointF, QRectF, QThread, QTimer, Qt, pyqtSignal
+from PyQt5.QtGui import QColor, QPainter, QPen, QPolygonF
 from PyQt5.QtWidgets import (
     QApplication,
     QAction,
@@ -37,8 +37,6 @@ from PyQt5.QtWidgets import (
 )
 
 from core.system.mk4s_z_auto_approach import run_mk4s_z_move_to_setpoint
-from core.ai.academic_ai_client import build_ai_recommendation
-from core.ai.academic_gcode_generator import GCodePatternRequest, build_academic_gcode_job, build_gcode_plan
 from core.ai.spm_approach_advisor import ApproachAdvisorInput, advise_approach
 from core.z_control.crtouch_probe_plan import CRTouchProbePlan
 from core.web.system_control import (
@@ -63,11 +61,21 @@ from core.web.real_scan_control import (
     run_real_constant_z_scan,
 )
 from core.web.mk4s_motion_limits import motion_limits_payload
+from core.application.refresh_scheduler import RefreshScheduler
+from core.application.scan_data_model import ScanChange, ScanDataModel
+from core.application.topography_renderer import GRID_MIN_CELL_PX, TopographyRenderer
+from core.application.z_trace_buffer import Z_TRACE_CAPACITY, ZTraceBuffer
+
+# The AI client and G-code generator (urllib, HTTP stack) load on first use.
+if TYPE_CHECKING:
+    from core.ai.academic_gcode_generator import GCodePatternRequest
 
 
 APP_VERSION = "v0.2.24"
 APP_TITLE = f"SPM Prusa Operator Software {APP_VERSION} - Phase 2.1/2.4"
 Z_VIEW_FULL_RANGE = (0.0, 220.0)
+Z_TRACE_LIVE_WINDOW = 240
+Z_TRACE_MIN_WINDOW = 16
 SYSTEM_CONTROL_WINDOW_WIDTH = 430
 SYSTEM_CONTROL_WINDOW_HEIGHT = 760
 GREEN_BUTTON_STYLE = "QPushButton { background: #167a3a; color: white; font-weight: 700; padding: 8px; }"
@@ -80,17 +88,35 @@ TOPOGRAPHY_VIEW_LABELS = ("Topography X+", "Topography X-", "Topography Y+", "To
 
 
 class ZTraceWidget(QWidget):
-    def __init__(self) -> None:
+    """Live Z trace over the full retained history.
+
+    The wheel zooms the time window, Shift+wheel or dragging scrolls back
+    through history, and a double click returns to the live window.
+    """
+
+    def __init__(self, scheduler: RefreshScheduler | None = None, capacity: int = Z_TRACE_CAPACITY) -> None:
         super().__init__()
-        self.samples: list[float] = []
+        self.scheduler = scheduler
+        self.history = ZTraceBuffer(capacity)
         self.view_mode = "auto"
         self.zoom_window_mm = 2.0
+        self.window_samples = Z_TRACE_LIVE_WINDOW
+        self.scroll_back = 0
+        self._drag_x: float | None = None
         self.setMinimumHeight(220)
 
     def add_sample(self, z_value: float) -> None:
-        self.samples.append(float(z_value))
-        self.samples = self.samples[-400:]
-        self.update()
+        self.history.append(z_value)
+        if self.scroll_back:
+            # A scrolled-back view stays on the same samples while new ones arrive.
+            self.scroll_back = self._clamped_scroll(self.scroll_back + 1)
+        self.request_repaint()
+
+    def request_repaint(self) -> None:
+        if self.scheduler is not None:
+            self.scheduler.request_update(self)
+        else:
+            self.update()
 
     def set_view_mode(self, mode: str) -> None:
         self.view_mode = mode
@@ -101,7 +127,55 @@ class ZTraceWidget(QWidget):
         self.update()
 
     def clear(self) -> None:
-        self.samples.clear()
+        self.history.clear()
+        self.scroll_back = 0
+        self.update()
+
+    def visible_span(self) -> tuple[int, int]:
+        stop = max(0, len(self.history) - self.scroll_back)
+        return max(0, stop - self.window_samples), stop
+
+    def _clamped_scroll(self, scroll_back: int) -> int:
+        limit = max(0, len(self.history) - self.window_samples)
+        return max(0, min(limit, int(scroll_back)))
+
+    def scroll_samples(self, delta: int) -> None:
+        """Scroll back (positive) or forward (negative) through history."""
+        self.scroll_back = self._clamped_scroll(self.scroll_back + int(delta))
+        self.update()
+
+    def zoom_time(self, factor: float) -> None:
+        upper = max(Z_TRACE_LIVE_WINDOW, len(self.history))
+        self.window_samples = int(max(Z_TRACE_MIN_WINDOW, min(upper, self.window_samples * factor)))
+        self.scroll_samples(0)
+
+    def wheelEvent(self, event: Any) -> None:  # noqa: N802
+        steps = event.angleDelta().y() / 120.0
+        if not steps:
+            return
+        if event.modifiers() & Qt.ShiftModifier:
+            self.scroll_samples(int(steps * max(1, self.window_samples // 4)))
+        else:
+            self.zoom_time(0.5 if steps > 0 else 2.0)
+
+    def mousePressEvent(self, event: Any) -> None:  # noqa: N802
+        self._drag_x = float(event.x())
+
+    def mouseMoveEvent(self, event: Any) -> None:  # noqa: N802
+        if self._drag_x is None:
+            return
+        plot_w = max(1, self.width() - 62)
+        delta = int((event.x() - self._drag_x) / plot_w * self.window_samples)
+        if delta:
+            self._drag_x = float(event.x())
+            self.scroll_samples(delta)
+
+    def mouseReleaseEvent(self, _event: Any) -> None:  # noqa: N802
+        self._drag_x = None
+
+    def mouseDoubleClickEvent(self, _event: Any) -> None:  # noqa: N802
+        self.window_samples = Z_TRACE_LIVE_WINDOW
+        self.scroll_back = 0
         self.update()
 
     def paintEvent(self, _event: Any) -> None:  # noqa: N802
@@ -123,17 +197,20 @@ class ZTraceWidget(QWidget):
             y = margin_top + (plot_h * i / 5)
             painter.drawLine(margin_left, int(y), width - margin_right, int(y))
 
+        start, stop = self.visible_span()
+        where = "live" if not self.scroll_back else f"{self.scroll_back} samples back"
         painter.setPen(QColor("#9fb3c8"))
-        painter.drawText(12, 18, f"Live Z signal ({self.view_mode})")
+        painter.drawText(12, 18, f"Live Z signal ({self.view_mode}) | {where}, {stop - start}/{len(self.history)} samples")
         painter.drawText(8, margin_top + 12, "Z mm")
 
-        if not self.samples:
+        if not len(self.history):
             painter.drawText(margin_left, margin_top + 34, "Read Z or apply a target to start the trace")
             return
 
-        latest = self.samples[-1]
-        low = min(self.samples)
-        high = max(self.samples)
+        positions, mins, maxs = self.history.envelope(start, stop, plot_w)
+        latest = self.history.latest
+        low = float(mins.min())
+        high = float(maxs.max())
         if self.view_mode == "full":
             low, high = Z_VIEW_FULL_RANGE
         elif self.view_mode == "zoom":
@@ -144,37 +221,71 @@ class ZTraceWidget(QWidget):
             low, high = low - pad, high + pad
         span = max(0.01, high - low)
 
-        painter.setPen(QPen(QColor("#5fd0ff"), 2))
-        points = self.samples[-240:]
-        last_x = last_y = None
-        for index, value in enumerate(points):
-            x = margin_left + int((index / max(1, len(points) - 1)) * plot_w)
-            normalized = max(0.0, min(1.0, (value - low) / span))
-            y = margin_top + plot_h - int(normalized * plot_h)
-            if last_x is not None and last_y is not None:
-                painter.drawLine(last_x, last_y, x, y)
-            last_x, last_y = x, y
+        xs = margin_left + (positions - start) / max(1, stop - start - 1) * plot_w
+        if mins is maxs:
+            ys = (np.clip((mins - low) / span, 0.0, 1.0),)
+        else:
+            ys = (np.clip((mins - low) / span, 0.0, 1.0), np.clip((maxs - low) / span, 0.0, 1.0))
+            xs = np.repeat(xs, 2)
+        ys = margin_top + plot_h - np.column_stack(ys).ravel() * plot_h
+        painter.setPen(QPen(QColor("#5fd0ff"), 2 if mins is maxs else 1))
+        painter.drawPolyline(QPolygonF([QPointF(x, y) for x, y in zip(xs.tolist(), ys.tolist())]))
 
+        history_low, history_high = self.history.range()
         painter.setPen(QColor("#d7e6f8"))
-        painter.drawText(12, height - 10, f"view {low:.3f}..{high:.3f} mm | current {latest:.3f} mm")
+        painter.drawText(
+            12,
+            height - 10,
+            f"view {low:.3f}..{high:.3f} mm | current {latest:.3f} mm | history {history_low:.3f}..{history_high:.3f} mm",
+        )
         painter.drawText(12, margin_top + 2, f"{high:.2f}")
         painter.drawText(12, margin_top + plot_h, f"{low:.2f}")
 
 
 class SignalPlotWidget(QWidget):
-    def __init__(self, title: str, mode: str, direction: str) -> None:
+    def __init__(
+        self,
+        title: str,
+        mode: str,
+        direction: str,
+        model: ScanDataModel | None = None,
+        scheduler: RefreshScheduler | None = None,
+    ) -> None:
         super().__init__()
+        self.scheduler = scheduler
         self.title = title
         self.mode = mode
         self.direction = direction
-        self.lines: list[list[dict[str, float]]] = []
-        self.current_line: list[dict[str, float]] = []
+        self.model: ScanDataModel | None = None
+        self.topography = TopographyRenderer()
+        self.dirty_rows: set[int] = set()
+        self.needs_full_sync = True
         self.setMinimumSize(640, 360)
-
-    def set_scan_data(self, lines: list[list[dict[str, float]]], current_line: list[dict[str, float]]) -> None:
-        self.lines = [list(line) for line in lines]
-        self.current_line = list(current_line)
-        self.update()
+        if model is not None:
+            self.set_model(model)
+
+    def set_model(self, model: ScanDataModel) -> None:
+        if self.model is not None:
+            self.model.unsubscribe(self.on_scan_change)
+        self.model = model
+        model.subscribe(self.on_scan_change)
+        self.on_scan_change(ScanChange(model.version, 0, 0, reset=True))
+
+    def on_scan_change(self, change: ScanChange) -> None:
+        if self.mode != "line":
+            if change.reset:
+                self.topography.reset()
+                self.dirty_rows.clear()
+                self.needs_full_sync = True
+            else:
+                self.dirty_rows.update(change.rows)
+        self.request_repaint()
+
+    def request_repaint(self) -> None:
+        if self.scheduler is not None:
+            self.scheduler.request_update(self)
+        else:
+            self.update()
 
     def paintEvent(self, _event: Any) -> None:  # noqa: N802
         painter = QPainter(self)
@@ -188,20 +299,21 @@ class SignalPlotWidget(QWidget):
         else:
             self.paint_topography(painter)
 
-    def selected_line(self) -> list[dict[str, float]]:
-        line = self.current_line or (self.lines[-1] if self.lines else [])
+    def selected_line(self) -> list[float]:
+        if self.model is None:
+            return []
+        line = self.model.line()
         if self.direction.endswith("-"):
-            return list(reversed(line))
-        return line
+            line = line[::-1]
+        return line.tolist()
 
     def paint_line(self, painter: QPainter) -> None:
-        line = self.selected_line()
-        if not line:
+        values = self.selected_line()
+        if not values:
             painter.setPen(QColor("#9fb3c8"))
             painter.drawText(24, 58, "Line mode waiting for measurement points")
             return
 
-        values = [float(point["z_feedback"]) for point in line]
         low = min(values)
         high = max(values)
         flat_signal = abs(high - low) < 1e-9
@@ -239,57 +351,45 @@ class SignalPlotWidget(QWidget):
             painter.drawEllipse(x - 5, y - 5, 10, 10)
 
         painter.setPen(QColor("#d7e6f8"))
-        latest_source = str(line[-1].get("feedback_source", "z_feedback"))
+        latest_source = str(self.model.last_point.get("feedback_source", "z_feedback"))
         painter.drawText(12, top + 4, f"{high:.3f} mm")
         painter.drawText(12, top + height, f"{low:.3f} mm")
         painter.drawText(left, self.height() - 10, f"{len(values)} points | latest {values[-1]:.4f} mm | {latest_source}")
 
     def paint_topography(self, painter: QPainter) -> None:
-        rows = list(self.lines)
-        if self.current_line:
-            rows.append(list(self.current_line))
-        if not rows:
+        if self.model is not None and (self.needs_full_sync or self.dirty_rows):
+            self.topography.sync(self.model.heights(), None if self.needs_full_sync else sorted(self.dirty_rows))
+            self.needs_full_sync = False
+            self.dirty_rows.clear()
+        image = self.topography.image()
+        if image is None:
             painter.setPen(QColor("#9fb3c8"))
             painter.drawText(24, 58, "Topography waiting for accumulated scan lines")
             return
 
-        if self.direction.startswith("Y-"):
-            rows = list(reversed(rows))
-        all_values = [float(point["z_feedback"]) for row in rows for point in row]
-        low = min(all_values)
-        high = max(all_values)
-        flat_signal = abs(high - low) < 1e-9
-        span = max(1e-9, high - low)
         left, top, right, bottom = 20, 42, 18, 24
         width = max(1, self.width() - left - right)
         height = max(1, self.height() - top - bottom)
-        cell_h = max(1, height / max(1, len(rows)))
-
-        for row_index, row in enumerate(rows):
-            points = list(row)
-            if self.direction.startswith("X-"):
-                points = list(reversed(points))
-            cell_w = max(1, width / max(1, len(points)))
-            for col, point in enumerate(points):
-                value = float(point["z_feedback"])
-                normalized = 0.55 if flat_signal else (value - low) / span
-                color = QColor.fromHsvF(0.62 - 0.62 * normalized, 0.88, 0.30 + 0.62 * normalized)
-                cell_x = int(left + col * cell_w)
-                cell_y = int(top + row_index * cell_h)
-                cell_width = max(1, math.ceil(cell_w))
-                cell_height = max(1, math.ceil(cell_h))
-                painter.fillRect(
-                    cell_x,
-                    cell_y,
-                    cell_width,
-                    cell_height,
-                    color,
-                )
-                painter.setPen(QPen(QColor("#111827"), 1))
-                painter.drawRect(cell_x, cell_y, cell_width, cell_height)
-
+        image = image.mirrored(self.direction.startswith("X-"), self.direction.startswith("Y-"))
+        painter.setRenderHint(QPainter.SmoothPixmapTransform, False)
+        painter.drawImage(QRectF(left, top, width, height), image)
+
+        rows, columns = image.height(), image.width()
+        line_count = self.model.line_count if self.model is not None else rows
+        cell_w = width / max(1, columns)
+        cell_h = height / max(1, rows)
+        if min(cell_w, cell_h) >= GRID_MIN_CELL_PX:
+            painter.setPen(QPen(QColor("#111827"), 1))
+            for col in range(columns + 1):
+                x = int(left + col * cell_w)
+                painter.drawLine(x, top, x, top + height)
+            for row_index in range(rows + 1):
+                y = int(top + row_index * cell_h)
+                painter.drawLine(left, y, left + width, y)
+
+        low, high = self.topography.low, self.topography.high
         painter.setPen(QColor("#d7e6f8"))
-        painter.drawText(left, self.height() - 8, f"{len(rows)} lines | Z {low:.4f}..{high:.4f} mm")
+        painter.drawText(left, self.height() - 8, f"{line_count} lines | Z {low:.4f}..{high:.4f} mm")
 
 
 class ToolWindow(QDialog):
@@ -579,6 +679,8 @@ class AcademicGCodeWindow(ToolWindow):
         self.owner.append_log("[ACADEMIC EXPORT] AI-suggested printer parameters applied locally.")
 
     def request(self) -> GCodePatternRequest:
+        from core.ai.academic_gcode_generator import GCodePatternRequest
+
         return GCodePatternRequest(
             prompt=self.prompt.toPlainText().strip()
             or "Create a 3x3 gold-like atomic island field with small hexagonal rings.",
@@ -607,6 +709,9 @@ class AcademicGCodeWindow(ToolWindow):
         self.refinement_notes.clear()
 
     def ask_ai_for_plan(self, chat_message: str = "") -> None:
+        from core.ai.academic_ai_client import build_ai_recommendation
+        from core.ai.academic_gcode_generator import build_gcode_plan
+
         try:
             plan = build_gcode_plan(self.request())
         except ValueError as exc:
@@ -656,6 +761,8 @@ class AcademicGCodeWindow(ToolWindow):
         self.owner.append_log(f"[ACADEMIC EXPORT] AI discussion round {self.chat_turn_count}; no file generated yet.")
 
     def accept_plan(self) -> None:
+        from core.ai.academic_gcode_generator import build_gcode_plan
+
         try:
             plan = build_gcode_plan(self.request())
         except ValueError as exc:
@@ -670,6 +777,8 @@ class AcademicGCodeWindow(ToolWindow):
         self.status.setText("Final build plan confirmed. Create Code is now enabled; no file has been created or sent.")
 
     def generate_gcode(self) -> None:
+        from core.ai.academic_gcode_generator import build_academic_gcode_job
+
         if self.accepted_request is None:
             QMessageBox.warning(
                 self,
@@ -754,6 +863,10 @@ class MeasurementWindow(ToolWindow):
         self.y_lines = QSpinBox()
         self.scan_speed = QDoubleSpinBox()
         self.scan_direction = QComboBox()
+        self.raster_motion = QComboBox()
+        self.contact_engine = QComboBox()
+        self.search_window = QComboBox()
+        self.lift_mode = QComboBox()
         self.surface = QComboBox()
         self.resolution_status = QLabel()
 
@@ -769,6 +882,14 @@ class MeasurementWindow(ToolWindow):
         self.scan_speed.setDecimals(2)
         self.scan_speed.setValue(5.0)
         self.scan_direction.addItems(["X+", "X-", "Y+", "Y-"])
+        self.raster_motion.addItem("Point by point (stop at each pixel)", "point")
+        self.raster_motion.addItem("Continuous line sweep", "line")
+        self.contact_engine.addItem("Stepped M119 search", "stepped")
+        self.contact_engine.addItem("Firmware probe move G38.2 (falls back to stepped)", "firmware_probe")
+        self.search_window.addItem("Full tapping range every pixel", "full")
+        self.search_window.addItem("Adaptive window around neighbour contacts", "adaptive")
+        self.lift_mode.addItem("Full retract after every tap", "full")
+        self.lift_mode.addItem("Partial lift above contact (full retract at line end/miss)", "partial")
         self.surface.addItems(["sphere_on_plane", "terrace", "grid_atoms", "bravais_lattice"])
         for widget in (self.x_size, self.y_size):
             widget.valueChanged.connect(self.update_resolution_status)
@@ -785,6 +906,10 @@ class MeasurementWindow(ToolWindow):
         xy_form.addRow("Y lines", self.y_lines)
         xy_form.addRow("Scan direction", self.scan_direction)
         xy_form.addRow("Scan speed mm/s", self.scan_speed)
+        xy_form.addRow("Raster motion", self.raster_motion)
+        xy_form.addRow("Tap contact engine", self.contact_engine)
+        xy_form.addRow("Tap search window", self.search_window)
+        xy_form.addRow("Lift between taps", self.lift_mode)
         xy_form.addRow("Simulation surface", self.surface)
         xy_group.setLayout(xy_form)
 
@@ -832,8 +957,12 @@ class MeasurementWindow(ToolWindow):
         layout.addWidget(self.status)
 
         preview_grid = QGridLayout()
-        self.line_preview = SignalPlotWidget("Measurement Progress - Line Mode X+", "line", "X+")
-        self.topography_preview = SignalPlotWidget("Measurement Progress - Topography X+", "topography", "X+")
+        self.line_preview = SignalPlotWidget(
+            "Measurement Progress - Line Mode X+", "line", "X+", owner.measurement_data, owner.refresh_scheduler
+        )
+        self.topography_preview = SignalPlotWidget(
+            "Measurement Progress - Topography X+", "topography", "X+", owner.measurement_data, owner.refresh_scheduler
+        )
         self.line_preview.setMinimumSize(420, 230)
         self.topography_preview.setMinimumSize(420, 230)
         preview_grid.addWidget(self.line_preview, 0, 0)
@@ -867,6 +996,9 @@ class MeasurementWindow(ToolWindow):
             approach_speed_mm_s=float(self.owner.approach_speed.value()),
             retract_after_tap_mm=float(self.owner.tap_retract_z.value()),
             full_retract_z_mm=float(self.owner.full_retract_z.value()),
+            contact_engine=str(self.contact_engine.currentData() or "stepped"),
+            search_window=str(self.search_window.currentData() or "full"),
+            lift_mode=str(self.lift_mode.currentData() or "full"),
         )
 
     def update_resolution_status(self) -> None:
@@ -888,8 +1020,12 @@ class MeasurementWindow(ToolWindow):
             self.status.setText("Measurement simulation running. Line/topography windows update point by point.")
 
     def start_real_scan(self) -> None:
-        if self.owner.start_measurement_real_scan(self.profile(), self.scan_speed.value()):
-            self.status.setText("Constant-Z raster requested. This mode reads M114 at each XY point but does not tap.")
+        motion_mode = str(self.raster_motion.currentData() or "point")
+        if self.owner.start_measurement_real_scan(self.profile(), self.scan_speed.value(), motion_mode):
+            if motion_mode == "line":
+                self.status.setText("Constant-Z raster requested. Each line is one G1 sweep; M114 counts are sampled and interpolated.")
+            else:
+                self.status.setText("Constant-Z raster requested. This mode reads M114 at each XY point but does not tap.")
 
     def start_foil_tap_scan(self) -> None:
         self.x_size.setValue(50.0)
@@ -899,9 +1035,9 @@ class MeasurementWindow(ToolWindow):
         if self.owner.start_measurement_foil_tap_scan(self.profile(), self.foil_tap_config(), self.scan_speed.value()):
             self.status.setText("Tapping scan requested. Each point approaches, records contact Z, retracts, then steps XY.")
 
-    def update_progress_views(self, lines: list[list[dict[str, float]]], current_line: list[dict[str, float]]) -> None:
-        self.line_preview.set_scan_data(lines, current_line)
-        self.topography_preview.set_scan_data(lines, current_line)
+    def update_progress_views(self) -> None:
+        self.line_preview.request_repaint()
+        self.topography_preview.request_repaint()
 
 
 class Worker(QThread):
@@ -994,11 +1130,12 @@ class RealScanWorker(QThread):
     point = pyqtSignal(dict)
     finished_payload = pyqtSignal(dict)
 
-    def __init__(self, profile: WebScanProfile, scan_speed_mm_s: float, port: str | None) -> None:
+    def __init__(self, profile: WebScanProfile, scan_speed_mm_s: float, port: str | None, motion_mode: str = "point") -> None:
         super().__init__()
         self.profile = profile
         self.scan_speed_mm_s = float(scan_speed_mm_s)
         self.port = port
+        self.motion_mode = motion_mode
 
     def run(self) -> None:
         try:
@@ -1007,6 +1144,7 @@ class RealScanWorker(QThread):
                 port=self.port,
                 scan_speed_mm_s=self.scan_speed_mm_s,
                 on_point=lambda point: self.point.emit(dict(point)),
+                motion_mode=self.motion_mode,
             )
             self.finished_payload.emit(result)
         except Exception as exc:  # pragma: no cover - exercised manually with hardware
@@ -1053,11 +1191,11 @@ class OperatorWorkstation(QMainWindow):
         self.measurement_window: MeasurementWindow | None = None
         self.signal_windows: dict[str, QDialog] = {}
         self.signal_plots: dict[str, SignalPlotWidget] = {}
+        self.refresh_scheduler = RefreshScheduler(self)
         self.measurement_timer = QTimer(self)
         self.measurement_timer.timeout.connect(self.advance_measurement_point)
         self.measurement_profile: WebScanProfile | None = None
-        self.measurement_lines: list[list[dict[str, float]]] = []
-        self.measurement_current_line: list[dict[str, float]] = []
+        self.measurement_data = ScanDataModel()
         self.measurement_line_payload: dict[str, Any] | None = None
         self.measurement_line_index = 0
         self.measurement_point_index = 0
@@ -1294,7 +1432,7 @@ class OperatorWorkstation(QMainWindow):
             readouts.addWidget(label)
         layout.addLayout(readouts)
 
-        self.z_trace = ZTraceWidget()
+        self.z_trace = ZTraceWidget(self.refresh_scheduler)
         layout.addWidget(self.z_trace, 1)
 
         scale_row = QHBoxLayout()
@@ -1525,6 +1663,8 @@ class OperatorWorkstation(QMainWindow):
         self.run_worker(action, self.render_system_payload)
 
     def ai_error_correction(self) -> None:
+        from core.ai.academic_ai_client import build_ai_recommendation
+
         context = {
             "system": self.last_system_payload,
             "z_state": self.z_state.text(),
@@ -1676,35 +1816,40 @@ class OperatorWorkstation(QMainWindow):
             return
         self.z_trace.add_sample(float(z_value))
         self.latest_z_value = float(z_value)
-        self.current_z.setText(f"Current Z: {float(z_value):.3f} mm")
-        self.z_state.setText(f"Live setpoint move: {sample.get('phase')} Z={float(z_value):.3f} target={sample.get('target_z')}")
-        self.append_log(f"[Z POINT] {sample.get('phase')} Z={float(z_value):.3f} target={sample.get('target_z')}")
+        self.show_live_z(
+            float(z_value), f"Live setpoint move: {sample.get('phase')} Z={float(z_value):.3f} target={sample.get('target_z')}"
+        )
+        self.queue_log(f"[Z POINT] {sample.get('phase')} Z={float(z_value):.3f} target={sample.get('target_z')}")
 
     def render_measurement_point(self, point: dict[str, Any]) -> None:
         line_index = int(point.get("line_index", 0))
-        while len(self.measurement_lines) < line_index:
-            self.measurement_lines.append([])
-        if line_index != self.measurement_line_index:
-            if self.measurement_current_line:
-                self.measurement_lines.append(self.measurement_current_line)
-            self.measurement_current_line = []
-            self.measurement_line_index = line_index
-        self.measurement_current_line.append(dict(point))
+        self.measurement_line_index = line_index
+        self.measurement_data.append(point, line_index)
         z_value = float(point["z_feedback"])
         self.latest_z_value = z_value
         self.z_trace.add_sample(z_value)
-        self.current_z.setText(f"Current Z: {z_value:.3f} mm")
-        self.z_state.setText(
+        self.show_live_z(
+            z_value,
             f"Real scan: line {line_index + 1}, point {int(point.get('point_index', 0)) + 1}, "
-            f"X={float(point['x']):.3f} Y={float(point['y']):.3f} Z={z_value:.3f} mm"
+            f"X={float(point['x']):.3f} Y={float(point['y']):.3f} Z={z_value:.3f} mm",
         )
-        self.append_log(
+        self.queue_log(
             f"[REAL SCAN POINT] line={line_index + 1} point={int(point.get('point_index', 0)) + 1} "
             f"X={float(point['x']):.3f} Y={float(point['y']):.3f} Z={z_value:.3f}"
         )
-        self.refresh_signal_windows()
+
+    def show_live_z(self, z_value: float, state: str) -> None:
+        """Set the Z readouts on the next refresh frame; only the latest values are shown."""
+
+        def apply() -> None:
+            self.current_z.setText(f"Current Z: {z_value:.3f} mm")
+            self.z_state.setText(state)
+
+        self.refresh_scheduler.schedule("live_z_labels", apply)
 
     def render_z_payload(self, payload: dict[str, Any]) -> None:
+        # Final payloads must land after any still-pending live frame.
+        self.refresh_scheduler.flush()
         current = payload.get("current") or {}
         if current.get("z") is not None:
             z_value = float(current["z"])
@@ -1718,6 +1863,7 @@ class OperatorWorkstation(QMainWindow):
         self.z_state.setText(f"ok={payload.get('ok')} status={payload.get('status')}\n{payload.get('message', '')}")
 
     def render_payload_log(self, payload: dict[str, Any]) -> None:
+        self.refresh_scheduler.flush()
         for line in payload.get("log_lines") or [payload.get("message", "")]:
             self.append_log(str(line))
 
@@ -1725,6 +1871,11 @@ class OperatorWorkstation(QMainWindow):
         if message:
             self.log.append(f"[{datetime.now().strftime('%H:%M:%S')}] {message}")
 
+    def queue_log(self, message: str) -> None:
+        """High-rate log line; written with the next refresh frame in one batch."""
+        if message:
+            self.refresh_scheduler.post_log(self.log.append, f"[{datetime.now().strftime('%H:%M:%S')}] {message}")
+
     def append_system_message(self, message: str) -> None:
         if message and hasattr(self, "system_log"):
             self.system_log.append(f"[{datetime.now().strftime('%H:%M:%S')}] {message}")
@@ -1788,7 +1939,9 @@ class OperatorWorkstation(QMainWindow):
             dialog.setWindowTitle(title)
             dialog.resize(760, 460)
             layout = QVBoxLayout()
-            plot = SignalPlotWidget(title=title, mode=mode, direction=direction)
+            plot = SignalPlotWidget(
+                title=title, mode=mode, direction=direction, model=self.measurement_data, scheduler=self.refresh_scheduler
+            )
             layout.addWidget(plot)
             dialog.setLayout(layout)
             self.signal_windows[key] = dialog
@@ -1806,8 +1959,7 @@ class OperatorWorkstation(QMainWindow):
             return False
         self.measurement_timer.stop()
         self.measurement_profile = profile
-        self.measurement_lines = []
-        self.measurement_current_line = []
+        self.measurement_data.reset(profile.x_points, profile.y_points)
         self.measurement_line_payload = build_scan_line(profile, 0)
         self.measurement_line_index = 0
         self.measurement_point_index = 0
@@ -1836,7 +1988,7 @@ class OperatorWorkstation(QMainWindow):
         request_real_scan_stop()
         self.append_log("[MEASUREMENT] Stopped")
 
-    def start_measurement_real_scan(self, profile: WebScanProfile, scan_speed_mm_s: float) -> bool:
+    def start_measurement_real_scan(self, profile: WebScanProfile, scan_speed_mm_s: float, motion_mode: str = "point") -> bool:
         try:
             profile.validate()
         except ValueError as exc:
@@ -1859,13 +2011,12 @@ class OperatorWorkstation(QMainWindow):
             return False
         self.measurement_timer.stop()
         self.measurement_profile = profile
-        self.measurement_lines = []
-        self.measurement_current_line = []
+        self.measurement_data.reset(profile.x_points, profile.y_points)
         self.measurement_line_index = 0
         self.measurement_point_index = 0
         self.measurement_paused = False
         clear_real_scan_pause()
-        worker = RealScanWorker(profile, scan_speed_mm_s, self.selected_port() or None)
+        worker = RealScanWorker(profile, scan_speed_mm_s, self.selected_port() or None, motion_mode)
         worker.point.connect(self.render_measurement_point)
         worker.finished_payload.connect(self.render_real_scan_payload)
         worker.finished_payload.connect(self.render_payload_log)
@@ -1874,7 +2025,7 @@ class OperatorWorkstation(QMainWindow):
         self.append_log(
             f"[REAL SCAN] Requested: {profile.x_points} points x {profile.y_points} lines, "
             f"X {profile.x_min:.1f}..{profile.x_max:.1f}, Y {profile.y_min:.1f}..{profile.y_max:.1f}, "
-            f"Z {profile.z_setpoint:.3f}"
+            f"Z {profile.z_setpoint:.3f}, motion {motion_mode}"
         )
         self.refresh_signal_windows()
         worker.start()
@@ -1934,8 +2085,7 @@ class OperatorWorkstation(QMainWindow):
             return False
         self.measurement_timer.stop()
         self.measurement_profile = profile
-        self.measurement_lines = []
-        self.measurement_current_line = []
+        self.measurement_data.reset(profile.x_points, profile.y_points)
         self.measurement_line_index = 0
         self.measurement_point_index = 0
         self.measurement_paused = False
@@ -1957,9 +2107,7 @@ class OperatorWorkstation(QMainWindow):
         return True
 
     def render_real_scan_payload(self, payload: dict[str, Any]) -> None:
-        if self.measurement_current_line:
-            self.measurement_lines.append(self.measurement_current_line)
-            self.measurement_current_line = []
+        self.refresh_scheduler.flush()
         self.refresh_signal_windows()
         if self.measurement_window is not None:
             self.measurement_window.status.setText(
@@ -1972,12 +2120,10 @@ class OperatorWorkstation(QMainWindow):
             return
         points = self.measurement_line_payload["points"]
         if self.measurement_point_index >= len(points):
-            if self.measurement_current_line:
-                self.measurement_lines.append(self.measurement_current_line)
-                self.measurement_current_line = []
             self.measurement_line_index += 1
             if self.measurement_line_index >= self.measurement_profile.y_points:
                 self.measurement_timer.stop()
+                self.refresh_scheduler.flush()
                 self.append_log("[MEASUREMENT] Simulated scan complete")
                 self.refresh_signal_windows()
                 return
@@ -1987,25 +2133,29 @@ class OperatorWorkstation(QMainWindow):
 
         point = dict(points[self.measurement_point_index])
         self.measurement_point_index += 1
-        self.measurement_current_line.append(point)
+        self.measurement_data.append(point, self.measurement_line_index)
         z_value = float(point["z_feedback"])
         self.latest_z_value = z_value
         self.z_trace.add_sample(z_value)
-        self.current_z.setText(f"Current Z: {z_value:.3f} mm")
-        self.z_state.setText(
+        self.show_live_z(
+            z_value,
             f"Measurement simulation: line {self.measurement_line_index + 1}/{self.measurement_profile.y_points}, "
-            f"point {self.measurement_point_index}/{self.measurement_profile.x_points}, Z={z_value:.4f} mm"
+            f"point {self.measurement_point_index}/{self.measurement_profile.x_points}, Z={z_value:.4f} mm",
         )
-        self.refresh_signal_windows()
 
     def refresh_signal_windows(self) -> None:
+        """Repaint every view; per-point updates arrive through ``measurement_data``."""
         if self.measurement_window is not None:
-            self.measurement_window.update_progress_views(self.measurement_lines, self.measurement_current_line)
+            self.measurement_window.update_progress_views()
         for plot in self.signal_plots.values():
-            plot.set_scan_data(self.measurement_lines, self.measurement_current_line)
+            plot.request_repaint()
 
 
 def main() -> int:
+    if "--profile-startup" in sys.argv[1:]:
+        from core.system.startup_profile import print_startup_profile
+
+        return print_startup_profile("core.application.operator_workstation_software")
     app = QApplication(sys.argv)
     window = OperatorWorkstation()
     window.show()
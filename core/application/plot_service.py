@@ -0,0 +1,93 @@
+"""In-process raster plot rendering with a PNG cache.
+
+``PlotService`` renders height maps through one pre-warmed Agg figure
+(``tools.plot_safe_raster.RasterFigure``) instead of spawning the plot CLI.
+PNGs are cached by a hash of the data plus the colour map, so re-rendering
+the same scan, or switching back to a colour map already seen, only writes
+cached bytes. ``submit`` renders on a single background worker; ``render``
+runs on the calling thread. Both share one figure under a lock.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+import hashlib
+from pathlib import Path
+from threading import Lock
+from typing import Any
+
+import numpy as np
+
+from tools.plot_safe_raster import RasterFigure, load_raster_grid
+
+PLOT_CACHE_SIZE = 32
+
+
+def height_map_digest(height_map: np.ndarray, x_values: np.ndarray, y_values: np.ndarray) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    for array in (height_map, x_values, y_values):
+        array = np.ascontiguousarray(array, dtype=np.float64)
+        digest.update(str(array.shape).encode("ascii"))
+        digest.update(array.tobytes())
+    return digest.hexdigest()
+
+
+class PlotService:
+    def __init__(self, cache_size: int = PLOT_CACHE_SIZE) -> None:
+        self.cache_size = max(1, int(cache_size))
+        self._cache: OrderedDict[tuple[str, str], bytes] = OrderedDict()
+        self._figure: RasterFigure | None = None
+        self._lock = Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="plot-service")
+        self.render_count = 0
+
+    def warm_up(self) -> Future:
+        """Import matplotlib and build the figure in the background."""
+        return self._executor.submit(self._ensure_figure)
+
+    def _ensure_figure(self) -> RasterFigure:
+        with self._lock:
+            if self._figure is None:
+                self._figure = RasterFigure()
+            return self._figure
+
+    def render(
+        self,
+        height_map: np.ndarray,
+        x_values: np.ndarray,
+        y_values: np.ndarray,
+        color_map: str = "viridis",
+        output_file: str | Path | None = None,
+    ) -> dict[str, Any]:
+        """PNG for the height map, from cache when possible; written to ``output_file`` if given."""
+        key = (height_map_digest(height_map, x_values, y_values), str(color_map))
+        figure = self._ensure_figure()
+        with self._lock:
+            png = self._cache.get(key)
+            cached = png is not None
+            if png is None:
+                png = figure.render_png(height_map, x_values, y_values, color_map)
+                self.render_count += 1
+                self._cache[key] = png
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+            else:
+                self._cache.move_to_end(key)
+        if output_file is not None:
+            output_path = Path(output_file)
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            output_path.write_bytes(png)
+        return {"png": png, "cached": cached, "color_map": str(color_map), "output_file": str(output_file or "")}
+
+    def render_csv(self, input_file: str, output_file: str | Path | None = None, color_map: str = "viridis") -> dict[str, Any]:
+        grid = load_raster_grid(input_file)
+        result = self.render(grid.height_map, grid.x_values, grid.y_values, color_map, output_file)
+        return {**result, "input_file": str(input_file)}
+
+    def submit(self, input_file: str, output_file: str | Path | None = None, color_map: str = "viridis") -> Future:
+        """``render_csv`` on the background worker; the future holds its result."""
+        return self._executor.submit(self.render_csv, input_file, output_file, color_map)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
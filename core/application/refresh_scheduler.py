@@ -0,0 +1,96 @@
+"""Frame-coalescing UI refresh for live scans.
+
+Data ingestion (scan points, Z samples) can arrive at any rate; painting is
+capped at a fixed frame rate. Callers register refresh callbacks by key and
+the scheduler runs each dirty key once per frame, latest callback winning.
+Low-priority log lines are buffered and appended to their sink in one batch
+per frame; a bounded buffer drops the oldest lines under sustained load and
+reports how many were skipped.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+import time
+from typing import Callable, Hashable
+
+from PyQt5.QtCore import QObject, QTimer, Qt
+
+DEFAULT_REFRESH_FPS = 30.0
+DEFAULT_MAX_PENDING_LOG_LINES = 500
+
+
+class RefreshScheduler(QObject):
+    def __init__(
+        self,
+        parent: QObject | None = None,
+        *,
+        fps: float = DEFAULT_REFRESH_FPS,
+        max_pending_log_lines: int = DEFAULT_MAX_PENDING_LOG_LINES,
+    ) -> None:
+        super().__init__(parent)
+        self.frame_interval_s = 1.0 / max(1.0, float(fps))
+        self.max_pending_log_lines = max(1, int(max_pending_log_lines))
+        self._callbacks: dict[Hashable, Callable[[], None]] = {}
+        self._logs: dict[Callable[[str], None], deque[str]] = {}
+        self._dropped_logs: dict[Callable[[str], None], int] = {}
+        self._last_frame = 0.0
+        self.frame_count = 0
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.timeout.connect(self.flush)
+
+    @property
+    def pending(self) -> bool:
+        return bool(self._callbacks or self._logs)
+
+    def schedule(self, key: Hashable, callback: Callable[[], None]) -> None:
+        """Run ``callback`` on the next frame; a later call for ``key`` replaces it."""
+        self._callbacks[key] = callback
+        self._arm()
+
+    def request_update(self, widget: object) -> None:
+        """Repaint ``widget`` (anything with ``update()``) on the next frame."""
+        self.schedule(widget, widget.update)  # type: ignore[attr-defined]
+
+    def post_log(self, sink: Callable[[str], None], message: str) -> None:
+        """Queue one log line; every queued line for ``sink`` is written per frame."""
+        if not message:
+            return
+        lines = self._logs.setdefault(sink, deque())
+        if len(lines) >= self.max_pending_log_lines:
+            lines.popleft()
+            self._dropped_logs[sink] = self._dropped_logs.get(sink, 0) + 1
+        lines.append(message)
+        self._arm()
+
+    def _arm(self) -> None:
+        if self._timer.isActive():
+            return
+        delay_s = self._last_frame + self.frame_interval_s - time.monotonic()
+        self._timer.start(max(0, int(delay_s * 1000.0)))
+
+    def flush(self) -> None:
+        """Run every pending refresh now (also used to force the final frame)."""
+        self._timer.stop()
+        self._last_frame = time.monotonic()
+        if not self.pending:
+            return
+        # Swap first so callbacks that schedule again land on the next frame.
+        callbacks, self._callbacks = self._callbacks, {}
+        logs, self._logs = self._logs, {}
+        dropped, self._dropped_logs = self._dropped_logs, {}
+        self.frame_count += 1
+        for callback in callbacks.values():
+            callback()
+        for sink, lines in logs.items():
+            if dropped.get(sink):
+                lines.appendleft(f"... {dropped[sink]} log lines skipped to keep the display responsive")
+            sink("\n".join(lines))
+
+    def clear(self) -> None:
+        self._timer.stop()
+        self._callbacks.clear()
+        self._logs.clear()
+        self._dropped_logs.clear()
@@ -0,0 +1,116 @@
+"""Shared append-only measurement data for the workstation signal views.
+
+One ``ScanDataModel`` holds the running measurement as preallocated NumPy
+arrays (line x point). Every append bumps ``version`` and notifies
+subscribers with the dirty row range, so views pull only what changed
+instead of receiving a copy of the whole scan for each point. Direction
+views (X-/Y-) are flipped array views, not copies.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Callable, Mapping
+
+import numpy as np
+
+CHANNELS = ("x", "y", "z_feedback")
+
+
+@dataclass(frozen=True)
+class ScanChange:
+    version: int
+    first_row: int
+    last_row: int
+    reset: bool = False
+
+    @property
+    def rows(self) -> range:
+        return range(self.first_row, self.last_row + 1)
+
+
+ScanListener = Callable[[ScanChange], None]
+
+
+class ScanDataModel:
+    def __init__(self, columns: int = 0, rows: int = 0) -> None:
+        self.version = 0
+        self._listeners: list[ScanListener] = []
+        self.reset(columns, rows)
+
+    def reset(self, columns: int, rows: int) -> None:
+        """Start a new measurement with room for ``rows`` x ``columns`` points."""
+        shape = (max(1, int(rows)), max(1, int(columns)))
+        self.arrays = {channel: np.full(shape, np.nan) for channel in CHANNELS}
+        self.counts = np.zeros(shape[0], dtype=np.int64)
+        self.line_count = 0
+        self.current_line_index = 0
+        self.point_count = 0
+        self.last_point: dict[str, Any] = {}
+        self.version += 1
+        self._notify(ScanChange(self.version, 0, shape[0] - 1, reset=True))
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self.arrays["z_feedback"].shape
+
+    def subscribe(self, listener: ScanListener) -> None:
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def unsubscribe(self, listener: ScanListener) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _notify(self, change: ScanChange) -> None:
+        for listener in list(self._listeners):
+            listener(change)
+
+    def _grow(self, rows: int, columns: int) -> None:
+        old_rows, old_columns = self.shape
+        shape = (
+            max(rows, old_rows * 2) if rows > old_rows else old_rows,
+            max(columns, old_columns * 2) if columns > old_columns else old_columns,
+        )
+        for channel, values in self.arrays.items():
+            grown = np.full(shape, np.nan)
+            grown[:old_rows, :old_columns] = values
+            self.arrays[channel] = grown
+        counts = np.zeros(shape[0], dtype=np.int64)
+        counts[:old_rows] = self.counts
+        self.counts = counts
+        self.version += 1
+        self._notify(ScanChange(self.version, 0, shape[0] - 1, reset=True))
+
+    def append(self, point: Mapping[str, Any], line_index: int | None = None) -> ScanChange:
+        """Append one point to ``line_index`` (defaults to ``point['line_index']``)."""
+        row = int(point.get("line_index", self.current_line_index) if line_index is None else line_index)
+        column = int(self.counts[row]) if row < len(self.counts) else 0
+        if row >= self.shape[0] or column >= self.shape[1]:
+            self._grow(row + 1, column + 1)
+        for channel, values in self.arrays.items():
+            values[row, column] = float(point.get(channel, np.nan))
+        self.counts[row] = column + 1
+        self.current_line_index = row
+        self.line_count = max(self.line_count, row + 1)
+        self.point_count += 1
+        self.last_point = dict(point)
+        self.version += 1
+        change = ScanChange(self.version, row, row)
+        self._notify(change)
+        return change
+
+    def heights(self, direction: str = "X+") -> np.ndarray:
+        """Z height map (NaN where unmeasured), flipped for X-/Y- views."""
+        values = self.arrays["z_feedback"]
+        if direction.startswith("X-"):
+            values = values[:, ::-1]
+        if direction.startswith("Y-"):
+            values = values[::-1, :]
+        return values
+
+    def line(self, line_index: int | None = None, channel: str = "z_feedback") -> np.ndarray:
+        row = self.current_line_index if line_index is None else int(line_index)
+        if row >= self.shape[0]:
+            return np.empty(0)
+        return self.arrays[channel][row, : int(self.counts[row])]
@@ -0,0 +1,113 @@
+"""Cached QImage renderer for the live topography views.
+
+The height map is a NumPy array (one row per scan line, NaN where no point
+has been measured yet), normally the shared ``ScanDataModel`` array. Heights
+are mapped through a precomputed 256-entry colour lookup table into a 32-bit
+image buffer. Only rows that changed since the last render are recoloured,
+unless the Z range widened, in which case every row is recoloured in one
+vectorized pass.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable
+
+import numpy as np
+from PyQt5.QtGui import QColor, QImage
+
+LUT_SIZE = 256
+FLAT_SIGNAL_LEVEL = 0.55
+EMPTY_CELL_COLOR = QColor("#050914")
+GRID_MIN_CELL_PX = 6
+
+
+def topography_lut(size: int = LUT_SIZE) -> np.ndarray:
+    """ARGB32 colours for normalized heights 0..1 (blue-low to red-high)."""
+    lut = np.empty(size, dtype=np.uint32)
+    for index in range(size):
+        normalized = index / (size - 1)
+        color = QColor.fromHsvF(0.62 - 0.62 * normalized, 0.88, 0.30 + 0.62 * normalized)
+        lut[index] = color.rgba()
+    return lut
+
+
+class TopographyRenderer:
+    def __init__(self) -> None:
+        self.lut = topography_lut()
+        self.heights = np.full((0, 0), np.nan)
+        self.low = np.inf
+        self.high = -np.inf
+        self._dirty_rows: set[int] = set()
+        self._pixels = np.zeros((0, 0), dtype=np.uint32)
+        self._image: QImage | None = None
+        self._rendered_range: tuple[float, float] | None = None
+        self.rendered_row_count = 0
+
+    @property
+    def row_count(self) -> int:
+        return int(self.heights.shape[0])
+
+    def sync(self, heights: np.ndarray, rows: Iterable[int] | None = None) -> None:
+        """Render from ``heights`` (rows x columns, NaN = unmeasured).
+
+        ``rows`` names the rows that changed since the last sync; a new
+        array, or ``rows=None``, marks every row dirty. The array is read in
+        place, not copied.
+        """
+        if heights is not self.heights:
+            if heights.shape != self._pixels.shape:
+                self._pixels = np.zeros(heights.shape, dtype=np.uint32)
+                self._image = None
+            self.heights = heights
+            rows = None
+        for row in range(heights.shape[0]) if rows is None else rows:
+            values = heights[row]
+            measured = values[~np.isnan(values)]
+            if measured.size:
+                self.low = min(self.low, float(measured.min()))
+                self.high = max(self.high, float(measured.max()))
+            self._dirty_rows.add(int(row))
+
+    def reset(self) -> None:
+        self.heights = np.full((0, 0), np.nan)
+        self.low = np.inf
+        self.high = -np.inf
+        self._dirty_rows = set()
+        self._pixels = np.zeros((0, 0), dtype=np.uint32)
+        self._image = None
+        self._rendered_range = None
+
+    @property
+    def flat_signal(self) -> bool:
+        return abs(self.high - self.low) < 1e-9
+
+    def _colorize(self, block: np.ndarray) -> np.ndarray:
+        if self.flat_signal:
+            normalized = np.full(block.shape, FLAT_SIGNAL_LEVEL)
+        else:
+            normalized = (block - self.low) / max(1e-9, self.high - self.low)
+        indices = np.clip(np.nan_to_num(normalized) * (LUT_SIZE - 1) + 0.5, 0, LUT_SIZE - 1).astype(np.intp)
+        colors = self.lut[indices]
+        colors[np.isnan(block)] = EMPTY_CELL_COLOR.rgba()
+        return colors
+
+    def image(self) -> QImage | None:
+        """The cached image; recolours only dirty rows unless the range moved."""
+        if self.heights.size == 0 or self.low > self.high:
+            return None
+        current_range = (self.low, self.high)
+        if current_range != self._rendered_range:
+            rows = list(range(self.row_count))
+        else:
+            rows = sorted(self._dirty_rows)
+        if rows:
+            self._pixels[rows] = self._colorize(self.heights[rows])
+            self._image = None
+        self.rendered_row_count = len(rows)
+        self._dirty_rows.clear()
+        self._rendered_range = current_range
+        if self._image is None:
+            height, width = self._pixels.shape
+            # QImage borrows the buffer; the renderer keeps ``_pixels`` alive.
+            self._image = QImage(self._pixels.data, width, height, width * 4, QImage.Format_ARGB32)
+        return self._image
@@ -0,0 +1,140 @@
+"""Fixed-capacity Z history for the live Z trace.
+
+Samples live in a preallocated NumPy ring. Alongside the raw values the
+ring keeps a min/max summary per block of ``BLOCK_SIZE`` samples, updated
+on append, so the whole-history range and min/max envelopes over long
+spans are computed from block summaries instead of rescanning every raw
+sample. Indices are logical: 0 is the oldest retained sample.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+Z_TRACE_CAPACITY = 1 << 20  # about 2.9 h at 100 samples/s, 8 MiB of float64
+BLOCK_SIZE = 256
+
+
+class ZTraceBuffer:
+    def __init__(self, capacity: int = Z_TRACE_CAPACITY) -> None:
+        blocks = max(1, -(-int(capacity) // BLOCK_SIZE))
+        self.capacity = blocks * BLOCK_SIZE
+        self._values = np.zeros(self.capacity, dtype=np.float64)
+        self._block_min = np.full(blocks, np.inf)
+        self._block_max = np.full(blocks, -np.inf)
+        self._head = 0
+        self.count = 0
+        self.total = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def clear(self) -> None:
+        self._block_min.fill(np.inf)
+        self._block_max.fill(-np.inf)
+        self._head = 0
+        self.count = 0
+
+    def append(self, value: float) -> None:
+        value = float(value)
+        position = self._head
+        block = position // BLOCK_SIZE
+        if position % BLOCK_SIZE == 0:
+            self._block_min[block] = self._block_max[block] = value
+        else:
+            if value < self._block_min[block]:
+                self._block_min[block] = value
+            if value > self._block_max[block]:
+                self._block_max[block] = value
+        self._values[position] = value
+        self._head = (position + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+        self.total += 1
+
+    @property
+    def latest(self) -> float:
+        if not self.count:
+            raise IndexError("Z trace is empty")
+        return float(self._values[self._head - 1])
+
+    @property
+    def _origin(self) -> int:
+        return (self._head - self.count) % self.capacity
+
+    def values(self, start: int = 0, stop: int | None = None) -> np.ndarray:
+        """Raw samples ``start:stop`` (logical indices), oldest first."""
+        start, stop = self._clamp(start, stop)
+        first = (self._origin + start) % self.capacity
+        length = stop - start
+        if first + length <= self.capacity:
+            return self._values[first : first + length].copy()
+        split = self.capacity - first
+        return np.concatenate((self._values[first:], self._values[: length - split]))
+
+    def _clamp(self, start: int, stop: int | None) -> tuple[int, int]:
+        stop = self.count if stop is None else max(0, min(int(stop), self.count))
+        return max(0, min(int(start), stop)), stop
+
+    def _full_blocks(self, start: int, stop: int) -> tuple[int, int]:
+        """Logical span ``[first, last)`` of whole summary blocks inside ``start:stop``."""
+        offset = (-self._origin) % BLOCK_SIZE
+        first = offset + -(-(start - offset) // BLOCK_SIZE) * BLOCK_SIZE
+        last = offset + ((stop - offset) // BLOCK_SIZE) * BLOCK_SIZE
+        return first, max(first, last)
+
+    def _block_indices(self, first: int, last: int) -> np.ndarray:
+        logical = np.arange(first, last, BLOCK_SIZE)
+        return ((self._origin + logical) % self.capacity) // BLOCK_SIZE
+
+    def range(self, start: int = 0, stop: int | None = None) -> tuple[float, float]:
+        """Min and max over ``start:stop``; whole blocks come from their summaries."""
+        start, stop = self._clamp(start, stop)
+        if start == stop:
+            raise ValueError("Z trace range is empty")
+        first, last = self._full_blocks(start, stop)
+        parts = [self.values(start, min(first, stop)), self.values(max(last, start), stop)]
+        low, high = np.inf, -np.inf
+        for part in parts:
+            if part.size:
+                low, high = min(low, float(part.min())), max(high, float(part.max()))
+        if last > first:
+            blocks = self._block_indices(first, last)
+            low = min(low, float(self._block_min[blocks].min()))
+            high = max(high, float(self._block_max[blocks].max()))
+        return low, high
+
+    def envelope(self, start: int, stop: int | None, bins: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Min/max envelope of ``start:stop`` in at most ``bins`` bins.
+
+        Returns ``(positions, mins, maxs)`` where ``positions`` is each bin's
+        first logical index. Spans short enough to draw directly come back
+        undecimated (``mins is maxs``).
+        """
+        start, stop = self._clamp(start, stop)
+        bins = max(1, int(bins))
+        span = stop - start
+        if span <= 2 * bins:
+            values = self.values(start, stop)
+            return np.arange(start, stop), values, values
+        per_bin = -(-span // bins)
+        if per_bin < 2 * BLOCK_SIZE:
+            values = self.values(start, stop)
+            edges = np.arange(0, span, per_bin)
+            return start + edges, np.minimum.reduceat(values, edges), np.maximum.reduceat(values, edges)
+
+        # Long spans: bins are whole summary blocks; the partial blocks at
+        # either end fold into the first and last bin.
+        first, last = self._full_blocks(start, stop)
+        blocks = self._block_indices(first, last)
+        blocks_per_bin = per_bin // BLOCK_SIZE
+        edges = np.arange(0, len(blocks), blocks_per_bin)
+        mins = np.minimum.reduceat(self._block_min[blocks], edges)
+        maxs = np.maximum.reduceat(self._block_max[blocks], edges)
+        positions = first + edges * BLOCK_SIZE
+        head, tail = self.values(start, first), self.values(last, stop)
+        if head.size:
+            mins[0], maxs[0] = min(mins[0], head.min()), max(maxs[0], head.max())
+            positions[0] = start
+        if tail.size:
+            mins[-1], maxs[-1] = min(mins[-1], tail.min()), max(maxs[-1], tail.max())
+        return positions, mins, maxs
@@ -0,0 +1,291 @@
+"""Shared registry of synthetic surface models.
+
+Every simulated surface in the project is registered here as a vectorized
+function of X/Y arrays: the educational raster signal, the web console
+surfaces, the GUI live-scan demo, the probe dashboard topography and the
+legacy scan-mode maps. ``surface_heights`` evaluates a model exactly at any
+points; ``height_map`` evaluates it once per parameter set on a regular
+grid, keeps the result in an LRU cache, and ``HeightMap.sample`` reads it
+back at arbitrary XY with nearest, bilinear or bicubic interpolation.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+import math
+from typing import Any, Callable
+
+import numpy as np
+
+HEIGHT_MAP_CACHE_SIZE = 32
+SAMPLING_METHODS = ("nearest", "bilinear", "bicubic")
+
+
+@dataclass(frozen=True)
+class SurfaceArea:
+    x_min: float
+    x_max: float
+    y_min: float
+    y_max: float
+
+
+@dataclass(frozen=True)
+class SurfaceModel:
+    name: str
+    evaluate: Callable[..., np.ndarray]
+    description: str = ""
+
+
+_SURFACE_MODELS: dict[str, SurfaceModel] = {}
+
+
+def register_surface_model(name: str, description: str = "") -> Callable[[Callable[..., np.ndarray]], Callable[..., np.ndarray]]:
+    """Register ``evaluate(x, y, area, **params)`` under ``name``.
+
+    ``x`` and ``y`` arrive as broadcast float64 arrays; ``area`` is the
+    ``SurfaceArea`` being evaluated, or ``None`` for point evaluations of
+    models that do not depend on it.
+    """
+
+    def decorator(evaluate: Callable[..., np.ndarray]) -> Callable[..., np.ndarray]:
+        _SURFACE_MODELS[name] = SurfaceModel(name=name, evaluate=evaluate, description=description)
+        _height_map.cache_clear()
+        return evaluate
+
+    return decorator
+
+
+def get_surface_model(name: str) -> SurfaceModel:
+    try:
+        return _SURFACE_MODELS[name]
+    except KeyError:
+        raise ValueError(f"Unknown surface model: {name}") from None
+
+
+def surface_model_names() -> list[str]:
+    return sorted(_SURFACE_MODELS)
+
+
+def surface_heights(name: str, x: Any, y: Any, area: SurfaceArea | None = None, **params: Any) -> np.ndarray:
+    """Evaluate ``name`` exactly at the broadcast ``x`` / ``y`` points (no cache)."""
+    model = get_surface_model(name)
+    x, y = np.broadcast_arrays(np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64))
+    return model.evaluate(x, y, area, **params)
+
+
+@lru_cache(maxsize=4 * HEIGHT_MAP_CACHE_SIZE)
+def grid_axis(start: float, stop: float, points: int) -> np.ndarray:
+    """Read-only ``points`` positions from ``start`` to ``stop`` as ``start + i * step``."""
+    if points == 1:
+        values = np.array([start], dtype=np.float64)
+    else:
+        step = (stop - start) / (points - 1)
+        values = start + np.arange(points) * step
+    values.setflags(write=False)
+    return values
+
+
+def _fractional_index(axis: np.ndarray, coordinate: np.ndarray) -> np.ndarray:
+    if axis.size == 1:
+        return np.zeros(coordinate.shape)
+    step = (axis[-1] - axis[0]) / (axis.size - 1)
+    return np.clip((coordinate - axis[0]) / step, 0.0, axis.size - 1)
+
+
+def _cubic_weights(t: np.ndarray) -> tuple[np.ndarray, ...]:
+    # Catmull-Rom: passes through the grid nodes, continuous first derivative.
+    t2 = t * t
+    t3 = t2 * t
+    return (
+        -0.5 * t3 + t2 - 0.5 * t,
+        1.5 * t3 - 2.5 * t2 + 1.0,
+        -1.5 * t3 + 2.0 * t2 + 0.5 * t,
+        0.5 * t3 - 0.5 * t2,
+    )
+
+
+@dataclass(frozen=True, eq=False)
+class HeightMap:
+    model: str
+    area: SurfaceArea
+    x_values: np.ndarray
+    y_values: np.ndarray
+    heights: np.ndarray
+
+    def sample(self, x: Any, y: Any, method: str = "bilinear") -> Any:
+        """Interpolated height at ``x`` / ``y``; points outside the area clamp to its edge.
+
+        Returns a float for scalar input, otherwise an array of the broadcast shape.
+        """
+        if method not in SAMPLING_METHODS:
+            raise ValueError(f"method must be one of {', '.join(SAMPLING_METHODS)}")
+        xs, ys = np.broadcast_arrays(np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64))
+        fx = _fractional_index(self.x_values, xs)
+        fy = _fractional_index(self.y_values, ys)
+        last_x = self.x_values.size - 1
+        last_y = self.y_values.size - 1
+
+        if method == "nearest":
+            values = self.heights[np.rint(fy).astype(np.intp), np.rint(fx).astype(np.intp)]
+        else:
+            ix = np.minimum(np.floor(fx).astype(np.intp), max(last_x - 1, 0))
+            iy = np.minimum(np.floor(fy).astype(np.intp), max(last_y - 1, 0))
+            tx = fx - ix
+            ty = fy - iy
+            if method == "bilinear":
+                ix1 = np.minimum(ix + 1, last_x)
+                iy1 = np.minimum(iy + 1, last_y)
+                top = self.heights[iy, ix] * (1.0 - tx) + self.heights[iy, ix1] * tx
+                bottom = self.heights[iy1, ix] * (1.0 - tx) + self.heights[iy1, ix1] * tx
+                values = top * (1.0 - ty) + bottom * ty
+            else:
+                wx = _cubic_weights(tx)
+                wy = _cubic_weights(ty)
+                values = np.zeros(xs.shape)
+                for m, weight_y in enumerate(wy):
+                    row = np.clip(iy + m - 1, 0, last_y)
+                    for n, weight_x in enumerate(wx):
+                        column = np.clip(ix + n - 1, 0, last_x)
+                        values = values + weight_y * weight_x * self.heights[row, column]
+
+        if np.ndim(x) == 0 and np.ndim(y) == 0:
+            return float(values)
+        return values
+
+
+def height_map(name: str, area: SurfaceArea, x_points: int, y_points: int, **params: Any) -> HeightMap:
+    """Cached ``x_points`` x ``y_points`` height map of ``name`` over ``area``.
+
+    Maps are shared per (model, area, grid, params) and read-only; the cache
+    keeps the ``HEIGHT_MAP_CACHE_SIZE`` most recently used.
+    """
+    return _height_map(name, area, int(x_points), int(y_points), tuple(sorted(params.items())))
+
+
+@lru_cache(maxsize=HEIGHT_MAP_CACHE_SIZE)
+def _height_map(name: str, area: SurfaceArea, x_points: int, y_points: int, params: tuple[tuple[str, Any], ...]) -> HeightMap:
+    x_values = grid_axis(area.x_min, area.x_max, x_points)
+    y_values = grid_axis(area.y_min, area.y_max, y_points)
+    heights = np.array(surface_heights(name, x_values[np.newaxis, :], y_values[:, np.newaxis], area, **dict(params)))
+    heights.setflags(write=False)
+    return HeightMap(model=name, area=area, x_values=x_values, y_values=y_values, heights=heights)
+
+
+def height_map_cache_info() -> Any:
+    return _height_map.cache_info()
+
+
+def clear_height_map_cache() -> None:
+    _height_map.cache_clear()
+
+
+def _require_area(area: SurfaceArea | None, name: str) -> SurfaceArea:
+    if area is None:
+        raise ValueError(f"Surface model {name} needs a scan area")
+    return area
+
+
+def _centred(x: np.ndarray, y: np.ndarray, area: SurfaceArea | None, name: str) -> tuple[np.ndarray, np.ndarray]:
+    """Coordinates scaled to -1..1 across the area, as used by the web console surfaces."""
+    area = _require_area(area, name)
+    cx = (area.x_min + area.x_max) / 2.0
+    cy = (area.y_min + area.y_max) / 2.0
+    sx = max(area.x_max - area.x_min, 1e-9)
+    sy = max(area.y_max - area.y_min, 1e-9)
+    return (x - cx) / (sx / 2.0), (y - cy) / (sy / 2.0)
+
+
+def _unit(x: np.ndarray, y: np.ndarray, area: SurfaceArea | None, name: str) -> tuple[np.ndarray, np.ndarray]:
+    """Coordinates scaled to 0..1 across the area."""
+    area = _require_area(area, name)
+    x_span = max(1e-9, area.x_max - area.x_min)
+    y_span = max(1e-9, area.y_max - area.y_min)
+    return (x - area.x_min) / x_span, (y - area.y_min) / y_span
+
+
+@register_surface_model("educational_bump", "Central Gaussian bump with a small wave texture (raster teaching signal).")
+def educational_bump(x: np.ndarray, y: np.ndarray, area: SurfaceArea | None, center_x: float = 50.0, center_y: float = 50.0) -> np.ndarray:
+    dx = x - center_x
+    dy = y - center_y
+    bump = np.exp(-((dx * dx + dy * dy) / 8.0))
+    texture = 0.15 * np.sin(x * 0.8) * np.cos(y * 0.8)
+    return bump + texture
+
+
+@register_surface_model("sphere_on_plane", "Hemispherical cap of height 1.8 on a flat plane.")
+def sphere_on_plane(x: np.ndarray, y: np.ndarray, area: SurfaceArea | None) -> np.ndarray:
+    nx, ny = _centred(x, y, area, "sphere_on_plane")
+    r2 = nx * nx + ny * ny
+    heights = np.zeros(r2.shape, dtype=np.float64)
+    inside = r2 <= 1.0
+    heights[inside] = 1.8 * np.sqrt(1.0 - r2[inside])
+    return heights
+
+
+@register_surface_model("terrace", "Eight terraces of 0.18 with a sine ripple along X.")
+def terrace(x: np.ndarray, y: np.ndarray, area: SurfaceArea | None) -> np.ndarray:
+    nx, _ny = _centred(x, y, area, "terrace")
+    steps = np.floor((nx + 1.0) * 4.0) * 0.18
+    ripple = 0.05 * np.sin(14.0 * nx)
+    return steps + ripple
+
+
+@register_surface_model("grid_atoms", "Square lattice of atom-like bumps.")
+def grid_atoms(x: np.ndarray, y: np.ndarray, area: SurfaceArea | None) -> np.ndarray:
+    nx, ny = _centred(x, y, area, "grid_atoms")
+    lattice = np.sin(8.0 * math.pi * (nx + 1.0)) * np.sin(8.0 * math.pi * (ny + 1.0))
+    return 0.25 + 0.22 * lattice
+
+
+@register_surface_model("bravais_lattice", "Oblique two-vector lattice with a long-range moire modulation.")
+def bravais_lattice(x: np.ndarray, y: np.ndarray, area: SurfaceArea | None) -> np.ndarray:
+    nx, ny = _centred(x, y, area, "bravais_lattice")
+    u = 10.0 * (nx + 0.35 * ny)
+    v = 10.0 * (0.22 * nx + ny)
+    lattice = (np.cos(2.0 * math.pi * u) + np.cos(2.0 * math.pi * v)) * 0.5
+    moire = 0.12 * np.sin(2.0 * math.pi * (1.6 * nx - 1.1 * ny))
+    return 0.35 + 0.18 * lattice + moire
+
+
+@register_surface_model("regulated_terrace", "Sloped plane with a raised terrace, lattice ripple and a ridge (GUI live-scan demo).")
+def regulated_terrace(x: np.ndarray, y: np.ndarray, area: SurfaceArea | None) -> np.ndarray:
+    nx, ny = _unit(x, y, area, "regulated_terrace")
+    step = np.where((nx > 0.58) & (ny > 0.32), 0.55, 0.0)
+    lattice = 0.18 * np.sin(nx * math.pi * 18.0) * np.cos(ny * math.pi * 14.0)
+    slope = 0.28 * nx + 0.16 * ny
+    ridge = 0.45 * np.exp(-((nx - 0.72) ** 2 + (ny - 0.68) ** 2) / 0.012)
+    return slope + step + lattice + ridge
+
+
+@register_surface_model("probe_hill", "Off-centre hill with a wave texture and a gentle slope (probe dashboard).")
+def probe_hill(x: np.ndarray, y: np.ndarray, area: SurfaceArea | None) -> np.ndarray:
+    nx, ny = _unit(x, y, area, "probe_hill")
+    hill = np.exp(-18.0 * ((nx - 0.52) ** 2 + (ny - 0.46) ** 2))
+    wave = 0.12 * np.sin(6.0 * math.pi * nx) * np.cos(4.0 * math.pi * ny)
+    slope = 0.08 * nx + 0.04 * ny
+    return hill + wave + slope
+
+
+@register_surface_model("stm_corrugation", "One sine-cosine period across the area, amplitude 2 (STM mode).")
+def stm_corrugation(x: np.ndarray, y: np.ndarray, area: SurfaceArea | None) -> np.ndarray:
+    nx, ny = _unit(x, y, area, "stm_corrugation")
+    return 2 * np.sin(2 * np.pi * nx) * np.cos(2 * np.pi * ny)
+
+
+@register_surface_model("afm_contact_ripple", "Sine ripple, 1.5 periods in X and one in Y (AFM contact mode).")
+def afm_contact_ripple(x: np.ndarray, y: np.ndarray, area: SurfaceArea | None) -> np.ndarray:
+    nx, ny = _unit(x, y, area, "afm_contact_ripple")
+    return 1.5 * np.sin(3 * np.pi * nx) * np.sin(2 * np.pi * ny)
+
+
+@register_surface_model("afm_noncontact_amplitude", "Oscillation amplitude map around 1.0 (AFM non-contact mode).")
+def afm_noncontact_amplitude(x: np.ndarray, y: np.ndarray, area: SurfaceArea | None) -> np.ndarray:
+    nx, ny = _unit(x, y, area, "afm_noncontact_amplitude")
+    return 1.0 - 0.2 * np.cos(2 * np.pi * nx) * np.cos(2 * np.pi * ny)
+
+
+@register_surface_model("line_profile", "Single sine period around 0.5 along X (profiling mode).")
+def line_profile(x: np.ndarray, y: np.ndarray, area: SurfaceArea | None) -> np.ndarray:
+    nx, _ny = _unit(x, y, area, "line_profile")
+    return 0.5 + 0.3 * np.sin(2 * np.pi * nx)
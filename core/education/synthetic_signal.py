@@ -1,4 +1,4 @@
-import math
+from core.education.surface_models import surface_heights
 
 
 def synthetic_surface_signal(x, y, *, center_x=50.0, center_y=50.0):
@@ -11,11 +11,7 @@ def synthetic_surface_signal(x, y, *, center_x=50.0, center_y=50.0):
 
     It is not real AFM/STM physics.
     It is a safe teaching signal for raster-scan visualization.
+    The surface is the "educational_bump" model in core.education.surface_models.
     """
-    dx = float(x) - center_x
-    dy = float(y) - center_y
-
-    bump = math.exp(-((dx * dx + dy * dy) / 8.0))
-    texture = 0.15 * math.sin(float(x) * 0.8) * math.cos(float(y) * 0.8)
-
-    return round(bump + texture, 4)
+    value = surface_heights("educational_bump", float(x), float(y), center_x=center_x, center_y=center_y)
+    return round(float(value), 4)
@@ -7,6 +7,8 @@ from typing import Any
 from serial import Serial
 from serial.tools import list_ports
 
+from core.system.mk4s_serial_session import borrow_serial
+
 PRUSA_USB_VID = "VID:PID=2C99:"
 PRUSA_USB_PID_ALLOWLIST = {"000D", "001A"}
 PROFILE_PATH = Path("config/spm_hardware_initialized_profile.json")
@@ -104,9 +106,7 @@ def run_home_and_verify(port: str | None = None) -> dict[str, Any]:
     "Run G28 auto-home, verify endstops, and record home position."
     chosen, log = _choose_port(port)
     log.append("CALIBRATION: opening serial connection.")
-    with Serial(chosen, 115200, timeout=0.2, write_timeout=1.0) as ser:
-        time.sleep(0.4)
-        ser.reset_input_buffer()
+    with borrow_serial(chosen, 115200) as ser:
         for cmd in ["M115", "M105", "M119", "M114"]:
             log.extend(_send(ser, cmd, timeout=6.0))
         firmware = ""
@@ -175,9 +175,7 @@ def run_repeatability_test(port: str | None = None, iterations: int = 3) -> dict
     chosen, log = _choose_port(port)
     log.append(f"REPEATABILITY: {iterations} iterations.")
     positions: list[dict[str, int] | None] = []
-    with Serial(chosen, 115200, timeout=0.2, write_timeout=1.0) as ser:
-        time.sleep(0.4)
-        ser.reset_input_buffer()
+    with borrow_serial(chosen, 115200) as ser:
         for i in range(iterations):
             log.append(f"  Iteration {i+1}/{iterations} - G28...")
             log.extend(_send(ser, "G28", timeout=120.0))
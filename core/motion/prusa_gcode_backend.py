@@ -2,9 +2,11 @@ from __future__ import annotations
 
 import re
 import time
-from typing import Dict, Optional, List, Tuple
+from contextlib import nullcontext
+from typing import Any, ContextManager, Dict, Optional, List, Tuple
 
 from core.motion.motion_backend import MotionBackend
+from core.system.mk4s_serial_session import get_serial_session
 
 try:
     import serial  # type: ignore
@@ -19,6 +21,12 @@ class PrusaGcodeBackend(MotionBackend):
     Safety rule:
     - connect() only opens serial + sets absolute mode (G90). No movement.
     - movement happens only via move_to()/home().
+
+    The port is the process-wide MK4S serial session, so the GUI paths that
+    use this backend (position query, parking, raster) take turns with the
+    web console and the approach/scan runners instead of competing for it.
+    Each command exchange holds one lease; disconnect() drops the backend's
+    reference but leaves the shared port open for the other users.
     """
 
     def __init__(
@@ -31,6 +39,7 @@ class PrusaGcodeBackend(MotionBackend):
         x_limits: Optional[Tuple[float, float]] = None,
         y_limits: Optional[Tuple[float, float]] = None,
         z_limits: Optional[Tuple[float, float]] = None,
+        stream_window: int = 4,
     ):
         self.port = port
         self.baudrate = baudrate
@@ -39,6 +48,7 @@ class PrusaGcodeBackend(MotionBackend):
         self.x_limits = x_limits
         self.y_limits = y_limits
         self.z_limits = z_limits
+        self.stream_window = stream_window
         self._ser = None
         self._connected = False
         self._last_position: Dict[str, float] = {}
@@ -106,6 +116,11 @@ class PrusaGcodeBackend(MotionBackend):
             if value < low or value > high:
                 raise ValueError(f"{axis} target {value} is out of limits [{low}, {high}].")
 
+    def _exchange(self) -> ContextManager[Any]:
+        """Lease the shared session for one exchange (plain serial objects need none)."""
+        lease = getattr(self._ser, "lease", None)
+        return lease(timeout=self.timeout) if lease is not None else nullcontext(self._ser)
+
     def _read_until_ok(self, timeout: float = 3.0) -> List[str]:
         """Collect lines until 'ok' or timeout."""
         assert self._ser is not None
@@ -132,10 +147,106 @@ class PrusaGcodeBackend(MotionBackend):
         line = cmd.strip()
         if not line:
             return []
-        self._ser.write((line + "\n").encode("ascii", errors="ignore"))
-        self._ser.flush()
-        resp = self._read_until_ok(timeout=timeout)
-        return resp
+        with self._exchange():
+            self._ser.write((line + "\n").encode("ascii", errors="ignore"))
+            self._ser.flush()
+            return self._read_until_ok(timeout=timeout)
+
+    # -------------------------
+    # pipelined streaming
+    # -------------------------
+    @staticmethod
+    def _checksum(payload: str) -> int:
+        """Marlin line checksum: XOR of every byte before the '*'."""
+        cs = 0
+        for byte in payload.encode("ascii", errors="ignore"):
+            cs ^= byte
+        return cs
+
+    @classmethod
+    def _numbered_line(cls, line_number: int, cmd: str) -> str:
+        payload = f"N{line_number} {cmd}"
+        return f"{payload}*{cls._checksum(payload)}"
+
+    @staticmethod
+    def _parse_resend(line: str) -> Optional[int]:
+        m = re.match(r"^(?:resend|rs)\s*:?\s*N?(\d+)", line.strip(), flags=re.IGNORECASE)
+        return int(m.group(1)) if m else None
+
+    def stream_gcode(
+        self,
+        commands: List[str],
+        *,
+        window: Optional[int] = None,
+        timeout: float = 30.0,
+    ) -> List[str]:
+        """
+        Stream commands with up to `window` lines in flight.
+
+        Each line is sent as `N<n> <cmd>*<checksum>` after an `M110 N0` line
+        number reset. Every `ok` frees one slot; `Resend: N` rewinds to line N.
+        The firmware planner stays fed instead of draining between moves.
+        Returns every firmware response line. Raises TimeoutError if the
+        firmware stops acknowledging for `timeout` seconds.
+        """
+        if not self._connected or self._ser is None:
+            raise RuntimeError("Not connected. Call connect() first.")
+        lines = [c.strip() for c in commands if c and c.strip()]
+        if not lines:
+            return []
+        in_flight_limit = max(1, int(window if window is not None else self.stream_window))
+        with self._exchange():
+            return self._stream_lines(lines, in_flight_limit, timeout)
+
+    def _stream_lines(self, lines: List[str], in_flight_limit: int, timeout: float) -> List[str]:
+        out: List[str] = list(self.send_gcode("M110 N0", timeout=3.0))
+        total = len(lines)
+        next_index = 0  # index into `lines` of the next line to transmit
+        sent_high = 0  # highest index+1 transmitted so far
+        acked = 0
+        sent = 0
+        resend_from: Optional[int] = None
+        ignore_resends = 0
+        deadline = time.time() + timeout
+
+        while next_index < total or acked < sent:
+            while next_index < total and sent - acked < in_flight_limit:
+                numbered = self._numbered_line(next_index + 1, lines[next_index])
+                self._ser.write((numbered + "\n").encode("ascii", errors="ignore"))
+                next_index += 1
+                sent += 1
+                sent_high = max(sent_high, next_index)
+            self._ser.flush()
+
+            raw = self._ser.readline()
+            if not raw:
+                if time.time() > deadline:
+                    raise TimeoutError(
+                        f"Streaming stalled: {acked}/{sent} lines acknowledged, {total - next_index} queued."
+                    )
+                continue
+            s = raw.decode("utf-8", errors="ignore").strip()
+            if not s:
+                continue
+            out.append(s)
+            deadline = time.time() + timeout
+
+            resend = self._parse_resend(s)
+            if resend is not None:
+                if resend == resend_from and ignore_resends > 0:
+                    # Lines already in flight behind the bad one are each
+                    # rejected with the same Resend request; rewind only once.
+                    ignore_resends -= 1
+                    continue
+                target = max(0, min(resend - 1, total))
+                resend_from = resend
+                ignore_resends = max(0, sent_high - target - 1)
+                next_index = target
+                continue
+            if s.lower().startswith("ok"):
+                acked += 1
+
+        return out
 
     # -------------------------
     # MotionBackend API
@@ -155,13 +266,12 @@ class PrusaGcodeBackend(MotionBackend):
                     "(set explicit port, e.g., '/dev/ttyACM0' or 'COM5')."
                 )
 
-        self._ser = serial.Serial(self.port, self.baudrate, timeout=self.timeout)
-        time.sleep(0.8)  # allow printer to settle
-        try:
-            self._ser.reset_input_buffer()
-            self._ser.reset_output_buffer()
-        except Exception:
-            pass
+        # The first open waits 0.8 s for the printer to settle; a port that
+        # is already open in this process is reused with stale input dropped.
+        session = get_serial_session(self.port, self.baudrate, settle_seconds=0.8)
+        with session.lease(timeout=self.timeout) as leased:
+            leased.reset_input_buffer()
+        self._ser = session
 
         self._connected = True
         self._last_state = {
@@ -190,11 +300,7 @@ class PrusaGcodeBackend(MotionBackend):
         self._last_state["position"] = dict(self._last_position)
 
     def disconnect(self) -> None:
-        if self._ser is not None:
-            try:
-                self._ser.close()
-            except Exception:
-                pass
+        # The shared session stays open for the other users of the port.
         self._ser = None
         self._connected = False
         self._last_state = {"connected": False, "position": dict(self._last_position)}
@@ -245,6 +351,47 @@ class PrusaGcodeBackend(MotionBackend):
             self._last_position["z"] = float(z)
         self._last_state["position"] = dict(self._last_position)
 
+    def stream_moves(
+        self,
+        points: List[Dict[str, float]],
+        *,
+        feedrate: Optional[float] = None,
+        window: Optional[int] = None,
+        timeout: float = 30.0,
+    ) -> List[str]:
+        """
+        Stream a sequence of absolute G1 moves through the pipelined window.
+        All targets are limit-checked before the first line is sent.
+
+        Intended for continuous paths that need no sampling between moves.
+        The point raster in core.acquisition.raster_engine keeps move_to,
+        because it reads the position and Z signal after every point.
+        """
+        cmds: List[str] = []
+        for point in points:
+            x, y, z = point.get("x"), point.get("y"), point.get("z")
+            if x is None and y is None and z is None:
+                raise ValueError("stream_moves requires at least one axis target per point.")
+            self._check_limits(x=x, y=y, z=z)
+            parts = ["G1"]
+            if x is not None:
+                parts.append(f"X{x}")
+            if y is not None:
+                parts.append(f"Y{y}")
+            if z is not None:
+                parts.append(f"Z{z}")
+            if feedrate is not None:
+                parts.append(f"F{feedrate}")
+            cmds.append(" ".join(parts))
+
+        resp = self.stream_gcode(cmds, window=window, timeout=timeout)
+        for point in points:
+            for axis in ("x", "y", "z"):
+                if point.get(axis) is not None:
+                    self._last_position[axis] = float(point[axis])
+        self._last_state["position"] = dict(self._last_position)
+        return resp
+
     def get_state(self) -> Dict:
         # Best-effort live readback when connected.
         if self._connected:
@@ -261,7 +408,11 @@ class PrusaGcodeBackend(MotionBackend):
     def emergency_stop(self) -> None:
         # M112 is immediate emergency stop (firmware dependent)
         # This MAY stop heaters/motors. Use carefully.
+        # Written without a lease on purpose: it must cut in even while a
+        # scan or approach holds the shared port.
         try:
-            self.send_gcode("M112", timeout=2.0)
+            if self._ser is not None:
+                self._ser.write(b"M112\n")
+                self._ser.flush()
         finally:
             self.disconnect()
@@ -2,26 +2,18 @@ from __future__ import annotations
 
 import csv
 import io
-import math
 from typing import List
 
+from core.education.surface_models import SurfaceArea, height_map
+
 
 def simulated_topography(width: int = 32, height: int = 32) -> List[List[float]]:
     if width < 2 or height < 2:
         raise ValueError("width and height must be >= 2")
 
-    data: List[List[float]] = []
-    for y in range(height):
-        row: List[float] = []
-        for x in range(width):
-            nx = x / (width - 1)
-            ny = y / (height - 1)
-            hill = math.exp(-18.0 * ((nx - 0.52) ** 2 + (ny - 0.46) ** 2))
-            wave = 0.12 * math.sin(6.0 * math.pi * nx) * math.cos(4.0 * math.pi * ny)
-            slope = 0.08 * nx + 0.04 * ny
-            row.append(round(hill + wave + slope, 6))
-        data.append(row)
-    return data
+    # Grid indices are the coordinates: the "probe_hill" model spans 0..width-1 by 0..height-1.
+    surface = height_map("probe_hill", SurfaceArea(0.0, width - 1.0, 0.0, height - 1.0), width, height)
+    return [[round(value, 6) for value in row] for row in surface.heights.tolist()]
 
 
 def topography_csv_text(data: List[List[float]]) -> str:
@@ -1,8 +1,7 @@
 # core/scan/afm_contact_mode.py
 
-import numpy as np
-
 from core.scan.base_scan_mode import BaseScanMode
+from core.education.surface_models import SurfaceArea, height_map
 from core.z_control.z_interface import get_z_driver
 
 
@@ -54,11 +53,8 @@ class AfmContactMode(BaseScanMode):
         self.z_driver.shutdown()
 
     def _generate_simulated_surface(self):
-        x = np.linspace(0, self.x_range, self.resolution)
-        y = np.linspace(0, self.y_range, self.resolution)
-        X, Y = np.meshgrid(x, y)
-        Z = 1.5 * np.sin(3 * np.pi * X / self.x_range) * np.sin(2 * np.pi * Y / self.y_range)
-        return Z
+        area = SurfaceArea(0.0, self.x_range, 0.0, self.y_range)
+        return height_map("afm_contact_ripple", area, self.resolution, self.resolution).heights
 
     def _simulate_contact_force(self, x, y):
         ix = min(int((x / self.x_range) * (self.resolution - 1)), self.resolution - 1)
@@ -1,9 +1,8 @@
 # control/afm_noncontact_mode.py
 
-import numpy as np
-
 from .base_scan_mode import BaseScanMode
 
+from core.education.surface_models import SurfaceArea, height_map
 from core.z_control.z_interface import get_z_driver
 
 
@@ -58,11 +57,8 @@ class AFMNonContactMode(BaseScanMode):
         self.z_driver.shutdown()
 
     def _generate_simulated_amplitude_map(self):
-        x = np.linspace(0, self.x_range, self.resolution)
-        y = np.linspace(0, self.y_range, self.resolution)
-        X, Y = np.meshgrid(x, y)
-        Z = 1.0 - 0.2 * np.cos(2 * np.pi * X / self.x_range) * np.cos(2 * np.pi * Y / self.y_range)
-        return Z
+        area = SurfaceArea(0.0, self.x_range, 0.0, self.y_range)
+        return height_map("afm_noncontact_amplitude", area, self.resolution, self.resolution).heights
 
     def _simulate_amplitude_signal(self, x, y):
         ix = min(int((x / self.x_range) * (self.resolution - 1)), self.resolution - 1)
@@ -3,6 +3,7 @@
 import numpy as np
 
 from core.scan.base_scan_mode import BaseScanMode
+from core.education.surface_models import SurfaceArea, height_map
 from core.z_control.z_interface import get_z_driver
 
 
@@ -56,10 +57,9 @@ class ProfilingMode(BaseScanMode):
         self.z_driver.shutdown()
 
     def _generate_simulated_profile(self):
-        x = np.linspace(0, self.range, self.resolution)
-        profile = 0.5 + 0.3 * np.sin(2 * np.pi * x / self.range)
-        profile += 0.05 * np.random.randn(self.resolution)  # add noise
-        return profile
+        area = SurfaceArea(0.0, self.range, 0.0, 0.0)
+        profile = height_map("line_profile", area, self.resolution, 1).heights[0]
+        return profile + 0.05 * np.random.randn(self.resolution)  # add noise
 
     def _simulate_height(self, pos):
         i = min(int((pos / self.range) * (self.resolution - 1)), self.resolution - 1)
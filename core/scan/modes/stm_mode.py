@@ -1,8 +1,7 @@
 # core/scan/stm_mode.py
 
-import numpy as np
-
 from core.scan.base_scan_mode import BaseScanMode
+from core.education.surface_models import SurfaceArea, height_map
 from core.z_control.z_interface import get_z_driver
 from core.scan.modes import stm_mode
 
@@ -76,11 +75,8 @@ class StmMode(BaseScanMode):
         """
         Create a synthetic 2D topography surface.
         """
-        x = np.linspace(0, self.x_range, self.resolution)
-        y = np.linspace(0, self.y_range, self.resolution)
-        X, Y = np.meshgrid(x, y)
-        Z = 2 * np.sin(2 * np.pi * X / self.x_range) * np.cos(2 * np.pi * Y / self.y_range)
-        return Z
+        area = SurfaceArea(0.0, self.x_range, 0.0, self.y_range)
+        return height_map("stm_corrugation", area, self.resolution, self.resolution).heights
 
     def _simulate_tunneling_signal(self, x, y):
         """
@@ -0,0 +1,107 @@
+"""Caches for JSON configuration files and derived hardware status.
+
+``FileCache`` keeps the parsed (and validated) contents of a file until its
+modification time or size changes, so repeated profile lookups during a
+scan cost one ``stat`` instead of a read, parse and validation. Cached
+values are shared between callers and must be treated as read-only.
+
+``ttl_cached`` holds derived status for a few seconds. Code that changes
+the state behind such status calls ``invalidate_status_caches`` so the next
+poll sees the change at once.
+"""
+
+from __future__ import annotations
+
+from functools import wraps
+import os
+from pathlib import Path
+from threading import Lock
+import time
+from typing import Any, Callable, TypeVar
+
+T = TypeVar("T")
+
+_STATUS_CACHES: list[TTLCache] = []
+
+
+class FileCache:
+    """Per-path cache of ``loader(path)``, keyed by the file's mtime and size.
+
+    A loader that raises is not cached, so an invalid file keeps failing
+    until it is fixed.
+    """
+
+    def __init__(self, loader: Callable[[Path], Any]) -> None:
+        self.loader = loader
+        self._entries: dict[str, tuple[tuple[int, int], Any]] = {}
+        self._lock = Lock()
+
+    def get(self, path: str | Path) -> Any:
+        key = os.path.abspath(path)
+        stat = os.stat(key)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and entry[0] == signature:
+            return entry[1]
+        value = self.loader(Path(path))
+        with self._lock:
+            self._entries[key] = (signature, value)
+        return value
+
+    def invalidate(self, path: str | Path | None = None) -> None:
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(os.path.abspath(path), None)
+
+
+class TTLCache:
+    """One value computed by ``compute`` and reused for ``ttl_s`` seconds."""
+
+    def __init__(self, compute: Callable[[], Any], ttl_s: float) -> None:
+        self.compute = compute
+        self.ttl_s = ttl_s
+        self._value: Any = None
+        self._expires = 0.0
+        self._lock = Lock()
+
+    def get(self) -> Any:
+        with self._lock:
+            if time.monotonic() < self._expires:
+                return self._value
+            self._value = self.compute()
+            self._expires = time.monotonic() + self.ttl_s
+            return self._value
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._expires = 0.0
+
+
+def ttl_cached(ttl_s: float) -> Callable[[Callable[[], T]], Callable[[], T]]:
+    """Cache a no-argument status function for ``ttl_s`` seconds.
+
+    The wrapper gains an ``invalidate()`` method and is also cleared by
+    ``invalidate_status_caches``.
+    """
+
+    def decorate(function: Callable[[], T]) -> Callable[[], T]:
+        cache = TTLCache(function, ttl_s)
+        _STATUS_CACHES.append(cache)
+
+        @wraps(function)
+        def cached() -> T:
+            return cache.get()
+
+        cached.invalidate = cache.invalidate  # type: ignore[attr-defined]
+        return cached
+
+    return decorate
+
+
+def invalidate_status_caches() -> None:
+    """Drop every ``ttl_cached`` value; call after a state change."""
+    for cache in _STATUS_CACHES:
+        cache.invalidate()
@@ -10,10 +10,10 @@ from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 from typing import Callable
-
-import serial
+import time
 
 from core.system.hardware_initialized_profile import get_motion_controller_settings
+from core.system.mk4s_serial_session import borrow_serial
 
 
 READONLY_HARDWARE_ACTIONS: dict[str, str] = {
@@ -84,13 +84,12 @@ def run_real_information_exchange(
     selected_port = port or settings["port"]
     selected_baudrate = int(baudrate or settings["baudrate"])
 
-    def send(command: str) -> list[str]:
-        import time
+    with borrow_serial(selected_port, selected_baudrate, timeout=timeout) as ser:
 
-        lines: list[str] = []
-        with serial.Serial(selected_port, selected_baudrate, timeout=timeout) as ser:
-            time.sleep(2.0)
+        def send(command: str) -> list[str]:
+            lines: list[str] = []
             ser.write((command + "\n").encode("ascii", errors="replace"))
+            ser.flush()
             end = time.time() + response_window_s
             while time.time() < end:
                 line = ser.readline().decode(errors="replace").strip()
@@ -98,9 +97,9 @@ def run_real_information_exchange(
                     lines.append(line)
                 if line == "ok" or line.startswith("ok "):
                     break
-        return lines
+            return lines
 
-    return run_with_transport(action, send)
+        return run_with_transport(action, send)
 
 
 def append_information_exchange_log(
@@ -3,6 +3,7 @@
 import json
 from pathlib import Path
 
+from core.system.config_cache import FileCache
 
 DEFAULT_PROFILE_PATH = Path("config/spm_hardware_initialized_profile.json")
 
@@ -33,15 +34,38 @@ def _validate_profile(profile: dict) -> None:
         )
 
 
+def _read_profile(profile_path: Path) -> dict:
+    profile = json.loads(profile_path.read_text(encoding="utf-8-sig"))
+    _validate_profile(profile)
+    return profile
+
+
+_PROFILE_CACHE = FileCache(_read_profile)
+
+
 def load_hardware_initialized_profile(path: str | Path = DEFAULT_PROFILE_PATH) -> dict:
+    """Return the validated profile, re-read only when the file changes.
+
+    The returned dict is shared between callers; copy it before editing.
+    """
     profile_path = Path(path)
 
-    if not profile_path.exists():
-        raise FileNotFoundError(f"Hardware initialized profile not found: {profile_path}")
+    try:
+        return _PROFILE_CACHE.get(profile_path)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Hardware initialized profile not found: {profile_path}") from None
 
-    profile = json.loads(profile_path.read_text(encoding="utf-8-sig"))
-    _validate_profile(profile)
-    return profile
+
+def clear_hardware_profile_cache() -> None:
+    _PROFILE_CACHE.invalidate()
+
+
+def hardware_motion_limits(path: str | Path = DEFAULT_PROFILE_PATH) -> dict[str, float]:
+    limits = load_hardware_initialized_profile(path)["hardware_initialized_profile"]["motion_limits"]
+    return {
+        key: float(limits[key])
+        for key in ("x_min", "x_max", "y_min", "y_max", "z_min", "z_max")
+    }
 
 
 def get_motion_controller_settings(path: str | Path = DEFAULT_PROFILE_PATH) -> dict:
@@ -15,9 +15,8 @@ from dataclasses import dataclass
 from datetime import datetime
 import time
 
-import serial
-
 from core.system.hardware_initialized_profile import get_motion_controller_settings
+from core.system.mk4s_serial_session import borrow_serial
 
 
 READONLY_STARTUP_COMMANDS = ("M115", "M105", "M119")
@@ -51,12 +50,10 @@ def run_readonly_hardware_startup(
 
     command_results: list[StartupCommandResult] = []
 
-    with serial.Serial(selected_port, selected_baudrate, timeout=timeout) as ser:
-        time.sleep(settle_seconds)
-
+    with borrow_serial(selected_port, selected_baudrate, timeout=timeout, settle_seconds=settle_seconds) as ser:
         for command in READONLY_STARTUP_COMMANDS:
             ser.write((command + "\n").encode("ascii"))
-            time.sleep(1.0)
+            ser.flush()
 
             response_lines: list[str] = []
             end_time = time.time() + 3.0
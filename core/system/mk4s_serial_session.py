@@ -0,0 +1,277 @@
+"""Shared long-lived MK4S serial session for every hardware module.
+
+The Prusa USB CDC port is opened once per process and then lent out to
+callers through ``borrow_serial``. A lease holds the session lock for the
+whole command exchange, so the GUI, the web console and background runners
+never interleave G-code on the same port. Only the first open pays the
+settle delay; later leases reuse the open port and only drop stale input.
+
+Scans, approaches and health tests hold one lease for the whole action,
+which can take minutes. Other callers, including ``close``, wait at most
+``wait`` seconds for the lock and then get ``SerialSessionBusy`` instead of
+blocking their thread.
+"""
+
+from __future__ import annotations
+
+import atexit
+import time
+from contextlib import contextmanager
+from threading import Lock, RLock
+from typing import Any, Callable, Iterator
+
+try:
+    import serial  # type: ignore
+except ModuleNotFoundError:  # pragma: no cover
+    serial = None
+
+
+DEFAULT_BAUDRATE = 115200
+DEFAULT_READ_TIMEOUT_S = 0.25
+DEFAULT_WRITE_TIMEOUT_S = 1.0
+DEFAULT_SETTLE_S = 0.4
+DEFAULT_LEASE_WAIT_S = 5.0
+
+
+class SerialSessionBusy(RuntimeError):
+    """Another caller holds the MK4S port (usually for a whole scan or move)."""
+
+
+class MK4SSerialSession:
+    """One open MK4S serial port shared by all callers in this process.
+
+    The object quacks like ``serial.Serial`` for the subset the project uses
+    (``readline``, ``write``, ``flush``, ``reset_input_buffer``), so existing
+    ``_send(ser, ...)`` helpers work unchanged on a borrowed session.
+    """
+
+    def __init__(
+        self,
+        port: str,
+        baudrate: int = DEFAULT_BAUDRATE,
+        *,
+        timeout: float = DEFAULT_READ_TIMEOUT_S,
+        write_timeout: float = DEFAULT_WRITE_TIMEOUT_S,
+        settle_seconds: float = DEFAULT_SETTLE_S,
+        opener: Callable[..., Any] | None = None,
+    ) -> None:
+        self.port = port
+        self.baudrate = int(baudrate)
+        self.timeout = timeout
+        self.write_timeout = write_timeout
+        self.settle_seconds = settle_seconds
+        self._opener = opener
+        self._ser: Any = None
+        self._lock = RLock()
+        self.fresh = False
+        self.opened_at = 0.0
+        self.open_count = 0
+        self.lease_count = 0
+
+    @property
+    def is_open(self) -> bool:
+        return self._ser is not None and bool(getattr(self._ser, "is_open", True))
+
+    def _open_port(self) -> Any:
+        if self._opener is not None:
+            return self._opener(
+                self.port,
+                self.baudrate,
+                timeout=self.timeout,
+                write_timeout=self.write_timeout,
+            )
+        if serial is None:
+            raise RuntimeError("pyserial is not installed. Run: python -m pip install pyserial")
+        return serial.Serial(self.port, self.baudrate, timeout=self.timeout, write_timeout=self.write_timeout)
+
+    def open(self) -> bool:
+        """Open the port if needed. Returns True when a new port was opened."""
+        with self._lock:
+            if self.is_open:
+                return False
+            self._ser = self._open_port()
+            time.sleep(self.settle_seconds)
+            self.opened_at = time.time()
+            self.open_count += 1
+            return True
+
+    def _acquire(self, wait: float | None) -> None:
+        acquired = self._lock.acquire() if wait is None else self._lock.acquire(timeout=max(0.0, wait))
+        if not acquired:
+            raise SerialSessionBusy(f"MK4S port {self.port} is busy with another action (waited {wait:.1f} s).")
+
+    def close(self, *, wait: float | None = DEFAULT_LEASE_WAIT_S) -> None:
+        """Close the port once no lease holds it; raises ``SerialSessionBusy`` after ``wait``."""
+        self._acquire(wait)
+        try:
+            ser, self._ser = self._ser, None
+            if ser is not None:
+                try:
+                    ser.close()
+                except Exception:
+                    pass
+        finally:
+            self._lock.release()
+
+    @contextmanager
+    def lease(
+        self,
+        *,
+        timeout: float | None = None,
+        wait: float | None = DEFAULT_LEASE_WAIT_S,
+    ) -> Iterator["MK4SSerialSession"]:
+        """Hold the port exclusively for one command exchange.
+
+        A lease may be held for a whole action, so ``wait`` bounds how long
+        to wait for it (``None`` waits indefinitely) before raising
+        ``SerialSessionBusy``. ``timeout`` only overrides the per-readline
+        timeout. Any serial or OS error closes the port so the next lease
+        reopens it cleanly. A freshly opened port keeps its buffered input so
+        the caller can read the firmware's startup banner.
+        """
+        self._acquire(wait)
+        try:
+            self.fresh = self.open()
+            self.lease_count += 1
+            previous_timeout = self._ser.timeout if timeout is not None else None
+            try:
+                if timeout is not None:
+                    self._ser.timeout = timeout
+                if not self.fresh:
+                    self.reset_input_buffer()
+                yield self
+            except Exception as exc:
+                if _is_port_failure(exc):
+                    self.close()
+                raise
+            finally:
+                if timeout is not None and self._ser is not None:
+                    self._ser.timeout = previous_timeout
+        finally:
+            self._lock.release()
+
+    def readline(self) -> bytes:
+        return self._ser.readline()
+
+    def write(self, data: bytes) -> int:
+        return self._ser.write(data)
+
+    def flush(self) -> None:
+        self._ser.flush()
+
+    def reset_input_buffer(self) -> None:
+        try:
+            self._ser.reset_input_buffer()
+        except AttributeError:
+            pass
+
+    def describe(self) -> dict[str, Any]:
+        return {
+            "port": self.port,
+            "baudrate": self.baudrate,
+            "open": self.is_open,
+            "opened_at": self.opened_at,
+            "open_count": self.open_count,
+            "lease_count": self.lease_count,
+        }
+
+
+def _is_port_failure(exc: BaseException) -> bool:
+    if isinstance(exc, OSError):
+        return True
+    return serial is not None and isinstance(exc, serial.SerialException)
+
+
+_SESSIONS: dict[str, MK4SSerialSession] = {}
+_SESSIONS_LOCK = Lock()
+
+
+def _session_key(port: str) -> str:
+    return str(port).strip().upper()
+
+
+def get_serial_session(
+    port: str,
+    baudrate: int = DEFAULT_BAUDRATE,
+    *,
+    settle_seconds: float = DEFAULT_SETTLE_S,
+) -> MK4SSerialSession:
+    """Return the process-wide session for ``port``, creating it on first use."""
+    if not port:
+        raise ValueError("MK4S serial session requires a port.")
+    key = _session_key(port)
+    with _SESSIONS_LOCK:
+        session = _SESSIONS.get(key)
+        if session is not None and session.baudrate != int(baudrate):
+            session.close()
+            session = None
+        if session is None:
+            session = MK4SSerialSession(port, baudrate, settle_seconds=settle_seconds)
+            _SESSIONS[key] = session
+        return session
+
+
+@contextmanager
+def borrow_serial(
+    port: str,
+    baudrate: int = DEFAULT_BAUDRATE,
+    *,
+    timeout: float | None = None,
+    settle_seconds: float = DEFAULT_SETTLE_S,
+    wait: float | None = DEFAULT_LEASE_WAIT_S,
+) -> Iterator[MK4SSerialSession]:
+    """Borrow the shared MK4S port for the duration of a ``with`` block.
+
+    Raises ``SerialSessionBusy`` when another action keeps the port for
+    longer than ``wait`` seconds.
+    """
+    session = get_serial_session(port, baudrate, settle_seconds=settle_seconds)
+    with session.lease(timeout=timeout, wait=wait) as leased:
+        yield leased
+
+
+def _forget_session(key: str, session: MK4SSerialSession) -> None:
+    with _SESSIONS_LOCK:
+        if _SESSIONS.get(key) is session:
+            del _SESSIONS[key]
+
+
+def close_serial_session(port: str, *, wait: float | None = DEFAULT_LEASE_WAIT_S) -> None:
+    """Close and forget the session for ``port``; a busy session stays registered."""
+    key = _session_key(port)
+    with _SESSIONS_LOCK:
+        session = _SESSIONS.get(key)
+    if session is not None:
+        session.close(wait=wait)
+        _forget_session(key, session)
+
+
+def close_serial_sessions(*, wait: float | None = DEFAULT_LEASE_WAIT_S) -> None:
+    """Close every idle session, then raise ``SerialSessionBusy`` if any was still leased."""
+    with _SESSIONS_LOCK:
+        sessions = list(_SESSIONS.items())
+    busy: list[str] = []
+    for key, session in sessions:
+        try:
+            session.close(wait=wait)
+        except SerialSessionBusy:
+            busy.append(session.port)
+            continue
+        _forget_session(key, session)
+    if busy:
+        raise SerialSessionBusy(f"MK4S port {', '.join(busy)} is busy with another action; not closed.")
+
+
+def _close_serial_sessions_at_exit() -> None:
+    try:
+        close_serial_sessions(wait=0.0)
+    except SerialSessionBusy:
+        pass
+
+
+def serial_sessions_status() -> list[dict[str, Any]]:
+    with _SESSIONS_LOCK:
+        return [session.describe() for session in _SESSIONS.values()]
+
+
+atexit.register(_close_serial_sessions_at_exit)
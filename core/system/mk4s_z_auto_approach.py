@@ -11,6 +11,7 @@ from typing import Callable
 import serial
 
 from core.system.hardware_initialized_profile import get_motion_controller_settings, load_hardware_initialized_profile
+from core.system.mk4s_serial_session import borrow_serial
 
 
 @dataclass(frozen=True)
@@ -156,8 +157,7 @@ def run_mk4s_z_auto_approach(
     raw_path = Path(raw_log_path)
     raw_path.parent.mkdir(parents=True, exist_ok=True)
     responses: list[str] = []
-    with serial.Serial(settings["port"], int(settings["baudrate"]), timeout=2) as ser:
-        time.sleep(2)
+    with borrow_serial(settings["port"], int(settings["baudrate"])) as ser:
         with raw_path.open("a", encoding="utf-8") as log:
             log.write(f"\n=== MK4S Z AUTO APPROACH {time.strftime('%Y-%m-%d %H:%M:%S')} ===\n")
             expected_z_after_m114: float | None = None
@@ -292,8 +292,7 @@ def run_mk4s_z_move_to_setpoint(
     clear_z_motion_stop()
     settings = get_motion_controller_settings()
     responses: list[str] = []
-    with serial.Serial(settings["port"], int(settings["baudrate"]), timeout=2) as ser:
-        time.sleep(0.4)
+    with borrow_serial(settings["port"], int(settings["baudrate"])) as ser:
         for gcode in ("M114",):
             ser.write((gcode + "\n").encode("ascii", errors="replace"))
             lines = _read_until_ok(ser, timeout_s=8.0)
@@ -377,8 +376,7 @@ def run_mk4s_z_manual_step(
     safe_min = float(reference["do_not_go_below_without_contact_detection"])
     safe_max = float(motion_limits["z_max"])
     responses: list[str] = []
-    with serial.Serial(settings["port"], int(settings["baudrate"]), timeout=2) as ser:
-        time.sleep(2)
+    with borrow_serial(settings["port"], int(settings["baudrate"])) as ser:
         ser.write(b"M114\n")
         current_lines = _read_until_ok(ser, timeout_s=8.0)
         responses.extend(current_lines)
@@ -437,8 +435,7 @@ def run_mk4s_z_safe_retract(*, execute: bool = False) -> ZManualMoveResult:
     clear_z_motion_stop()
     settings = get_motion_controller_settings()
     responses: list[str] = []
-    with serial.Serial(settings["port"], int(settings["baudrate"]), timeout=2) as ser:
-        time.sleep(2)
+    with borrow_serial(settings["port"], int(settings["baudrate"])) as ser:
         for gcode in ("G90", command, "M400", "M114"):
             if z_motion_stop_requested():
                 return ZManualMoveResult(
@@ -0,0 +1,129 @@
+"""Import-time startup profile for the operator entry points.
+
+``--profile-startup`` on the desktop GUIs and the web console imports the
+entry module in a fresh interpreter under ``python -X importtime`` and
+prints the import tree, slowest branches first, so a cold-start regression
+shows up as a named module.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+import subprocess
+import sys
+from typing import Iterator
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+STARTUP_PROFILE_MIN_MS = 2.0
+STARTUP_PROFILE_SLOWEST = 10
+
+
+@dataclass(frozen=True)
+class ImportTiming:
+    module: str
+    self_us: int
+    cumulative_us: int
+    children: tuple[ImportTiming, ...] = field(default_factory=tuple)
+
+    @property
+    def self_ms(self) -> float:
+        return self.self_us / 1000.0
+
+    @property
+    def cumulative_ms(self) -> float:
+        return self.cumulative_us / 1000.0
+
+    def walk(self) -> Iterator[ImportTiming]:
+        yield self
+        for child in self.children:
+            yield from child.walk()
+
+
+def parse_importtime(output: str) -> tuple[ImportTiming, ...]:
+    """Top-level import trees from ``-X importtime`` stderr, in import order.
+
+    The interpreter reports each module after its own imports, indented two
+    spaces per nesting level, so children are collected per depth until
+    their parent's line arrives.
+    """
+    pending: dict[int, list[ImportTiming]] = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:") :].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue
+        self_text, cumulative_text, name = parts
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        children = tuple(pending.pop(depth + 1, ()))
+        timing = ImportTiming(name.strip(), int(self_text), int(cumulative_text), children)
+        pending.setdefault(depth, []).append(timing)
+    return tuple(pending.get(0, ()))
+
+
+@dataclass(frozen=True)
+class StartupProfile:
+    module: str
+    imports: tuple[ImportTiming, ...]
+
+    @property
+    def entry(self) -> ImportTiming | None:
+        return next((timing for timing in self.imports if timing.module == self.module), None)
+
+    @property
+    def total_ms(self) -> float:
+        return self.entry.cumulative_ms if self.entry else 0.0
+
+    @property
+    def interpreter_ms(self) -> float:
+        """Imports done before the entry module (site, encodings, ...)."""
+        return sum(timing.cumulative_ms for timing in self.imports if timing is not self.entry)
+
+    def summary_lines(self, min_ms: float = STARTUP_PROFILE_MIN_MS, slowest: int = STARTUP_PROFILE_SLOWEST) -> list[str]:
+        entry = self.entry
+        if entry is None:
+            return [f"Startup import profile: {self.module}", "Entry module was not imported."]
+        modules = list(entry.walk())
+        lines = [
+            f"Startup import profile: {self.module}",
+            f"Import time: {self.total_ms:.1f} ms ({len(modules)} modules); Python startup: {self.interpreter_ms:.1f} ms",
+            "",
+            f"Import tree (branches >= {min_ms:g} ms, slowest first):",
+            "  cumul ms   self ms  module",
+        ]
+
+        def add_branch(timing: ImportTiming, depth: int) -> None:
+            lines.append(f"  {timing.cumulative_ms:8.1f}  {timing.self_ms:8.1f}  {'  ' * depth}{timing.module}")
+            for child in sorted(timing.children, key=lambda item: item.cumulative_us, reverse=True):
+                if child.cumulative_ms >= min_ms:
+                    add_branch(child, depth + 1)
+
+        add_branch(entry, 0)
+        lines.extend(["", f"Slowest modules by self time (top {slowest}):"])
+        for timing in sorted(modules, key=lambda item: item.self_us, reverse=True)[:slowest]:
+            lines.append(f"  {timing.self_ms:8.1f} ms  {timing.module}")
+        return lines
+
+    def summary_text(self) -> str:
+        return "\n".join(self.summary_lines())
+
+
+def profile_startup(module: str) -> StartupProfile:
+    """Import ``module`` in a fresh interpreter and collect its import tree."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if completed.returncode != 0:
+        errors = [line for line in completed.stderr.splitlines() if not line.startswith("import time:")]
+        raise RuntimeError(f"Importing {module} failed: {' '.join(errors[-3:])}")
+    return StartupProfile(module=module, imports=parse_importtime(completed.stderr))
+
+
+def print_startup_profile(module: str) -> int:
+    print(profile_startup(module).summary_text())
+    return 0
@@ -0,0 +1,206 @@
+"""Background jobs for long-running web console hardware actions.
+
+Approach, Z moves, safe retract/standby and the health test can block for
+minutes, so the console starts them as jobs: the POST returns a job id at
+once and progress, log lines and the final payload come from ``/api/jobs``
+and the live stream. Jobs that need the same hardware share one
+single-worker executor, so they run one after another in submit order.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from threading import Event, Lock, Thread
+import time
+from typing import Any, Callable
+import uuid
+
+from core.web.live_stream import publish_live_event, publish_log_lines
+
+JOB_HISTORY_LIMIT = 50
+JOB_CANCEL_REPEAT_S = 0.1
+JOB_FINISHED_STATES = ("complete", "failed", "cancelled")
+MK4S_RESOURCE = "mk4s"
+
+
+@dataclass
+class ConsoleJob:
+    job_id: str
+    action: str
+    resource: str
+    status: str = "queued"
+    message: str = ""
+    created_at: float = field(default_factory=time.time)
+    started_at: float | None = None
+    finished_at: float | None = None
+    cancel_requested: bool = False
+    result: Any = None
+    cancel: Callable[[], None] | None = field(default=None, repr=False)
+    future: Future | None = field(default=None, repr=False)
+    done: Event = field(default_factory=Event, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in JOB_FINISHED_STATES
+
+    def snapshot(self, include_result: bool = True) -> dict[str, Any]:
+        end = self.finished_at or time.time()
+        payload = {
+            "job_id": self.job_id,
+            "action": self.action,
+            "resource": self.resource,
+            "status": self.status,
+            "message": self.message,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "elapsed_s": round(end - self.started_at, 3) if self.started_at else 0.0,
+            "cancel_requested": self.cancel_requested,
+            "cancellable": self.cancel is not None or not self.started_at,
+        }
+        if include_result:
+            payload["result"] = self.result
+        return payload
+
+
+class ConsoleJobManager:
+    def __init__(self, history_limit: int = JOB_HISTORY_LIMIT) -> None:
+        self.history_limit = history_limit
+        self._executors: dict[str, ThreadPoolExecutor] = {}
+        self._jobs: OrderedDict[str, ConsoleJob] = OrderedDict()
+        self._lock = Lock()
+
+    def _executor(self, resource: str) -> ThreadPoolExecutor:
+        executor = self._executors.get(resource)
+        if executor is None:
+            executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"job-{resource}")
+            self._executors[resource] = executor
+        return executor
+
+    def submit(
+        self,
+        action: str,
+        run: Callable[[], Any],
+        *,
+        resource: str = MK4S_RESOURCE,
+        cancel: Callable[[], None] | None = None,
+    ) -> ConsoleJob:
+        """Queue ``run`` behind the other jobs for ``resource``.
+
+        ``cancel`` stops the action while it runs (for example by setting a
+        stop event it polls); without it only a queued job can be cancelled.
+        """
+        job = ConsoleJob(job_id=uuid.uuid4().hex[:12], action=action, resource=resource, cancel=cancel)
+        job.message = f"{action} queued."
+        with self._lock:
+            self._jobs[job.job_id] = job
+            while len(self._jobs) > self.history_limit:
+                oldest = next(iter(self._jobs.values()))
+                if not oldest.finished:
+                    break
+                self._jobs.popitem(last=False)
+            job.future = self._executor(resource).submit(self._run, job, run)
+        self._publish(job)
+        return job
+
+    def _run(self, job: ConsoleJob, run: Callable[[], Any]) -> None:
+        if job.cancel_requested:
+            self._finish(job, "cancelled", f"{job.action} cancelled before it started.")
+            return
+        job.status = "running"
+        job.started_at = time.time()
+        job.message = f"{job.action} running."
+        self._publish(job)
+        try:
+            job.result = run()
+        except Exception as exc:
+            self._finish(job, "failed", f"{job.action} failed: {exc}")
+            return
+        message = job.result.get("message", "") if isinstance(job.result, dict) else ""
+        if job.cancel_requested:
+            self._finish(job, "cancelled", message or f"{job.action} stopped on request.")
+        elif isinstance(job.result, dict) and job.result.get("status") == "failed":
+            self._finish(job, "failed", message or f"{job.action} failed.")
+        else:
+            self._finish(job, "complete", message or f"{job.action} complete.")
+
+    def _finish(self, job: ConsoleJob, status: str, message: str) -> None:
+        job.status = status
+        job.message = message
+        job.finished_at = time.time()
+        job.done.set()
+        if isinstance(job.result, dict):
+            publish_log_lines(list(job.result.get("log_lines") or []), source=job.action)
+        self._publish(job)
+
+    def _publish(self, job: ConsoleJob) -> None:
+        publish_live_event(
+            "status",
+            {
+                "source": "job",
+                "job_id": job.job_id,
+                "action": job.action,
+                "status": job.status,
+                "message": job.message,
+                "ok": job.result.get("ok") if isinstance(job.result, dict) else None,
+            },
+        )
+
+    def get(self, job_id: str) -> ConsoleJob | None:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self) -> list[ConsoleJob]:
+        with self._lock:
+            return list(self._jobs.values())
+
+    def active(self, resource: str | None = None) -> list[ConsoleJob]:
+        return [job for job in self.jobs() if not job.finished and resource in (None, job.resource)]
+
+    def cancel(self, job_id: str) -> ConsoleJob | None:
+        job = self.get(job_id)
+        if job is None or job.finished:
+            return job
+        if job.future is not None and job.future.cancel():
+            job.cancel_requested = True
+            self._finish(job, "cancelled", f"{job.action} cancelled before it started.")
+        elif job.cancel is not None:
+            job.cancel_requested = True
+            # Actions clear their stop flag when they start, so keep setting
+            # it until the job has actually ended.
+            Thread(target=self._repeat_cancel, args=(job,), name=f"cancel-{job.job_id}", daemon=True).start()
+            job.message = f"{job.action} stop requested."
+            self._publish(job)
+        else:
+            job.message = f"{job.action} cannot be interrupted; it will finish on its own."
+            self._publish(job)
+        return job
+
+    @staticmethod
+    def _repeat_cancel(job: ConsoleJob) -> None:
+        while not job.done.is_set():
+            job.cancel()
+            job.done.wait(JOB_CANCEL_REPEAT_S)
+
+
+CONSOLE_JOBS = ConsoleJobManager()
+
+
+def job_payload(job_id: str = "") -> dict[str, Any]:
+    """One job with its result, or the job list (newest first) without results."""
+    if job_id:
+        job = CONSOLE_JOBS.get(job_id)
+        if job is None:
+            raise ValueError(f"Unknown job: {job_id}")
+        return job.snapshot()
+    jobs = [job.snapshot(include_result=False) for job in reversed(CONSOLE_JOBS.jobs())]
+    return {"ok": True, "status": "jobs", "jobs": jobs, "active": sum(job["status"] not in JOB_FINISHED_STATES for job in jobs)}
+
+
+def cancel_job_payload(job_id: str) -> dict[str, Any]:
+    job = CONSOLE_JOBS.cancel(job_id)
+    if job is None:
+        raise ValueError(f"Unknown job: {job_id}")
+    return {"ok": True, "status": "cancel_requested" if not job.finished else job.status, "message": job.message, "job": job.snapshot()}
@@ -0,0 +1,72 @@
+"""Route handlers for console endpoints that need more than one call.
+
+The route table imports this module when one of these routes is first
+used, or when the server warms the table after it starts listening.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from core.ai.academic_ai_client import build_ai_recommendation, get_academic_ai_status
+from core.web.live_stream import start_live_scan
+from core.web.route_table import RawResponse, RouteQuery
+from core.web.spm_scan_plan_api import build_scan_plan_from_query
+from core.web.spm_scan_simulation import (
+    build_scan_frame,
+    build_scan_frame_buffer,
+    build_scan_line,
+    profile_from_query,
+    scan_profile_payload,
+)
+
+
+def ai_status() -> dict[str, Any]:
+    status = get_academic_ai_status()
+    return {
+        "configured": status.configured,
+        "mode": status.mode,
+        "role": status.role,
+        "safety_rule": status.safety_rule,
+    }
+
+
+def ai_recommendation(task: str) -> dict[str, Any]:
+    return build_ai_recommendation(task=task, context={"source": "web_operator_console"})
+
+
+def scan_plan(query: RouteQuery) -> dict[str, Any]:
+    return build_scan_plan_from_query(query.query_string)
+
+
+def scan_profile(query: RouteQuery) -> dict[str, Any]:
+    return scan_profile_payload(profile_from_query(query.values))
+
+
+def scan_line(query: RouteQuery) -> dict[str, Any]:
+    return build_scan_line(profile_from_query(query.values), line_index=query.integer("line_index"))
+
+
+def scan_frame(query: RouteQuery) -> dict[str, Any] | RawResponse:
+    """Float32 frame buffer, or the JSON frame with ``format=json``."""
+    profile = profile_from_query(query.values)
+    if query.text("format", default="f32") == "json":
+        return build_scan_frame(profile)
+    channels = query.text("channels")
+    body = build_scan_frame_buffer(
+        profile,
+        row_start=query.integer("row_start"),
+        row_count=query.optional_integer("row_count"),
+        **({"channels": tuple(channels.split(","))} if channels else {}),
+    )
+    return RawResponse(body, "application/octet-stream")
+
+
+def scan_stream_start(query: RouteQuery) -> dict[str, Any]:
+    return start_live_scan(
+        profile_from_query(query.values),
+        source=query.text("source", default="simulation"),
+        start_line=query.integer("start_line"),
+        line_interval_s=query.number("line_interval_ms") / 1000.0,
+        port=query.text("port") or None,
+    )
@@ -1,10 +1,14 @@
 ﻿from __future__ import annotations
 
+from collections import deque
 from datetime import datetime
 from pathlib import Path
+import atexit
 import json
 import re
 import secrets
+import threading
+import time
 from typing import Any
 
 
@@ -37,12 +41,93 @@ def make_session_id(prefix: str = "HW") -> str:
     return f"{prefix}_{stamp}_{token}"
 
 
+DEFAULT_FLUSH_INTERVAL_S = 0.25
+DEFAULT_TAIL_LINES = 2000
+IMMEDIATE_FLUSH_LEVELS = {"FAIL", "ERROR", "CRITICAL"}
+
+
+class _BackgroundLogWriter:
+    """One daemon thread that appends pending lines for every dirty logger.
+
+    Loggers with unwritten lines are held strongly until flushed, so a logger
+    that goes out of scope right after ``emit`` still reaches the disk.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._dirty: set[HardwareDevLogger] = set()
+        self._wake = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def schedule(self, logger: "HardwareDevLogger") -> None:
+        with self._lock:
+            if logger in self._dirty:
+                return
+            self._dirty.add(logger)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="hardware-dev-log-writer", daemon=True)
+                self._thread.start()
+        self._wake.set()
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                deadlines = [logger.next_flush_at() for logger in self._dirty]
+            timeout = max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+            self._wake.wait(timeout)
+            self._wake.clear()
+            self.flush_due()
+
+    def flush_due(self, *, force: bool = False) -> None:
+        now = time.monotonic()
+        with self._lock:
+            due = [logger for logger in self._dirty if force or logger.flush_due(now)]
+            self._dirty.difference_update(due)
+        for logger in due:
+            try:
+                logger.flush()
+            except OSError:
+                pass
+
+    def flush_all(self) -> None:
+        self.flush_due(force=True)
+
+
+_WRITER = _BackgroundLogWriter()
+atexit.register(_WRITER.flush_all)
+
+
+def flush_hardware_logs() -> None:
+    """Write every pending hardware log line now (also runs at interpreter exit)."""
+    _WRITER.flush_all()
+
+
 class HardwareDevLogger:
-    def __init__(self, phase: str, session_id: str | None = None) -> None:
+    """Append-only session log mirrored to ``.txt`` and ``.jsonl``.
+
+    ``emit`` only queues the line; a shared background writer appends queued
+    lines every ``flush_interval_s``. FAIL/ERROR/CRITICAL events, ``flush()``,
+    ``close()`` and interpreter exit write immediately. ``lines``/``records``
+    keep the last ``tail_lines`` entries for ``summary_lines()``.
+    """
+
+    def __init__(
+        self,
+        phase: str,
+        session_id: str | None = None,
+        *,
+        flush_interval_s: float = DEFAULT_FLUSH_INTERVAL_S,
+        tail_lines: int = DEFAULT_TAIL_LINES,
+    ) -> None:
         self.phase = phase
         self.session_id = session_id or make_session_id("SPM")
-        self.lines: list[str] = []
-        self.records: list[dict[str, Any]] = []
+        self.flush_interval_s = max(0.0, float(flush_interval_s))
+        self.lines: deque[str] = deque(maxlen=tail_lines)
+        self.records: deque[dict[str, Any]] = deque(maxlen=tail_lines)
+        self._pending: list[tuple[str, dict[str, Any]]] = []
+        self._pending_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._last_flush = time.monotonic()
 
         base = hardware_log_dir() / f"{self.session_id}_{self.phase}"
         self.text_path = base.with_suffix(".txt")
@@ -55,6 +140,14 @@ class HardwareDevLogger:
             text_log=str(self.text_path),
             jsonl_log=str(self.jsonl_path),
         )
+        # The log paths are handed out right away, so create both files now.
+        self.flush()
+
+    def __enter__(self) -> "HardwareDevLogger":
+        return self
+
+    def __exit__(self, *_exc: Any) -> None:
+        self.close()
 
     def emit(self, level: str, event: str, **fields: Any) -> str:
         now = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
@@ -85,20 +178,40 @@ class HardwareDevLogger:
             **safe_fields,
         }
 
-        self.lines.append(line)
-        self.records.append(record)
-        self.flush()
+        with self._pending_lock:
+            self.lines.append(line)
+            self.records.append(record)
+            self._pending.append((line, record))
+        if level.upper() in IMMEDIATE_FLUSH_LEVELS or self.flush_interval_s == 0:
+            self.flush()
+        else:
+            _WRITER.schedule(self)
         return line
 
     def emit_raw(self, direction: str, text: str, **fields: Any) -> str:
         return self.emit("RAW", direction, text=redact(text), **fields)
 
+    def next_flush_at(self) -> float:
+        return self._last_flush + self.flush_interval_s
+
+    def flush_due(self, now: float) -> bool:
+        return now >= self.next_flush_at()
+
     def flush(self) -> None:
-        self.text_path.write_text("\n".join(self.lines) + "\n", encoding="utf-8")
-        self.jsonl_path.write_text(
-            "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in self.records),
-            encoding="utf-8",
-        )
+        with self._write_lock:
+            with self._pending_lock:
+                pending, self._pending = self._pending, []
+            if not pending:
+                return
+            with self.text_path.open("a", encoding="utf-8") as handle:
+                handle.write("".join(line + "\n" for line, _ in pending))
+            with self.jsonl_path.open("a", encoding="utf-8") as handle:
+                handle.write("".join(json.dumps(record, ensure_ascii=False) + "\n" for _, record in pending))
+            self._last_flush = time.monotonic()
+
+    def close(self) -> None:
+        self.flush()
 
     def summary_lines(self) -> list[str]:
-        return list(self.lines)
+        with self._pending_lock:
+            return list(self.lines)
@@ -15,6 +15,9 @@ from __future__ import annotations
 from dataclasses import asdict, dataclass
 from typing import Any
 
+from core.system.config_cache import ttl_cached
+
+HARDWARE_STATUS_TTL_S = 2.0
 
 SAFE_READONLY_COMMANDS = {
     "IDENTITY": "M115",
@@ -115,3 +118,14 @@ def validate_readonly_plan(payload: dict[str, Any]) -> bool:
             return False
 
     return payload.get("execution_allowed") is False and payload.get("gcode_sent") is False
+
+
+@ttl_cached(HARDWARE_STATUS_TTL_S)
+def cached_hardware_information() -> tuple[dict[str, Any], bool]:
+    """``hardware_information_status()`` and its plan check, reused briefly.
+
+    Status polls from several console tabs share one result; the dict is
+    shared, so treat it as read-only.
+    """
+    status = hardware_information_status()
+    return status, validate_readonly_plan(status)
@@ -0,0 +1,156 @@
+"""HTTP validators and compression for the web operator console.
+
+Static files and responses of pure routes (output depends only on the
+query) are encoded once into a ``CachedBody``: the identity bytes, an
+optional gzip copy and a content-hash ETag for each. Browsers revalidate
+with ``If-None-Match`` and get a bodiless 304 while nothing changed.
+Static entries are keyed by file mtime and size, so an edited file is
+picked up on the next request.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+import gzip
+import hashlib
+import mimetypes
+from pathlib import Path
+from threading import Lock
+from urllib.parse import parse_qsl, urlencode
+
+from core.system.config_cache import FileCache
+
+GZIP_MIN_BYTES = 1024
+GZIP_LEVEL = 6
+# On-the-fly compression of uncached responses favours speed over ratio.
+GZIP_DYNAMIC_LEVEL = 1
+RESPONSE_CACHE_MAX_BYTES = 32 * 1024 * 1024
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/octet-stream",
+    "image/svg+xml",
+)
+
+
+def compressible(content_type: str) -> bool:
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def gzip_body(body: bytes, content_type: str, level: int = GZIP_LEVEL) -> bytes | None:
+    """Gzip ``body``, or ``None`` when it is small, not a text-like type or would not shrink."""
+    if len(body) < GZIP_MIN_BYTES or not compressible(content_type):
+        return None
+    compressed = gzip.compress(body, compresslevel=level, mtime=0)
+    return compressed if len(compressed) < len(body) else None
+
+
+def content_etag(body: bytes) -> str:
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    for part in accept_encoding.split(","):
+        coding, _, parameters = part.partition(";")
+        if coding.strip().lower() not in {"gzip", "*"}:
+            continue
+        parameters = parameters.strip().replace(" ", "")
+        if not parameters.startswith("q="):
+            return True
+        try:
+            return float(parameters[2:]) > 0
+        except ValueError:
+            return False
+    return False
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison, as ``If-None-Match`` requires."""
+    if not if_none_match or not etag:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in tags or etag in tags
+
+
+@dataclass(frozen=True)
+class CachedBody:
+    body: bytes
+    content_type: str
+    etag: str
+    gzip_body: bytes | None = None
+    gzip_etag: str = ""
+
+    @classmethod
+    def build(cls, body: bytes, content_type: str) -> CachedBody:
+        etag = content_etag(body)
+        compressed = gzip_body(body, content_type)
+        # Each encoding is its own representation, so it needs its own strong tag.
+        return cls(body, content_type, etag, compressed, etag[:-1] + '-gzip"' if compressed else "")
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + len(self.gzip_body or b"")
+
+    def representation(self, gzip_ok: bool) -> tuple[bytes, str, str]:
+        """Body, ETag and Content-Encoding to send."""
+        if gzip_ok and self.gzip_body is not None:
+            return self.gzip_body, self.gzip_etag, "gzip"
+        return self.body, self.etag, ""
+
+
+def _load_static_file(path: Path) -> CachedBody:
+    content_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+    return CachedBody.build(path.read_bytes(), content_type)
+
+
+STATIC_FILES = FileCache(_load_static_file)
+
+
+class ResponseCache:
+    """LRU of encoded responses for pure routes, bounded by total bytes."""
+
+    def __init__(self, max_bytes: int = RESPONSE_CACHE_MAX_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, CachedBody] = OrderedDict()
+        self._bytes = 0
+        self._lock = Lock()
+
+    @staticmethod
+    def key(path: str, query_string: str) -> str:
+        """Cache key that ignores parameter order (repeated names keep theirs)."""
+        pairs = sorted(parse_qsl(query_string, keep_blank_values=True), key=lambda pair: pair[0])
+        return f"{path}?{urlencode(pairs)}"
+
+    def get(self, key: str) -> CachedBody | None:
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+            return cached
+
+    def put(self, key: str, cached: CachedBody) -> CachedBody:
+        if cached.size > self.max_bytes:
+            return cached
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.size
+            self._entries[key] = cached
+            self._bytes += cached.size
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.size
+        return cached
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+RESPONSES = ResponseCache()
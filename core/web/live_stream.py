@@ -0,0 +1,313 @@
+"""Server-Sent Events stream for the web operator console.
+
+Every browser tab holds one ``/api/stream`` connection. Producers (streamed
+scan runs, Z readbacks, system and Z actions) publish small JSON events to
+``LIVE_EVENTS``, which fans them out into a bounded queue per client. A
+client that falls behind loses its oldest queued events instead of stalling
+the producer; the next event it receives reports how many were dropped.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+import itertools
+import json
+from threading import Condition, Event, Lock, Thread
+import time
+from typing import Any, Callable
+
+LIVE_STREAM_QUEUE_SIZE = 512
+LIVE_STREAM_KEEPALIVE_S = 15.0
+LIVE_EVENT_TYPES = ("scan_point", "scan_line", "z_sample", "log", "status")
+# Replayed to a new tab so it shows the current state without waiting.
+LIVE_REPLAYED_EVENTS = ("status", "z_sample")
+LIVE_SCAN_SOURCES = ("simulation", "real")
+
+
+@dataclass(frozen=True)
+class LiveEvent:
+    event_id: int
+    event: str
+    data: dict[str, Any]
+
+    def encode(self, dropped: int = 0) -> bytes:
+        data = {**self.data, "dropped": dropped} if dropped else self.data
+        body = json.dumps(data, separators=(",", ":"))
+        return f"id: {self.event_id}\nevent: {self.event}\ndata: {body}\n\n".encode("utf-8")
+
+
+class LiveSubscriber:
+    """Bounded event queue for one stream client."""
+
+    def __init__(self, maxsize: int = LIVE_STREAM_QUEUE_SIZE) -> None:
+        self._events: deque[LiveEvent] = deque(maxlen=max(1, int(maxsize)))
+        self._ready = Condition()
+        self._dropped = 0
+        self._closed = False
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    @property
+    def dropped(self) -> int:
+        return self._dropped
+
+    def offer(self, event: LiveEvent) -> None:
+        with self._ready:
+            if self._closed:
+                return
+            if len(self._events) == self._events.maxlen:
+                self._dropped += 1
+            self._events.append(event)
+            self._ready.notify()
+
+    def next_event(self, timeout: float | None = None) -> tuple[LiveEvent | None, int]:
+        """Next queued event and the drop count since the last call.
+
+        Returns ``(None, 0)`` on timeout or once the subscriber is closed.
+        """
+        with self._ready:
+            if not self._ready.wait_for(lambda: self._events or self._closed, timeout):
+                return None, 0
+            if not self._events:
+                return None, 0
+            dropped, self._dropped = self._dropped, 0
+            return self._events.popleft(), dropped
+
+    def close(self) -> None:
+        with self._ready:
+            self._closed = True
+            self._ready.notify_all()
+
+
+class LiveEventBroker:
+    def __init__(self, maxsize: int = LIVE_STREAM_QUEUE_SIZE) -> None:
+        self.maxsize = maxsize
+        self._lock = Lock()
+        self._subscribers: set[LiveSubscriber] = set()
+        self._latest: dict[str, LiveEvent] = {}
+        self._ids = itertools.count(1)
+
+    @property
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+
+    def subscribe(self) -> LiveSubscriber:
+        subscriber = LiveSubscriber(self.maxsize)
+        with self._lock:
+            for event in sorted(self._latest.values(), key=lambda item: item.event_id):
+                subscriber.offer(event)
+            self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: LiveSubscriber) -> None:
+        with self._lock:
+            self._subscribers.discard(subscriber)
+        subscriber.close()
+
+    def publish(self, event: str, data: dict[str, Any]) -> LiveEvent:
+        if event not in LIVE_EVENT_TYPES:
+            raise ValueError(f"Unknown live event type: {event}")
+        with self._lock:
+            live_event = LiveEvent(next(self._ids), event, dict(data))
+            if event in LIVE_REPLAYED_EVENTS:
+                self._latest[event] = live_event
+            subscribers = tuple(self._subscribers)
+        for subscriber in subscribers:
+            subscriber.offer(live_event)
+        return live_event
+
+    def close_all(self) -> None:
+        with self._lock:
+            subscribers = tuple(self._subscribers)
+            self._subscribers.clear()
+        for subscriber in subscribers:
+            subscriber.close()
+
+
+LIVE_EVENTS = LiveEventBroker()
+
+
+def publish_live_event(event: str, data: dict[str, Any]) -> LiveEvent:
+    return LIVE_EVENTS.publish(event, data)
+
+
+def publish_log_lines(lines: list[str], source: str = "") -> None:
+    clean = [str(line) for line in lines if str(line).strip()]
+    if clean:
+        publish_live_event("log", {"source": source, "lines": clean})
+
+
+def publish_api_result(route: str, payload: Any) -> None:
+    """Status (and Z readback, if any) of a finished system or Z action."""
+    if not isinstance(payload, dict):
+        return
+    publish_live_event(
+        "status",
+        {
+            "source": "api",
+            "route": route,
+            "ok": payload.get("ok"),
+            "status": payload.get("status", ""),
+            "mode": payload.get("mode", ""),
+            "message": payload.get("message", ""),
+        },
+    )
+    current = payload.get("current")
+    if isinstance(current, dict) and current.get("z") is not None:
+        publish_live_event("z_sample", {"source": route, "z": float(current["z"]), "time": time.time()})
+
+
+def scan_point_publisher(run_id: int, source: str) -> Callable[[dict[str, Any]], None]:
+    """``on_point`` callback for the real scan runners."""
+
+    def on_point(point: dict[str, Any]) -> None:
+        publish_live_event("scan_point", {"run_id": run_id, "source": source, "point": dict(point)})
+
+    return on_point
+
+
+_LIVE_SCAN_STOP = Event()
+_LIVE_SCAN_LOCK = Lock()
+_LIVE_SCAN_RUN_IDS = itertools.count(1)
+_live_scan_thread: Thread | None = None
+_live_scan_job: Any = None
+
+
+def live_scan_running() -> bool:
+    thread = _live_scan_thread
+    job = _live_scan_job
+    return (thread is not None and thread.is_alive()) or (job is not None and not job.finished)
+
+
+def start_live_scan(
+    profile: Any,
+    *,
+    source: str = "simulation",
+    start_line: int = 0,
+    line_interval_s: float = 0.0,
+    port: str | None = None,
+) -> dict[str, Any]:
+    """Run a raster on a background thread and stream it to every client.
+
+    ``source="simulation"`` publishes one ``scan_line`` event per line from
+    the web surface model, ``line_interval_s`` apart. ``source="real"`` queues
+    the constant-Z hardware raster as an MK4S job and publishes each
+    ``scan_point`` as the printer reports it.
+    """
+    global _live_scan_thread, _live_scan_job
+
+    if source not in LIVE_SCAN_SOURCES:
+        raise ValueError(f"source must be one of {', '.join(LIVE_SCAN_SOURCES)}")
+    profile.validate()
+    start_line = max(0, int(start_line))
+    if source == "real":
+        from core.web.real_scan_control import real_scan_allowed
+
+        if not real_scan_allowed():
+            return {
+                "ok": False,
+                "status": "motion_locked",
+                "message": "Real scan is locked. Launch with SPM_WEB_ALLOW_REAL_SCAN=1.",
+                "log_lines": ["REAL SCAN BLOCKED: SPM_WEB_ALLOW_REAL_SCAN is not enabled."],
+            }
+
+    with _LIVE_SCAN_LOCK:
+        if live_scan_running():
+            return {
+                "ok": False,
+                "status": "busy",
+                "message": "A streamed scan is already running.",
+                "log_lines": ["Streamed scan not started: another scan is running."],
+            }
+        run_id = next(_LIVE_SCAN_RUN_IDS)
+        _LIVE_SCAN_STOP.clear()
+        job_id = ""
+        if source == "real":
+            from core.web.console_jobs import CONSOLE_JOBS
+            from core.web.real_scan_control import request_real_scan_stop
+
+            _live_scan_job = CONSOLE_JOBS.submit(
+                "real_scan",
+                lambda: _run_real_scan(run_id, profile, port=port),
+                cancel=request_real_scan_stop,
+            )
+            job_id = _live_scan_job.job_id
+        else:
+            _live_scan_thread = Thread(
+                target=_run_simulated_scan,
+                args=(run_id, profile),
+                kwargs={"start_line": start_line, "line_interval_s": line_interval_s},
+                name=f"live-scan-{run_id}",
+                daemon=True,
+            )
+            _live_scan_thread.start()
+
+    message = f"Streamed {source} scan {run_id} started: {profile.x_points} points x {profile.y_points} lines."
+    return {
+        "ok": True,
+        "status": "started",
+        "message": message,
+        "run_id": run_id,
+        "job_id": job_id,
+        "source": source,
+        "start_line": start_line,
+        "line_count": profile.y_points,
+        "log_lines": [message],
+    }
+
+
+def stop_live_scan() -> dict[str, Any]:
+    _LIVE_SCAN_STOP.set()
+    if live_scan_running():
+        job = _live_scan_job
+        if job is not None and not job.finished:
+            from core.web.console_jobs import CONSOLE_JOBS
+
+            CONSOLE_JOBS.cancel(job.job_id)
+        message = "Streamed scan stop requested."
+    else:
+        message = "No streamed scan is running."
+    return {"ok": True, "status": "stop_requested", "message": message, "log_lines": [message]}
+
+
+def _publish_scan_status(run_id: int, source: str, status: str, message: str, **extra: Any) -> None:
+    publish_live_event(
+        "status",
+        {"source": "scan", "scan_source": source, "run_id": run_id, "status": status, "message": message, **extra},
+    )
+
+
+def _run_simulated_scan(run_id: int, profile: Any, *, start_line: int, line_interval_s: float) -> None:
+    from core.web.spm_scan_simulation import build_scan_line
+
+    _publish_scan_status(run_id, "simulation", "running", "Streamed simulation scan running.", line_index=start_line)
+    try:
+        for line_index in range(start_line, profile.y_points):
+            if _LIVE_SCAN_STOP.is_set():
+                _publish_scan_status(run_id, "simulation", "stopped", "Streamed scan stopped.", line_index=line_index)
+                return
+            publish_live_event("scan_line", {"run_id": run_id, **build_scan_line(profile, line_index)})
+            if line_interval_s > 0 and line_index + 1 < profile.y_points:
+                _LIVE_SCAN_STOP.wait(line_interval_s)
+    except Exception as exc:
+        _publish_scan_status(run_id, "simulation", "failed", f"Streamed scan failed: {exc}")
+        return
+    _publish_scan_status(run_id, "simulation", "complete", "Streamed scan complete.", line_index=profile.y_points)
+
+
+def _run_real_scan(run_id: int, profile: Any, *, port: str | None) -> dict[str, Any]:
+    """Job body of a streamed real scan; the job publishes the log lines."""
+    from core.web.real_scan_control import run_real_constant_z_scan
+
+    _publish_scan_status(run_id, "real", "running", "Streamed real scan running.")
+    try:
+        result = run_real_constant_z_scan(profile, port=port, on_point=scan_point_publisher(run_id, "real"))
+    except Exception as exc:
+        _publish_scan_status(run_id, "real", "failed", f"Real scan failed: {exc}")
+        raise
+    _publish_scan_status(run_id, "real", str(result.get("status", "")), str(result.get("message", "")), ok=bool(result.get("ok")))
+    return result
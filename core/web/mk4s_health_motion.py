@@ -2,11 +2,13 @@
 
 import re
 import time
-import json
 from pathlib import Path
 from serial import Serial
 from serial.tools import list_ports
 
+from core.system.hardware_initialized_profile import hardware_motion_limits
+from core.system.mk4s_serial_session import borrow_serial
+
 PRUSA_USB_VID = "VID:PID=2C99:"
 PRUSA_USB_PID_ALLOWLIST = {"000D", "001A"}
 SAFE_Z_MM = 100.0
@@ -84,16 +86,7 @@ def _counts_to_position(counts: dict[str, int]) -> dict[str, float]:
 
 
 def _motion_limits() -> dict[str, float]:
-    profile = json.loads(PROFILE_PATH.read_text(encoding="utf-8-sig"))
-    limits = profile["hardware_initialized_profile"]["motion_limits"]
-    return {
-        "x_min": float(limits["x_min"]),
-        "x_max": float(limits["x_max"]),
-        "y_min": float(limits["y_min"]),
-        "y_max": float(limits["y_max"]),
-        "z_min": float(limits["z_min"]),
-        "z_max": float(limits["z_max"]),
-    }
+    return hardware_motion_limits(PROFILE_PATH)
 
 
 def _test_range_blockers(position: dict[str, float], *, x_mm: float, y_mm: float, z_mm: float) -> list[str]:
@@ -160,9 +153,7 @@ def _verified_relative_leg(
 def run_mk4s_health_motion(port: str | None = None, profile: str = "short") -> dict:
     chosen, log = _choose_port(port)
     log.append("HEALTH MOTION: opening serial connection.")
-    with Serial(chosen, 115200, timeout=0.2, write_timeout=1.0) as ser:
-        time.sleep(0.4)
-        ser.reset_input_buffer()
+    with borrow_serial(chosen, 115200) as ser:
 
         for cmd in ["M115", "M105", "M119", "M114"]:
             log.extend(_send(ser, cmd, timeout=6.0))
@@ -273,9 +264,7 @@ def run_mk4s_safe_standby(port: str | None = None) -> dict:
     if blockers:
         return {"ok": False, "port": chosen, "log_lines": log + ["BLOCKED: safe standby target is invalid.", *blockers]}
 
-    with Serial(chosen, 115200, timeout=0.2, write_timeout=1.0) as ser:
-        time.sleep(0.4)
-        ser.reset_input_buffer()
+    with borrow_serial(chosen, 115200) as ser:
 
         initial_lines = _send(ser, "M114", timeout=6.0)
         log.extend(initial_lines)
@@ -357,9 +346,7 @@ def run_mk4s_safe_retract(port: str | None = None) -> dict:
     chosen, log = _choose_port(port)
     log.append("SAFE RETRACT: opening serial connection.")
 
-    with Serial(chosen, 115200, timeout=0.2, write_timeout=1.0) as ser:
-        time.sleep(0.4)
-        ser.reset_input_buffer()
+    with borrow_serial(chosen, 115200) as ser:
 
         initial_lines = _send(ser, "M114", timeout=6.0)
         log.extend(initial_lines)
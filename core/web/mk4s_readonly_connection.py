@@ -4,6 +4,7 @@ from dataclasses import asdict, dataclass
 from typing import Any
 import time
 
+from core.system.mk4s_serial_session import borrow_serial
 from core.web.hardware_dev_logger import HardwareDevLogger, redact
 
 
@@ -326,7 +327,7 @@ def connect_real_hardware_readonly(
         )
 
     try:
-        import serial
+        import serial  # noqa: F401  (presence check before borrowing the shared session)
     except Exception as exc:
         logger.emit("FAIL", "serial_import_failed", error=str(exc))
         return asdict(
@@ -360,28 +361,24 @@ def connect_real_hardware_readonly(
 
     try:
         logger.emit("INFO", "serial_open_attempt", port=selected_port, baud=baud)
-        with serial.Serial(
-            port=selected_port,
-            baudrate=baud,
-            timeout=0.25,
-            write_timeout=2,
-        ) as ser:
-            logger.emit("PASS", "serial_open_ok", port=selected_port, baud=baud)
-            logger.emit("INFO", "serial_settle_wait", seconds=settle_seconds)
-            time.sleep(settle_seconds)
-
-            startup_lines = _read_available(ser, 0.30, logger)
-            if startup_lines:
-                transcript.append("=== STARTUP / BUFFERED LINES ===")
-                transcript.extend(startup_lines)
-                transcript.append("")
+        with borrow_serial(selected_port, baud, settle_seconds=settle_seconds) as ser:
+            if ser.fresh:
+                logger.emit("PASS", "serial_open_ok", port=selected_port, baud=baud)
+                logger.emit("INFO", "serial_settle_wait", seconds=settle_seconds)
+                startup_lines = _read_available(ser, 0.30, logger)
+                if startup_lines:
+                    transcript.append("=== STARTUP / BUFFERED LINES ===")
+                    transcript.extend(startup_lines)
+                    transcript.append("")
+            else:
+                logger.emit("PASS", "serial_session_reused", port=selected_port, baud=baud)
 
             for command in READONLY_COMMANDS:
                 transcript.append(f"=== COMMAND {command} ===")
                 transcript.extend(_send_readonly_command(ser, command, timeout_seconds, logger))
                 transcript.append("")
 
-        logger.emit("PASS", "serial_closed_cleanly", port=selected_port)
+        logger.emit("PASS", "serial_lease_released", port=selected_port)
 
     except Exception as exc:
         transcript.append(f"ERROR: {exc}")
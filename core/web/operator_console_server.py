@@ -3,11 +3,14 @@
 from __future__ import annotations
 
 import argparse
+from functools import partial
 import json
+import time
 from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
+from threading import Thread
 from typing import Any
-from urllib.parse import parse_qs, urlparse
+from urllib.parse import urlsplit
 
 # Phase 2.2E: script-launch import path fix
 from pathlib import Path as _SPM_Path
@@ -17,9 +20,22 @@ _SPM_PROJECT_ROOT = _SPM_Path(__file__).resolve().parents[2]
 if str(_SPM_PROJECT_ROOT) not in _SPM_sys.path:
     _SPM_sys.path.insert(0, str(_SPM_PROJECT_ROOT))
 
-from core.ai.academic_ai_client import build_ai_recommendation, get_academic_ai_status
-from core.web.spm_scan_simulation import build_scan_line, profile_from_query, scan_profile_payload
-from core.web.system_control import dry_run_startup_plan, system_close, system_off, system_on, system_status
+from core.web.http_cache import (
+    GZIP_DYNAMIC_LEVEL,
+    RESPONSES,
+    STATIC_FILES,
+    CachedBody,
+    accepts_gzip,
+    compressible,
+    etag_matches,
+    gzip_body,
+)
+from core.web.live_stream import publish_api_result
+from core.web.route_table import RawResponse, Route, RouteQuery, RouteTable, query_argument
+
+# API modules (system control, AI client, scan simulation) are imported by
+# the route table on first use, or by a warm-up thread once the server
+# listens, so the server starts quickly.
 
 
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
@@ -66,303 +82,370 @@ PHASE_MAP: list[dict[str, str]] = [
 ]
 
 
-def json_response(payload: dict[str, Any] | list[dict[str, Any]]) -> bytes:
-    return json.dumps(payload, indent=2).encode("utf-8")
+JSON_CONTENT_TYPE = "application/json; charset=utf-8"
+# A GET on a job route waits this long for the result before answering 202.
+JOB_GET_WAIT_S = 5.0
+
+
+def json_response(payload: dict[str, Any] | list[dict[str, Any]], indent: int | None = 2) -> bytes:
+    return json.dumps(payload, indent=indent).encode("utf-8")
+
+
+def console_status() -> dict[str, Any]:
+    return {
+        "project": "SPM Prusa MK4S",
+        "console": "web_operator_console",
+        "phase": "2.3B",
+        "status": "ok",
+        "hardware": {
+            "mk4s": "not_connected_stub",
+            "z_scanner": "not_connected_stub",
+            "xy_scanner": "simulation_scan_model",
+        },
+        "safety": {
+            "real_motion_enabled": False,
+            "default_mode": "simulation_stub",
+        },
+        "measurement": {
+            "approach_required_before_scan": True,
+            "start_pause_stop": "simulation_shell",
+            "default_center": "simulation_shell",
+        },
+        "scan_model": "constant_distance_z_feedback_raster",
+    }
+
+
+def phase_map() -> list[dict[str, str]]:
+    return PHASE_MAP
+
+
+def route_timings() -> list[dict[str, Any]]:
+    return ROUTES.timings_payload()
+
+
+_SYSTEM = "core.web.system_control"
+_Z = "core.web.z_scanner_control"
+_HANDLERS = "core.web.console_route_handlers"
+_JOBS = "core.web.console_jobs"
+# Long hardware actions: POST runs them as jobs on the MK4S executor.
+_MK4S_JOB = {"job": "mk4s"}
+_Z_JOB = {"job": "mk4s", "cancel": "core.system.mk4s_z_auto_approach:request_z_motion_stop"}
+
+
+def _system_route(path: str, function: str, **options: Any) -> Route:
+    """System and Z actions: compact JSON, result published to the live stream."""
+    module = _Z if path.startswith(("/api/z/", "/api/measurement/")) else _SYSTEM
+    return Route(path, f"{module}:{function}", publish=True, indent=None, **options)
+
+
+ROUTES = RouteTable(
+    [
+        _system_route("/api/system/on", "system_on", arguments=lambda q: {"mode": q.text("mode", default="dry_run"), "port": q.text("port")}),
+        _system_route("/api/system/off", "system_disconnect", aliases=("/api/system/disconnect",)),
+        _system_route("/api/system/safe-retract", "system_safe_retract", aliases=("/api/system/safe_retract",), **_MK4S_JOB),
+        _system_route("/api/system/safe-standby", "system_safe_standby", aliases=("/api/system/safe_standby",), **_MK4S_JOB),
+        _system_route("/api/system/close", "system_close"),
+        _system_route("/api/system/status", "system_status"),
+        _system_route("/api/system/diagnostics", "system_diagnostics"),
+        _system_route("/api/system/sync-position", "system_sync_logical_position"),
+        _system_route("/api/system/config/port", "system_apply_port", arguments=lambda q: {"port": q.text("port")}),
+        _system_route(
+            "/api/system/config/mode",
+            "system_apply_mode",
+            arguments=lambda q: {"mode": q.text("mode", default="hardware_readonly")},
+        ),
+        _system_route("/api/z/reference", "z_reference_payload"),
+        _system_route("/api/z/read", "z_read_status", arguments=lambda q: {"port": q.text("port") or None}),
+        _system_route(
+            "/api/z/auto-preview",
+            "z_auto_preview",
+            arguments=lambda q: {
+                "setpoint_distance_mm": q.number("setpoint_distance_mm", "setpoint_mm"),
+                "retract_after": q.confirmed("retract_after"),
+            },
+        ),
+        _system_route(
+            "/api/z/auto-approach",
+            "z_auto_approach",
+            failure="Z auto approach failed",
+            **_Z_JOB,
+            arguments=lambda q: {
+                "setpoint_distance_mm": q.number("setpoint_distance_mm", "setpoint_mm"),
+                "retract_after": q.confirmed("retract_after"),
+                "confirmed": q.confirmed("confirmed"),
+            },
+        ),
+        _system_route(
+            "/api/z/move-to-setpoint",
+            "z_move_to_setpoint",
+            failure="Apply Target Z failed",
+            **_Z_JOB,
+            arguments=lambda q: {"target_z_mm": q.number("target_z_mm", "setpoint_mm"), "confirmed": q.confirmed("confirmed")},
+        ),
+        _system_route(
+            "/api/z/manual-step",
+            "z_manual_step",
+            failure="Manual Z move failed",
+            **_Z_JOB,
+            arguments=lambda q: {
+                "direction": q.text("direction", default="down"),
+                "step_mm": q.number("step_mm", default=0.1),
+                "confirmed": q.confirmed("confirmed"),
+            },
+        ),
+        _system_route(
+            "/api/z/retract",
+            "z_retract",
+            failure="Z retract failed",
+            arguments=lambda q: {"confirmed": q.confirmed("confirmed")},
+            **_Z_JOB,
+        ),
+        _system_route("/api/z/stop", "z_stop_now"),
+        _system_route("/api/measurement/limits", "measurement_limits_payload"),
+        Route(
+            "/api/system/health-test",
+            f"{_SYSTEM}:system_health_test",
+            arguments=lambda q: {
+                "confirmed": "1" if q.confirmed("confirmed") else "0",
+                "motion": "1" if q.confirmed("motion") else "0",
+                "profile": "long" if q.text("profile") == "long" else "short",
+            },
+            **_MK4S_JOB,
+        ),
+        Route("/api/system/dry-run", f"{_SYSTEM}:dry_run_startup_plan"),
+        Route("/api/status", console_status),
+        Route("/api/phase-map", phase_map),
+        Route("/api/routes", route_timings),
+        Route("/api/ai/status", f"{_HANDLERS}:ai_status"),
+        Route("/api/ai/recommendation", f"{_HANDLERS}:ai_recommendation", arguments=lambda q: {"task": q.text("task", default="general")}),
+        Route("/api/scan/plan", f"{_HANDLERS}:scan_plan", arguments=query_argument, cacheable=True),
+        Route("/api/scan/profile", f"{_HANDLERS}:scan_profile", arguments=query_argument, cacheable=True),
+        Route("/api/scan/line", f"{_HANDLERS}:scan_line", arguments=query_argument, cacheable=True),
+        # Whole grid in one response; compact to keep 500x500 JSON frames small.
+        Route("/api/scan/frame", f"{_HANDLERS}:scan_frame", arguments=query_argument, indent=None, cacheable=True),
+        Route("/api/scan/stream/start", f"{_HANDLERS}:scan_stream_start", arguments=query_argument),
+        Route("/api/scan/stream/stop", "core.web.live_stream:stop_live_scan"),
+        Route("/api/stream", stream=True),
+        Route("/api/jobs", f"{_JOBS}:job_payload", arguments=lambda q: {"job_id": q.text("id", "job_id")}),
+        Route("/api/jobs/cancel", f"{_JOBS}:cancel_job_payload", arguments=lambda q: {"job_id": q.text("id", "job_id")}),
+    ]
+)
 
 
 class OperatorConsoleHandler(SimpleHTTPRequestHandler):
-    """HTTP handler serving static UI and local API endpoints."""
+    """HTTP handler serving static UI and the ``ROUTES`` API endpoints."""
 
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         super().__init__(*args, directory=str(WEB_ROOT), **kwargs)
 
-    def _send_json(self, payload: dict[str, Any] | list[dict[str, Any]], status: int = 200) -> None:
-        body = json_response(payload)
-        self.send_response(status)
-        self.send_header("Content-Type", "application/json; charset=utf-8")
-        self.send_header("Content-Length", str(len(body)))
+    def _send_json(
+        self,
+        payload: dict[str, Any] | list[dict[str, Any]],
+        status: int = 200,
+        indent: int | None = 2,
+        elapsed_ms: float | None = None,
+    ) -> None:
+        body = json_response(payload, indent=indent)
+        self._send_bytes(body, JSON_CONTENT_TYPE, status=status, elapsed_ms=elapsed_ms)
+
+    def _send_bytes(
+        self,
+        body: bytes,
+        content_type: str,
+        status: int = 200,
+        elapsed_ms: float | None = None,
+        cached: CachedBody | None = None,
+    ) -> None:
+        """Send ``body``, gzipped when the client accepts it.
+
+        A ``cached`` body carries an ETag, so the browser revalidates it and
+        gets a 304 while it is unchanged; other responses are not stored.
+        """
+        gzip_ok = accepts_gzip(self.headers.get("Accept-Encoding", ""))
+        if cached is not None:
+            body, etag, encoding = cached.representation(gzip_ok)
+        else:
+            etag, encoding = "", ""
+            compressed = gzip_body(body, content_type, level=GZIP_DYNAMIC_LEVEL) if gzip_ok else None
+            if compressed is not None:
+                body, encoding = compressed, "gzip"
+        not_modified = status == 200 and etag_matches(self.headers.get("If-None-Match", ""), etag)
+
+        self.send_response(304 if not_modified else status)
+        if not not_modified:
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+        if encoding and not not_modified:
+            self.send_header("Content-Encoding", encoding)
+        if compressible(content_type):
+            self.send_header("Vary", "Accept-Encoding")
+        if etag:
+            self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "no-cache" if etag else "no-store")
+        if elapsed_ms is not None:
+            self.send_header("Server-Timing", f"handler;dur={elapsed_ms:.2f}")
         self.end_headers()
-        self.wfile.write(body)
+        if not not_modified:
+            self.wfile.write(body)
+
+    def _send_static(self) -> None:
+        """Serve a file from ``WEB_ROOT`` through ``STATIC_FILES``."""
+        file_path = Path(self.translate_path(self.path))
+        try:
+            cached = STATIC_FILES.get(file_path) if file_path.is_file() else None
+        except OSError:
+            cached = None
+        if cached is None:
+            # Directories, missing files and read errors keep the stock handling.
+            super().do_GET()
+            return
+        self._send_bytes(cached.body, cached.content_type, cached=cached)
 
     def _send_error_json(self, message: str, status: int = 400) -> None:
         self._send_json({"status": "error", "message": message}, status=status)
 
-    def do_GET(self) -> None:  # noqa: N802
-        # === Phase 2.2D smart main system routes start ===
-        from urllib.parse import urlparse as _spm_urlparse, parse_qs as _spm_parse_qs
-        _spm_parsed = _spm_urlparse(self.path)
-        _spm_path = _spm_parsed.path
-        _spm_qs = _spm_parse_qs(_spm_parsed.query)
-        
-        def _spm_first(name, default=""):
-            values = _spm_qs.get(name, [])
-            return values[0] if values else default
-
-        def _spm_first_any(names, default=""):
-            for name in names:
-                values = _spm_qs.get(name, [])
-                if values:
-                    return values[0]
-            return default
-        
-        def _spm_send_json(payload, status_code=200):
-            import json as _spm_json
-            data = _spm_json.dumps(payload, ensure_ascii=False).encode("utf-8")
-            self.send_response(status_code)
-            self.send_header("Content-Type", "application/json; charset=utf-8")
-            self.send_header("Content-Length", str(len(data)))
-            self.end_headers()
-            self.wfile.write(data)
-        
-        if _spm_path == "/api/system/on":
-            from core.web.system_control import system_on
-            _spm_send_json(system_on(mode=_spm_first("mode", "dry_run"), port=_spm_first("port", "")))
-            return
-        
-        if _spm_path in {"/api/system/off", "/api/system/disconnect"}:
-            from core.web.system_control import system_disconnect
-            _spm_send_json(system_disconnect())
-            return
-        
-        if _spm_path in {"/api/system/safe-retract", "/api/system/safe_retract"}:
-            from core.web.system_control import system_safe_retract
-            _spm_send_json(system_safe_retract())
-            return
-
-        if _spm_path in {"/api/system/safe-standby", "/api/system/safe_standby"}:
-            from core.web.system_control import system_safe_standby
-            _spm_send_json(system_safe_standby())
-            return
-        
-        if _spm_path == "/api/system/close":
-            from core.web.system_control import system_close
-            _spm_send_json(system_close())
-            return
-        
-        if _spm_path == "/api/system/status":
-            from core.web.system_control import system_status
-            _spm_send_json(system_status())
-            return
-
-        if _spm_path == "/api/system/diagnostics":
-            from core.web.system_control import system_diagnostics
-            _spm_send_json(system_diagnostics())
-            return
-
-        if _spm_path == "/api/system/sync-position":
-            from core.web.system_control import system_sync_logical_position
-            _spm_send_json(system_sync_logical_position())
-            return
-        
-        if _spm_path == "/api/system/config/port":
-            from core.web.system_control import system_apply_port
-            _spm_send_json(system_apply_port(_spm_first("port", "")))
-            return
-        
-        if _spm_path == "/api/system/config/mode":
-            from core.web.system_control import system_apply_mode
-            _spm_send_json(system_apply_mode(_spm_first("mode", "hardware_readonly")))
-            return
-
-        if _spm_path == "/api/z/reference":
-            from core.web.z_scanner_control import z_reference_payload
-            _spm_send_json(z_reference_payload())
-            return
-
-        if _spm_path == "/api/z/read":
-            from core.web.z_scanner_control import z_read_status
-            _spm_send_json(z_read_status(port=_spm_first("port", "") or None))
-            return
-
-        if _spm_path == "/api/z/auto-preview":
-            from core.web.z_scanner_control import z_auto_preview
-            _spm_send_json(z_auto_preview(
-                setpoint_distance_mm=float(_spm_first_any(("setpoint_distance_mm", "setpoint_mm"), "0") or 0),
-                retract_after=_spm_first("retract_after", "0") == "1",
-            ))
-            return
-
-        if _spm_path == "/api/z/auto-approach":
-            from core.web.z_scanner_control import z_auto_approach
-            try:
-                _spm_send_json(z_auto_approach(
-                    setpoint_distance_mm=float(_spm_first_any(("setpoint_distance_mm", "setpoint_mm"), "0") or 0),
-                    retract_after=_spm_first("retract_after", "0") == "1",
-                    confirmed=_spm_first("confirmed", "0") == "1",
-                ))
-            except Exception as exc:
-                _spm_send_json({
-                    "ok": False,
-                    "status": "failed",
-                    "message": f"Z auto approach failed: {exc}",
-                    "log_lines": [f"Z auto approach failed: {exc}"],
-                }, 500)
-            return
-
-        if _spm_path == "/api/z/move-to-setpoint":
-            from core.web.z_scanner_control import z_move_to_setpoint
-            try:
-                _spm_send_json(z_move_to_setpoint(
-                    target_z_mm=float(_spm_first_any(("target_z_mm", "setpoint_mm"), "0") or 0),
-                    confirmed=_spm_first("confirmed", "0") == "1",
-                ))
-            except Exception as exc:
-                _spm_send_json({
-                    "ok": False,
-                    "status": "failed",
-                    "message": f"Apply Target Z failed: {exc}",
-                    "log_lines": [f"Apply Target Z failed: {exc}"],
-                }, 500)
-            return
-
-        if _spm_path == "/api/z/manual-step":
-            from core.web.z_scanner_control import z_manual_step
-            try:
-                _spm_send_json(z_manual_step(
-                    direction=_spm_first("direction", "down"),
-                    step_mm=float(_spm_first("step_mm", "0.1") or 0.1),
-                    confirmed=_spm_first("confirmed", "0") == "1",
-                ))
-            except Exception as exc:
-                _spm_send_json({
-                    "ok": False,
-                    "status": "failed",
-                    "message": f"Manual Z move failed: {exc}",
-                    "log_lines": [f"Manual Z move failed: {exc}"],
-                }, 500)
-            return
-
-        if _spm_path == "/api/z/retract":
-            from core.web.z_scanner_control import z_retract
-            try:
-                _spm_send_json(z_retract(confirmed=_spm_first("confirmed", "0") == "1"))
-            except Exception as exc:
-                _spm_send_json({
-                    "ok": False,
-                    "status": "failed",
-                    "message": f"Z retract failed: {exc}",
-                    "log_lines": [f"Z retract failed: {exc}"],
-                }, 500)
-            return
-
-        if _spm_path == "/api/z/stop":
-            from core.web.z_scanner_control import z_stop_now
-            _spm_send_json(z_stop_now())
-            return
+    def _stream_live_events(self) -> None:
+        """Hold the connection open and write live events as SSE frames."""
+        from core.web.live_stream import LIVE_EVENTS, LIVE_STREAM_KEEPALIVE_S
 
-        if _spm_path == "/api/measurement/limits":
-            from core.web.z_scanner_control import measurement_limits_payload
-            _spm_send_json(measurement_limits_payload())
-            return
-        # === Phase 2.2D smart main system routes end ===
-        parsed = urlparse(self.path)
-
-        if parsed.path == "/api/scan/plan":
-            from core.web.spm_scan_plan_api import build_scan_plan_from_query
-            self._send_json(build_scan_plan_from_query(parsed.query))
-            return
-
-        # Phase 2.2E health-test top route
-        if parsed.path == "/api/system/health-test":
-            from core.web.system_control import system_health_test
-            confirmed = "1" if "confirmed=1" in parsed.query else "0"
-            motion = "1" if "motion=1" in parsed.query else "0"
-            profile = "long" if "profile=long" in parsed.query else "short"
-            self._send_json(system_health_test(confirmed=confirmed, motion=motion, profile=profile))
-            return
-
-        query = parse_qs(parsed.query)
-        route = parsed.path
-
-        if route == "/api/system/status":
-            self._send_json(system_status())
-            return
-
-        if route == "/api/system/on":
-            mode = query.get("mode", ["dry_run"])[0]
-            self._send_json(system_on(mode=mode))
-            return
-
-        if route == "/api/system/off":
-            self._send_json(system_off())
-            return
-
-        if route == "/api/system/close":
-            self._send_json(system_close())
-            return
-
-        if route == "/api/system/dry-run":
-            self._send_json(dry_run_startup_plan())
-            return
-
-        if route == "/api/status":
-            self._send_json(
-                {
-                    "project": "SPM Prusa MK4S",
-                    "console": "web_operator_console",
-                    "phase": "2.3B",
-                    "status": "ok",
-                    "hardware": {
-                        "mk4s": "not_connected_stub",
-                        "z_scanner": "not_connected_stub",
-                        "xy_scanner": "simulation_scan_model",
-                    },
-                    "safety": {
-                        "real_motion_enabled": False,
-                        "default_mode": "simulation_stub",
-                    },
-                    "measurement": {
-                        "approach_required_before_scan": True,
-                        "start_pause_stop": "simulation_shell",
-                        "default_center": "simulation_shell",
-                    },
-                    "scan_model": "constant_distance_z_feedback_raster",
-                }
-            )
-            return
-
-        if route == "/api/phase-map":
-            self._send_json(PHASE_MAP)
-            return
-
-        if route == "/api/ai/status":
-            status = get_academic_ai_status()
-            self._send_json(
-                {
-                    "configured": status.configured,
-                    "mode": status.mode,
-                    "role": status.role,
-                    "safety_rule": status.safety_rule,
-                }
-            )
-            return
-
-        if route == "/api/ai/recommendation":
-            task = query.get("task", ["general"])[0]
-            self._send_json(build_ai_recommendation(task=task, context={"source": "web_operator_console"}))
-            return
-
-        if route == "/api/scan/profile":
-            try:
-                profile = profile_from_query(query)
-                self._send_json(scan_profile_payload(profile))
-            except ValueError as error:
-                self._send_error_json(str(error))
-            return
-
-        if route == "/api/scan/line":
-            try:
-                profile = profile_from_query(query)
-                line_index = int(float(query.get("line_index", [0])[0]))
-                self._send_json(build_scan_line(profile, line_index=line_index))
-            except (TypeError, ValueError) as error:
-                self._send_error_json(str(error))
-            return
-
-        if route == "/":
-            self.path = "/index.html"
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream; charset=utf-8")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("X-Accel-Buffering", "no")
+        self.end_headers()
+        subscriber = LIVE_EVENTS.subscribe()
+        try:
+            self.wfile.write(f"retry: 2000\n: {LIVE_EVENTS.subscriber_count} live clients\n\n".encode("utf-8"))
+            while True:
+                event, dropped = subscriber.next_event(timeout=LIVE_STREAM_KEEPALIVE_S)
+                if event is not None:
+                    self.wfile.write(event.encode(dropped))
+                elif subscriber.closed:
+                    break
+                else:
+                    self.wfile.write(b": keepalive\n\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            LIVE_EVENTS.unsubscribe(subscriber)
+            self.close_connection = True
 
-        super().do_GET()
+    def do_GET(self) -> None:  # noqa: N802
+        url = urlsplit(self.path)
+        route = ROUTES.match(url.path)
+        if route is None:
+            if url.path == "/":
+                self.path = "/index.html"
+            self._send_static()
+            return
+        if route.stream:
+            self._stream_live_events()
+            return
+        query = RouteQuery(url.query)
+        if route.job:
+            # Hardware routes share the resource's job queue even when a client
+            # waits for the result, so a GET cannot race a queued POST.
+            self._wait_for_job(route, query, url.path)
+            return
+
+        self._dispatch(route, query, url.path)
+
+    def do_POST(self) -> None:  # noqa: N802
+        # Parameters travel in the query string; any request body is discarded.
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        url = urlsplit(self.path)
+        route = ROUTES.match(url.path)
+        if route is None or route.stream:
+            self._send_error_json(f"POST is not supported for {url.path}", status=405)
+            return
+        query = RouteQuery(url.query)
+        if not route.job:
+            self._dispatch(route, query, url.path)
+            return
+        job = self._submit_job(route, query, url.path)
+        if job is None:
+            return
+        self._send_accepted(job)
+
+    def _send_accepted(self, job: Any) -> None:
+        self._send_json(
+            {"ok": True, "status": "accepted", "message": job.message, "job_id": job.job_id, "job": job.snapshot(include_result=False)},
+            status=202,
+        )
+
+    def _submit_job(self, route: Route, query: RouteQuery, path: str, outcome: dict[str, Any] | None = None) -> Any:
+        """Queue ``route`` on its job resource; answer 400 and return ``None`` for bad arguments."""
+        try:
+            route.arguments(query)
+        except (TypeError, ValueError) as error:
+            self._send_error_json(str(error))
+            return None
+
+        from core.web.console_jobs import CONSOLE_JOBS
+
+        return CONSOLE_JOBS.submit(
+            path,
+            partial(_run_route_job, route, query, path, outcome),
+            resource=route.job,
+            cancel=ROUTES.cancel_handler(route),
+        )
+
+    def _wait_for_job(self, route: Route, query: RouteQuery, path: str) -> None:
+        """Run a job route through its queue and answer with its result.
+
+        A job still queued or running after ``JOB_GET_WAIT_S`` (behind a scan,
+        say) is answered with 202 and its ``job_id``, as for POST.
+        """
+        outcome: dict[str, Any] = {}
+        job = self._submit_job(route, query, path, outcome)
+        if job is None:
+            return
+        if not job.done.wait(JOB_GET_WAIT_S):
+            self._send_accepted(job)
+            return
+        payload = job.result
+        if not isinstance(payload, dict):
+            payload = {"ok": False, "status": job.status, "message": job.message, "log_lines": [], "job_id": job.job_id}
+            self._send_json(payload, status=500 if job.status == "failed" else 200)
+            return
+        self._send_bytes(json_response(payload, indent=route.indent), JSON_CONTENT_TYPE, status=outcome.get("status", 200))
+
+    def _dispatch(self, route: Route, query: RouteQuery, path: str) -> None:
+        cache_key = RESPONSES.key(path, query.query_string) if route.cacheable else ""
+        if cache_key:
+            started = time.perf_counter()
+            cached = RESPONSES.get(cache_key)
+            if cached is not None:
+                elapsed_ms = (time.perf_counter() - started) * 1000.0
+                ROUTES.record(route, elapsed_ms)
+                self._send_bytes(cached.body, cached.content_type, elapsed_ms=elapsed_ms, cached=cached)
+                return
+
+        payload, status, elapsed_ms = ROUTES.call(route, query)
+        if isinstance(payload, RawResponse):
+            body, content_type, status = payload.body, payload.content_type, payload.status
+        else:
+            body, content_type = json_response(payload, indent=route.indent), JSON_CONTENT_TYPE
+        cached = RESPONSES.put(cache_key, CachedBody.build(body, content_type)) if cache_key and status == 200 else None
+        self._send_bytes(body, content_type, status=status, elapsed_ms=elapsed_ms, cached=cached)
+        if route.publish and not isinstance(payload, RawResponse):
+            publish_api_result(path, payload)
+
+
+def _run_route_job(route: Route, query: RouteQuery, path: str, outcome: dict[str, Any] | None = None) -> Any:
+    payload, status, _elapsed_ms = ROUTES.call(route, query)
+    if outcome is not None:
+        outcome["status"] = status
+    if route.publish:
+        publish_api_result(path, payload)
+    return payload
+
+
+def _warm_routes() -> None:
+    for failure in ROUTES.resolve_all():
+        print(f"Route handler unavailable: {failure}")
 
 
 def run_server(host: str = "127.0.0.1", port: int = 8787) -> None:
@@ -370,6 +453,7 @@ def run_server(host: str = "127.0.0.1", port: int = 8787) -> None:
         raise FileNotFoundError(f"Web root does not exist: {WEB_ROOT}")
 
     server = ThreadingHTTPServer((host, port), OperatorConsoleHandler)
+    Thread(target=_warm_routes, name="route-warmup", daemon=True).start()
     print(f"SPM Prusa web operator console running at http://{host}:{port}")
     print("Press Ctrl+C to stop.")
     server.serve_forever()
@@ -379,7 +463,12 @@ def main() -> None:
     parser = argparse.ArgumentParser(description="Run the local SPM Prusa web operator console.")
     parser.add_argument("--host", default="127.0.0.1")
     parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--profile-startup", action="store_true", help="Print the import-time tree and exit.")
     args = parser.parse_args()
+    if args.profile_startup:
+        from core.system.startup_profile import print_startup_profile
+
+        raise SystemExit(print_startup_profile("core.web.operator_console_server"))
     run_server(host=args.host, port=args.port)
 
 
@@ -5,19 +5,34 @@ from __future__ import annotations
 import os
 import re
 import time
-from dataclasses import dataclass
+from bisect import bisect_left
+from dataclasses import asdict, dataclass
+from pathlib import Path
 from threading import Event
 from typing import Callable, Any
 
 from serial import Serial
 
-from core.system.hardware_initialized_profile import get_motion_controller_settings, load_hardware_initialized_profile
+from core.acquisition.scan_journal import (
+    ScanJournal,
+    ScanJournalState,
+    default_scan_journal_path,
+    load_scan_journal,
+)
+from core.system.hardware_initialized_profile import get_motion_controller_settings, hardware_motion_limits
+from core.system.mk4s_serial_session import borrow_serial
 from core.web.spm_scan_simulation import WebScanProfile, raster_line_coordinates
 
 
 _REAL_SCAN_STOP = Event()
 _REAL_SCAN_PAUSE = Event()
 
+REAL_SCAN_MOTION_MODES = ("point", "line")
+FOIL_TAP_CONTACT_ENGINES = ("stepped", "firmware_probe")
+FOIL_TAP_SEARCH_WINDOWS = ("full", "adaptive")
+FOIL_TAP_LIFT_MODES = ("full", "partial")
+LINE_SWEEP_ARRIVAL_TOLERANCE_MM = 0.02
+
 
 @dataclass(frozen=True)
 class RealScanPoint:
@@ -46,6 +61,10 @@ class FoilTapConfig:
     full_retract_z_mm: float = 120.0
     contact_source: str = "M119_z_min_experimental"
     abort_on_no_contact: bool = True
+    contact_engine: str = "stepped"
+    search_window: str = "full"
+    adaptive_margin_mm: float = 0.75
+    lift_mode: str = "full"
 
     @property
     def tap_min_z_mm(self) -> float:
@@ -89,16 +108,7 @@ def foil_tap_allowed() -> bool:
 
 
 def _motion_limits() -> dict[str, float]:
-    profile = load_hardware_initialized_profile()
-    limits = profile["hardware_initialized_profile"]["motion_limits"]
-    return {
-        "x_min": float(limits["x_min"]),
-        "x_max": float(limits["x_max"]),
-        "y_min": float(limits["y_min"]),
-        "y_max": float(limits["y_max"]),
-        "z_min": float(limits["z_min"]),
-        "z_max": float(limits["z_max"]),
-    }
+    return hardware_motion_limits()
 
 
 def validate_real_scan_profile(profile: WebScanProfile) -> None:
@@ -131,6 +141,14 @@ def validate_foil_tap_config(config: FoilTapConfig) -> None:
         or config.approach_speed_mm_s <= 0
     ):
         raise ValueError("Tap step, approach speed, and retract distances must be positive")
+    if config.contact_engine not in FOIL_TAP_CONTACT_ENGINES:
+        raise ValueError(f"contact_engine must be one of {', '.join(FOIL_TAP_CONTACT_ENGINES)}")
+    if config.search_window not in FOIL_TAP_SEARCH_WINDOWS:
+        raise ValueError(f"search_window must be one of {', '.join(FOIL_TAP_SEARCH_WINDOWS)}")
+    if config.adaptive_margin_mm <= 0:
+        raise ValueError("adaptive_margin_mm must be positive")
+    if config.lift_mode not in FOIL_TAP_LIFT_MODES:
+        raise ValueError(f"lift_mode must be one of {', '.join(FOIL_TAP_LIFT_MODES)}")
 
 
 def _linspace(start: float, stop: float, points: int) -> list[float]:
@@ -140,10 +158,13 @@ def _linspace(start: float, stop: float, points: int) -> list[float]:
     return [start + index * step for index in range(points)]
 
 
-def real_scan_plan(profile: WebScanProfile) -> dict[str, Any]:
+def real_scan_plan(profile: WebScanProfile, motion_mode: str = "point") -> dict[str, Any]:
     validate_real_scan_profile(profile)
+    if motion_mode not in REAL_SCAN_MOTION_MODES:
+        raise ValueError(f"motion_mode must be one of {', '.join(REAL_SCAN_MOTION_MODES)}")
     return {
         "mode": "constant_z_real_m114_raster",
+        "motion_mode": motion_mode,
         "x_min": profile.x_min,
         "x_max": profile.x_max,
         "y_min": profile.y_min,
@@ -194,6 +215,98 @@ def _parse_xyz(lines: list[str]) -> dict[str, float] | None:
     return values
 
 
+def _parse_count_xyz(lines: list[str]) -> dict[str, float] | None:
+    """Physical position from the M114 ``Count`` block, which tracks the steppers while moving."""
+    joined = "\n".join(lines)
+    match = re.search(r"Count\s+X:\s*([+-]?\d+)\s+Y:\s*([+-]?\d+)\s+Z:\s*([+-]?\d+)", joined)
+    if not match:
+        return None
+    return {
+        "x": int(match.group(1)) / 100.0,
+        "y": int(match.group(2)) / 100.0,
+        "z": int(match.group(3)) / 400.0,
+    }
+
+
+def _interpolate_line_samples(
+    samples: list[dict[str, float]],
+    coordinates: list[tuple[float, float]],
+    primary_axis: str,
+) -> list[dict[str, float]]:
+    """Resample timed sweep positions onto the raster grid along ``primary_axis``.
+
+    Samples are sorted by the primary coordinate; each grid point takes a
+    linear interpolation of the bracketing samples and clamps to the nearest
+    sample outside the covered span.
+    """
+    if not samples:
+        raise ValueError("line sweep produced no position samples")
+    ordered = sorted(samples, key=lambda sample: sample[primary_axis])
+    keys = [sample[primary_axis] for sample in ordered]
+    resampled: list[dict[str, float]] = []
+    for x, y in coordinates:
+        target = x if primary_axis == "x" else y
+        index = bisect_left(keys, target)
+        if index <= 0:
+            low = high = ordered[0]
+        elif index >= len(ordered):
+            low = high = ordered[-1]
+        else:
+            low, high = ordered[index - 1], ordered[index]
+        span = high[primary_axis] - low[primary_axis]
+        fraction = 0.0 if span == 0 else (target - low[primary_axis]) / span
+        resampled.append({"x": float(x), "y": float(y), "z": low["z"] + fraction * (high["z"] - low["z"])})
+    return resampled
+
+
+def _sweep_line(
+    ser: Serial,
+    coordinates: list[tuple[float, float]],
+    *,
+    feedrate: float,
+    sample_interval_s: float,
+    log_lines: list[str],
+) -> list[dict[str, float]] | None:
+    """Run one raster line as a single G1 sweep and sample M114 counts while it moves."""
+    start_x, start_y = coordinates[0]
+    end_x, end_y = coordinates[-1]
+    primary_axis = "x" if abs(end_x - start_x) >= abs(end_y - start_y) else "y"
+    end_value = end_x if primary_axis == "x" else end_y
+
+    move_start = f"G1 X{start_x:.3f} Y{start_y:.3f} F{feedrate:.0f}"
+    log_lines.extend([f">>> {move_start}", *_send(ser, move_start, timeout=60.0)])
+    log_lines.extend([">>> M400", *_send(ser, "M400", timeout=90.0)])
+
+    samples: list[dict[str, float]] = []
+    started = time.time()
+    first = _parse_count_xyz(_send(ser, "M114", timeout=8.0))
+    if first is not None:
+        samples.append({**first, "t": 0.0})
+
+    sweep = f"G1 X{end_x:.3f} Y{end_y:.3f} F{feedrate:.0f}"
+    log_lines.extend([f">>> {sweep}", *_send(ser, sweep, timeout=60.0)])
+    length = ((end_x - start_x) ** 2 + (end_y - start_y) ** 2) ** 0.5
+    deadline = time.time() + 2.0 * length / max(feedrate / 60.0, 1e-6) + 10.0
+    while time.time() < deadline:
+        position = _parse_count_xyz(_send(ser, "M114", timeout=8.0))
+        if position is not None:
+            samples.append({**position, "t": time.time() - started})
+            if abs(position[primary_axis] - end_value) <= LINE_SWEEP_ARRIVAL_TOLERANCE_MM:
+                break
+        if sample_interval_s > 0:
+            time.sleep(sample_interval_s)
+
+    log_lines.extend([">>> M400", *_send(ser, "M400", timeout=90.0)])
+    final = _parse_count_xyz(_send(ser, "M114", timeout=8.0))
+    if final is not None:
+        samples.append({**final, "t": time.time() - started})
+    log_lines.append(
+        f"LINE SWEEP: {len(samples)} M114 count samples along {primary_axis.upper()} "
+        f"in {time.time() - started:.2f} s."
+    )
+    return samples or None
+
+
 def _m119_contact_detected(lines: list[str]) -> bool:
     for line in lines:
         match = re.search(r"\bz_min:\s*(\w+)", line, flags=re.IGNORECASE)
@@ -202,6 +315,125 @@ def _m119_contact_detected(lines: list[str]) -> bool:
     return False
 
 
+def _firmware_probe_rejected(lines: list[str]) -> bool:
+    for line in lines:
+        lowered = line.strip().lower()
+        if "unknown command" in lowered or "unsupported" in lowered or "not supported" in lowered:
+            return True
+        if lowered.startswith("timeout waiting for ok"):
+            return True
+    return False
+
+
+def _firmware_probe_reported(lines: list[str]) -> bool | None:
+    """What the firmware itself said about a G38 move: triggered, failed or nothing."""
+    for line in lines:
+        lowered = line.strip().lower()
+        if "probing failed" in lowered or "probe failed" in lowered or "failed to reach" in lowered:
+            return False
+        prb = re.search(r"\[prb:[^\]]*:([01])\]", lowered)
+        if prb:
+            return prb.group(1) == "1"
+        if "probe triggered" in lowered:
+            return True
+    return None
+
+
+def _firmware_probe_contact(
+    ser: Serial,
+    config: FoilTapConfig,
+    *,
+    feedrate: float,
+    log_lines: list[str],
+    feedrate_fine: float | None = None,
+) -> tuple[str, dict[str, float] | None]:
+    """Search for contact with a firmware probing move (G38.2) at the current XY.
+
+    Returns ``("contact", xyz)``, ``("no_contact", xyz)`` or ``("unsupported", None)``
+    when the caller must fall back to the stepped M119 search. Contact is
+    only reported from an M119 trigger or the firmware's own probe result.
+    A move that stops above the search floor without either (for example a
+    G38.2 acknowledged with ``ok`` but never executed) is treated as
+    unsupported, never as contact.
+
+    With ``feedrate_fine`` the first probe runs at ``feedrate``; after a
+    trigger the head backs off ``tap_step_fast_mm`` and probes again at
+    ``feedrate_fine``, and that slow touch gives the contact Z.
+    """
+    status, xyz = _firmware_probe_move(ser, config, feedrate=feedrate, log_lines=log_lines)
+    if status != "contact" or feedrate_fine is None or xyz is None:
+        return status, xyz
+    backoff_z = min(config.tap_start_z_mm, float(xyz["z"]) + config.tap_step_fast_mm)
+    backoff_cmd = f"G1 Z{backoff_z:.3f} F{feedrate:.0f}"
+    log_lines.extend([f">>> {backoff_cmd}", *_send(ser, backoff_cmd, timeout=60.0)])
+    log_lines.extend([">>> M400", *_send(ser, "M400", timeout=90.0)])
+    fine_status, fine_xyz = _firmware_probe_move(ser, config, feedrate=feedrate_fine, log_lines=log_lines)
+    if fine_status == "unsupported":
+        log_lines.append("FOIL TAP: slow G38.2 re-probe unusable; keeping the fast probe contact.")
+        return status, xyz
+    return fine_status, fine_xyz
+
+
+def _firmware_probe_move(
+    ser: Serial,
+    config: FoilTapConfig,
+    *,
+    feedrate: float,
+    log_lines: list[str],
+) -> tuple[str, dict[str, float] | None]:
+    """One G38.2 move down to the tap floor; see ``_firmware_probe_contact``."""
+    probe_cmd = f"G38.2 Z{config.tap_min_z_mm:.3f} F{feedrate:.0f}"
+    probe = _send(ser, probe_cmd, timeout=90.0)
+    log_lines.extend([f">>> {probe_cmd}", *probe])
+    if _firmware_probe_rejected(probe):
+        return "unsupported", None
+    log_lines.extend([">>> M400", *_send(ser, "M400", timeout=90.0)])
+    m119 = _send(ser, "M119", timeout=8.0)
+    log_lines.extend([">>> M119", *m119])
+    readback = _send(ser, "M114", timeout=8.0)
+    log_lines.extend([">>> M114", *readback])
+    xyz = _parse_count_xyz(readback) or _parse_xyz(readback)
+    reported = _firmware_probe_reported(probe)
+    if _m119_contact_detected(m119) or reported is True:
+        return "contact", xyz
+    if xyz is None:
+        log_lines.append("FOIL TAP: no Z readback after G38.2; cannot tell where the probe stopped.")
+        return "unsupported", None
+    if reported is False or xyz["z"] <= config.tap_min_z_mm + 1e-3:
+        return "no_contact", xyz
+    log_lines.append(
+        f"FOIL TAP: G38.2 stopped at Z={xyz['z']:.3f} above the search floor without a trigger; "
+        "not recording contact."
+    )
+    return "unsupported", None
+
+
+def _restart_search_if_touching(
+    ser: Serial,
+    config: FoilTapConfig,
+    search_start_z: float,
+    *,
+    contact: bool,
+    log_lines: list[str],
+) -> float:
+    """Climb back to ``tap_start_z_mm`` when a reduced search start is already in contact.
+
+    Returns the Z the search should start from. A contact at the first Z of
+    an adaptive window or partial-lift hover only means the foil is higher
+    than predicted, so it is not recorded.
+    """
+    if not contact or search_start_z >= config.tap_start_z_mm:
+        return search_start_z
+    log_lines.append(
+        f"FOIL TAP: contact already at search start Z={search_start_z:.3f}; "
+        "re-searching the full tapping range."
+    )
+    start_cmd = f"G1 Z{config.tap_start_z_mm:.3f} F300"
+    log_lines.extend([f">>> {start_cmd}", *_send(ser, start_cmd, timeout=90.0)])
+    log_lines.extend([">>> M400", *_send(ser, "M400", timeout=90.0)])
+    return config.tap_start_z_mm
+
+
 def _tap_z_values(config: FoilTapConfig) -> list[float]:
     values: list[float] = []
     z = config.tap_start_z_mm
@@ -213,23 +445,202 @@ def _tap_z_values(config: FoilTapConfig) -> list[float]:
     return values
 
 
+def _predict_contact_z(
+    rows: list[list[dict[str, Any]]],
+    row: list[dict[str, Any]],
+    x: float,
+    y: float,
+) -> float | None:
+    """Predict the contact Z at (x, y) from pixels that already touched.
+
+    Uses the previous pixel on the current line (extrapolated along the line
+    when two are available) and the nearest contact on the previous line.
+    Returns None when no neighbour has a contact yet.
+    """
+    estimates: list[float] = []
+    touched = [point for point in row[-2:] if point.get("contact_detected")]
+    if len(touched) == 2 and touched[-1] is row[-1]:
+        estimates.append(2.0 * float(touched[1]["measured_z"]) - float(touched[0]["measured_z"]))
+    elif row and row[-1].get("contact_detected"):
+        estimates.append(float(row[-1]["measured_z"]))
+    if rows:
+        previous = [point for point in rows[-1] if point.get("contact_detected")]
+        if previous:
+            nearest = min(previous, key=lambda point: (point["x"] - x) ** 2 + (point["y"] - y) ** 2)
+            estimates.append(float(nearest["measured_z"]))
+    if not estimates:
+        return None
+    return sum(estimates) / len(estimates)
+
+
+def _adaptive_tap_z_values(config: FoilTapConfig, predicted_z: float) -> tuple[float, list[float]]:
+    """Return (start Z, descending tap Z values) around a predicted contact.
+
+    The approach starts ``adaptive_margin_mm`` above the prediction and steps
+    fine through the window below it. Each time the window is exhausted
+    without contact it doubles in depth and the step grows with it (capped at
+    ``tap_step_fast_mm``), down to ``tap_min_z_mm``.
+    """
+    margin = config.adaptive_margin_mm
+    start_z = round(min(config.tap_start_z_mm, max(config.tap_min_z_mm, predicted_z + margin)), 4)
+    values: list[float] = []
+    z = start_z
+    window_floor = max(config.tap_min_z_mm, predicted_z - margin)
+    step = config.tap_step_fine_mm
+    while z > config.tap_min_z_mm:
+        if z <= window_floor:
+            margin *= 2.0
+            window_floor = max(config.tap_min_z_mm, predicted_z - margin)
+            step = min(config.tap_step_fast_mm, step * 2.0)
+        current_step = step
+        if z - config.tap_min_z_mm <= config.fine_zone_mm:
+            current_step = min(step, config.tap_step_fine_mm)
+        z = max(window_floor, z - current_step)
+        values.append(round(z, 4))
+    return start_z, values
+
+
+def _tap_lift_z(
+    config: FoilTapConfig,
+    contact_z: float,
+    *,
+    contact_detected: bool,
+    line_end: bool,
+) -> float:
+    """Z to lift to after a tap, before the XY hop to the next pixel.
+
+    ``lift_mode="partial"`` lifts ``retract_after_tap_mm`` above the contact.
+    Line ends, missed contacts and lifts that would leave the hardware Z
+    limits or exceed ``full_retract_z_mm`` use the full retract instead.
+    """
+    if config.lift_mode != "partial" or not contact_detected or line_end:
+        return config.full_retract_z_mm
+    limits = _motion_limits()
+    lift_z = round(contact_z + config.retract_after_tap_mm, 4)
+    if lift_z < limits["z_min"] or lift_z > limits["z_max"] or lift_z >= config.full_retract_z_mm:
+        return config.full_retract_z_mm
+    return lift_z
+
+
+def _foil_tap_full_retract(ser: Serial, config: FoilTapConfig, log_lines: list[str]) -> None:
+    retract_cmd = f"G1 Z{config.full_retract_z_mm:.3f} F300"
+    log_lines.extend([f">>> {retract_cmd}", *_send(ser, retract_cmd, timeout=60.0)])
+    log_lines.extend([">>> M400", *_send(ser, "M400", timeout=90.0)])
+
+
+def _stepped_tap_search(
+    ser: Any,
+    config: FoilTapConfig,
+    z_values: list[float],
+    *,
+    feedrate: float,
+    feedrate_fine: float,
+    fine_floor_z: float,
+    xyz: dict[str, float],
+    log_lines: list[str],
+) -> tuple[str, dict[str, float], int]:
+    """Step down through ``z_values`` checking M119 after every move.
+
+    Returns (status, last M114 readback, tap count); status is "contact",
+    "no_contact" or "stopped". Moves at or above ``fine_floor_z`` and inside
+    ``fine_zone_mm`` of the tap floor use the fine feedrate.
+    """
+    taps = 0
+    for z in z_values:
+        if real_scan_stop_requested():
+            return "stopped", xyz, taps
+        fine = z >= fine_floor_z or (z - config.tap_min_z_mm) <= config.fine_zone_mm
+        z_feedrate = feedrate_fine if fine else feedrate
+        z_cmd = f"G1 Z{z:.3f} F{z_feedrate:.0f}"
+        log_lines.extend([f">>> {z_cmd}", *_send(ser, z_cmd, timeout=60.0)])
+        log_lines.extend([">>> M400", *_send(ser, "M400", timeout=90.0)])
+        m119 = _send(ser, "M119", timeout=8.0)
+        log_lines.extend([">>> M119", *m119])
+        readback = _send(ser, "M114", timeout=8.0)
+        log_lines.extend([">>> M114", *readback])
+        parsed = _parse_xyz(readback)
+        if parsed is not None:
+            xyz = parsed
+        taps += 1
+        if _m119_contact_detected(m119):
+            return "contact", xyz, taps
+    return "no_contact", xyz, taps
+
+
 def run_real_constant_z_scan(
     profile: WebScanProfile,
     *,
     port: str | None = None,
     scan_speed_mm_s: float = 5.0,
     on_point: Callable[[dict[str, float]], None] | None = None,
+    motion_mode: str = "point",
+    sample_interval_s: float = 0.05,
+    journal_path: str | Path | None = None,
+    resume: ScanJournalState | None = None,
 ) -> dict[str, Any]:
+    """Run the constant-Z raster.
+
+    ``motion_mode="point"`` stops at every pixel (G1, M400, M114).
+    ``motion_mode="line"`` sweeps each raster line with one G1 move, samples
+    M114 stepper counts while the carriage moves and interpolates them onto
+    the ``raster_line_coordinates`` grid. Point payloads keep the same shape.
+
+    Every completed point is appended to a checkpoint journal
+    (``journal_path`` or a new file under docs/scan_journals). ``resume``
+    continues a loaded journal; see ``resume_real_scan``.
+    """
     validate_real_scan_profile(profile)
+    plan = real_scan_plan(profile, motion_mode)
     if not real_scan_allowed():
         return {
             "ok": False,
             "status": "motion_locked",
             "message": "Real scan is locked. Launch with SPM_WEB_ALLOW_REAL_SCAN=1.",
-            "plan": real_scan_plan(profile),
+            "plan": plan,
             "log_lines": ["REAL SCAN BLOCKED: SPM_WEB_ALLOW_REAL_SCAN is not enabled."],
         }
 
+    journal, resumed = _start_scan_journal(
+        "constant_z",
+        journal_path,
+        resume,
+        profile=profile,
+        options={"scan_speed_mm_s": scan_speed_mm_s, "motion_mode": motion_mode, "sample_interval_s": sample_interval_s},
+        whole_lines=motion_mode == "line",
+        on_point=on_point,
+    )
+    try:
+        result = _run_constant_z_raster(
+            profile,
+            plan,
+            port=port,
+            scan_speed_mm_s=scan_speed_mm_s,
+            on_point=on_point,
+            motion_mode=motion_mode,
+            sample_interval_s=sample_interval_s,
+            journal=journal,
+            resumed=resumed,
+        )
+        journal.record_end(str(result["status"]))
+    finally:
+        journal.close()
+    result["journal_path"] = str(journal.path)
+    result["log_lines"] = [*result.get("log_lines", []), f"SCAN JOURNAL: {journal.path}"]
+    return result
+
+
+def _run_constant_z_raster(
+    profile: WebScanProfile,
+    plan: dict[str, Any],
+    *,
+    port: str | None,
+    scan_speed_mm_s: float,
+    on_point: Callable[[dict[str, float]], None] | None,
+    motion_mode: str,
+    sample_interval_s: float,
+    journal: ScanJournal,
+    resumed: dict[int, list[dict[str, Any]]],
+) -> dict[str, Any]:
     clear_real_scan_stop()
     clear_real_scan_pause()
     settings = get_motion_controller_settings()
@@ -237,13 +648,14 @@ def run_real_constant_z_scan(
     feedrate = max(30.0, min(float(scan_speed_mm_s), 50.0) * 60.0)
     log_lines = [
         f"REAL SCAN: opening {selected_port}.",
-        f"REAL SCAN: constant Z={profile.z_setpoint:.3f} mm, {profile.x_points} points x {profile.y_points} lines.",
+        f"REAL SCAN: constant Z={profile.z_setpoint:.3f} mm, {profile.x_points} points x {profile.y_points} lines, "
+        f"motion mode={motion_mode}.",
     ]
+    if resumed:
+        log_lines.append(f"REAL SCAN: resuming {journal.path.name}; {sum(map(len, resumed.values()))} points already journaled.")
     rows: list[list[dict[str, float]]] = []
 
-    with Serial(selected_port, int(settings["baudrate"]), timeout=0.25, write_timeout=1.0) as ser:
-        time.sleep(0.4)
-        ser.reset_input_buffer()
+    with borrow_serial(selected_port, int(settings["baudrate"])) as ser:
         for command in ("M114", "G90", f"G1 Z{profile.z_setpoint:.3f} F300", "M400"):
             if real_scan_stop_requested():
                 return {"ok": False, "status": "stopped", "message": "Real scan stopped before raster.", "log_lines": log_lines}
@@ -252,8 +664,56 @@ def run_real_constant_z_scan(
 
         for line_index in range(profile.y_points):
             coordinates, line_direction = raster_line_coordinates(profile, line_index)
-            row: list[dict[str, float]] = []
+            row: list[dict[str, float]] = list(resumed.get(line_index, []))
+            if len(row) == len(coordinates):
+                rows.append(row)
+                continue
+            done = {int(point["point_index"]) for point in row}
+            if motion_mode == "line":
+                while real_scan_paused() and not real_scan_stop_requested():
+                    time.sleep(0.05)
+                if real_scan_stop_requested():
+                    log_lines.append("REAL SCAN STOPPED: operator stop requested.")
+                    return {"ok": False, "status": "stopped", "message": "Real scan stopped by operator.", "lines": rows, "log_lines": log_lines}
+                samples = _sweep_line(
+                    ser,
+                    coordinates,
+                    feedrate=feedrate,
+                    sample_interval_s=sample_interval_s,
+                    log_lines=log_lines,
+                )
+                if samples is None:
+                    return {
+                        "ok": False,
+                        "status": "failed",
+                        "message": "Real scan failed: could not parse M114 stepper counts during line sweep.",
+                        "lines": rows,
+                        "log_lines": log_lines,
+                    }
+                primary_axis = "x" if line_direction.startswith("X") else "y"
+                for point_index, sample in enumerate(_interpolate_line_samples(samples, coordinates, primary_axis)):
+                    point = RealScanPoint(
+                        point_index=point_index,
+                        line_index=line_index,
+                        x=sample["x"],
+                        y=sample["y"],
+                        z_feedback=sample["z"],
+                        measured_z=sample["z"],
+                        commanded_z=float(profile.z_setpoint),
+                        surface_height=sample["z"] - profile.z_setpoint,
+                        feedback_error=0.0,
+                        feedback_source="M114_count_line_sweep_interpolated",
+                    )
+                    payload = dict(point.__dict__)
+                    row.append(payload)
+                    journal.record_point(payload)
+                    if on_point is not None:
+                        on_point(payload)
+                rows.append(row)
+                continue
             for point_index, (x, y) in enumerate(coordinates):
+                if point_index in done:
+                    continue
                 while real_scan_paused() and not real_scan_stop_requested():
                     time.sleep(0.05)
                 if real_scan_stop_requested():
@@ -287,6 +747,7 @@ def run_real_constant_z_scan(
                 )
                 payload = dict(point.__dict__)
                 row.append(payload)
+                journal.record_point(payload)
                 if on_point is not None:
                     on_point(payload)
             rows.append(row)
@@ -296,7 +757,7 @@ def run_real_constant_z_scan(
         "status": "complete",
         "message": f"Real constant-Z scan complete: {profile.x_points} points x {profile.y_points} lines.",
         "lines": rows,
-        "plan": real_scan_plan(profile),
+        "plan": plan,
         "log_lines": [*log_lines, "REAL SCAN COMPLETE."],
     }
 
@@ -308,6 +769,8 @@ def run_real_foil_tap_scan(
     port: str | None = None,
     scan_speed_mm_s: float = 5.0,
     on_point: Callable[[dict[str, float]], None] | None = None,
+    journal_path: str | Path | None = None,
+    resume: ScanJournalState | None = None,
 ) -> dict[str, Any]:
     validate_real_scan_profile(profile)
     validate_foil_tap_config(config)
@@ -319,6 +782,43 @@ def run_real_foil_tap_scan(
             "log_lines": ["FOIL TAP BLOCKED: real scan and foil tap gates are not both enabled."],
         }
 
+    journal, resumed = _start_scan_journal(
+        "foil_tap",
+        journal_path,
+        resume,
+        profile=profile,
+        config=config,
+        options={"scan_speed_mm_s": scan_speed_mm_s},
+        on_point=on_point,
+    )
+    try:
+        result = _run_foil_tap_raster(
+            profile,
+            config,
+            port=port,
+            scan_speed_mm_s=scan_speed_mm_s,
+            on_point=on_point,
+            journal=journal,
+            resumed=resumed,
+        )
+        journal.record_end(str(result["status"]))
+    finally:
+        journal.close()
+    result["journal_path"] = str(journal.path)
+    result["log_lines"] = [*result.get("log_lines", []), f"SCAN JOURNAL: {journal.path}"]
+    return result
+
+
+def _run_foil_tap_raster(
+    profile: WebScanProfile,
+    config: FoilTapConfig,
+    *,
+    port: str | None,
+    scan_speed_mm_s: float,
+    on_point: Callable[[dict[str, float]], None] | None,
+    journal: ScanJournal,
+    resumed: dict[int, list[dict[str, Any]]],
+) -> dict[str, Any]:
     clear_real_scan_stop()
     clear_real_scan_pause()
     settings = get_motion_controller_settings()
@@ -333,12 +833,16 @@ def run_real_foil_tap_scan(
         f"X {profile.x_min:.2f}..{profile.x_max:.2f}, Y {profile.y_min:.2f}..{profile.y_max:.2f}.",
         f"FOIL TAP: table Z={config.table_z_mm:.2f}; approach {config.tap_start_z_mm:.2f} down to "
         f"{config.tap_min_z_mm:.2f}; approach speed={config.approach_speed_mm_s:.2f} mm/s; "
-        f"full retract Z={config.full_retract_z_mm:.2f}; source={config.contact_source}.",
+        f"full retract Z={config.full_retract_z_mm:.2f}; source={config.contact_source}; "
+        f"contact engine={config.contact_engine}; search window={config.search_window}; "
+        f"lift mode={config.lift_mode}.",
     ]
+    if resumed:
+        log_lines.append(f"FOIL TAP: resuming {journal.path.name}; {sum(map(len, resumed.values()))} points already journaled.")
+    use_firmware_probe = config.contact_engine == "firmware_probe"
+    adaptive_window = config.search_window == "adaptive"
 
-    with Serial(selected_port, int(settings["baudrate"]), timeout=0.25, write_timeout=1.0) as ser:
-        time.sleep(0.4)
-        ser.reset_input_buffer()
+    with borrow_serial(selected_port, int(settings["baudrate"])) as ser:
         for command in (
             "M114",
             "G90",
@@ -352,51 +856,115 @@ def run_real_foil_tap_scan(
             lines = _send(ser, command, timeout=90.0 if command == "M400" or command.startswith("G1 ") else 8.0)
             log_lines.extend([f">>> {command}", *lines])
         log_lines.append("FOIL TAP: scanner pre-positioned to XY minimum before first approach.")
+        journal.record_position(profile.x_min, profile.y_min, config.full_retract_z_mm)
 
         z_values = _tap_z_values(config)
+        hover_z: float | None = None
         for line_index in range(profile.y_points):
             coordinates, line_direction = raster_line_coordinates(profile, line_index)
-            row: list[dict[str, float]] = []
+            row: list[dict[str, float]] = list(resumed.get(line_index, []))
+            done = {int(point["point_index"]) for point in row}
             for point_index, (x, y) in enumerate(coordinates):
+                if point_index in done:
+                    continue
                 while real_scan_paused() and not real_scan_stop_requested():
                     time.sleep(0.05)
                 if real_scan_stop_requested():
                     log_lines.append("FOIL TAP STOPPED: operator stop requested.")
+                    if hover_z is not None:
+                        _foil_tap_full_retract(ser, config, log_lines)
                     return {"ok": False, "status": "stopped", "message": "Foil tap stopped by operator.", "lines": rows, "log_lines": log_lines}
 
                 move_xy = f"G1 X{x:.3f} Y{y:.3f} F{feedrate_xy:.0f}"
                 log_lines.extend([f">>> {move_xy}", *_send(ser, move_xy, timeout=60.0)])
                 log_lines.extend([">>> M400", *_send(ser, "M400", timeout=90.0)])
-                start_cmd = f"G1 Z{config.tap_start_z_mm:.3f} F300"
-                log_lines.extend([f">>> {start_cmd}", *_send(ser, start_cmd, timeout=90.0)])
-                log_lines.extend([">>> M400", *_send(ser, "M400", timeout=90.0)])
+                predicted_z = _predict_contact_z(rows, row, x, y) if adaptive_window else None
+                if predicted_z is None:
+                    search_start_z, point_z_values, fine_floor_z = config.tap_start_z_mm, z_values, float("inf")
+                else:
+                    search_start_z, point_z_values = _adaptive_tap_z_values(config, predicted_z)
+                    fine_floor_z = predicted_z - config.adaptive_margin_mm
+                if hover_z is not None and hover_z <= search_start_z:
+                    # Partial lift: start the search from the hop height
+                    # instead of climbing back up to the window start.
+                    search_start_z = hover_z
+                    point_z_values = [z for z in point_z_values if z < hover_z]
+                else:
+                    start_cmd = f"G1 Z{search_start_z:.3f} F300"
+                    log_lines.extend([f">>> {start_cmd}", *_send(ser, start_cmd, timeout=90.0)])
+                    log_lines.extend([">>> M400", *_send(ser, "M400", timeout=90.0)])
 
                 contact_detected = False
                 contact_z = config.tap_min_z_mm
                 xyz = {"x": float(x), "y": float(y), "z": config.tap_min_z_mm}
                 tap_count = 0
-                for z in z_values:
-                    if real_scan_stop_requested():
-                        log_lines.append("FOIL TAP STOPPED: operator stop requested during Z tap.")
-                        return {"ok": False, "status": "stopped", "message": "Foil tap stopped by operator.", "lines": rows, "log_lines": log_lines}
-                    z_feedrate = feedrate_z_fine if (z - config.tap_min_z_mm) <= config.fine_zone_mm else feedrate_z
-                    z_cmd = f"G1 Z{z:.3f} F{z_feedrate:.0f}"
-                    log_lines.extend([f">>> {z_cmd}", *_send(ser, z_cmd, timeout=60.0)])
-                    log_lines.extend([">>> M400", *_send(ser, "M400", timeout=90.0)])
+                point_engine = "stepped"
+                if use_firmware_probe:
                     m119 = _send(ser, "M119", timeout=8.0)
                     log_lines.extend([">>> M119", *m119])
-                    readback = _send(ser, "M114", timeout=8.0)
-                    log_lines.extend([">>> M114", *readback])
-                    parsed = _parse_xyz(readback)
-                    if parsed is not None:
-                        xyz = parsed
-                    tap_count += 1
-                    if _m119_contact_detected(m119):
+                    restart_z = _restart_search_if_touching(
+                        ser, config, search_start_z, contact=_m119_contact_detected(m119), log_lines=log_lines
+                    )
+                    if restart_z != search_start_z:
+                        search_start_z, point_z_values, fine_floor_z = restart_z, z_values, float("inf")
+                    # Fast probe to find the foil, then one slow touch for the reading.
+                    probe_status, probed = _firmware_probe_contact(
+                        ser, config, feedrate=feedrate_z, feedrate_fine=feedrate_z_fine, log_lines=log_lines
+                    )
+                    if probe_status == "unsupported":
+                        use_firmware_probe = False
+                        log_lines.append("FOIL TAP: firmware probing move unusable; falling back to stepped M119 search.")
+                    else:
+                        point_engine = "firmware_probe"
+                        tap_count = 1
+                        if probed is not None:
+                            xyz = probed
+                        contact_detected = probe_status == "contact"
+                        if contact_detected:
+                            contact_z = float(xyz["z"])
+                if point_engine == "stepped":
+                    status, xyz, taps = _stepped_tap_search(
+                        ser,
+                        config,
+                        point_z_values,
+                        feedrate=feedrate_z,
+                        feedrate_fine=feedrate_z_fine,
+                        fine_floor_z=fine_floor_z,
+                        xyz=xyz,
+                        log_lines=log_lines,
+                    )
+                    tap_count += taps
+                    restart_z = _restart_search_if_touching(
+                        ser, config, search_start_z, contact=status == "contact" and taps == 1, log_lines=log_lines
+                    )
+                    if restart_z != search_start_z:
+                        search_start_z = restart_z
+                        status, xyz, taps = _stepped_tap_search(
+                            ser,
+                            config,
+                            z_values,
+                            feedrate=feedrate_z,
+                            feedrate_fine=feedrate_z_fine,
+                            fine_floor_z=float("inf"),
+                            xyz=xyz,
+                            log_lines=log_lines,
+                        )
+                        tap_count += taps
+                    if status == "stopped":
+                        log_lines.append("FOIL TAP STOPPED: operator stop requested during Z tap.")
+                        _foil_tap_full_retract(ser, config, log_lines)
+                        return {"ok": False, "status": "stopped", "message": "Foil tap stopped by operator.", "lines": rows, "log_lines": log_lines}
+                    if status == "contact":
                         contact_detected = True
                         contact_z = float(xyz["z"])
-                        break
 
-                retract_z = config.full_retract_z_mm
+                retract_z = _tap_lift_z(
+                    config,
+                    contact_z,
+                    contact_detected=contact_detected,
+                    line_end=point_index == len(coordinates) - 1,
+                )
+                hover_z = retract_z if retract_z < config.full_retract_z_mm else None
                 retract_cmd = f"G1 Z{retract_z:.3f} F300"
                 log_lines.extend([f">>> {retract_cmd}", *_send(ser, retract_cmd, timeout=60.0)])
                 log_lines.extend([">>> M400", *_send(ser, "M400", timeout=90.0)])
@@ -414,10 +982,14 @@ def run_real_foil_tap_scan(
                     "feedback_source": config.contact_source,
                     "contact_detected": float(1 if contact_detected else 0),
                     "tap_count": float(tap_count),
+                    "contact_engine": point_engine,
+                    "search_start_z": float(search_start_z),
                     "retract_z": float(retract_z),
+                    "lift": "full" if hover_z is None else "partial",
                     "scan_direction": line_direction,
                 }
                 row.append(point)
+                journal.record_point(point)
                 if on_point is not None:
                     on_point(point)
                 if not contact_detected and config.abort_on_no_contact:
@@ -445,3 +1017,86 @@ def run_real_foil_tap_scan(
         "lines": rows,
         "log_lines": [*log_lines, "FOIL TAP COMPLETE."],
     }
+
+
+def _start_scan_journal(
+    kind: str,
+    journal_path: str | Path | None,
+    resume: ScanJournalState | None,
+    *,
+    profile: WebScanProfile,
+    options: dict[str, Any],
+    config: FoilTapConfig | None = None,
+    whole_lines: bool = False,
+    on_point: Callable[[dict[str, float]], None] | None = None,
+) -> tuple[ScanJournal, dict[int, list[dict[str, Any]]]]:
+    """Open a new journal, or reopen ``resume`` and replay its points.
+
+    With ``whole_lines`` partially journaled lines are dropped, because a
+    line sweep can only be repeated as a whole.
+    """
+    if resume is None:
+        journal = ScanJournal(journal_path or default_scan_journal_path(kind))
+        journal.record_plan(
+            kind,
+            {
+                "profile": asdict(profile),
+                "config": asdict(config) if config is not None else None,
+                "options": options,
+            },
+        )
+        return journal, {}
+    if resume.kind != kind:
+        raise ValueError(f"Journal {resume.path} is a {resume.kind or 'unknown'} scan, not {kind}.")
+    resumed = resume.rows_by_line()
+    if whole_lines:
+        resumed = {
+            line: row
+            for line, row in resumed.items()
+            if len(row) >= len(raster_line_coordinates(profile, line)[0])
+        }
+    journal = ScanJournal(resume.path)
+    journal.record_resume(sum(map(len, resumed.values())))
+    if on_point is not None:
+        for line_index in sorted(resumed):
+            for point in resumed[line_index]:
+                on_point(point)
+    return journal, resumed
+
+
+def resume_real_scan(
+    journal_path: str | Path,
+    *,
+    port: str | None = None,
+    on_point: Callable[[dict[str, float]], None] | None = None,
+) -> dict[str, Any]:
+    """Continue a journaled real scan, skipping pixels it already recorded.
+
+    The profile, foil-tap config and runner options come from the journal's
+    plan record. A journal that already finished is rebuilt without touching
+    the hardware.
+    """
+    state = load_scan_journal(journal_path)
+    plan = state.plan
+    profile = WebScanProfile(**plan["profile"])
+    options = dict(plan.get("options") or {})
+    if not state.resumable:
+        rows = state.rows()
+        if on_point is not None:
+            for row in rows:
+                for point in row:
+                    on_point(point)
+        return {
+            "ok": True,
+            "status": "complete",
+            "message": f"Scan journal {state.path.name} is already complete; frame rebuilt from journal.",
+            "lines": rows,
+            "journal_path": str(state.path),
+            "log_lines": [f"SCAN JOURNAL: {len(state.points)} points replayed from {state.path.name}."],
+        }
+    if state.kind == "constant_z":
+        return run_real_constant_z_scan(profile, port=port, on_point=on_point, resume=state, **options)
+    if state.kind == "foil_tap":
+        config = FoilTapConfig(**plan["config"])
+        return run_real_foil_tap_scan(profile, config, port=port, on_point=on_point, resume=state, **options)
+    raise ValueError(f"Journal {state.path} has unknown scan kind {state.kind!r}.")
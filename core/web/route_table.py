@@ -0,0 +1,218 @@
+"""Declarative GET route table for the web operator console.
+
+Each ``Route`` names its handler, usually as ``"module:function"``, plus a
+function that turns the typed query into keyword arguments. ``RouteTable`` looks a
+request path up in one dict, imports each handler module the first time
+the route is used (or when ``resolve_all`` warms the table) and keeps
+per-route call counts and timings.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import importlib
+from threading import Lock
+import time
+from typing import Any, Callable
+from urllib.parse import parse_qs
+
+TRUE_QUERY_VALUES = {"1", "true", "yes", "on"}
+
+
+class RouteQuery:
+    """Typed access to a parsed query string.
+
+    Each getter takes one or more parameter names and uses the first one
+    present, so renamed parameters can keep their old spelling.
+    """
+
+    def __init__(self, query_string: str = "") -> None:
+        self.query_string = query_string
+        self.values: dict[str, list[str]] = parse_qs(query_string)
+
+    def _first(self, names: tuple[str, ...]) -> tuple[str, str] | None:
+        for name in names:
+            values = self.values.get(name)
+            if values:
+                return name, values[0]
+        return None
+
+    def text(self, *names: str, default: str = "") -> str:
+        found = self._first(names)
+        return found[1] if found else default
+
+    def number(self, *names: str, default: float = 0.0) -> float:
+        found = self._first(names)
+        if found is None or not found[1].strip():
+            return default
+        try:
+            return float(found[1])
+        except ValueError:
+            raise ValueError(f"{found[0]} must be a number, got {found[1]!r}") from None
+
+    def integer(self, *names: str, default: int = 0) -> int:
+        return int(self.number(*names, default=default))
+
+    def optional_integer(self, *names: str) -> int | None:
+        found = self._first(names)
+        return None if found is None or not found[1].strip() else self.integer(*names)
+
+    def confirmed(self, *names: str) -> bool:
+        """Hardware confirmations: only an explicit ``1`` counts."""
+        return self.text(*names) == "1"
+
+    def boolean(self, *names: str, default: bool = False) -> bool:
+        found = self._first(names)
+        return default if found is None else found[1].strip().lower() in TRUE_QUERY_VALUES
+
+
+@dataclass(frozen=True)
+class RawResponse:
+    """Non-JSON route result, sent as-is."""
+
+    body: bytes
+    content_type: str
+    status: int = 200
+
+
+def no_arguments(query: RouteQuery) -> dict[str, Any]:
+    return {}
+
+
+def query_argument(query: RouteQuery) -> dict[str, Any]:
+    return {"query": query}
+
+
+@dataclass(frozen=True)
+class Route:
+    """One GET endpoint.
+
+    ``failure`` turns any exception from the handler into an ``ok=False``
+    500 payload prefixed with that text, as the hardware routes report
+    them; without it, ``ValueError``/``TypeError`` become a 400 error.
+    ``publish`` sends the result to the live stream, and ``stream`` routes
+    are served by the request handler itself. A route with a ``job``
+    resource runs as a background job when POSTed; ``cancel`` names the
+    function that stops it mid-run. ``cacheable`` marks a route whose
+    output depends only on its query, so the server may keep the encoded
+    response and answer repeats from it.
+    """
+
+    path: str
+    target: str | Callable[..., Any] = ""
+    arguments: Callable[[RouteQuery], dict[str, Any]] = no_arguments
+    aliases: tuple[str, ...] = ()
+    failure: str = ""
+    publish: bool = False
+    indent: int | None = 2
+    stream: bool = False
+    job: str = ""
+    cancel: str | Callable[[], None] = ""
+    cacheable: bool = False
+
+    @property
+    def paths(self) -> tuple[str, ...]:
+        return (self.path, *self.aliases)
+
+
+@dataclass
+class RouteTiming:
+    calls: int = 0
+    errors: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    last_ms: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "mean_ms": round(self.total_ms / self.calls, 3) if self.calls else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "last_ms": round(self.last_ms, 3),
+        }
+
+
+class RouteTable:
+    def __init__(self, routes: list[Route]) -> None:
+        self.routes = tuple(routes)
+        self._by_path: dict[str, Route] = {}
+        for route in self.routes:
+            for path in route.paths:
+                if path in self._by_path:
+                    raise ValueError(f"Route {path} is registered twice")
+                self._by_path[path] = route
+        self._handlers: dict[str, Callable[..., Any]] = {}
+        self._timings = {route.path: RouteTiming() for route in self.routes}
+        self._lock = Lock()
+
+    def match(self, path: str) -> Route | None:
+        return self._by_path.get(path)
+
+    def handler(self, route: Route) -> Callable[..., Any]:
+        return self._resolve(route.target)
+
+    def cancel_handler(self, route: Route) -> Callable[[], None] | None:
+        return self._resolve(route.cancel) if route.cancel else None
+
+    def _resolve(self, target: str | Callable[..., Any]) -> Callable[..., Any]:
+        if callable(target):
+            return target
+        handler = self._handlers.get(target)
+        if handler is None:
+            module_name, _, function_name = target.partition(":")
+            handler = getattr(importlib.import_module(module_name), function_name)
+            self._handlers[target] = handler
+        return handler
+
+    def resolve_all(self) -> list[str]:
+        """Import every handler now; returns the routes that failed to resolve."""
+        failures = []
+        for route in self.routes:
+            for target in (route.target, route.cancel):
+                if not target:
+                    continue
+                try:
+                    self._resolve(target)
+                except (ImportError, AttributeError) as exc:
+                    failures.append(f"{route.path}: {exc}")
+        return failures
+
+    def record(self, route: Route, elapsed_ms: float, failed: bool = False) -> None:
+        with self._lock:
+            timing = self._timings[route.path]
+            timing.calls += 1
+            timing.errors += int(failed)
+            timing.total_ms += elapsed_ms
+            timing.max_ms = max(timing.max_ms, elapsed_ms)
+            timing.last_ms = elapsed_ms
+
+    def timings_payload(self) -> list[dict[str, Any]]:
+        with self._lock:
+            return [
+                {"path": route.path, "aliases": list(route.aliases), **self._timings[route.path].as_dict()}
+                for route in self.routes
+            ]
+
+    def call(self, route: Route, query: RouteQuery) -> tuple[Any, int, float]:
+        """Run ``route``; returns its payload, HTTP status and elapsed milliseconds."""
+        started = time.perf_counter()
+        payload, status = self._call(route, query)
+        elapsed_ms = (time.perf_counter() - started) * 1000.0
+        self.record(route, elapsed_ms, failed=status != 200)
+        return payload, status, elapsed_ms
+
+    def _call(self, route: Route, query: RouteQuery) -> tuple[Any, int]:
+        try:
+            arguments = route.arguments(query)
+        except (TypeError, ValueError) as error:
+            return {"status": "error", "message": str(error)}, 400
+        try:
+            return self.handler(route)(**arguments), 200
+        except Exception as exc:
+            if route.failure:
+                message = f"{route.failure}: {exc}"
+                return {"ok": False, "status": "failed", "message": message, "log_lines": [message]}, 500
+            if isinstance(exc, (TypeError, ValueError)):
+                return {"status": "error", "message": str(exc)}, 400
+            raise
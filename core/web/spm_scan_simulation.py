@@ -1,11 +1,27 @@
-﻿"""SPM raster scan simulation model for the web operator console."""
+﻿"""SPM raster scan simulation model for the web operator console.
+
+Surfaces come from the shared registry in ``core.education.surface_models``.
+Each one is evaluated for the whole scan grid at once and the height map is
+cached per grid, so a line request only slices a row (or a column for Y
+scans) of it.
+"""
 
 from __future__ import annotations
 
-import math
 from dataclasses import dataclass
 from typing import Any
 
+import json
+import struct
+
+import numpy as np
+
+from core.education.surface_models import SurfaceArea, grid_axis, height_map, surface_heights, surface_model_names
+
+DEFAULT_SURFACE = "sphere_on_plane"
+FRAME_MAGIC = b"SPMF"
+FRAME_CHANNELS = ("z_feedback", "surface_height")
+
 
 @dataclass(frozen=True)
 class WebScanProfile:
@@ -38,95 +54,98 @@ class WebScanProfile:
             raise ValueError("scan_direction must be one of X+, X-, Y+, Y-")
 
 
-def _linspace(start: float, stop: float, points: int) -> list[float]:
-    if points == 1:
-        return [start]
-    step = (stop - start) / (points - 1)
-    return [start + i * step for i in range(points)]
+def grid_axes(profile: WebScanProfile) -> tuple[np.ndarray, np.ndarray]:
+    """Cached, read-only X and Y sample positions of the scan grid."""
+    return (
+        grid_axis(profile.x_min, profile.x_max, profile.x_points),
+        grid_axis(profile.y_min, profile.y_max, profile.y_points),
+    )
 
 
-def raster_line_coordinates(profile: WebScanProfile, line_index: int) -> tuple[list[tuple[float, float]], str]:
+def _surface_model(profile: WebScanProfile) -> str:
+    # Unknown names have always rendered as the sphere.
+    return profile.surface if profile.surface in surface_model_names() else DEFAULT_SURFACE
+
+
+def _scan_area(profile: WebScanProfile) -> SurfaceArea:
+    return SurfaceArea(x_min=profile.x_min, x_max=profile.x_max, y_min=profile.y_min, y_max=profile.y_max)
+
+
+def _raster_line(profile: WebScanProfile, line_index: int) -> tuple[np.ndarray, np.ndarray, tuple, str]:
+    """X and Y of one raster line in scan order, its index into the height grid, and its direction."""
     profile.validate()
     if not 0 <= line_index < profile.y_points:
         raise ValueError("line_index outside scan range")
 
-    x_values = _linspace(profile.x_min, profile.x_max, profile.x_points)
-    y_values = _linspace(profile.y_min, profile.y_max, profile.y_points)
-    primary_is_x = profile.scan_direction.startswith("X")
-    primary_positive = profile.scan_direction.endswith("+")
-
-    if primary_is_x:
-        primary = x_values if primary_positive else list(reversed(x_values))
-        secondary = y_values[line_index]
-        direction = profile.scan_direction
-        if profile.serpentine and line_index % 2 == 1:
-            primary = list(reversed(primary))
-            direction = "X-" if direction == "X+" else "X+"
-        return [(x, secondary) for x in primary], direction
-
-    primary = y_values if primary_positive else list(reversed(y_values))
-    secondary = x_values[line_index % len(x_values)]
+    x_values, y_values = grid_axes(profile)
     direction = profile.scan_direction
+    reverse = not direction.endswith("+")
     if profile.serpentine and line_index % 2 == 1:
-        primary = list(reversed(primary))
-        direction = "Y-" if direction == "Y+" else "Y+"
-    return [(secondary, y) for y in primary], direction
+        reverse = not reverse
+        direction = direction[0] + ("-" if direction.endswith("+") else "+")
+    step = -1 if reverse else 1
+
+    if direction.startswith("X"):
+        xs = x_values[::step]
+        return xs, np.full(xs.shape, y_values[line_index]), (line_index, slice(None, None, step)), direction
+
+    column = line_index % profile.x_points
+    ys = y_values[::step]
+    return np.full(ys.shape, x_values[column]), ys, (slice(None, None, step), column), direction
+
+
+def raster_line_coordinates(profile: WebScanProfile, line_index: int) -> tuple[list[tuple[float, float]], str]:
+    xs, ys, _selector, direction = _raster_line(profile, line_index)
+    return list(zip(xs.tolist(), ys.tolist())), direction
 
 
 def simulated_surface_height(x: float, y: float, profile: WebScanProfile) -> float:
-    cx = (profile.x_min + profile.x_max) / 2.0
-    cy = (profile.y_min + profile.y_max) / 2.0
-    sx = max(profile.x_max - profile.x_min, 1e-9)
-    sy = max(profile.y_max - profile.y_min, 1e-9)
-
-    nx = (x - cx) / (sx / 2.0)
-    ny = (y - cy) / (sy / 2.0)
-
-    if profile.surface == "terrace":
-        terrace = math.floor((nx + 1.0) * 4.0) * 0.18
-        ripple = 0.05 * math.sin(14.0 * nx)
-        return terrace + ripple
-
-    if profile.surface == "grid_atoms":
-        lattice = math.sin(8.0 * math.pi * (nx + 1.0)) * math.sin(8.0 * math.pi * (ny + 1.0))
-        return 0.25 + 0.22 * lattice
-
-    if profile.surface == "bravais_lattice":
-        # Oblique Bravais-style lattice: two non-orthogonal basis directions with
-        # a small long-range modulation so the topography is not visually flat.
-        u = 10.0 * (nx + 0.35 * ny)
-        v = 10.0 * (0.22 * nx + ny)
-        lattice = (math.cos(2.0 * math.pi * u) + math.cos(2.0 * math.pi * v)) * 0.5
-        moire = 0.12 * math.sin(2.0 * math.pi * (1.6 * nx - 1.1 * ny))
-        return 0.35 + 0.18 * lattice + moire
-
-    r2 = nx * nx + ny * ny
-    if r2 <= 1.0:
-        return 1.8 * math.sqrt(1.0 - r2)
-    return 0.0
+    return float(surface_heights(_surface_model(profile), x, y, _scan_area(profile)))
 
 
-def build_scan_line(profile: WebScanProfile, line_index: int) -> dict[str, Any]:
+def surface_height_grid(profile: WebScanProfile) -> np.ndarray:
+    """Read-only surface heights over the whole grid, shape ``(y_points, x_points)``.
+
+    Cached per grid: only the bounds, point counts and surface take part in
+    the key, so feedback and scan-order settings share one height map.
+    """
     profile.validate()
+    return height_map(_surface_model(profile), _scan_area(profile), profile.x_points, profile.y_points).heights
 
-    if not 0 <= line_index < profile.y_points:
-        raise ValueError("line_index outside scan range")
 
-    coordinates, direction = raster_line_coordinates(profile, line_index)
+def _round6(values: np.ndarray) -> np.ndarray:
+    """``round(value, 6)`` for every element, without a Python call per value.
 
-    points: list[dict[str, float]] = []
+    ``np.round`` rounds ``value * 1e6`` and can pick the wrong side of a
+    decimal tie through that product's rounding error; the few values near
+    a tie are rounded by ``round`` itself.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    rounded = np.round(values, 6)
+    scaled = values * 1e6
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-4
+    if near_tie.any():
+        rounded[near_tie] = [round(value, 6) for value in values[near_tie].tolist()]
+    return rounded
+
+
+def build_scan_line(profile: WebScanProfile, line_index: int) -> dict[str, Any]:
+    xs, ys, selector, direction = _raster_line(profile, line_index)
+    heights = surface_height_grid(profile)[selector]
+    z_feedback = profile.z_setpoint + (heights * profile.feedback_gain)
 
-    for point_index, (x, y) in enumerate(coordinates):
-        surface_height = simulated_surface_height(x, y, profile)
-        z_feedback = profile.z_setpoint + (surface_height * profile.feedback_gain)
+    points: list[dict[str, float]] = []
 
+    for point_index, (x, y, surface_height, z_value) in enumerate(
+        zip(*(_round6(values).tolist() for values in (xs, ys, heights, z_feedback)))
+    ):
         points.append(
             {
                 "point_index": point_index,
-                "x": round(x, 6),
-                "y": round(y, 6),
-                "surface_height": round(surface_height, 6),
-                "z_feedback": round(z_feedback, 6),
+                "x": x,
+                "y": y,
+                "surface_height": surface_height,
+                "z_feedback": z_value,
                 "feedback_error": 0.0,
             }
         )
@@ -143,6 +162,98 @@ def build_scan_line(profile: WebScanProfile, line_index: int) -> dict[str, Any]:
     }
 
 
+def build_scan_frame(profile: WebScanProfile) -> dict[str, Any]:
+    """Whole-grid variant of ``build_scan_line``: every line in one payload.
+
+    Heights are laid out by grid row (``[y_index][x_index]``, both axes
+    ascending) independent of the scan direction; values are rounded like
+    the per-line points.
+    """
+    heights = surface_height_grid(profile)
+    x_values, y_values = grid_axes(profile)
+    z_feedback = profile.z_setpoint + (heights * profile.feedback_gain)
+
+    return {
+        "line_count": profile.y_points,
+        "x_points": profile.x_points,
+        "y_points": profile.y_points,
+        "surface": profile.surface,
+        "scan_direction": profile.scan_direction,
+        "z_setpoint": profile.z_setpoint,
+        "feedback_gain": profile.feedback_gain,
+        "height_source": "simulated_z_feedback_minus_setpoint",
+        "layout": "rows_y_then_x",
+        "x_values": _round6(x_values).tolist(),
+        "y_values": _round6(y_values).tolist(),
+        "surface_height": _round6(heights).tolist(),
+        "z_feedback": _round6(z_feedback).tolist(),
+        "z_min": round(float(z_feedback.min()), 6),
+        "z_max": round(float(z_feedback.max()), 6),
+    }
+
+
+def build_scan_frame_buffer(
+    profile: WebScanProfile,
+    *,
+    row_start: int = 0,
+    row_count: int | None = None,
+    channels: tuple[str, ...] = FRAME_CHANNELS,
+) -> bytes:
+    """Grid rows ``row_start`` onwards as a little-endian Float32 buffer.
+
+    Layout: ``FRAME_MAGIC``, a uint32 header length, the JSON header
+    (space-padded so the data starts 4-byte aligned), then the samples as
+    ``[channel][row][x_index]`` in ``rows_y_then_x`` order, like
+    ``build_scan_frame``. ``value_range`` covers the whole grid, so row
+    ranges of one frame share a colour scale.
+    """
+    heights = surface_height_grid(profile)
+    if not channels or any(channel not in FRAME_CHANNELS for channel in channels):
+        raise ValueError(f"channels must be taken from {', '.join(FRAME_CHANNELS)}")
+    if not 0 <= row_start < profile.y_points:
+        raise ValueError("row_start outside scan range")
+    row_stop = profile.y_points if row_count is None else row_start + int(row_count)
+    if row_stop <= row_start:
+        raise ValueError("row_count must be positive")
+    row_stop = min(row_stop, profile.y_points)
+
+    planes = {"surface_height": heights, "z_feedback": profile.z_setpoint + (heights * profile.feedback_gain)}
+    header = {
+        "format": "spm_frame_f32",
+        "dtype": "<f4",
+        "layout": "rows_y_then_x",
+        "shape": [len(channels), row_stop - row_start, profile.x_points],
+        "channels": list(channels),
+        "row_start": row_start,
+        "row_stop": row_stop,
+        "x_points": profile.x_points,
+        "y_points": profile.y_points,
+        "extent": {"x_min": profile.x_min, "x_max": profile.x_max, "y_min": profile.y_min, "y_max": profile.y_max},
+        "surface": profile.surface,
+        "scan_direction": profile.scan_direction,
+        "serpentine": profile.serpentine,
+        "z_setpoint": profile.z_setpoint,
+        "feedback_gain": profile.feedback_gain,
+        "value_range": {channel: [float(planes[channel].min()), float(planes[channel].max())] for channel in channels},
+    }
+    header_bytes = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    prefix = len(FRAME_MAGIC) + 4
+    header_bytes += b" " * (-(prefix + len(header_bytes)) % 4)
+    data = np.stack([planes[channel][row_start:row_stop] for channel in channels]).astype("<f4")
+    return FRAME_MAGIC + struct.pack("<I", len(header_bytes)) + header_bytes + data.tobytes()
+
+
+def parse_scan_frame_buffer(buffer: bytes) -> tuple[dict[str, Any], np.ndarray]:
+    """Header and ``(channels, rows, x_points)`` samples of a frame buffer."""
+    if buffer[: len(FRAME_MAGIC)] != FRAME_MAGIC:
+        raise ValueError("not an SPM frame buffer")
+    offset = len(FRAME_MAGIC) + 4
+    (header_length,) = struct.unpack_from("<I", buffer, len(FRAME_MAGIC))
+    header = json.loads(buffer[offset : offset + header_length])
+    data = np.frombuffer(buffer, dtype="<f4", offset=offset + header_length)
+    return header, data.reshape(header["shape"])
+
+
 def profile_from_query(query: dict[str, list[str]]) -> WebScanProfile:
     def get_float(name: str, default: float) -> float:
         try:
@@ -189,6 +300,7 @@ def scan_profile_payload(profile: WebScanProfile) -> dict[str, Any]:
         "surface": profile.surface,
         "serpentine": profile.serpentine,
         "scan_direction": profile.scan_direction,
+        "surface_models": surface_model_names(),
         "scan_principle": "constant_distance_z_feedback_raster",
         "line_sequence": "scan X line, step Y, scan next X line, accumulate topography",
         "execution_allowed": False,
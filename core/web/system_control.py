@@ -18,7 +18,8 @@ import time
 from dataclasses import dataclass, field
 from typing import Any
 
-from core.web.hardware_status_adapter import hardware_information_status, validate_readonly_plan
+from core.system.config_cache import invalidate_status_caches
+from core.web.hardware_status_adapter import cached_hardware_information
 
 
 @dataclass
@@ -52,7 +53,7 @@ def _readonly_hardware_allowed() -> bool:
 def system_status() -> dict[str, Any]:
     """Return current safe system status."""
     STATE.real_motion_enabled = _real_motion_allowed()
-    hardware_info = hardware_information_status()
+    hardware_info, plan_valid = cached_hardware_information()
 
     return {
         "status": "ok",
@@ -68,7 +69,7 @@ def system_status() -> dict[str, Any]:
             "scan_model": "constant_distance_z_feedback_raster",
         },
         "hardware_information_status": hardware_info,
-        "hardware_information_plan_valid": validate_readonly_plan(hardware_info),
+        "hardware_information_plan_valid": plan_valid,
         "safety": {
             "default_mode": "dry_run",
             "motion_allowed_this_phase": False,
@@ -240,6 +241,7 @@ def _base_payload():
 
 
 def _set_state(payload):
+    invalidate_status_caches()
     _SPM_SYSTEM_STATE.update({
         "connected": bool(payload.get("connected", payload.get("powered", False))),
         "powered": bool(payload.get("powered", False)),
@@ -330,13 +332,11 @@ def _position_diagnostic(position, tolerance_mm=0.02):
 
 
 def _send_serial_commands(commands, *, port=None, baudrate=115200, settle_seconds=0.4):
-    import serial
+    from core.system.mk4s_serial_session import borrow_serial
 
     selected_port = port or _SPM_SYSTEM_STATE.get("manual_port") or _SPM_SYSTEM_STATE.get("port") or "COM5"
-    log_lines = [f"PHASE 2.1 SERIAL: opening {selected_port}."]
-    with serial.Serial(selected_port, int(baudrate), timeout=0.25, write_timeout=1.0) as ser:
-        time.sleep(settle_seconds)
-        ser.reset_input_buffer()
+    log_lines = [f"PHASE 2.1 SERIAL: using shared session on {selected_port}."]
+    with borrow_serial(selected_port, int(baudrate), settle_seconds=settle_seconds) as ser:
         for command in commands:
             log_lines.append(f">>> {command}")
             ser.write((command + "\n").encode("ascii", errors="replace"))
@@ -360,6 +360,7 @@ def system_apply_port(port: str = ""):
 
     if selected == "":
         _SPM_SYSTEM_STATE["manual_port"] = ""
+        invalidate_status_caches()
         return {
             **_base_payload(),
             "ok": True,
@@ -375,6 +376,7 @@ def system_apply_port(port: str = ""):
         return _blocked_payload("config", f"Port rejected: {selected}. Allowed troubleshooting ports are COM1-COM10.")
 
     _SPM_SYSTEM_STATE["manual_port"] = selected
+    invalidate_status_caches()
     return {
         **_base_payload(),
         "ok": True,
@@ -394,6 +396,7 @@ def system_apply_mode(mode: str = "hardware_readonly"):
 
     if selected in {"hardware_readonly", "real_hardware_readonly", "readonly"}:
         _SPM_SYSTEM_STATE["operation_mode"] = "hardware_readonly"
+        invalidate_status_caches()
         return {
             **_base_payload(),
             "ok": True,
@@ -406,6 +409,7 @@ def system_apply_mode(mode: str = "hardware_readonly"):
 
     if selected in {"dry_run", "simulation", "simulated"}:
         _SPM_SYSTEM_STATE["operation_mode"] = "dry_run"
+        invalidate_status_caches()
         return {
             **_base_payload(),
             "ok": True,
@@ -849,6 +853,20 @@ def system_disconnect():
                 "log_lines": list(retract.get("log_lines") or []) + ["Disconnect blocked: safe retract was not confirmed."],
             }
 
+    from core.system.mk4s_serial_session import SerialSessionBusy, close_serial_sessions
+
+    try:
+        close_serial_sessions()
+    except SerialSessionBusy as error:
+        message = f"Disconnect blocked: {error} Stop or wait for the running action first."
+        return {
+            **_base_payload(),
+            "ok": False,
+            "status": "busy",
+            "message": message,
+            "log_lines": [message],
+        }
+
     payload = {
         **_base_payload(),
         "ok": True,
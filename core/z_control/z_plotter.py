@@ -6,8 +6,6 @@
 def launch_z_plotter():
     print("[Z-Plotter] Visualizing Z-axis behavior...")
 
-import matplotlib.pyplot as plt
-
 class ZDataPlotter:
     def __init__(self):
         self.z_positions = []
@@ -18,6 +16,8 @@ class ZDataPlotter:
         self.timestamps.append(timestamp)
 
     def plot(self):
+        import matplotlib.pyplot as plt
+
         plt.figure()
         plt.plot(self.timestamps, self.z_positions)
         plt.xlabel("Time (s)")
@@ -38,3 +38,103 @@ def test_move_to_updates_cached_position(monkeypatch):
 	state = b.get_state()
 	assert state["position"]["x"] == 12.0
 	assert state["position"]["y"] == 5.5
+
+
+class FakeMarlin:
+	"""Minimal Marlin line-number/checksum responder with a planner window."""
+
+	def __init__(self, corrupt_line=None):
+		self.expected = 1
+		self.executed = []
+		self.replies = []
+		self.corrupt_line = corrupt_line
+		self.max_unread = 0
+		self.unread = 0
+
+	def write(self, data):
+		line = data.decode("ascii").strip()
+		self.unread += 1
+		self.max_unread = max(self.max_unread, self.unread)
+		if not line.startswith("N"):
+			self.replies.append(b"ok\n")
+			return len(data)
+		payload, cs = line.rsplit("*", 1)
+		number = int(payload.split()[0][1:])
+		cmd = payload.split(" ", 1)[1]
+		if number == 0 and cmd.startswith("M110"):
+			self.expected = 1
+			self.replies.append(b"ok\n")
+			return len(data)
+		if number == self.corrupt_line:
+			self.corrupt_line = None
+			cs = "-1"
+		if int(cs) != PrusaGcodeBackend._checksum(payload):
+			self.replies += [b"Error:checksum mismatch\n", f"Resend: {self.expected}\n".encode(), b"ok\n"]
+		elif number != self.expected:
+			self.replies += [b"Error:Line Number is not Last Line Number+1\n", f"Resend: {self.expected}\n".encode(), b"ok\n"]
+		else:
+			self.executed.append(cmd)
+			self.expected += 1
+			self.replies.append(b"ok\n")
+		return len(data)
+
+	def flush(self):
+		pass
+
+	def readline(self):
+		if not self.replies:
+			return b""
+		reply = self.replies.pop(0)
+		if reply.startswith(b"ok"):
+			self.unread -= 1
+		return reply
+
+
+def _streaming_backend(fake):
+	b = PrusaGcodeBackend(port="/dev/null", auto_detect_port=False, stream_window=3)
+	b._connected = True
+	b._ser = fake
+	return b
+
+
+def test_numbered_line_uses_marlin_checksum():
+	assert PrusaGcodeBackend._numbered_line(1, "G28") == "N1 G28*18"
+	assert PrusaGcodeBackend._parse_resend("Resend: 7") == 7
+	assert PrusaGcodeBackend._parse_resend("rs N12") == 12
+	assert PrusaGcodeBackend._parse_resend("ok") is None
+
+
+def test_stream_gcode_keeps_window_in_flight_and_preserves_order():
+	fake = FakeMarlin()
+	b = _streaming_backend(fake)
+	cmds = [f"G1 X{i} F600" for i in range(10)]
+
+	b.stream_gcode(cmds)
+
+	assert fake.executed == cmds
+	assert fake.max_unread == 3
+
+
+def test_stream_gcode_resends_after_checksum_error():
+	fake = FakeMarlin(corrupt_line=4)
+	b = _streaming_backend(fake)
+	cmds = [f"G1 Y{i} F600" for i in range(8)]
+
+	responses = b.stream_gcode(cmds)
+
+	assert fake.executed == cmds
+	assert any(line.startswith("Resend: 4") for line in responses)
+
+
+def test_stream_moves_checks_limits_before_sending():
+	fake = FakeMarlin()
+	b = _streaming_backend(fake)
+	b.x_limits = (0.0, 200.0)
+
+	with pytest.raises(ValueError):
+		b.stream_moves([{"x": 10.0}, {"x": 250.0}])
+	assert fake.executed == []
+
+	b.stream_moves([{"x": 10.0, "y": 1.0}, {"x": 20.0}], feedrate=1200)
+	assert fake.executed == ["G1 X10.0 Y1.0 F1200", "G1 X20.0 F1200"]
+	assert b.get_state()["position"]["x"] == 20.0
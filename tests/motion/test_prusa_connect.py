@@ -7,3 +7,56 @@ def test_prusa_connect_missing_port_raises():
     b = PrusaGcodeBackend(port="COM_DOES_NOT_EXIST_9999")
     with pytest.raises(Exception):
         b.connect()
+
+
+class EchoOkSerial:
+    def __init__(self, *args, **kwargs):
+        self.timeout = kwargs.get("timeout")
+        self.is_open = True
+        self.written = []
+        self.pending = []
+
+    def write(self, data):
+        self.written.append(data)
+        self.pending.append(b"X:1.00 Y:2.00 Z:3.00 E:0.00\n" if data.startswith(b"M114") else b"ok\n")
+        if data.startswith(b"M114"):
+            self.pending.append(b"ok\n")
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def readline(self):
+        return self.pending.pop(0) if self.pending else b""
+
+    def reset_input_buffer(self):
+        self.pending.clear()
+
+    def close(self):
+        self.is_open = False
+
+
+def test_prusa_connect_uses_the_shared_serial_session(monkeypatch):
+    from core.motion import prusa_gcode_backend
+    from core.system.mk4s_serial_session import MK4SSerialSession
+
+    opened = []
+
+    def opener(*args, **kwargs):
+        opened.append(EchoOkSerial(*args, **kwargs))
+        return opened[-1]
+
+    session = MK4SSerialSession("COM5", settle_seconds=0.0, opener=opener)
+    monkeypatch.setattr(prusa_gcode_backend, "get_serial_session", lambda *args, **kwargs: session)
+
+    b = PrusaGcodeBackend(port="COM5")
+    b.connect()
+    leases = session.lease_count
+    b.send_gcode("G1 X5")
+    b.disconnect()
+
+    assert len(opened) == 1
+    assert b"G90\n" in opened[0].written and b"M114\n" in opened[0].written
+    assert session.lease_count == leases + 1
+    assert session.is_open is True
+    assert b.get_state()["position"] == {"x": 1.0, "y": 2.0, "z": 3.0, "e": 0.0}
@@ -18,3 +18,13 @@ def test_default_acquisition_channels_include_safe_simulation():
     channels = available_default_channels()
 
     assert [channel.name for channel in channels] == ["simulated_surface"]
+
+
+def test_simulated_surface_channel_reads_many_samples_at_once():
+    channel = SimulatedSurfaceChannel()
+    points = [(50, 50), (48.5, 51.25), (60, 40)]
+
+    samples = channel.read_samples(points=points, z=20)
+
+    assert [sample.value for sample in samples] == [channel.read_sample(x=x, y=y, z=20).value for x, y in points]
+    assert [(sample.x, sample.y, sample.z) for sample in samples] == [(50.0, 50.0, 20.0), (48.5, 51.25, 20.0), (60.0, 40.0, 20.0)]
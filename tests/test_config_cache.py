@@ -0,0 +1,78 @@
+import os
+
+import pytest
+
+from core.system.config_cache import FileCache, invalidate_status_caches, ttl_cached
+
+
+def test_file_cache_reloads_only_when_the_file_changes(tmp_path):
+    path = tmp_path / "profile.json"
+    path.write_text("1", encoding="utf-8")
+    reads = []
+    cache = FileCache(lambda p: reads.append(p) or p.read_text(encoding="utf-8"))
+
+    assert cache.get(path) == cache.get(path) == "1"
+    path.write_text("22", encoding="utf-8")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert cache.get(path) == "22"
+    assert len(reads) == 2
+    cache.invalidate(path)
+    cache.get(path)
+    assert len(reads) == 3
+
+
+def test_file_cache_does_not_keep_failed_loads(tmp_path):
+    path = tmp_path / "broken.json"
+    path.write_text("{", encoding="utf-8")
+    calls = []
+
+    def loader(p):
+        calls.append(p)
+        raise ValueError("invalid")
+
+    cache = FileCache(loader)
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            cache.get(path)
+    assert len(calls) == 2
+
+
+def test_ttl_cached_status_is_reused_until_invalidated():
+    calls = []
+
+    @ttl_cached(60.0)
+    def status():
+        calls.append(1)
+        return {"calls": len(calls)}
+
+    assert status() is status()
+    status.invalidate()
+    assert status()["calls"] == 2
+    invalidate_status_caches()
+    assert status()["calls"] == 3
+
+
+def test_apply_mode_invalidates_cached_hardware_status(monkeypatch):
+    from core.web import hardware_status_adapter
+    from core.web.system_control import system_apply_mode
+
+    calls = []
+    monkeypatch.setattr(
+        hardware_status_adapter,
+        "hardware_information_status",
+        lambda: calls.append(1) or {"command_plan": [], "execution_allowed": False, "gcode_sent": False},
+    )
+    hardware_status_adapter.cached_hardware_information.invalidate()
+    try:
+        hardware_status_adapter.cached_hardware_information()
+        hardware_status_adapter.cached_hardware_information()
+        assert system_apply_mode("dry_run")["ok"] is True
+        status, plan_valid = hardware_status_adapter.cached_hardware_information()
+    finally:
+        system_apply_mode("hardware_readonly")
+        hardware_status_adapter.cached_hardware_information.invalidate()
+
+    assert len(calls) == 2
+    assert plan_valid is True
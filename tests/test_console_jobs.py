@@ -0,0 +1,184 @@
+import json
+import threading
+import time
+
+import pytest
+
+from core.web.console_jobs import CONSOLE_JOBS, ConsoleJobManager, cancel_job_payload, job_payload
+
+
+def wait_done(job, timeout=5.0):
+    assert job.done.wait(timeout), f"{job.action} did not finish"
+    return job
+
+
+def test_jobs_on_one_resource_run_in_submit_order():
+    manager = ConsoleJobManager()
+    order = []
+    release = threading.Event()
+
+    first = manager.submit("first", lambda: (release.wait(5), order.append("first")))
+    second = manager.submit("second", lambda: order.append("second"))
+    other = wait_done(manager.submit("other", lambda: order.append("other"), resource="camera"))
+
+    assert other.status == "complete"
+    assert second.status == "queued"
+    release.set()
+    wait_done(second)
+
+    assert order == ["other", "first", "second"]
+    assert [job.status for job in (first, second)] == ["complete", "complete"]
+    assert manager.active() == []
+
+
+def test_queued_job_is_cancelled_before_it_starts():
+    manager = ConsoleJobManager()
+    release = threading.Event()
+    ran = []
+
+    blocker = manager.submit("blocker", lambda: release.wait(5))
+    queued = manager.submit("queued", lambda: ran.append(True))
+    manager.cancel(queued.job_id)
+    release.set()
+    wait_done(blocker)
+
+    assert queued.status == "cancelled"
+    assert ran == []
+
+
+def test_running_job_cancel_hook_repeats_until_the_action_stops():
+    manager = ConsoleJobManager()
+    stop = threading.Event()
+    started = threading.Event()
+
+    def action():
+        started.set()
+        # Mimic an action that clears its stop flag when it starts.
+        time.sleep(0.05)
+        stop.clear()
+        assert stop.wait(5)
+        return {"ok": False, "status": "stopped", "message": "Stopped by operator.", "log_lines": []}
+
+    job = manager.submit("approach", action, cancel=stop.set)
+    assert started.wait(5)
+    manager.cancel(job.job_id)
+    wait_done(job)
+
+    assert job.status == "cancelled"
+    assert job.message == "Stopped by operator."
+
+
+def test_failed_payload_and_exception_mark_the_job_failed():
+    manager = ConsoleJobManager()
+
+    def boom():
+        raise RuntimeError("port busy")
+
+    reported = wait_done(manager.submit("health", lambda: {"ok": False, "status": "failed", "message": "bad"}))
+    raised = wait_done(manager.submit("retract", boom))
+    uninterruptible = manager.submit("standby", lambda: time.sleep(0.1))
+    time.sleep(0.02)
+    manager.cancel(uninterruptible.job_id)
+
+    assert (reported.status, reported.message) == ("failed", "bad")
+    assert raised.status == "failed" and "port busy" in raised.message
+    assert "cannot be interrupted" in uninterruptible.message
+    assert wait_done(uninterruptible).status == "complete"
+
+
+def test_job_payloads_report_one_job_or_the_list():
+    job = wait_done(CONSOLE_JOBS.submit("payload-check", lambda: {"ok": True, "status": "done"}, resource="test"))
+
+    single = job_payload(job.job_id)
+    listing = job_payload()
+
+    assert single["status"] == "complete" and single["result"] == {"ok": True, "status": "done"}
+    assert listing["jobs"][0]["job_id"] == job.job_id
+    assert "result" not in listing["jobs"][0]
+    assert cancel_job_payload(job.job_id)["status"] == "complete"
+    with pytest.raises(ValueError, match="Unknown job"):
+        job_payload("missing")
+
+
+def test_post_runs_hardware_route_as_job_and_get_waits_on_the_same_queue(monkeypatch):
+    from http.server import ThreadingHTTPServer
+    from urllib.error import HTTPError
+    from urllib.request import Request, urlopen
+
+    from core.web.operator_console_server import OperatorConsoleHandler
+
+    monkeypatch.delenv("SPM_WEB_ALLOW_Z_MOTION", raising=False)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), OperatorConsoleHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        with urlopen(Request(f"{base}/api/z/retract", method="POST"), timeout=5) as response:
+            code = response.status
+            accepted = json.loads(response.read())
+        deadline = time.monotonic() + 5
+        while True:
+            with urlopen(f"{base}/api/jobs?id={accepted['job_id']}", timeout=5) as response:
+                job = json.loads(response.read())
+            if job["status"] in ("complete", "failed", "cancelled") or time.monotonic() > deadline:
+                break
+            time.sleep(0.02)
+        with urlopen(f"{base}/api/z/retract", timeout=5) as response:
+            direct = json.loads(response.read())
+        with urlopen(f"{base}/api/jobs", timeout=5) as response:
+            listing = json.loads(response.read())
+        try:
+            urlopen(Request(f"{base}/index.html", method="POST"), timeout=5)
+        except HTTPError as error:
+            assert error.code == 405
+        else:
+            raise AssertionError("POST to a static file was accepted")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert code == 202 and accepted["status"] == "accepted"
+    assert job["status"] == "complete"
+    assert job["result"]["status"] == "confirmation_required"
+    assert direct["status"] == "confirmation_required"
+    retracts = [entry for entry in listing["jobs"] if entry["action"] == "/api/z/retract"]
+    assert len(retracts) >= 2 and retracts[0]["job_id"] != accepted["job_id"]
+
+
+def test_get_on_busy_hardware_route_answers_accepted_instead_of_waiting(monkeypatch):
+    from http.server import ThreadingHTTPServer
+    from urllib.request import urlopen
+
+    from core.web import operator_console_server
+    from core.web.operator_console_server import OperatorConsoleHandler
+
+    monkeypatch.delenv("SPM_WEB_ALLOW_Z_MOTION", raising=False)
+    monkeypatch.setattr(operator_console_server, "JOB_GET_WAIT_S", 0.2)
+    release = threading.Event()
+    scan = CONSOLE_JOBS.submit("long scan", lambda: release.wait(5), resource="mk4s")
+    server = ThreadingHTTPServer(("127.0.0.1", 0), OperatorConsoleHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        with urlopen(f"http://127.0.0.1:{server.server_address[1]}/api/z/retract", timeout=5) as response:
+            code = response.status
+            queued = json.loads(response.read())
+    finally:
+        release.set()
+        server.shutdown()
+        server.server_close()
+
+    assert code == 202 and queued["status"] == "accepted"
+    wait_done(scan)
+    assert wait_done(CONSOLE_JOBS.get(queued["job_id"])).result["status"] == "confirmation_required"
+
+
+def test_web_console_posts_long_hardware_actions_as_jobs():
+    from pathlib import Path
+
+    web_root = Path(__file__).resolve().parents[1] / "web" / "operator_console"
+    stream_js = (web_root / "live_stream.js").read_text(encoding="utf-8")
+    z_js = (web_root / "phase_2_2c4_safe_layout.js").read_text(encoding="utf-8")
+    system_js = (web_root / "main_system_upgrade.js").read_text(encoding="utf-8")
+
+    assert 'method: "POST"' in stream_js and "/api/jobs?id=" in stream_js
+    assert "await job(`${ROUTES.zAutoApproach}" in z_js
+    assert 'api("/api/system/safe-retract", { job: true })' in system_js
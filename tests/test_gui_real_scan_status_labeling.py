@@ -9,6 +9,16 @@ def test_real_hardware_scan_status_is_explicit_about_blocking_cli_and_preview_re
     assert "REAL MK4S motion running via blocking CLI" in text
     assert "preview updates after CSV/plot generation" in text
     assert "Measurement values: configured raster pipeline / simulated surface unless a real sensor backend is active" in text
-    assert "Live point-by-point hardware visualization: planned for the next integration phase" in text
+    assert "Live point-by-point hardware visualization: streaming" in text
     assert "Real scan complete: output CSV and raster preview were refreshed" in text
-    assert "Real scan failed: blocking CLI returned exit code" in text
+    assert "blocking CLI returned exit code" in text
+    assert "Real scan failed: {failure_detail}" in text
+
+
+def test_real_hardware_scan_runs_in_process_with_subprocess_fallback():
+    text = GUI.read_text(encoding="utf-8-sig", errors="replace")
+
+    assert "class HardwareScanWorker(QThread)" in text
+    assert "run_configured_raster(" in text
+    assert "SCAN_ENGINE_ENV" in text
+    assert "self.build_cli_command(profile, execute_hardware=True)" in text
@@ -0,0 +1,53 @@
+import json
+import time
+
+from core.web import hardware_dev_logger
+from core.web.hardware_dev_logger import HardwareDevLogger, flush_hardware_logs
+
+
+def _logger(tmp_path, monkeypatch, **kwargs):
+    monkeypatch.setattr(hardware_dev_logger, "hardware_log_dir", lambda: tmp_path)
+    return HardwareDevLogger("test_phase", session_id="SPM_TEST", **kwargs)
+
+
+def test_logger_appends_lines_and_records_with_same_schema(tmp_path, monkeypatch):
+    logger = _logger(tmp_path, monkeypatch, flush_interval_s=60.0)
+    logger.emit("INFO", "probe", port="COM5", note="two\nlines")
+
+    assert len(logger.text_path.read_text(encoding="utf-8").splitlines()) == 1
+    flush_hardware_logs()
+
+    text_lines = logger.text_path.read_text(encoding="utf-8").splitlines()
+    records = [json.loads(line) for line in logger.jsonl_path.read_text(encoding="utf-8").splitlines()]
+    assert text_lines == logger.summary_lines()
+    assert "note=two\\nlines" in text_lines[1]
+    assert records[1]["event"] == "probe"
+    assert set(records[1]) == {"timestamp", "level", "event", "session", "phase", "port", "note"}
+
+
+def test_failures_are_written_immediately(tmp_path, monkeypatch):
+    logger = _logger(tmp_path, monkeypatch, flush_interval_s=60.0)
+    logger.emit("FAIL", "serial_open", error="access denied")
+
+    assert "serial_open" in logger.text_path.read_text(encoding="utf-8")
+
+
+def test_background_writer_flushes_after_interval(tmp_path, monkeypatch):
+    logger = _logger(tmp_path, monkeypatch, flush_interval_s=0.01)
+    logger.emit("RAW", "rx", text="ok")
+
+    deadline = time.monotonic() + 2.0
+    while "rx" not in logger.text_path.read_text(encoding="utf-8") and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert "[rx]" in logger.text_path.read_text(encoding="utf-8")
+
+
+def test_in_memory_tail_is_bounded_but_file_keeps_everything(tmp_path, monkeypatch):
+    logger = _logger(tmp_path, monkeypatch, tail_lines=5)
+    for index in range(20):
+        logger.emit_raw("tx", f"M114 #{index}")
+    logger.close()
+
+    assert len(logger.summary_lines()) == 5
+    assert "M114 #19" in logger.summary_lines()[-1]
+    assert len(logger.jsonl_path.read_text(encoding="utf-8").splitlines()) == 21
@@ -1,6 +1,7 @@
 ﻿from core.system.hardware_initialized_profile import (
     get_motion_controller_settings,
     initialization_allows_only_readonly_checks,
+    hardware_motion_limits,
     load_hardware_initialized_profile,
 )
 
@@ -39,3 +40,21 @@ def test_rejects_conflicting_confirmed_z_calibration(tmp_path):
 
     with pytest.raises(ValueError, match="Unsafe Z calibration"):
         load_hardware_initialized_profile(path)
+
+
+def test_profile_is_cached_until_the_file_changes(tmp_path):
+    import json
+    import os
+
+    profile = json.loads(json.dumps(load_hardware_initialized_profile()))
+    path = tmp_path / "profile.json"
+    path.write_text(json.dumps(profile), encoding="utf-8")
+
+    assert load_hardware_initialized_profile(path) is load_hardware_initialized_profile(path)
+
+    profile["hardware_initialized_profile"]["motion_limits"]["x_max"] = 123.0
+    path.write_text(json.dumps(profile), encoding="utf-8")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert hardware_motion_limits(path)["x_max"] == 123.0
@@ -0,0 +1,91 @@
+import gzip
+import json
+import threading
+from http.server import ThreadingHTTPServer
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+from core.web.http_cache import (
+    CachedBody,
+    ResponseCache,
+    accepts_gzip,
+    etag_matches,
+    gzip_body,
+)
+
+
+def test_cached_body_has_a_tag_per_encoding():
+    body = json.dumps({"points": list(range(500))}).encode("utf-8")
+    cached = CachedBody.build(body, "application/json")
+
+    assert gzip.decompress(cached.gzip_body) == body
+    assert cached.etag != cached.gzip_etag
+    assert cached.representation(gzip_ok=False) == (body, cached.etag, "")
+    assert cached.representation(gzip_ok=True)[1:] == (cached.gzip_etag, "gzip")
+    assert CachedBody.build(body, "application/json").etag == cached.etag
+    assert gzip_body(b"{}", "application/json") is None
+    assert gzip_body(bytes(4096), "image/png") is None
+
+
+def test_request_header_parsing():
+    assert accepts_gzip("gzip, deflate, br")
+    assert accepts_gzip("br;q=1.0, gzip;q=0.8")
+    assert not accepts_gzip("gzip;q=0")
+    assert not accepts_gzip("identity")
+    assert etag_matches('W/"abc", "def"', '"abc"')
+    assert etag_matches("*", '"abc"')
+    assert not etag_matches('"abc"', "")
+
+
+def test_response_cache_ignores_query_order_and_evicts_by_size():
+    cache = ResponseCache(max_bytes=2500)
+    first = CachedBody.build(bytes(1000), "image/png")
+
+    assert ResponseCache.key("/api/scan/plan", "nx=5&ny=6") == ResponseCache.key("/api/scan/plan", "ny=6&nx=5")
+    assert ResponseCache.key("/a", "x=1&x=2") != ResponseCache.key("/a", "x=2&x=1")
+    cache.put("a", first)
+    cache.put("b", CachedBody.build(bytes(1000), "image/png"))
+    cache.get("a")
+    cache.put("c", CachedBody.build(bytes(1000), "image/png"))
+
+    assert cache.get("a") is first
+    assert cache.get("b") is None
+    assert len(cache) == 2
+
+
+def test_static_files_and_pure_routes_revalidate_with_etags():
+    from core.web.operator_console_server import OperatorConsoleHandler
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), OperatorConsoleHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+
+    def get(path, **headers):
+        try:
+            with urlopen(Request(f"{base}{path}", headers=headers), timeout=5) as response:
+                return response.status, response.headers, response.read()
+        except HTTPError as error:
+            return error.code, error.headers, error.read()
+
+    try:
+        results = {}
+        for path in ("/scan_raster.js", "/api/scan/plan?nx=7&ny=5"):
+            status, headers, body = get(path, **{"Accept-Encoding": "gzip"})
+            revalidated = get(path, **{"Accept-Encoding": "gzip", "If-None-Match": headers["ETag"]})
+            results[path] = (status, headers, body, revalidated)
+        plain = get("/api/scan/plan?ny=5&nx=7")
+        status_headers = get("/api/system/status")[1]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    for path, (status, headers, body, revalidated) in results.items():
+        assert status == 200 and headers["Content-Encoding"] == "gzip", path
+        assert headers["Cache-Control"] == "no-cache"
+        assert revalidated[0] == 304 and revalidated[2] == b""
+    plan_body = gzip.decompress(results["/api/scan/plan?nx=7&ny=5"][2])
+    assert plain[2] == plan_body
+    assert plain[1]["ETag"] != results["/api/scan/plan?nx=7&ny=5"][1]["ETag"]
+    assert "Content-Encoding" not in plain[1]
+    assert status_headers["Cache-Control"] == "no-store"
+    assert "ETag" not in status_headers
@@ -0,0 +1,119 @@
+import json
+import time
+
+import pytest
+
+from core.web.live_stream import (
+    LIVE_EVENTS,
+    LiveEvent,
+    LiveEventBroker,
+    LiveSubscriber,
+    live_scan_running,
+    publish_api_result,
+    start_live_scan,
+    stop_live_scan,
+)
+from core.web.spm_scan_simulation import WebScanProfile, build_scan_line
+
+
+def drain(subscriber, timeout=0.05):
+    events = []
+    while True:
+        event, _ = subscriber.next_event(timeout=timeout)
+        if event is None:
+            return events
+        events.append(event)
+
+
+def wait_for_scan_end(timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while live_scan_running():
+        assert time.monotonic() < deadline, "streamed scan did not finish"
+        time.sleep(0.01)
+
+
+def test_live_event_encodes_as_sse_frame():
+    frame = LiveEvent(7, "z_sample", {"z": 1.25}).encode(dropped=3).decode("utf-8")
+
+    assert frame.startswith("id: 7\nevent: z_sample\ndata: ")
+    assert frame.endswith("\n\n")
+    assert json.loads(frame.split("data: ", 1)[1]) == {"z": 1.25, "dropped": 3}
+
+
+def test_slow_subscriber_drops_oldest_events_and_reports_count():
+    subscriber = LiveSubscriber(maxsize=3)
+    for index in range(5):
+        subscriber.offer(LiveEvent(index, "log", {"index": index}))
+
+    event, dropped = subscriber.next_event(timeout=0)
+    assert (event.event_id, dropped) == (2, 2)
+    assert [event.event_id for event in drain(subscriber)] == [3, 4]
+    assert subscriber.next_event(timeout=0) == (None, 0)
+
+
+def test_broker_fans_out_and_replays_latest_status_to_new_clients():
+    broker = LiveEventBroker(maxsize=8)
+    first = broker.subscribe()
+    broker.publish("status", {"status": "old"})
+    broker.publish("log", {"lines": ["a"]})
+    broker.publish("status", {"status": "ready"})
+
+    late = broker.subscribe()
+    assert [event.data for event in drain(late)] == [{"status": "ready"}]
+    assert [event.event for event in drain(first)] == ["status", "log", "status"]
+
+    broker.unsubscribe(first)
+    broker.publish("log", {"lines": ["b"]})
+    assert first.closed and drain(first) == []
+    assert broker.subscriber_count == 1
+    with pytest.raises(ValueError, match="Unknown live event type"):
+        broker.publish("telemetry", {})
+
+
+def test_publish_api_result_reports_status_and_z_readback():
+    subscriber = LIVE_EVENTS.subscribe()
+    try:
+        drain(subscriber)
+        publish_api_result("/api/z/read", {"ok": True, "status": "read", "current": {"z": 4.2}})
+        events = drain(subscriber)
+    finally:
+        LIVE_EVENTS.unsubscribe(subscriber)
+
+    assert [event.event for event in events] == ["status", "z_sample"]
+    assert events[0].data["route"] == "/api/z/read"
+    assert events[1].data["z"] == 4.2
+
+
+def test_streamed_simulation_scan_publishes_every_line_then_completes():
+    profile = WebScanProfile(x_points=6, y_points=4, surface="terrace")
+    subscriber = LIVE_EVENTS.subscribe()
+    try:
+        drain(subscriber)
+        started = start_live_scan(profile, start_line=1)
+        wait_for_scan_end()
+        events = [event for event in drain(subscriber) if event.data.get("run_id") == started["run_id"]]
+    finally:
+        LIVE_EVENTS.unsubscribe(subscriber)
+
+    assert started["ok"] is True
+    lines = [event.data for event in events if event.event == "scan_line"]
+    assert [line["line_index"] for line in lines] == [1, 2, 3]
+    assert lines[0]["points"] == build_scan_line(profile, 1)["points"]
+    assert [event.data["status"] for event in events if event.event == "status"] == ["running", "complete"]
+
+
+def test_streamed_scan_stops_and_allows_one_run_at_a_time(monkeypatch):
+    monkeypatch.delenv("SPM_WEB_ALLOW_REAL_SCAN", raising=False)
+    profile = WebScanProfile(x_points=4, y_points=50)
+
+    started = start_live_scan(profile, line_interval_s=0.05)
+    try:
+        assert start_live_scan(profile)["status"] == "busy"
+    finally:
+        stop_live_scan()
+    wait_for_scan_end()
+
+    assert started["status"] == "started"
+    assert start_live_scan(profile, source="real")["status"] == "motion_locked"
+    with pytest.raises(ValueError, match="source"):
+        start_live_scan(profile, source="camera")
@@ -0,0 +1,191 @@
+import threading
+
+import pytest
+
+from core.system import mk4s_serial_session
+from core.system.mk4s_serial_session import MK4SSerialSession, SerialSessionBusy
+
+
+class FakeSerial:
+    def __init__(self, port, baudrate, *, timeout, write_timeout):
+        self.port = port
+        self.baudrate = baudrate
+        self.timeout = timeout
+        self.write_timeout = write_timeout
+        self.is_open = True
+        self.written: list[bytes] = []
+        self.pending: list[bytes] = []
+        self.resets = 0
+
+    def write(self, data):
+        self.written.append(data)
+        self.pending.append(b"ok\n")
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def readline(self):
+        return self.pending.pop(0) if self.pending else b""
+
+    def reset_input_buffer(self):
+        self.resets += 1
+        self.pending.clear()
+
+    def close(self):
+        self.is_open = False
+
+
+def _session(opened):
+    def opener(*args, **kwargs):
+        ser = FakeSerial(*args, **kwargs)
+        opened.append(ser)
+        return ser
+
+    return MK4SSerialSession("COM5", settle_seconds=0.0, opener=opener)
+
+
+def test_session_opens_port_once_across_leases():
+    opened = []
+    session = _session(opened)
+
+    with session.lease() as ser:
+        assert ser.fresh is True
+        ser.write(b"M114\n")
+        assert ser.readline() == b"ok\n"
+    with session.lease() as ser:
+        assert ser.fresh is False
+        ser.write(b"M119\n")
+
+    assert len(opened) == 1
+    assert opened[0].written == [b"M114\n", b"M119\n"]
+    # The fresh open keeps its buffered startup banner; reuse drops stale input.
+    assert opened[0].resets == 1
+    assert session.describe()["lease_count"] == 2
+
+
+def test_lease_timeout_override_is_restored():
+    opened = []
+    session = _session(opened)
+
+    with session.lease(timeout=2.0):
+        assert opened[0].timeout == 2.0
+    assert opened[0].timeout == mk4s_serial_session.DEFAULT_READ_TIMEOUT_S
+
+
+def test_port_failure_closes_session_for_reopen():
+    opened = []
+    session = _session(opened)
+
+    with pytest.raises(OSError):
+        with session.lease():
+            raise OSError("device disconnected")
+    assert session.is_open is False
+
+    with session.lease() as ser:
+        assert ser.fresh is True
+    assert len(opened) == 2
+
+
+def test_leases_are_serialized_between_threads():
+    opened = []
+    session = _session(opened)
+    inside = []
+    overlap = []
+
+    def worker():
+        for _ in range(50):
+            with session.lease():
+                if inside:
+                    overlap.append(True)
+                inside.append(True)
+                inside.pop()
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert overlap == []
+    assert len(opened) == 1
+
+
+def test_busy_session_raises_instead_of_blocking():
+    opened = []
+    session = _session(opened)
+    holding = threading.Event()
+    release = threading.Event()
+
+    def long_action():
+        with session.lease():
+            holding.set()
+            release.wait(5)
+
+    thread = threading.Thread(target=long_action)
+    thread.start()
+    try:
+        assert holding.wait(5)
+        with pytest.raises(SerialSessionBusy, match="busy"):
+            with session.lease(wait=0.05):
+                pass
+    finally:
+        release.set()
+        thread.join()
+
+    assert session.is_open is True
+    with session.lease(wait=0.05) as ser:
+        assert ser.fresh is False
+
+
+def test_registry_returns_shared_session_per_port():
+    mk4s_serial_session.close_serial_sessions()
+    first = mk4s_serial_session.get_serial_session("com5")
+    second = mk4s_serial_session.get_serial_session("COM5")
+
+    assert first is second
+    assert [item["port"] for item in mk4s_serial_session.serial_sessions_status()] == ["com5"]
+    mk4s_serial_session.close_serial_sessions()
+    assert mk4s_serial_session.serial_sessions_status() == []
+
+
+def test_fresh_lease_keeps_startup_banner():
+    def opener(*args, **kwargs):
+        ser = FakeSerial(*args, **kwargs)
+        ser.pending.append(b"start\n")
+        return ser
+
+    session = MK4SSerialSession("COM5", settle_seconds=0.0, opener=opener)
+
+    with session.lease() as ser:
+        assert ser.fresh is True
+        assert ser.readline() == b"start\n"
+
+
+def test_close_while_leased_reports_busy_and_keeps_the_session(monkeypatch):
+    opened = []
+    session = _session(opened)
+    monkeypatch.setitem(mk4s_serial_session._SESSIONS, "COM5", session)
+    holding = threading.Event()
+    release = threading.Event()
+
+    def long_action():
+        with session.lease():
+            holding.set()
+            release.wait(5)
+
+    thread = threading.Thread(target=long_action)
+    thread.start()
+    try:
+        assert holding.wait(5)
+        with pytest.raises(SerialSessionBusy, match="not closed"):
+            mk4s_serial_session.close_serial_sessions(wait=0.05)
+        assert session.is_open is True
+        assert mk4s_serial_session._SESSIONS.get("COM5") is session
+    finally:
+        release.set()
+        thread.join()
+
+    mk4s_serial_session.close_serial_sessions(wait=0.05)
+    assert opened[0].is_open is False
+    assert "COM5" not in mk4s_serial_session._SESSIONS
@@ -83,11 +83,20 @@ def test_operator_workstation_has_phase_2_1_and_2_2_panels():
 def test_operator_workstation_live_z_trace_reacts_to_each_point():
     assert "class ZTraceWidget(QWidget)" in APP_SOURCE
     assert "def add_sample" in APP_SOURCE
+    assert "self.history = ZTraceBuffer(capacity)" in APP_SOURCE
+    assert "painter.drawPolyline" in APP_SOURCE
     assert "pyqtSignal(dict)" in APP_SOURCE
     assert "on_sample=lambda sample: self.sample.emit(dict(sample))" in APP_SOURCE
     assert "[Z POINT]" in APP_SOURCE
 
 
+def test_operator_workstation_coalesces_live_updates_into_frames():
+    assert "self.refresh_scheduler = RefreshScheduler(self)" in APP_SOURCE
+    assert "self.scheduler.request_update(self)" in APP_SOURCE
+    assert "def queue_log" in APP_SOURCE
+    assert "self.refresh_scheduler.flush()" in APP_SOURCE
+
+
 def test_operator_workstation_has_adjustable_z_scale_modes():
     assert "Full" in APP_SOURCE
     assert "Auto" in APP_SOURCE
@@ -58,3 +58,59 @@ def test_plot_cli_uses_safe_5x5_defaults(monkeypatch):
         "output_file": "data/safe_raster_5x5_output.png",
         "color_map": "viridis",
     }
+
+
+def _write_raster(path, rows):
+    lines = ["scan_direction,actual_x,actual_y,simulated_z_signal"]
+    lines.extend(",".join(str(value) for value in row) for row in rows)
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def test_raster_grid_snaps_jittered_coordinates_and_splits_directions(tmp_path):
+    from tools.plot_safe_raster import load_raster_grid
+
+    path = tmp_path / "raster.csv"
+    _write_raster(
+        path,
+        [
+            ("forward", 10.0, 5.0, 1.0),
+            ("forward", 20.0, 5.0, 2.0),
+            ("backward", 20.0004, 6.0, 3.0),
+            ("backward", 9.9998, 6.0002, 4.0),
+        ],
+    )
+
+    grid = load_raster_grid(str(path))
+
+    assert grid.x_values.tolist() == [9.9998, 20.0]
+    assert grid.y_values.tolist() == [5.0, 6.0]
+    assert grid.height_map.tolist() == [[1.0, 2.0], [4.0, 3.0]]
+    assert grid.direction_counts == {"backward": 2, "forward": 2}
+    assert grid.forward_image[0].tolist() == [1.0, 2.0]
+    assert all(value != value for value in grid.forward_image[1])
+    assert grid.backward_image[1].tolist() == [4.0, 3.0]
+
+
+def test_raster_grid_is_cached_until_file_changes(tmp_path):
+    from tools.plot_safe_raster import load_raster_csv, load_raster_grid
+
+    path = tmp_path / "raster.csv"
+    _write_raster(path, [("forward", 0.0, 0.0, 1.0), ("forward", 1.0, 0.0, 2.0)])
+
+    first = load_raster_grid(str(path))
+    assert load_raster_grid(str(path)) is first
+
+    _write_raster(path, [("forward", 0.0, 0.0, 1.0), ("forward", 1.0, 0.0, 5.0), ("forward", 2.0, 0.0, 6.0)])
+    assert load_raster_csv(str(path)) == ([0.0, 1.0, 2.0], [0.0], [[1.0, 5.0, 6.0]])
+
+
+def test_raster_grid_reports_missing_points(tmp_path):
+    import pytest
+
+    from tools.plot_safe_raster import load_raster_grid
+
+    path = tmp_path / "raster.csv"
+    _write_raster(path, [("forward", 0.0, 0.0, 1.0), ("forward", 1.0, 0.0, 2.0), ("forward", 0.0, 1.0, 3.0)])
+
+    with pytest.raises(ValueError, match="Missing raster point"):
+        load_raster_grid(str(path))
@@ -0,0 +1,56 @@
+import numpy as np
+
+from core.application.plot_service import PlotService, height_map_digest
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def _grid():
+    x_values = np.array([0.0, 1.0, 2.0])
+    y_values = np.array([0.0, 1.0])
+    height_map = np.array([[0.0, 0.5, 1.0], [1.5, 2.0, 2.5]])
+    return height_map, x_values, y_values
+
+
+def test_render_caches_by_data_and_colour_map(tmp_path):
+    service = PlotService()
+    height_map, x_values, y_values = _grid()
+    output = tmp_path / "plot.png"
+
+    first = service.render(height_map, x_values, y_values, "viridis", output)
+    again = service.render(height_map.copy(), x_values, y_values, "viridis")
+    plasma = service.render(height_map, x_values, y_values, "plasma")
+    back = service.render(height_map, x_values, y_values, "viridis")
+    service.shutdown()
+
+    assert first["png"].startswith(PNG_SIGNATURE)
+    assert output.read_bytes() == first["png"]
+    assert not first["cached"] and again["cached"] and back["cached"]
+    assert not plasma["cached"] and plasma["png"] != first["png"]
+    assert service.render_count == 2
+
+
+def test_digest_tracks_values_and_axes():
+    height_map, x_values, y_values = _grid()
+    changed = height_map.copy()
+    changed[0, 0] = 0.25
+
+    assert height_map_digest(height_map, x_values, y_values) == height_map_digest(height_map.copy(), x_values, y_values)
+    assert height_map_digest(changed, x_values, y_values) != height_map_digest(height_map, x_values, y_values)
+    assert height_map_digest(height_map, x_values + 1, y_values) != height_map_digest(height_map, x_values, y_values)
+
+
+def test_submit_renders_csv_in_background(tmp_path):
+    csv_path = tmp_path / "scan.csv"
+    csv_path.write_text(
+        "actual_x,actual_y,simulated_z_signal\n0,0,1\n1,0,2\n0,1,3\n1,1,4\n",
+        encoding="utf-8",
+    )
+    service = PlotService(cache_size=1)
+    service.warm_up().result(timeout=30)
+
+    result = service.submit(str(csv_path), tmp_path / "scan.png", "magma").result(timeout=30)
+    service.shutdown()
+
+    assert result["input_file"] == str(csv_path)
+    assert (tmp_path / "scan.png").read_bytes().startswith(PNG_SIGNATURE)
@@ -0,0 +1,120 @@
+import csv
+
+from core.acquisition import raster_engine
+from core.acquisition.raster_engine import run_configured_raster
+from core.education.config_loader import load_config
+from core.education.scan_profile import ScanProfile
+
+
+def _profile(**overrides):
+    values = dict(
+        x_min=48, x_max=52, y_min=48, y_max=52, z=20, x_resolution=3, y_resolution=2,
+        feedrate_xy=300, feedrate_z=6, mode="SIMULATED_SURFACE",
+    )
+    values.update(overrides)
+    return ScanProfile(**values)
+
+
+class FakeMotion:
+    def __init__(self):
+        self.moves = []
+        self.connected = False
+        self.position = {"x": 0.0, "y": 0.0, "z": 0.0}
+
+    def connect(self):
+        self.connected = True
+
+    def disconnect(self):
+        self.connected = False
+
+    def move_to(self, *, x=None, y=None, z=None, feedrate=None):
+        self.moves.append((x, y, z))
+        for axis, value in (("x", x), ("y", y), ("z", z)):
+            if value is not None:
+                self.position[axis] = float(value)
+
+    def get_state(self):
+        return {"connected": self.connected, "position": dict(self.position)}
+
+
+class FakeZDriver:
+    def __init__(self):
+        self.position = 0.0
+        self.closed = False
+
+    def move_to(self, value):
+        self.position = value
+
+    def get_position(self):
+        return self.position
+
+    def close(self):
+        self.closed = True
+
+
+def test_hardware_raster_streams_points_and_writes_outputs(tmp_path):
+    output = tmp_path / "scan.csv"
+    motion, z_driver = FakeMotion(), FakeZDriver()
+    points, logs = [], []
+
+    result = run_configured_raster(
+        _profile(), str(output), dry_run=False, config=load_config(),
+        on_point=points.append, on_log=logs.append, dwell_s=0.0, motion=motion, z_driver=z_driver,
+    )
+
+    # 2 Y lines x 2 directions x 3 points, then 3 X columns x 2 directions x 2 points.
+    assert result["ok"] and result["status"] == "complete"
+    assert result["point_count"] == len(points) == 24
+    assert [point["point_index"] for point in points] == list(range(24))
+    assert {point["point_count"] for point in points} == {24}
+    assert [point["line_index"] for point in points[:7]] == [0, 0, 0, 1, 1, 1, 2]
+    assert points[-1]["line_index"] == 9
+    assert motion.moves[0] == (None, None, 20)
+    assert not motion.connected and z_driver.closed
+    with output.open(newline="", encoding="utf-8") as handle:
+        rows = list(csv.DictReader(handle))
+    assert len(rows) == 24 and "line_index" not in rows[0]
+    assert output.with_suffix(".metadata.json").exists()
+    assert output.with_suffix(".spmscan").exists()
+    assert "Validation: PASS" in logs and result["log_lines"] == logs
+
+
+def test_stop_request_ends_scan_and_keeps_partial_rows(tmp_path):
+    output = tmp_path / "scan.csv"
+
+    def stop_after_five(point):
+        if point["point_index"] == 4:
+            raster_engine.request_raster_stop()
+
+    result = run_configured_raster(
+        _profile(), str(output), dry_run=False, config=load_config(),
+        on_point=stop_after_five, dwell_s=0.0, motion=FakeMotion(), z_driver=FakeZDriver(),
+    )
+    raster_engine.clear_raster_stop()
+
+    assert not result["ok"] and result["status"] == "stopped"
+    assert result["point_count"] == 5
+    assert output.read_text(encoding="utf-8").count("\n") == 6
+
+
+def test_invalid_profile_never_connects(tmp_path):
+    motion = FakeMotion()
+    moves = []
+    motion.connect = lambda: moves.append("connect")
+
+    result = run_configured_raster(
+        _profile(x_max=400), str(tmp_path / "scan.csv"), dry_run=False, config=load_config(),
+        motion=motion, z_driver=FakeZDriver(),
+    )
+
+    assert not result["ok"] and result["status"] == "invalid"
+    assert moves == []
+
+
+def test_dry_run_streams_synthetic_points(tmp_path):
+    points = []
+
+    result = run_configured_raster(_profile(), str(tmp_path / "dry.csv"), dry_run=True, config=load_config(), on_point=points.append)
+
+    assert result["ok"] and result["point_count"] == len(points) == 24
+    assert "Dry run only. No hardware movement." in result["log_lines"]
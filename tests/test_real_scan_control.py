@@ -2,11 +2,21 @@ from core.web.real_scan_control import (
     clear_real_scan_pause,
     FoilTapConfig,
     RealScanPoint,
+    _firmware_probe_contact,
+    _interpolate_line_samples,
     _m119_contact_detected,
+    _adaptive_tap_z_values,
+    _parse_count_xyz,
+    _predict_contact_z,
+    _restart_search_if_touching,
+    _stepped_tap_search,
+    _tap_lift_z,
+    _sweep_line,
     _tap_z_values,
     real_scan_paused,
     real_scan_plan,
     request_real_scan_pause,
+    validate_foil_tap_config,
     validate_real_scan_profile,
 )
 from pathlib import Path
@@ -93,7 +103,363 @@ def test_m119_contact_parser_detects_triggered_z_min():
 def test_foil_tap_backend_full_retracts_and_explains_no_contact():
     source = Path("core/web/real_scan_control.py").read_text(encoding="utf-8")
 
-    assert "retract_z = config.full_retract_z_mm" in source
+    assert "return config.full_retract_z_mm" in source
     assert "configured Z search lower limit" in source
     assert "Lower the Z setpoint/search limit below the expected surface height" in source
     assert "FOIL TAP: scanner pre-positioned to XY minimum before first approach." in source
+
+
+def test_real_scan_plan_reports_motion_mode():
+    profile = WebScanProfile(x_min=75, x_max=175, y_min=55, y_max=155, x_points=10, y_points=2, z_setpoint=100)
+
+    assert real_scan_plan(profile)["motion_mode"] == "point"
+    assert real_scan_plan(profile, "line")["motion_mode"] == "line"
+
+
+def test_count_parser_uses_physical_stepper_counts():
+    lines = ["X:120.00 Y:100.00 Z:100.00 E:0.00 Count X:11050 Y:10000 Z:40000", "ok"]
+
+    assert _parse_count_xyz(lines) == {"x": 110.5, "y": 100.0, "z": 100.0}
+    assert _parse_count_xyz(["X:1 Y:2 Z:3", "ok"]) is None
+
+
+def test_line_samples_interpolate_onto_raster_grid():
+    samples = [
+        {"x": 100.0, "y": 50.0, "z": 10.0, "t": 0.0},
+        {"x": 104.0, "y": 50.0, "z": 12.0, "t": 0.4},
+        {"x": 110.0, "y": 50.0, "z": 12.0, "t": 1.0},
+    ]
+    coordinates = [(110.0, 50.0), (105.0, 50.0), (102.0, 50.0), (99.0, 50.0)]
+
+    points = _interpolate_line_samples(samples, coordinates, "x")
+
+    assert [p["x"] for p in points] == [110.0, 105.0, 102.0, 99.0]
+    assert [round(p["z"], 6) for p in points] == [12.0, 12.0, 11.0, 10.0]
+
+
+class SweepSerial:
+    """Fake MK4S that advances X by 2 mm per M114 poll after a sweep starts."""
+
+    def __init__(self):
+        self.x = 100.0
+        self.target = 100.0
+        self.replies = []
+        self.commands = []
+
+    def write(self, data):
+        command = data.decode("ascii").strip()
+        self.commands.append(command)
+        if command.startswith("G1 "):
+            self.target = float(command.split()[1][1:])
+        if command == "M400":
+            self.x = self.target
+        if command == "M114":
+            if self.x < self.target:
+                self.x = min(self.target, self.x + 2.0)
+            elif self.x > self.target:
+                self.x = max(self.target, self.x - 2.0)
+            count_x = int(round(self.x * 100))
+            self.replies.append(f"X:{self.target:.2f} Y:50.00 Z:100.00 E:0.00 Count X:{count_x} Y:5000 Z:40000")
+        self.replies.append("ok")
+
+    def flush(self):
+        pass
+
+    def readline(self):
+        return (self.replies.pop(0) + "\n").encode() if self.replies else b""
+
+
+def test_sweep_line_issues_single_move_and_samples_counts():
+    ser = SweepSerial()
+    log = []
+    coordinates = [(100.0 + 2.5 * i, 50.0) for i in range(5)]
+
+    samples = _sweep_line(ser, coordinates, feedrate=600, sample_interval_s=0.0, log_lines=log)
+
+    sweeps = [c for c in ser.commands if c.startswith("G1 X110.000")]
+    assert sweeps == ["G1 X110.000 Y50.000 F600"]
+    assert samples[-1]["x"] == 110.0
+    assert len(samples) >= 5
+    assert any(line.startswith("LINE SWEEP:") for line in log)
+
+
+class ProbeSerial:
+    """Fake MK4S answering G38.2 either as unknown or by stopping at a trigger Z."""
+
+    def __init__(self, supports_g38, trigger_z=None, moves=True, reply=None):
+        self.supports_g38 = supports_g38
+        self.trigger_z = trigger_z
+        self.moves = moves
+        self.reply = reply
+        self.z = 20.0
+        self.replies = []
+        self.commands = []
+
+    def write(self, data):
+        command = data.decode("ascii").strip()
+        self.commands.append(command)
+        if command.startswith("G38.2"):
+            if not self.supports_g38:
+                self.replies.append('echo:Unknown command: "G38.2 Z0.000 F120"')
+            elif self.reply is not None:
+                self.replies.append(self.reply)
+                self.z = 12.5
+            elif self.moves:
+                floor = float(command.split()[1][1:])
+                self.z = self.trigger_z if self.trigger_z is not None else floor
+        if command.startswith("G1 Z"):
+            self.z = float(command.split()[1][1:])
+        if command == "M119":
+            state = "TRIGGERED" if self.trigger_z is not None and self.z == self.trigger_z else "open"
+            self.replies.append(f"z_min: {state}")
+        if command == "M114":
+            self.replies.append(f"X:10.00 Y:20.00 Z:{self.z:.2f} E:0.00 Count X:1000 Y:2000 Z:{int(self.z * 400)}")
+        self.replies.append("ok")
+
+    def flush(self):
+        pass
+
+    def readline(self):
+        return (self.replies.pop(0) + "\n").encode() if self.replies else b""
+
+
+def test_firmware_probe_reads_trigger_z_in_one_move():
+    ser = ProbeSerial(supports_g38=True, trigger_z=4.25)
+    log = []
+    config = FoilTapConfig(contact_engine="firmware_probe")
+
+    status, xyz = _firmware_probe_contact(ser, config, feedrate=120, log_lines=log)
+
+    assert status == "contact"
+    assert xyz["z"] == 4.25
+    assert [c for c in ser.commands if c.startswith("G")] == ["G38.2 Z0.000 F120"]
+
+
+def test_firmware_probe_reports_no_contact_at_search_floor():
+    ser = ProbeSerial(supports_g38=True)
+    status, xyz = _firmware_probe_contact(ser, FoilTapConfig(), feedrate=120, log_lines=[])
+
+    assert status == "no_contact"
+    assert xyz["z"] == 0.0
+
+
+def test_firmware_probe_rejection_requests_stepped_fallback():
+    ser = ProbeSerial(supports_g38=False)
+    status, xyz = _firmware_probe_contact(ser, FoilTapConfig(), feedrate=120, log_lines=[])
+
+    assert status == "unsupported"
+    assert xyz is None
+    assert ser.commands == ["G38.2 Z0.000 F120"]
+
+
+def test_firmware_probe_that_does_not_move_is_not_contact():
+    ser = ProbeSerial(supports_g38=True, moves=False)
+    log = []
+
+    status, xyz = _firmware_probe_contact(ser, FoilTapConfig(), feedrate=120, log_lines=log)
+
+    assert status == "unsupported"
+    assert xyz is None
+    assert any("without a trigger" in line for line in log)
+
+
+def test_firmware_probe_trusts_its_own_probe_result():
+    triggered = ProbeSerial(supports_g38=True, reply="[PRB:10.000,20.000,12.500:1]")
+    failed = ProbeSerial(supports_g38=True, reply="Error:Probing Failed")
+
+    assert _firmware_probe_contact(triggered, FoilTapConfig(), feedrate=120, log_lines=[])[0] == "contact"
+    assert _firmware_probe_contact(failed, FoilTapConfig(), feedrate=120, log_lines=[])[0] == "no_contact"
+
+
+def test_firmware_probe_backs_off_and_touches_again_slowly():
+    ser = ProbeSerial(supports_g38=True, trigger_z=4.25)
+
+    status, xyz = _firmware_probe_contact(ser, FoilTapConfig(), feedrate=120, feedrate_fine=30, log_lines=[])
+
+    assert (status, xyz["z"]) == ("contact", 4.25)
+    assert [c for c in ser.commands if c.startswith("G")] == ["G38.2 Z0.000 F120", "G1 Z5.250 F120", "G38.2 Z0.000 F30"]
+
+
+def test_contact_at_reduced_search_start_restarts_from_the_top():
+    config = FoilTapConfig(z_setpoint_mm=0.0, tapping_range_mm=20.0)
+    ser = ProbeSerial(supports_g38=True)
+    log = []
+
+    assert _restart_search_if_touching(ser, config, 7.5, contact=False, log_lines=log) == 7.5
+    assert _restart_search_if_touching(ser, config, 20.0, contact=True, log_lines=log) == 20.0
+    assert ser.commands == []
+    assert _restart_search_if_touching(ser, config, 7.5, contact=True, log_lines=log) == 20.0
+    assert ser.commands == ["G1 Z20.000 F300", "M400"]
+    assert any("re-searching the full tapping range" in line for line in log)
+
+
+def test_foil_tap_rejects_unknown_contact_engine():
+    try:
+        validate_foil_tap_config(FoilTapConfig(contact_engine="laser"))
+    except ValueError as exc:
+        assert "contact_engine" in str(exc)
+    else:
+        raise AssertionError("validate_foil_tap_config should reject unknown contact engines")
+
+
+def _tap_point(x, y, z, contact=True):
+    return {"x": x, "y": y, "measured_z": z, "contact_detected": 1.0 if contact else 0.0}
+
+
+def test_contact_prediction_uses_line_trend_and_previous_line():
+    assert _predict_contact_z([], [], 10.0, 20.0) is None
+
+    row = [_tap_point(10.0, 20.0, 5.0), _tap_point(11.0, 20.0, 5.2)]
+    assert abs(_predict_contact_z([], row, 12.0, 20.0) - 5.4) < 1e-9
+
+    previous = [_tap_point(12.0, 19.0, 5.0), _tap_point(40.0, 19.0, 9.0), _tap_point(12.1, 19.0, 1.0, contact=False)]
+    assert abs(_predict_contact_z([previous], row, 12.0, 20.0) - 5.2) < 1e-9
+    assert _predict_contact_z([], [_tap_point(11.0, 20.0, 5.0, contact=False)], 12.0, 20.0) is None
+
+
+def test_adaptive_window_starts_above_prediction_and_widens_on_miss():
+    config = FoilTapConfig(z_setpoint_mm=0.0, tapping_range_mm=20.0, adaptive_margin_mm=0.5)
+
+    start_z, values = _adaptive_tap_z_values(config, 8.0)
+
+    assert start_z == 8.5
+    assert values[:4] == [8.25, 8.0, 7.75, 7.5]
+    assert values[-1] == config.tap_min_z_mm
+    assert all(a > b for a, b in zip(values, values[1:]))
+    assert len(values) < len(_tap_z_values(config))
+    steps = [a - b for a, b in zip(values, values[1:])]
+    assert max(steps) <= config.tap_step_fast_mm + 1e-9
+
+
+def test_adaptive_window_is_clamped_to_tapping_range():
+    config = FoilTapConfig(z_setpoint_mm=2.0, tapping_range_mm=5.0)
+
+    assert _adaptive_tap_z_values(config, 30.0)[0] == config.tap_start_z_mm
+    assert _adaptive_tap_z_values(config, -4.0) == (config.tap_min_z_mm, [])
+
+
+class TapSerial:
+    """Fake MK4S whose Z-min switch triggers at or below ``surface_z``."""
+
+    def __init__(self, surface_z):
+        self.surface_z = surface_z
+        self.z = 20.0
+        self.replies = []
+
+    def write(self, data):
+        command = data.decode("ascii").strip()
+        if command.startswith("G1 Z"):
+            self.z = float(command.split()[1][1:])
+        if command == "M119":
+            self.replies.append(f"z_min: {'TRIGGERED' if self.z <= self.surface_z else 'open'}")
+        if command == "M114":
+            self.replies.append(f"X:10.00 Y:20.00 Z:{self.z:.2f} E:0.00 Count X:1000 Y:2000 Z:{int(self.z * 400)}")
+        self.replies.append("ok")
+
+    def flush(self):
+        pass
+
+    def readline(self):
+        return (self.replies.pop(0) + "\n").encode() if self.replies else b""
+
+
+def test_stepped_tap_search_stops_on_first_contact():
+    config = FoilTapConfig(z_setpoint_mm=0.0, tapping_range_mm=20.0)
+    start_z, values = _adaptive_tap_z_values(config, 6.0)
+    ser = TapSerial(surface_z=5.6)
+
+    status, xyz, taps = _stepped_tap_search(
+        ser, config, values, feedrate=120, feedrate_fine=30, fine_floor_z=5.25, xyz={"z": start_z}, log_lines=[]
+    )
+
+    assert status == "contact"
+    assert xyz["z"] == 5.5
+    assert taps == 5
+
+
+def test_partial_lift_hops_just_above_contact_inside_a_line():
+    config = FoilTapConfig(lift_mode="partial", retract_after_tap_mm=1.5)
+
+    assert _tap_lift_z(config, 6.0, contact_detected=True, line_end=False) == 7.5
+    assert _tap_lift_z(config, 6.0, contact_detected=True, line_end=True) == config.full_retract_z_mm
+    assert _tap_lift_z(config, 6.0, contact_detected=False, line_end=False) == config.full_retract_z_mm
+    assert _tap_lift_z(FoilTapConfig(), 6.0, contact_detected=True, line_end=False) == FoilTapConfig().full_retract_z_mm
+
+
+def test_partial_lift_falls_back_to_full_retract_outside_limits():
+    config = FoilTapConfig(lift_mode="partial", retract_after_tap_mm=50.0, full_retract_z_mm=40.0)
+
+    assert _tap_lift_z(config, 6.0, contact_detected=True, line_end=False) == 40.0
+
+
+def test_foil_tap_rejects_unknown_lift_mode():
+    try:
+        validate_foil_tap_config(FoilTapConfig(lift_mode="hover"))
+    except ValueError as exc:
+        assert "lift_mode" in str(exc)
+    else:
+        raise AssertionError("validate_foil_tap_config should reject unknown lift modes")
+
+
+def test_completed_journal_resumes_without_hardware(tmp_path):
+    from core.acquisition.scan_journal import ScanJournal
+    from core.web.real_scan_control import resume_real_scan
+    from dataclasses import asdict
+
+    path = tmp_path / "scan.journal.jsonl"
+    profile = WebScanProfile(x_points=2, y_points=1)
+    journal = ScanJournal(path)
+    journal.record_plan("constant_z", {"profile": asdict(profile), "config": None, "options": {"motion_mode": "point"}})
+    for point_index in range(2):
+        journal.record_point({"line_index": 0, "point_index": point_index, "x": 20.0, "y": 20.0, "measured_z": 0.1})
+    journal.record_end("complete")
+    journal.close()
+    replayed = []
+
+    result = resume_real_scan(path, on_point=replayed.append)
+
+    assert result["ok"] is True
+    assert len(result["lines"][0]) == 2
+    assert len(replayed) == 2
+
+
+def test_line_mode_resume_drops_partial_lines(tmp_path):
+    from core.acquisition.scan_journal import ScanJournal, load_scan_journal
+    from core.web.real_scan_control import _start_scan_journal
+
+    path = tmp_path / "scan.journal.jsonl"
+    profile = WebScanProfile(x_points=2, y_points=2)
+    journal = ScanJournal(path)
+    journal.record_plan("constant_z", {"profile": {}, "options": {}})
+    for line_index, point_index in ((0, 0), (0, 1), (1, 0)):
+        journal.record_point({"line_index": line_index, "point_index": point_index, "x": 0.0, "y": 0.0, "measured_z": 0.0})
+    journal.close()
+
+    reopened, resumed = _start_scan_journal(
+        "constant_z", None, load_scan_journal(path), profile=profile, options={}, whole_lines=True
+    )
+    reopened.close()
+
+    assert sorted(resumed) == [0]
+
+
+def test_line_mode_resume_counts_points_along_y_lines(tmp_path):
+    from core.acquisition.scan_journal import ScanJournal, load_scan_journal
+    from core.web.real_scan_control import _start_scan_journal
+
+    path = tmp_path / "scan.journal.jsonl"
+    # Y lines carry y_points points each, not x_points.
+    profile = WebScanProfile(x_points=2, y_points=3, scan_direction="Y+")
+    journal = ScanJournal(path)
+    journal.record_plan("constant_z", {"profile": {}, "options": {}})
+    for line_index, point_count in ((0, 3), (1, 2)):
+        for point_index in range(point_count):
+            journal.record_point({"line_index": line_index, "point_index": point_index, "x": 0.0, "y": 0.0, "measured_z": 0.0})
+    journal.close()
+
+    reopened, resumed = _start_scan_journal(
+        "constant_z", None, load_scan_journal(path), profile=profile, options={}, whole_lines=True
+    )
+    reopened.close()
+
+    assert sorted(resumed) == [0]
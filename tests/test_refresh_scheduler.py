@@ -0,0 +1,63 @@
+import time
+
+from PyQt5.QtCore import QCoreApplication
+
+from core.application.refresh_scheduler import RefreshScheduler
+
+
+APP = QCoreApplication.instance() or QCoreApplication([])
+
+
+class _Widget:
+    def __init__(self):
+        self.updates = 0
+
+    def update(self):
+        self.updates += 1
+
+
+def test_scheduler_runs_each_key_once_per_frame_with_latest_callback():
+    scheduler = RefreshScheduler()
+    calls = []
+    widget = _Widget()
+    for index in range(100):
+        scheduler.schedule("labels", lambda index=index: calls.append(index))
+        scheduler.request_update(widget)
+
+    scheduler.flush()
+
+    assert calls == [99]
+    assert widget.updates == 1
+    assert scheduler.frame_count == 1
+    scheduler.flush()
+    assert scheduler.frame_count == 1
+
+
+def test_scheduler_batches_log_lines_and_reports_dropped_lines():
+    scheduler = RefreshScheduler(max_pending_log_lines=3)
+    written = []
+    for index in range(5):
+        scheduler.post_log(written.append, f"line {index}")
+
+    scheduler.flush()
+
+    assert len(written) == 1
+    assert written[0].splitlines() == [
+        "... 2 log lines skipped to keep the display responsive",
+        "line 2",
+        "line 3",
+        "line 4",
+    ]
+
+
+def test_scheduler_caps_frame_rate():
+    scheduler = RefreshScheduler(fps=20.0)
+    frames = []
+    deadline = time.monotonic() + 2.0
+    while len(frames) < 3 and time.monotonic() < deadline:
+        scheduler.schedule("view", lambda: frames.append(time.monotonic()))
+        APP.processEvents()
+        time.sleep(0.001)
+
+    assert len(frames) == 3
+    assert min(later - earlier for earlier, later in zip(frames, frames[1:])) >= 0.04
@@ -0,0 +1,55 @@
+import pytest
+
+from core.web.route_table import RawResponse, Route, RouteQuery, RouteTable, query_argument
+
+
+def test_route_query_decodes_typed_values_with_fallback_names():
+    query = RouteQuery("setpoint_mm=0.25&step_mm=&confirmed=true&retract_after=1&serpentine=yes&count=3.0")
+
+    assert query.number("setpoint_distance_mm", "setpoint_mm") == 0.25
+    assert query.number("step_mm", default=0.1) == 0.1
+    assert query.integer("count") == 3
+    assert query.optional_integer("row_count") is None
+    assert query.confirmed("confirmed") is False
+    assert query.confirmed("retract_after") is True
+    assert query.boolean("serpentine") is True
+    assert query.text("direction", default="down") == "down"
+    with pytest.raises(ValueError, match="count must be a number"):
+        RouteQuery("count=three").integer("count")
+
+
+def test_route_table_maps_failures_to_status_codes():
+    def explode(**_kwargs):
+        raise RuntimeError("serial port busy")
+
+    def reject(query):
+        raise ValueError(f"bad {query.text('name')}")
+
+    table = RouteTable(
+        [
+            Route("/ok", lambda query: {"name": query.text("name")}, arguments=query_argument),
+            Route("/frame", lambda: RawResponse(b"\x00\x01", "application/octet-stream")),
+            Route("/hardware", explode, failure="Z retract failed"),
+            Route("/reject", reject, arguments=query_argument),
+            Route("/args", lambda value: value, arguments=lambda q: {"value": q.number("value")}),
+        ]
+    )
+
+    assert table.call(table.match("/ok"), RouteQuery("name=x"))[:2] == ({"name": "x"}, 200)
+    assert table.call(table.match("/frame"), RouteQuery())[0].body == b"\x00\x01"
+    payload, status, _ = table.call(table.match("/hardware"), RouteQuery())
+    assert status == 500
+    assert payload["message"] == "Z retract failed: serial port busy"
+    assert table.call(table.match("/reject"), RouteQuery("name=y"))[:2] == ({"status": "error", "message": "bad y"}, 400)
+    assert table.call(table.match("/args"), RouteQuery("value=x"))[1] == 400
+
+    timings = {item["path"]: item for item in table.timings_payload()}
+    assert timings["/ok"]["calls"] == 1 and timings["/ok"]["errors"] == 0
+    assert timings["/hardware"]["errors"] == 1
+
+
+def test_route_table_resolves_string_targets_once():
+    table = RouteTable([Route("/dumps", "json:dumps"), Route("/missing", "core.no_such_module:handler")])
+
+    assert table.handler(table.match("/dumps")) is table.handler(table.match("/dumps"))
+    assert table.resolve_all() == ["/missing: No module named 'core.no_such_module'"]
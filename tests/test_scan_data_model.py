@@ -0,0 +1,67 @@
+import numpy as np
+
+from core.application.scan_data_model import ScanDataModel
+
+
+def _point(x, z, line_index=0):
+    return {"x": x, "y": float(line_index), "z_feedback": z, "line_index": line_index}
+
+
+def test_append_fills_preallocated_rows_and_reports_dirty_row():
+    model = ScanDataModel(columns=3, rows=2)
+    changes = []
+    model.subscribe(changes.append)
+    start = model.version
+
+    change = model.append(_point(0.0, 1.0))
+    model.append(_point(1.0, 2.0))
+    model.append(_point(0.0, 3.0, line_index=1))
+
+    assert change.rows == range(0, 1)
+    assert [item.rows for item in changes] == [range(0, 1), range(0, 1), range(1, 2)]
+    assert model.version == start + 3
+    assert model.shape == (2, 3)
+    assert model.line_count == 2
+    assert model.point_count == 3
+    assert model.line(0).tolist() == [1.0, 2.0]
+    assert model.line().tolist() == [3.0]
+    assert model.line(1, channel="x").tolist() == [0.0]
+    assert np.isnan(model.heights()[0, 2])
+
+
+def test_heights_are_flipped_views_for_reverse_directions():
+    model = ScanDataModel(columns=2, rows=2)
+    model.append(_point(0.0, 1.0))
+    model.append(_point(1.0, 2.0))
+
+    x_minus = model.heights("X-")
+    y_minus = model.heights("Y-")
+
+    assert x_minus[0].tolist() == [2.0, 1.0]
+    assert y_minus[1].tolist() == [1.0, 2.0]
+    assert np.shares_memory(x_minus, model.arrays["z_feedback"])
+    model.append(_point(0.0, 5.0, line_index=1))
+    assert y_minus[0, 0] == 5.0
+
+
+def test_reset_and_growth_notify_full_refresh():
+    model = ScanDataModel(columns=1, rows=1)
+    changes = []
+    model.subscribe(changes.append)
+
+    model.append(_point(0.0, 1.0))
+    model.append(_point(1.0, 2.0))
+    model.append(_point(0.0, 3.0, line_index=2))
+
+    assert [change.reset for change in changes] == [False, True, False, True, False]
+    assert model.shape == (3, 2)
+    assert model.line(0).tolist() == [1.0, 2.0]
+
+    model.reset(columns=4, rows=4)
+    assert changes[-1].reset and changes[-1].rows == range(0, 4)
+    assert model.point_count == 0
+    assert model.line().tolist() == []
+
+    model.unsubscribe(changes.append)
+    model.append(_point(0.0, 1.0))
+    assert len(changes) == 6
@@ -0,0 +1,93 @@
+import csv
+import json
+import os
+
+import numpy as np
+
+from core.acquisition.raster_stream import load_raster_frame
+from core.acquisition.scan_dataset import (
+    csv_to_scan_dataset,
+    dataset_path_for_output,
+    fresh_dataset_for,
+    open_scan_dataset,
+    scan_dataset_to_csv,
+    write_scan_dataset,
+)
+
+
+def test_dataset_stores_typed_memory_mapped_columns(tmp_path):
+    path = write_scan_dataset(
+        tmp_path / "scan.spmscan",
+        {
+            "timestamp": ["2026-06-11T10:14:42", "2026-06-11T10:14:43"],
+            "scan_direction": ["forward", "backward"],
+            "line": ["0", "1"],
+            "actual_x": ["10.0", "20.5"],
+            "contact_detected": [1.0, 0.0],
+        },
+        {"execution_mode": "DRY_RUN"},
+    )
+
+    dataset = open_scan_dataset(path)
+
+    assert dataset.point_count == 2
+    assert dataset.metadata == {"execution_mode": "DRY_RUN"}
+    assert isinstance(dataset.column("actual_x"), np.memmap)
+    assert dataset.column("actual_x").dtype == np.dtype("<f8")
+    assert dataset.column("line").dtype == np.dtype("<i8")
+    assert dataset.column_info("timestamp")["kind"] == "timestamp"
+    assert dataset.decoded("scan_direction") == ["forward", "backward"]
+    assert dataset.decoded("timestamp") == ["2026-06-11T10:14:42", "2026-06-11T10:14:43"]
+    assert all(column["offset"] % 64 == 0 for column in dataset.header["columns"])
+
+
+def test_only_canonical_integer_text_becomes_an_int_column(tmp_path):
+    path = write_scan_dataset(
+        tmp_path / "scan.spmscan",
+        {
+            "line": ["0", "-12"],
+            "double_sign": ["--5", "3"],
+            "sample_id": ["007", "010"],
+            "actual_x": ["0.5", "-0.25"],
+        },
+    )
+
+    dataset = open_scan_dataset(path)
+
+    assert dataset.column_info("line")["kind"] == "int"
+    assert dataset.decoded("line") == [0, -12]
+    assert dataset.column_info("double_sign")["kind"] == "category"
+    assert dataset.decoded("double_sign") == ["--5", "3"]
+    assert dataset.column_info("sample_id")["kind"] == "category"
+    assert dataset.decoded("sample_id") == ["007", "010"]
+    assert dataset.column_info("actual_x")["kind"] == "float"
+
+
+def test_csv_round_trip_preserves_rows_and_sidecar_metadata(tmp_path):
+    source = tmp_path / "raster.csv"
+    source.write_text(open("data/safe_raster_5x5_output.csv", encoding="utf-8").read(), encoding="utf-8")
+    source.with_suffix(".metadata.json").write_text(json.dumps({"point_count": 25}), encoding="utf-8")
+
+    dataset_path = csv_to_scan_dataset(source)
+    restored = scan_dataset_to_csv(dataset_path, tmp_path / "restored.csv")
+
+    with source.open(newline="", encoding="utf-8") as original, restored.open(newline="", encoding="utf-8") as copy:
+        assert list(csv.DictReader(original)) == list(csv.DictReader(copy))
+    assert open_scan_dataset(dataset_path).metadata == {"point_count": 25}
+
+
+def test_raster_frame_prefers_fresh_dataset_over_csv(tmp_path):
+    source = tmp_path / "raster.csv"
+    source.write_text(open("data/safe_raster_5x5_output.csv", encoding="utf-8").read(), encoding="utf-8")
+    expected = load_raster_frame(str(source))
+
+    dataset_path = csv_to_scan_dataset(source)
+    frame = load_raster_frame(str(source))
+
+    assert dataset_path == dataset_path_for_output(source)
+    assert frame == expected
+
+    assert load_raster_frame(str(dataset_path)).point_count == 25
+    stale = os.stat(source).st_mtime - 10
+    os.utime(dataset_path, (stale, stale))
+    assert fresh_dataset_for(source) is None
@@ -0,0 +1,94 @@
+from core.acquisition.scan_journal import ScanJournal, load_scan_journal
+
+
+def _point(line_index, point_index, z=1.0):
+    return {"line_index": line_index, "point_index": point_index, "x": float(point_index), "y": float(line_index), "measured_z": z}
+
+
+def test_journal_round_trip_rebuilds_rows_in_scan_order(tmp_path):
+    path = tmp_path / "scan.journal.jsonl"
+    journal = ScanJournal(path)
+    journal.record_plan("constant_z", {"profile": {"x_points": 2}, "options": {}})
+    for point in (_point(0, 0), _point(0, 1), _point(1, 0)):
+        journal.record_point(point)
+    journal.record_position(5.0, 6.0, 120.0)
+    journal.close()
+
+    state = load_scan_journal(path)
+
+    assert state.kind == "constant_z"
+    assert state.resumable is True
+    assert state.completed() == {(0, 0), (0, 1), (1, 0)}
+    assert [[p["point_index"] for p in row] for row in state.rows()] == [[0, 1], [0]]
+    assert state.last_position == {"x": 5.0, "y": 6.0, "z": 120.0}
+
+
+def test_journal_ignores_torn_last_record_after_crash(tmp_path):
+    path = tmp_path / "scan.journal.jsonl"
+    journal = ScanJournal(path)
+    journal.record_plan("foil_tap", {"profile": {}, "options": {}})
+    journal.record_point(_point(0, 0))
+    journal.close()
+    with path.open("a", encoding="utf-8") as handle:
+        handle.write('{"type": "point", "point": {"line_in')
+
+    state = load_scan_journal(path)
+
+    assert state.completed() == {(0, 0)}
+
+
+def test_resume_after_torn_last_record_keeps_new_records(tmp_path):
+    path = tmp_path / "scan.journal.jsonl"
+    journal = ScanJournal(path)
+    journal.record_plan("foil_tap", {"profile": {}, "options": {}})
+    journal.record_point(_point(0, 0))
+    journal.close()
+    with path.open("a", encoding="utf-8") as handle:
+        handle.write('{"type": "point", "point": {"line_in')
+
+    resumed = ScanJournal(path)
+    resumed.record_resume(1)
+    resumed.record_point(_point(0, 1))
+    resumed.record_end("complete")
+    resumed.close()
+
+    state = load_scan_journal(path)
+
+    assert state.completed() == {(0, 0), (0, 1)}
+    assert state.resumable is False
+    assert all(line.startswith("{") and line.endswith("}") for line in path.read_text(encoding="utf-8").splitlines())
+
+
+def test_loader_skips_undecodable_lines_in_the_middle(tmp_path):
+    path = tmp_path / "scan.journal.jsonl"
+    journal = ScanJournal(path)
+    journal.record_plan("foil_tap", {"profile": {}, "options": {}})
+    journal.close()
+    with path.open("a", encoding="utf-8") as handle:
+        handle.write('{"type": "po\n')
+    journal = ScanJournal(path)
+    journal.record_point(_point(1, 0))
+    journal.close()
+
+    assert load_scan_journal(path).completed() == {(1, 0)}
+
+
+def test_journal_end_record_marks_scan_complete(tmp_path):
+    path = tmp_path / "scan.journal.jsonl"
+    journal = ScanJournal(path)
+    journal.record_plan("constant_z", {"profile": {}, "options": {}})
+    journal.record_end("complete")
+    journal.close()
+
+    assert load_scan_journal(path).resumable is False
+
+
+def test_journal_batches_fsync(tmp_path):
+    journal = ScanJournal(tmp_path / "scan.journal.jsonl", fsync_every=4, fsync_interval_s=3600.0)
+    journal.record_plan("constant_z", {"profile": {}, "options": {}})
+    assert journal.fsync_count == 1
+    for index in range(8):
+        journal.record_point(_point(0, index))
+    assert journal.fsync_count == 3
+    journal.close()
+    assert journal.closed
@@ -0,0 +1,182 @@
+import itertools
+import json
+import math
+
+import numpy as np
+import pytest
+
+from core.web.spm_scan_simulation import (
+    WebScanProfile,
+    build_scan_frame,
+    build_scan_frame_buffer,
+    build_scan_line,
+    grid_axes,
+    parse_scan_frame_buffer,
+    raster_line_coordinates,
+    surface_height_grid,
+)
+
+
+SURFACES = ["sphere_on_plane", "terrace", "grid_atoms", "bravais_lattice"]
+
+
+def make_profile(**overrides):
+    values = {
+        "x_min": 3.5,
+        "x_max": 91.25,
+        "y_min": -7.0,
+        "y_max": 44.4,
+        "x_points": 37,
+        "y_points": 23,
+        "z_setpoint": 0.13,
+        "feedback_gain": 1.7,
+    }
+    values.update(overrides)
+    return WebScanProfile(**values)
+
+
+def reference_height(x, y, profile):
+    """The original point-by-point model, kept here as the parity reference."""
+    cx = (profile.x_min + profile.x_max) / 2.0
+    cy = (profile.y_min + profile.y_max) / 2.0
+    sx = max(profile.x_max - profile.x_min, 1e-9)
+    sy = max(profile.y_max - profile.y_min, 1e-9)
+    nx = (x - cx) / (sx / 2.0)
+    ny = (y - cy) / (sy / 2.0)
+
+    if profile.surface == "terrace":
+        return math.floor((nx + 1.0) * 4.0) * 0.18 + 0.05 * math.sin(14.0 * nx)
+    if profile.surface == "grid_atoms":
+        return 0.25 + 0.22 * (math.sin(8.0 * math.pi * (nx + 1.0)) * math.sin(8.0 * math.pi * (ny + 1.0)))
+    if profile.surface == "bravais_lattice":
+        u = 10.0 * (nx + 0.35 * ny)
+        v = 10.0 * (0.22 * nx + ny)
+        lattice = (math.cos(2.0 * math.pi * u) + math.cos(2.0 * math.pi * v)) * 0.5
+        moire = 0.12 * math.sin(2.0 * math.pi * (1.6 * nx - 1.1 * ny))
+        return 0.35 + 0.18 * lattice + moire
+    r2 = nx * nx + ny * ny
+    return 1.8 * math.sqrt(1.0 - r2) if r2 <= 1.0 else 0.0
+
+
+def scalar_scan_line(profile, line_index):
+    coordinates, direction = raster_line_coordinates(profile, line_index)
+    points = []
+    for point_index, (x, y) in enumerate(coordinates):
+        surface_height = reference_height(x, y, profile)
+        z_feedback = profile.z_setpoint + (surface_height * profile.feedback_gain)
+        points.append(
+            {
+                "point_index": point_index,
+                "x": round(x, 6),
+                "y": round(y, 6),
+                "surface_height": round(surface_height, 6),
+                "z_feedback": round(z_feedback, 6),
+                "feedback_error": 0.0,
+            }
+        )
+    return direction, points
+
+
+@pytest.mark.parametrize("surface", SURFACES)
+def test_surface_height_grid_matches_scalar_model_exactly(surface):
+    profile = make_profile(surface=surface)
+    heights = surface_height_grid(profile)
+    x_values, y_values = grid_axes(profile)
+
+    expected = [[reference_height(x, y, profile) for x in x_values.tolist()] for y in y_values.tolist()]
+
+    assert heights.shape == (profile.y_points, profile.x_points)
+    assert heights.tolist() == expected
+
+
+@pytest.mark.parametrize(
+    "surface,scan_direction,serpentine",
+    list(itertools.product(SURFACES, ["X+", "X-", "Y+", "Y-"], [True, False])),
+)
+def test_build_scan_line_matches_scalar_reference(surface, scan_direction, serpentine):
+    profile = make_profile(surface=surface, scan_direction=scan_direction, serpentine=serpentine)
+
+    for line_index in range(profile.y_points):
+        line = build_scan_line(profile, line_index)
+        direction, points = scalar_scan_line(profile, line_index)
+
+        assert line["direction"] == direction
+        assert line["points"] == points
+
+
+def test_surface_height_grid_is_cached_per_grid_and_read_only():
+    profile = make_profile(surface="terrace")
+    heights = surface_height_grid(profile)
+
+    same_grid = make_profile(surface="terrace", z_setpoint=0.5, feedback_gain=2.0, scan_direction="Y-")
+    assert surface_height_grid(same_grid) is heights
+    assert surface_height_grid(make_profile(surface="grid_atoms")) is not heights
+    with pytest.raises(ValueError):
+        heights[0, 0] = 1.0
+
+
+def test_build_scan_frame_holds_every_line_by_grid_row():
+    profile = make_profile(surface="bravais_lattice", scan_direction="X-")
+    frame = build_scan_frame(profile)
+
+    assert frame["layout"] == "rows_y_then_x"
+    assert len(frame["z_feedback"]) == profile.y_points
+    assert all(len(row) == profile.x_points for row in frame["z_feedback"])
+    for line_index in range(profile.y_points):
+        line = build_scan_line(profile, line_index)
+        by_x = {point["x"]: point["z_feedback"] for point in line["points"]}
+        assert [by_x[x] for x in frame["x_values"]] == frame["z_feedback"][line_index]
+    assert frame["z_min"] == min(min(row) for row in frame["z_feedback"])
+    assert frame["z_max"] == max(max(row) for row in frame["z_feedback"])
+
+
+def test_rounding_matches_python_round_at_decimal_ties():
+    from core.web.spm_scan_simulation import _round6
+
+    values = np.concatenate(
+        [
+            np.arange(-2000, 2000) * 1e-6 + 5e-7,
+            np.array([2.675e-6, 1.0000005, -0.0000025, 1e-9, -1e-9]),
+            np.random.default_rng(7).uniform(-50.0, 50.0, 20000),
+        ]
+    )
+
+    assert _round6(values).tolist() == [round(value, 6) for value in values.tolist()]
+
+
+def test_build_scan_frame_validates_profile():
+    with pytest.raises(ValueError):
+        build_scan_frame(make_profile(x_points=1))
+
+
+def test_frame_buffer_holds_float32_channels_by_grid_row():
+    profile = make_profile(surface="grid_atoms")
+    buffer = build_scan_frame_buffer(profile)
+    header, data = parse_scan_frame_buffer(buffer)
+    heights = surface_height_grid(profile)
+
+    assert buffer[:4] == b"SPMF"
+    assert (8 + int.from_bytes(buffer[4:8], "little")) % 4 == 0
+    assert header["shape"] == [2, profile.y_points, profile.x_points]
+    assert header["channels"] == ["z_feedback", "surface_height"]
+    assert data.dtype == np.dtype("<f4")
+    assert np.array_equal(data[1], heights.astype(np.float32))
+    assert np.array_equal(data[0], (profile.z_setpoint + heights * profile.feedback_gain).astype(np.float32))
+    assert header["value_range"]["surface_height"] == [float(heights.min()), float(heights.max())]
+    assert len(buffer) < len(json.dumps(build_scan_frame(profile))) / 2
+
+
+def test_frame_buffer_row_range_and_channel_selection():
+    profile = make_profile()
+    heights = surface_height_grid(profile)
+
+    header, data = parse_scan_frame_buffer(
+        build_scan_frame_buffer(profile, row_start=20, row_count=10, channels=("surface_height",))
+    )
+
+    assert (header["row_start"], header["row_stop"]) == (20, profile.y_points)
+    assert data.shape == (1, profile.y_points - 20, profile.x_points)
+    assert np.array_equal(data[0], heights[20:].astype(np.float32))
+    for kwargs in ({"row_start": profile.y_points}, {"row_count": 0}, {"channels": ("phase",)}):
+        with pytest.raises(ValueError):
+            build_scan_frame_buffer(profile, **kwargs)
@@ -0,0 +1,67 @@
+import subprocess
+import sys
+
+import pytest
+
+from core.system.startup_profile import PROJECT_ROOT, StartupProfile, parse_importtime, profile_startup
+
+
+IMPORTTIME_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       300 |        300 | encodings
+import time:       120 |        120 |     json.decoder
+import time:       200 |        320 |   json
+import time:      5000 |       5000 |   numpy
+import time:       400 |       5720 | app.entry
+"""
+
+
+def test_parse_importtime_builds_nested_tree():
+    imports = parse_importtime(IMPORTTIME_OUTPUT)
+
+    assert [timing.module for timing in imports] == ["encodings", "app.entry"]
+    entry = imports[1]
+    assert [child.module for child in entry.children] == ["json", "numpy"]
+    assert entry.children[0].children[0].module == "json.decoder"
+    assert entry.cumulative_ms == pytest.approx(5.72)
+
+
+def test_startup_profile_summary_lists_slowest_branch_first():
+    profile = StartupProfile(module="app.entry", imports=parse_importtime(IMPORTTIME_OUTPUT))
+    lines = profile.summary_lines(min_ms=0.1)
+
+    assert profile.total_ms == pytest.approx(5.72)
+    assert profile.interpreter_ms == pytest.approx(0.3)
+    assert "(4 modules)" in lines[1]
+    tree = [line.split()[-1] for line in lines[5:9]]
+    assert tree == ["app.entry", "numpy", "json", "json.decoder"]
+
+
+def test_profile_startup_reports_the_web_console_entry_module():
+    profile = profile_startup("core.web.operator_console_server")
+
+    assert profile.entry is not None
+    assert profile.total_ms > 0
+    assert "Startup import profile: core.web.operator_console_server" in profile.summary_text()
+
+
+@pytest.mark.parametrize(
+    "module",
+    [
+        "core.web.operator_console_server",
+        "core.application.operator_workstation_software",
+        "core.application.gui_scan_launcher",
+    ],
+)
+def test_entry_points_defer_heavy_modules(module):
+    deferred = ["matplotlib", "core.ai.academic_ai_client", "core.scan", "core.motion.parking"]
+    code = f"import sys, {module}; print(','.join(name for name in {deferred!r} if name in sys.modules))"
+    completed = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert completed.stdout.strip() == ""
@@ -0,0 +1,137 @@
+import math
+
+import numpy as np
+import pytest
+
+from core.education.surface_models import (
+    HeightMap,
+    SurfaceArea,
+    grid_axis,
+    height_map,
+    height_map_cache_info,
+    surface_heights,
+    surface_model_names,
+)
+from core.education.synthetic_signal import synthetic_surface_signal
+from core.probe_framework.simulated_topography import simulated_topography
+
+
+AREA = SurfaceArea(x_min=20.0, x_max=80.0, y_min=10.0, y_max=70.0)
+
+
+def grid_map(heights_of, x_points=9, y_points=7):
+    x_values = grid_axis(AREA.x_min, AREA.x_max, x_points)
+    y_values = grid_axis(AREA.y_min, AREA.y_max, y_points)
+    heights = heights_of(x_values[np.newaxis, :], y_values[:, np.newaxis])
+    return HeightMap(model="test", area=AREA, x_values=x_values, y_values=y_values, heights=heights)
+
+
+def test_registry_holds_every_simulated_surface():
+    assert {
+        "educational_bump",
+        "sphere_on_plane",
+        "terrace",
+        "grid_atoms",
+        "bravais_lattice",
+        "regulated_terrace",
+        "probe_hill",
+        "stm_corrugation",
+        "afm_contact_ripple",
+        "afm_noncontact_amplitude",
+        "line_profile",
+    } <= set(surface_model_names())
+    with pytest.raises(ValueError, match="Unknown surface model"):
+        surface_heights("no_such_surface", 0.0, 0.0, AREA)
+
+
+def test_area_models_need_an_area():
+    with pytest.raises(ValueError, match="needs a scan area"):
+        surface_heights("terrace", 0.0, 0.0)
+
+
+def test_height_map_is_cached_and_read_only():
+    first = height_map("bravais_lattice", AREA, 40, 30)
+    hits = height_map_cache_info().hits
+
+    assert height_map("bravais_lattice", AREA, 40, 30) is first
+    assert height_map_cache_info().hits == hits + 1
+    assert height_map("bravais_lattice", AREA, 41, 30) is not first
+    assert first.heights.shape == (30, 40)
+    with pytest.raises(ValueError):
+        first.heights[0, 0] = 0.0
+
+
+def test_height_map_matches_exact_evaluation():
+    surface = height_map("regulated_terrace", AREA, 25, 19)
+    x_values, y_values = np.meshgrid(surface.x_values, surface.y_values)
+
+    expected = surface_heights("regulated_terrace", x_values, y_values, AREA)
+
+    assert np.array_equal(surface.heights, expected)
+
+
+@pytest.mark.parametrize("method", ["nearest", "bilinear", "bicubic"])
+def test_sampling_at_grid_nodes_returns_node_heights(method):
+    surface = height_map("grid_atoms", AREA, 17, 13)
+    x_values, y_values = np.meshgrid(surface.x_values, surface.y_values)
+
+    np.testing.assert_allclose(surface.sample(x_values, y_values, method=method), surface.heights, atol=1e-12)
+
+
+def test_bilinear_is_exact_for_planes_and_bicubic_for_quadratics():
+    plane = grid_map(lambda x, y: 0.3 * x - 0.7 * y + 2.0)
+    bowl = grid_map(lambda x, y: 0.01 * x * x + 0.02 * y * y - 0.005 * x * y)
+    rng = np.random.default_rng(5)
+    # Stay one cell inside the edges, where bicubic clamps its neighbours.
+    xs = rng.uniform(AREA.x_min + 7.5, AREA.x_max - 7.5, 500)
+    ys = rng.uniform(AREA.y_min + 10.0, AREA.y_max - 10.0, 500)
+
+    np.testing.assert_allclose(plane.sample(xs, ys, method="bilinear"), 0.3 * xs - 0.7 * ys + 2.0, atol=1e-9)
+    np.testing.assert_allclose(
+        bowl.sample(xs, ys, method="bicubic"),
+        0.01 * xs * xs + 0.02 * ys * ys - 0.005 * xs * ys,
+        atol=1e-9,
+    )
+
+
+def test_bicubic_tracks_smooth_surfaces_closer_than_bilinear():
+    surface = height_map("probe_hill", AREA, 24, 24)
+    rng = np.random.default_rng(11)
+    xs = rng.uniform(AREA.x_min, AREA.x_max, 2000)
+    ys = rng.uniform(AREA.y_min, AREA.y_max, 2000)
+    exact = surface_heights("probe_hill", xs, ys, AREA)
+
+    bilinear_error = np.abs(surface.sample(xs, ys, method="bilinear") - exact).max()
+    bicubic_error = np.abs(surface.sample(xs, ys, method="bicubic") - exact).max()
+
+    assert bicubic_error < bilinear_error
+
+
+def test_sample_returns_float_for_scalars_and_clamps_outside_the_area():
+    surface = height_map("terrace", AREA, 12, 8)
+
+    inside = surface.sample(AREA.x_max, AREA.y_min)
+    assert isinstance(inside, float)
+    assert surface.sample(AREA.x_max + 50.0, AREA.y_min - 50.0) == inside
+    with pytest.raises(ValueError, match="method"):
+        surface.sample(30.0, 30.0, method="spline")
+
+
+def test_educational_signal_keeps_its_values():
+    for x, y in [(50, 50), (48, 48), (47.3, 52.9), (10, 90)]:
+        dx = x - 50.0
+        dy = y - 50.0
+        expected = math.exp(-((dx * dx + dy * dy) / 8.0)) + 0.15 * math.sin(x * 0.8) * math.cos(y * 0.8)
+        assert synthetic_surface_signal(x, y) == round(expected, 4)
+
+
+def test_probe_topography_keeps_its_values():
+    data = simulated_topography(width=6, height=5)
+
+    for y, row in enumerate(data):
+        for x, value in enumerate(row):
+            nx = x / 5
+            ny = y / 4
+            hill = math.exp(-18.0 * ((nx - 0.52) ** 2 + (ny - 0.46) ** 2))
+            wave = 0.12 * math.sin(6.0 * math.pi * nx) * math.cos(4.0 * math.pi * ny)
+            assert value == round(hill + wave + 0.08 * nx + 0.04 * ny, 6)
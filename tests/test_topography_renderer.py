@@ -0,0 +1,65 @@
+import numpy as np
+
+from core.application.topography_renderer import LUT_SIZE, TopographyRenderer, topography_lut
+
+
+def test_lut_runs_from_low_to_high_colour():
+    lut = topography_lut()
+
+    assert lut.shape == (LUT_SIZE,)
+    assert lut.dtype == np.uint32
+    assert lut[0] != lut[-1]
+
+
+def test_renderer_recolours_only_changed_rows():
+    heights = np.full((2, 3), np.nan)
+    heights[0] = [0.0, 1.0, 2.0]
+    renderer = TopographyRenderer()
+    renderer.sync(heights)
+    image = renderer.image()
+
+    assert (image.width(), image.height()) == (3, 2)
+    assert renderer.rendered_row_count == 2  # new array renders every row once
+
+    heights[1, 0] = 0.5
+    renderer.sync(heights, [1])
+    renderer.image()
+    assert renderer.rendered_row_count == 1
+    assert renderer.heights is heights
+    assert np.isnan(renderer.heights[1, 2])
+
+    renderer.sync(heights, [])
+    renderer.image()
+    assert renderer.rendered_row_count == 0
+
+
+def test_renderer_rerenders_everything_when_range_widens():
+    heights = np.array([[0.0, 1.0], [0.5, np.nan]])
+    renderer = TopographyRenderer()
+    renderer.sync(heights)
+    before = renderer.image().pixel(1, 0)
+
+    heights[1, 1] = 4.0
+    renderer.sync(heights, [1])
+    image = renderer.image()
+
+    assert renderer.rendered_row_count == 2
+    assert image.pixel(1, 0) != before
+
+
+def test_renderer_reset_forgets_previous_range():
+    renderer = TopographyRenderer()
+    renderer.sync(np.array([[0.0, 1.0], [2.0, 3.0]]))
+    renderer.reset()
+    renderer.sync(np.array([[5.0, 5.0]]))
+
+    assert renderer.heights.shape == (1, 2)
+    assert renderer.flat_signal
+    assert renderer.image() is not None
+
+
+def test_renderer_waits_for_first_measurement():
+    renderer = TopographyRenderer()
+    renderer.sync(np.full((2, 2), np.nan))
+
+    assert renderer.image() is None
@@ -373,9 +373,9 @@ def test_web_operator_console_calls_system_control_api():
     assert "/api/system/off" in app_js
     assert "/api/system/status" in app_js
     assert "/api/system/close" in app_js
-    assert 'route == "/api/system/status"' in server_py
-    assert 'route == "/api/system/on"' in server_py
-    assert 'route == "/api/system/dry-run"' in server_py
+    assert '"/api/system/status", "system_status"' in server_py
+    assert '"/api/system/on", "system_on"' in server_py
+    assert '"/api/system/dry-run", f"{_SYSTEM}:dry_run_startup_plan"' in server_py
 
 def test_hardware_status_adapter_uses_existing_information_layer():
     from core.web.hardware_status_adapter import hardware_information_status, validate_readonly_plan
@@ -663,3 +663,148 @@ def test_phase_2_1_position_diagnostic_detects_logical_count_mismatch():
     assert diagnostic["status"] == "needs_sync"
     assert diagnostic["values"]["physical_x"] == 125.0
     assert diagnostic["mismatches"]
+
+
+def test_scan_frame_route_returns_whole_grid():
+    import json
+    import threading
+    from http.server import ThreadingHTTPServer
+    from urllib.error import HTTPError
+    from urllib.request import urlopen
+
+    from core.web.operator_console_server import OperatorConsoleHandler
+    from core.web.spm_scan_simulation import parse_scan_frame_buffer
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), OperatorConsoleHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        with urlopen(f"{base}/api/scan/frame?x_points=8&y_points=4&surface=terrace&format=json", timeout=5) as response:
+            frame = json.loads(response.read())
+        with urlopen(f"{base}/api/scan/frame?x_points=8&y_points=4&surface=terrace&row_start=1&channels=surface_height", timeout=5) as response:
+            content_type = response.headers["Content-Type"]
+            header, data = parse_scan_frame_buffer(response.read())
+        try:
+            urlopen(f"{base}/api/scan/frame?x_points=1", timeout=5)
+        except HTTPError as error:
+            assert error.code == 400
+            assert json.loads(error.read())["status"] == "error"
+        else:
+            raise AssertionError("invalid frame profile was accepted")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert frame["x_points"] == 8
+    assert len(frame["z_feedback"]) == 4
+    assert all(len(row) == 8 for row in frame["z_feedback"])
+    assert content_type == "application/octet-stream"
+    assert header["channels"] == ["surface_height"]
+    assert data.shape == (1, 3, 8)
+    assert abs(data[0][-1][0] - frame["surface_height"][-1][0]) < 1e-6
+
+
+def test_stream_route_pushes_live_events_as_sse():
+    import json
+    import threading
+    from http.server import ThreadingHTTPServer
+    from urllib.request import urlopen
+
+    from core.web.live_stream import LIVE_EVENTS, publish_live_event
+    from core.web.operator_console_server import OperatorConsoleHandler
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), OperatorConsoleHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        with urlopen(f"{base}/api/stream", timeout=5) as response:
+            content_type = response.headers["Content-Type"]
+            assert response.readline().startswith(b"retry:")
+            publish_live_event("log", {"source": "test", "lines": ["stream check"]})
+            frame = []
+            while True:
+                line = response.readline().decode("utf-8").rstrip("\n")
+                if line.startswith(("id:", "event:", "data:")):
+                    frame.append(line)
+                if line.startswith("data:") and "stream check" in line:
+                    break
+    finally:
+        LIVE_EVENTS.close_all()
+        server.shutdown()
+        server.server_close()
+
+    assert content_type.startswith("text/event-stream")
+    assert frame[-2] == "event: log"
+    assert json.loads(frame[-1][len("data: "):])["lines"] == ["stream check"]
+
+
+def test_web_console_consumes_live_stream_instead_of_polling():
+    html = (WEB_ROOT / "index.html").read_text(encoding="utf-8")
+    stream_js = (WEB_ROOT / "live_stream.js").read_text(encoding="utf-8")
+    raster_js = (WEB_ROOT / "scan_raster.js").read_text(encoding="utf-8")
+    z_js = (WEB_ROOT / "z_live.js").read_text(encoding="utf-8")
+
+    assert html.index("live_stream.js") < html.index("scan_raster.js")
+    assert 'new EventSource("/api/stream")' in stream_js
+    assert "/api/scan/stream/start" in raster_js
+    assert "setTimeout(resolve, 80)" not in raster_js
+    assert "setInterval" not in z_js
+    assert "parseFrame" in raster_js and "/api/scan/frame" in raster_js
+    assert 'data-action="load-frame"' in html
+    assert 'SPMLiveStream.on("z_sample"' in z_js
+
+
+def test_route_table_dispatches_each_path_to_one_handler():
+    from core.web.operator_console_server import ROUTES
+    from core.web.route_table import Route, RouteTable
+
+    assert ROUTES.resolve_all() == []
+    assert ROUTES.match("/api/system/off") is ROUTES.match("/api/system/disconnect")
+    assert ROUTES.match("/api/system/on").target == "core.web.system_control:system_on"
+    assert ROUTES.match("/api/system/status").publish is True
+    assert ROUTES.match("/index.html") is None
+    try:
+        RouteTable([Route("/api/a", "x:y"), Route("/api/b", "x:z", aliases=("/api/a",))])
+    except ValueError as error:
+        assert "/api/a" in str(error)
+    else:
+        raise AssertionError("duplicate route path was accepted")
+
+
+def test_route_table_reports_errors_and_timings_over_http():
+    import json
+    import threading
+    from http.server import ThreadingHTTPServer
+    from urllib.error import HTTPError
+    from urllib.request import urlopen
+
+    from core.web.operator_console_server import OperatorConsoleHandler
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), OperatorConsoleHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        with urlopen(f"{base}/api/phase-map", timeout=5) as response:
+            server_timing = response.headers["Server-Timing"]
+            phases = json.loads(response.read())
+        try:
+            urlopen(f"{base}/api/scan/line?line_index=abc", timeout=5)
+        except HTTPError as error:
+            assert error.code == 400
+            assert "line_index must be a number" in json.loads(error.read())["message"]
+        else:
+            raise AssertionError("invalid line_index was accepted")
+        with urlopen(f"{base}/api/routes", timeout=5) as response:
+            timings = {item["path"]: item for item in json.loads(response.read())}
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert server_timing.startswith("handler;dur=")
+    assert phases == PHASE_MAP
+    assert timings["/api/phase-map"]["calls"] >= 1
+    assert timings["/api/scan/line"]["errors"] >= 1
+    assert timings["/api/system/off"]["aliases"] == ["/api/system/disconnect"]
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from core.application.z_trace_buffer import BLOCK_SIZE, ZTraceBuffer
+
+
+def _filled(capacity, count, seed=3):
+    values = np.random.default_rng(seed).normal(size=count).cumsum()
+    buffer = ZTraceBuffer(capacity)
+    for value in values:
+        buffer.append(value)
+    return buffer, values[-buffer.capacity :]
+
+
+def test_ring_keeps_latest_samples_in_order():
+    buffer, retained = _filled(4 * BLOCK_SIZE, 4 * BLOCK_SIZE * 3 + 77)
+
+    assert len(buffer) == buffer.capacity == 4 * BLOCK_SIZE
+    assert buffer.total == 4 * BLOCK_SIZE * 3 + 77
+    assert buffer.latest == retained[-1]
+    np.testing.assert_array_equal(buffer.values(), retained)
+    np.testing.assert_array_equal(buffer.values(100, 900), retained[100:900])
+
+
+@pytest.mark.parametrize("count", [10, 3 * BLOCK_SIZE + 5, 16 * BLOCK_SIZE + 301])
+def test_range_matches_raw_samples(count):
+    buffer, retained = _filled(8 * BLOCK_SIZE, count)
+
+    assert buffer.range() == (retained.min(), retained.max())
+    for start, stop in [(0, 7), (3, 300), (BLOCK_SIZE - 1, 5 * BLOCK_SIZE + 2), (1, len(retained))]:
+        start, stop = min(start, len(retained) - 1), min(stop, len(retained))
+        assert buffer.range(start, stop) == (retained[start:stop].min(), retained[start:stop].max())
+
+
+@pytest.mark.parametrize("bins", [700, 60, 3])
+def test_envelope_bins_bound_raw_samples(bins):
+    buffer, retained = _filled(64 * BLOCK_SIZE, 64 * BLOCK_SIZE + 1234)
+    start, stop = 37, len(retained) - 11
+
+    positions, mins, maxs = buffer.envelope(start, stop, bins)
+
+    assert len(positions) <= bins
+    assert positions[0] == start
+    edges = list(positions[1:]) + [stop]
+    for position, end, low, high in zip(positions, edges, mins, maxs):
+        assert low == retained[position:end].min()
+        assert high == retained[position:end].max()
+
+
+def test_short_span_is_not_decimated_and_clear_empties():
+    buffer, retained = _filled(4 * BLOCK_SIZE, 50)
+
+    positions, mins, maxs = buffer.envelope(0, None, 400)
+
+    assert mins is maxs
+    np.testing.assert_array_equal(positions, np.arange(50))
+    np.testing.assert_array_equal(mins, retained)
+    buffer.clear()
+    assert len(buffer) == 0
+    buffer.append(2.5)
+    assert buffer.range() == (2.5, 2.5)
@@ -2,93 +2,196 @@ from __future__ import annotations
 
 import argparse
 import csv
+import io
+from collections import OrderedDict
+from dataclasses import dataclass
 from pathlib import Path
 
-import matplotlib.pyplot as plt
+import numpy as np
 
 
 # ------------------------------------------------------------
 # Load raster CSV produced by the SPM scan launcher
 # Expected columns:
 # timestamp,target_x,target_y,actual_x,actual_y,actual_z,simulated_z_signal
+# Optional: scan_direction (forward/backward/upward/downward)
 # ------------------------------------------------------------
-def load_raster_csv(input_file: str) -> tuple[list[float], list[float], list[list[float]]]:
-    rows: list[dict[str, str]] = []
+GRID_SNAP_TOLERANCE = 1e-3
+_GRID_CACHE_SIZE = 8
+_GRID_CACHE: OrderedDict[tuple[str, int, int, float], "RasterGrid"] = OrderedDict()
+
+
+@dataclass(frozen=True)
+class RasterGrid:
+    """Raster CSV as arrays. ``height_map`` rows follow ``y_values``.
+
+    Arrays are read-only because loaded grids are shared through the cache.
+    ``direction_images`` hold one image per scan direction, NaN where that
+    direction did not sample.
+    """
+
+    x_values: np.ndarray
+    y_values: np.ndarray
+    height_map: np.ndarray
+    direction_counts: dict[str, int]
+    direction_images: dict[str, np.ndarray]
+
+    @property
+    def forward_image(self) -> np.ndarray | None:
+        return self.direction_images.get("forward")
+
+    @property
+    def backward_image(self) -> np.ndarray | None:
+        return self.direction_images.get("backward")
+
+
+def snap_grid_axis(values: np.ndarray, tolerance: float) -> tuple[np.ndarray, np.ndarray]:
+    """Group coordinates closer than ``tolerance``; return (axis, index per value)."""
+    ordered = np.sort(values)
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(ordered) > tolerance) + 1))
+    axis = ordered[starts]
+    indices = np.searchsorted(axis, values + tolerance, side="right") - 1
+    return axis, indices
+
+
+def _read_only(array: np.ndarray) -> np.ndarray:
+    array.setflags(write=False)
+    return array
 
+
+def _parse_raster_csv(input_file: str, tolerance: float) -> RasterGrid:
     with open(input_file, newline="", encoding="utf-8") as csvfile:
-        reader = csv.DictReader(csvfile)
-        for row in reader:
-            rows.append(row)
+        reader = csv.reader(csvfile)
+        header = next(reader, [])
+        required_columns = {"actual_x", "actual_y", "simulated_z_signal"}
+        missing_columns = required_columns - set(header)
+        rows = list(reader)
 
     if not rows:
         raise ValueError(f"No data rows found in CSV file: {input_file}")
-
-    required_columns = {"actual_x", "actual_y", "simulated_z_signal"}
-    missing_columns = required_columns - set(rows[0].keys())
-
     if missing_columns:
         raise ValueError(
             f"CSV file is missing required columns: {sorted(missing_columns)}"
         )
 
-    x_values = sorted({float(row["actual_x"]) for row in rows})
-    y_values = sorted({float(row["actual_y"]) for row in rows})
-
-    signal_by_xy: dict[tuple[float, float], float] = {}
+    columns = list(zip(*rows))
+    x = np.asarray(columns[header.index("actual_x")], dtype=float)
+    y = np.asarray(columns[header.index("actual_y")], dtype=float)
+    signal = np.asarray(columns[header.index("simulated_z_signal")], dtype=float)
+    if "scan_direction" in header:
+        directions = np.asarray(columns[header.index("scan_direction")])
+    else:
+        directions = np.full(len(rows), "forward")
+
+    x_values, column_index = snap_grid_axis(x, tolerance)
+    y_values, row_index = snap_grid_axis(y, tolerance)
+    shape = (len(y_values), len(x_values))
+
+    # Repeated raster points keep the last sample, as the CSV order implies.
+    height_map = np.full(shape, np.nan)
+    filled = np.zeros(shape, dtype=bool)
+    height_map[row_index, column_index] = signal
+    filled[row_index, column_index] = True
+    if not filled.all():
+        missing_row, missing_column = np.argwhere(~filled)[0]
+        raise ValueError(f"Missing raster point for X={x_values[missing_column]}, Y={y_values[missing_row]}")
+
+    names, counts = np.unique(directions, return_counts=True)
+    direction_counts = {str(name): int(count) for name, count in zip(names, counts)}
+    direction_images: dict[str, np.ndarray] = {}
+    for name in direction_counts:
+        mask = directions == name
+        image = np.full(shape, np.nan)
+        image[row_index[mask], column_index[mask]] = signal[mask]
+        direction_images[name] = _read_only(image)
+
+    return RasterGrid(
+        x_values=_read_only(x_values),
+        y_values=_read_only(y_values),
+        height_map=_read_only(height_map),
+        direction_counts=direction_counts,
+        direction_images=direction_images,
+    )
 
-    for row in rows:
-        x = float(row["actual_x"])
-        y = float(row["actual_y"])
-        signal = float(row["simulated_z_signal"])
-        signal_by_xy[(x, y)] = signal
 
-    z_matrix: list[list[float]] = []
+def load_raster_grid(input_file: str, tolerance: float = GRID_SNAP_TOLERANCE) -> RasterGrid:
+    """Load a raster CSV in one pass, cached on (path, mtime, size, tolerance)."""
+    path = Path(input_file).resolve()
+    stat = path.stat()
+    key = (str(path), stat.st_mtime_ns, stat.st_size, float(tolerance))
+    grid = _GRID_CACHE.get(key)
+    if grid is not None:
+        _GRID_CACHE.move_to_end(key)
+        return grid
+    grid = _parse_raster_csv(str(path), tolerance)
+    _GRID_CACHE[key] = grid
+    while len(_GRID_CACHE) > _GRID_CACHE_SIZE:
+        _GRID_CACHE.popitem(last=False)
+    return grid
 
-    for y in y_values:
-        z_row: list[float] = []
-        for x in x_values:
-            key = (x, y)
-            if key not in signal_by_xy:
-                raise ValueError(f"Missing raster point for X={x}, Y={y}")
-            z_row.append(signal_by_xy[key])
-        z_matrix.append(z_row)
 
-    return x_values, y_values, z_matrix
+def load_raster_csv(input_file: str) -> tuple[list[float], list[float], list[list[float]]]:
+    grid = load_raster_grid(input_file)
+    return grid.x_values.tolist(), grid.y_values.tolist(), grid.height_map.tolist()
 
 
 # ------------------------------------------------------------
 # Plot raster matrix using selected matplotlib color map
 # ------------------------------------------------------------
+PLOT_FIGSIZE = (7, 6)
+PLOT_DPI = 150
+PLOT_COLOR_MAPS = ("viridis", "plasma", "inferno", "magma")
+
+
+class RasterFigure:
+    """One reusable Agg figure; each render swaps data and colour map.
+
+    Building the figure (and importing matplotlib) is the slow part, so a
+    caller can construct this once, ahead of time, and render many PNGs.
+    Not thread-safe: serialize calls to ``render_png``.
+    """
+
+    def __init__(self) -> None:
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        self.figure = Figure(figsize=PLOT_FIGSIZE)
+        self.canvas = FigureCanvasAgg(self.figure)
+        axes = self.figure.add_subplot()
+        self.image = axes.imshow(np.zeros((2, 2)), cmap="viridis", origin="lower", aspect="auto")
+        self.colorbar = self.figure.colorbar(self.image, ax=axes, label="Simulated Z signal")
+        axes.set_xlabel("X position")
+        axes.set_ylabel("Y position")
+        axes.set_title("Safe Educational SPM Raster Scan")
+
+    def render_png(
+        self,
+        height_map: np.ndarray,
+        x_values: np.ndarray,
+        y_values: np.ndarray,
+        color_map: str = "viridis",
+    ) -> bytes:
+        self.image.set_data(height_map)
+        self.image.set_cmap(color_map)
+        self.image.set_extent((float(np.min(x_values)), float(np.max(x_values)), float(np.min(y_values)), float(np.max(y_values))))
+        self.image.set_clim(float(np.nanmin(height_map)), float(np.nanmax(height_map)))
+        self.colorbar.update_normal(self.image)
+        self.figure.tight_layout()
+        buffer = io.BytesIO()
+        self.figure.savefig(buffer, format="png", dpi=PLOT_DPI)
+        return buffer.getvalue()
+
+
 def plot_raster(
     input_file: str,
     output_file: str,
     color_map: str = "viridis",
 ) -> None:
-    x_values, y_values, z_matrix = load_raster_csv(input_file)
+    grid = load_raster_grid(input_file)
 
     output_path = Path(output_file)
     output_path.parent.mkdir(parents=True, exist_ok=True)
-
-    plt.figure(figsize=(7, 6))
-    plt.imshow(
-        z_matrix,
-        cmap=color_map,
-        origin="lower",
-        extent=[
-            min(x_values),
-            max(x_values),
-            min(y_values),
-            max(y_values),
-        ],
-        aspect="auto",
-    )
-    plt.colorbar(label="Simulated Z signal")
-    plt.xlabel("X position")
-    plt.ylabel("Y position")
-    plt.title("Safe Educational SPM Raster Scan")
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=150)
-    plt.close()
+    output_path.write_bytes(RasterFigure().render_png(grid.height_map, grid.x_values, grid.y_values, color_map))
 
     print(f"Saved plot: {output_path}")
 
@@ -107,7 +210,7 @@ def main() -> None:
         "--cmap",
         dest="color_map",
         default="viridis",
-        choices=["viridis", "plasma", "inferno", "magma"],
+        choices=list(PLOT_COLOR_MAPS),
     )
 
     args = parser.parse_args()
@@ -140,6 +140,7 @@ function handleAction(action) {
 
   if (action === "scan-profile") window.SPMRaster.checkScanProfile();
   if (action === "reset-raster") window.SPMRaster.resetRaster();
+  if (action === "load-frame") window.SPMRaster.loadFrame();
   if (action === "step-line") window.SPMRaster.stepOneLine();
   if (action === "run-raster") window.SPMRaster.runRasterSimulation();
 
@@ -0,0 +1,106 @@
+(function () {
+  "use strict";
+
+  const EVENT_TYPES = ["scan_point", "scan_line", "z_sample", "log", "status"];
+  const JOB_FINISHED = ["complete", "failed", "cancelled"];
+  // Fallback poll for a job's result when its final stream event was missed.
+  const JOB_POLL_MS = 2000;
+  const listeners = new Map(EVENT_TYPES.map((type) => [type, new Set()]));
+  let source = null;
+
+  function logLine(message) {
+    if (window.spmReliableLogLine) window.spmReliableLogLine(message);
+  }
+
+  function dispatch(type, message) {
+    let data;
+    try {
+      data = JSON.parse(message.data);
+    } catch (error) {
+      logLine(`STREAM parse error on ${type}: ${error}`);
+      return;
+    }
+
+    if (data.dropped) logLine(`STREAM ${data.dropped} live events dropped; the browser fell behind.`);
+    if (type === "log" && Array.isArray(data.lines)) data.lines.forEach((line) => logLine(line));
+
+    for (const listener of listeners.get(type)) {
+      try {
+        listener(data);
+      } catch (error) {
+        logLine(`STREAM ${type} listener failed: ${error}`);
+      }
+    }
+  }
+
+  function connect() {
+    if (source || !window.EventSource) return;
+
+    // EventSource reconnects on its own after a dropped connection.
+    source = new EventSource("/api/stream");
+    EVENT_TYPES.forEach((type) => source.addEventListener(type, (message) => dispatch(type, message)));
+  }
+
+  function on(type, listener) {
+    if (!listeners.has(type)) throw new Error(`Unknown live event type: ${type}`);
+    listeners.get(type).add(listener);
+    connect();
+    return () => listeners.get(type).delete(listener);
+  }
+
+  function connected() {
+    return Boolean(source && source.readyState === EventSource.OPEN);
+  }
+
+  function waitForJob(jobId) {
+    return new Promise((resolve) => {
+      let settled = false;
+      let timer = null;
+      let off = () => {};
+
+      async function check() {
+        if (settled) return;
+        const job = await fetch(`/api/jobs?id=${encodeURIComponent(jobId)}`).then((r) => r.json());
+        if (settled || !JOB_FINISHED.includes(job.status)) return;
+
+        settled = true;
+        clearTimeout(timer);
+        off();
+        resolve(job.result || { ok: false, status: job.status, message: job.message, log_lines: [] });
+      }
+
+      function poll() {
+        check().catch(() => {}).finally(() => {
+          if (!settled) timer = setTimeout(poll, JOB_POLL_MS);
+        });
+      }
+
+      off = on("status", (data) => {
+        if (data.source === "job" && data.job_id === jobId && JOB_FINISHED.includes(data.status)) check().catch(() => {});
+      });
+      timer = setTimeout(poll, JOB_POLL_MS);
+    });
+  }
+
+  // POST a long hardware action as a background job and resolve with its final payload.
+  async function runJob(path) {
+    const response = await fetch(path, { method: "POST" });
+    const accepted = await response.json();
+
+    if (response.status !== 202) return accepted;
+    logLine(`JOB ${accepted.job_id} ${accepted.message}`);
+    return waitForJob(accepted.job_id);
+  }
+
+  function cancelJob(jobId) {
+    return fetch(`/api/jobs/cancel?id=${encodeURIComponent(jobId)}`, { method: "POST" }).then((r) => r.json());
+  }
+
+  window.SPMLiveStream = {
+    on,
+    connect,
+    connected,
+    runJob,
+    cancelJob
+  };
+})();
@@ -53,12 +53,15 @@
     }
   }
 
-  function api(path) {
-    log("API", "main_system_request", { path });
-    return fetch(path)
-      .then((r) => r.json())
+  function api(path, options = {}) {
+    const asJob = options.job === true && Boolean(window.SPMLiveStream);
+    log("API", "main_system_request", { path, job: asJob });
+    const request = asJob ? window.SPMLiveStream.runJob(path) : fetch(path).then((r) => r.json());
+    return request
       .then((json) => {
-        if (window.spmVisibleLogPayload) window.spmVisibleLogPayload(json);
+        // A connected stream has already shown the job's log lines.
+        const streamed = asJob && window.SPMLiveStream.connected();
+        if (window.spmVisibleLogPayload && !streamed) window.spmVisibleLogPayload(json);
         log("API", "main_system_response", {
           path,
           ok: json.ok,
@@ -336,7 +339,7 @@
   }
 
   async function safeRetract() {
-    const json = await api("/api/system/safe-retract");
+    const json = await api("/api/system/safe-retract", { job: true });
     state.safeRetracted = Boolean(json.ok && json.safe_retracted !== false);
     setConnectionState();
     return json;
@@ -359,7 +362,7 @@
       return;
     }
 
-    const json = await api("/api/system/safe-standby");
+    const json = await api("/api/system/safe-standby", { job: true });
     state.safeRetracted = Boolean(json.ok && json.safe_retracted !== false);
     state.motionVerified = Boolean(json.ok);
     setConnectionState();
@@ -406,7 +409,7 @@
       return;
     }
 
-    const json = await api("/api/system/health-test?confirmed=1&motion=1&profile=" + encodeURIComponent(profile));
+    const json = await api("/api/system/health-test?confirmed=1&motion=1&profile=" + encodeURIComponent(profile), { job: true });
     for (const line of (json.log_lines || [])) {
       log("HEALTH", "health_test_line", { line });
     }
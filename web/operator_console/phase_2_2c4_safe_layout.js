@@ -117,6 +117,14 @@
     return json;
   }
 
+  // Z moves run as server-side jobs, so a long approach cannot time out the request.
+  async function job(url) {
+    if (!window.SPMLiveStream) return api(url);
+    const json = await window.SPMLiveStream.runJob(url);
+    renderZPayload(json);
+    return json;
+  }
+
   function installZPanel() {
     const panel = qs(".z-panel");
     if (!panel || qs("#spm-z-workstation", panel)) return;
@@ -230,7 +238,7 @@
       log("Apply Target Z cancelled.");
       return;
     }
-    await api(`${ROUTES.zMoveToSetpoint}?target_z_mm=${encodeURIComponent(target)}&confirmed=1`);
+    await job(`${ROUTES.zMoveToSetpoint}?target_z_mm=${encodeURIComponent(target)}&confirmed=1`);
     await api(ROUTES.zRead).catch(() => {});
   }
 
@@ -240,7 +248,7 @@
       log("Z auto approach cancelled.");
       return;
     }
-    await api(`${ROUTES.zAutoApproach}?setpoint_distance_mm=${encodeURIComponent(zSetpoint())}&confirmed=1`);
+    await job(`${ROUTES.zAutoApproach}?setpoint_distance_mm=${encodeURIComponent(zSetpoint())}&confirmed=1`);
   }
 
   async function zRetract() {
@@ -249,7 +257,7 @@
       log("Z retract cancelled.");
       return;
     }
-    await api(`${ROUTES.zRetract}?confirmed=1`);
+    await job(`${ROUTES.zRetract}?confirmed=1`);
   }
 
   function renderZPayload(json) {
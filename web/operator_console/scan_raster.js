@@ -7,9 +7,17 @@
     runningRaster: false,
     centerReady: false,
     approachReady: false,
-    runToken: 0
+    runToken: 0,
+    activeRunId: null,
+    startingRun: false,
+    earlyEvents: [],
+    partialLines: new Map(),
+    frame: null
   };
 
+  // Pacing between streamed lines, so the topography visibly builds up.
+  const LINE_INTERVAL_MS = 80;
+
   function byId(id) {
     return document.getElementById(id);
   }
@@ -73,6 +81,7 @@
 
     state.runningRaster = false;
     state.runToken += 1;
+    stopStreamedRun();
     setText("measurement-status", "paused");
     log("Measurement paused. Raster loop interrupted.");
   }
@@ -80,6 +89,7 @@
   function stopRaster() {
     state.runningRaster = false;
     state.runToken += 1;
+    stopStreamedRun();
     setText("measurement-status", "stopped");
     log("Measurement stopped. Raster loop interrupted.");
   }
@@ -89,6 +99,8 @@
     state.currentLineIndex = 0;
     state.runningRaster = false;
     state.runToken += 1;
+    state.frame = null;
+    stopStreamedRun();
 
     setText("line-status", "0 / 0");
     setText("topography-status", "empty");
@@ -112,6 +124,66 @@
     return payload;
   }
 
+  function parseFrame(buffer) {
+    const magic = String.fromCharCode(...new Uint8Array(buffer, 0, 4));
+    if (magic !== "SPMF") throw new Error("Response is not an SPM frame buffer.");
+
+    const headerLength = new DataView(buffer).getUint32(4, true);
+    const header = JSON.parse(new TextDecoder().decode(new Uint8Array(buffer, 8, headerLength)));
+    const [channels, rows, columns] = header.shape;
+    // Float32Array reads the host byte order; every browser platform is little-endian.
+    const data = new Float32Array(buffer, 8 + headerLength, channels * rows * columns);
+    const planes = {};
+
+    header.channels.forEach((name, index) => {
+      planes[name] = data.subarray(index * rows * columns, (index + 1) * rows * columns);
+    });
+
+    return { header, planes, rows, columns };
+  }
+
+  async function loadFrame() {
+    const params = getScanParams();
+    params.set("channels", "z_feedback,surface_height");
+
+    const response = await fetch(`/api/scan/frame?${params.toString()}`);
+    if (!response.ok) {
+      const payload = await response.json();
+      log(`Frame error: ${payload.message}`);
+      return;
+    }
+
+    state.frame = parseFrame(await response.arrayBuffer());
+    state.rasterLines = [];
+    state.currentLineIndex = state.frame.header.y_points;
+
+    const { rows, columns } = state.frame;
+    setText("line-status", `${rows} / ${state.frame.header.y_points}`);
+    setText("topography-status", `${rows} lines (frame)`);
+    setText("measurement-status", "frame loaded");
+
+    redrawAll();
+    log(`Frame loaded: ${columns} X points × ${rows} Y lines in one request.`);
+  }
+
+  function frameLine(rowIndex) {
+    const { header, planes, columns } = state.frame;
+    const step = (header.extent.x_max - header.extent.x_min) / Math.max(columns - 1, 1);
+    const offset = rowIndex * columns;
+    const points = [];
+
+    for (let column = 0; column < columns; column += 1) {
+      points.push({
+        point_index: column,
+        x: header.extent.x_min + column * step,
+        surface_height: planes.surface_height[offset + column],
+        z_feedback: planes.z_feedback[offset + column]
+      });
+    }
+
+    return { line_index: header.row_start + rowIndex, line_count: header.y_points, points };
+  }
+
   async function stepOneLine(options = {}) {
     const manual = options.manual === true;
     const token = options.token ?? state.runToken;
@@ -130,6 +202,11 @@
       return;
     }
 
+    addLine(line);
+  }
+
+  function addLine(line) {
+    state.frame = null;
     state.rasterLines.push(line);
     state.currentLineIndex += 1;
 
@@ -170,34 +247,109 @@
     setText("measurement-status", "running");
     log("Measurement started: fixed-distance line scan → Y step → topography accumulation.");
 
+    const params = getScanParams();
+    params.set("start_line", String(state.currentLineIndex));
+    params.set("line_interval_ms", String(LINE_INTERVAL_MS));
+
+    // Lines arrive on the live stream; the start request only returns the run id.
+    state.startingRun = true;
+    state.earlyEvents = [];
     try {
-      const yPoints = Number(byId("scan-y-points").value);
+      const response = await fetch(`/api/scan/stream/start?${params.toString()}`);
+      const payload = await response.json();
 
-      while (state.runningRaster && token === state.runToken && state.currentLineIndex < yPoints) {
-        await stepOneLine({ token });
-        await new Promise((resolve) => setTimeout(resolve, 80));
-      }
+      if (payload.status === "error" || !payload.ok) throw new Error(payload.message);
 
       if (token !== state.runToken) {
+        stopStreamedRun(true);
         return;
       }
 
-      if (state.currentLineIndex >= yPoints) {
-        setText("measurement-status", "complete");
-        log("Measurement complete.");
-      }
+      state.activeRunId = payload.run_id;
+      state.partialLines.clear();
+      const early = state.earlyEvents;
+      state.earlyEvents = [];
+      early.forEach(([type, data]) => handleRunEvent(type, data));
     } catch (error) {
       if (token === state.runToken) {
+        state.runningRaster = false;
         setText("measurement-status", "error");
         log(`Measurement failed: ${error.message}`);
       }
     } finally {
-      if (token === state.runToken) {
-        state.runningRaster = false;
-      }
+      state.startingRun = false;
+      state.earlyEvents = [];
+    }
+  }
+
+  function stopStreamedRun(force = false) {
+    if (state.activeRunId === null && !force) return;
+
+    state.activeRunId = null;
+    fetch("/api/scan/stream/stop").catch(() => {});
+  }
+
+  function handleRunEvent(type, data) {
+    if (state.activeRunId === null && state.startingRun) {
+      state.earlyEvents.push([type, data]);
+      return;
+    }
+
+    if (data.run_id !== state.activeRunId) return;
+
+    if (type === "scan_line") {
+      addLine(data);
+    } else if (type === "scan_point") {
+      addScanPoint(data.point);
+    } else if (type === "status") {
+      finishRun(data);
     }
   }
 
+  function addScanPoint(point) {
+    const xPoints = Number(byId("scan-x-points").value);
+    const points = state.partialLines.get(point.line_index) || [];
+
+    points.push(point);
+    state.partialLines.set(point.line_index, points);
+    setText("z-readout", `${Number(point.z_feedback).toFixed(3)} mm`);
+
+    if (points.length < xPoints) return;
+
+    state.partialLines.delete(point.line_index);
+    addLine({
+      line_index: point.line_index,
+      line_count: Number(byId("scan-y-points").value),
+      y: point.y,
+      direction: "hardware",
+      points: [...points].sort((a, b) => a.point_index - b.point_index)
+    });
+  }
+
+  function finishRun(data) {
+    if (data.status === "running") return;
+
+    state.activeRunId = null;
+    state.runningRaster = false;
+
+    if (data.status === "complete") {
+      setText("measurement-status", "complete");
+      log("Measurement complete.");
+    } else if (data.status !== "stopped") {
+      setText("measurement-status", "error");
+      log(`Measurement failed: ${data.message}`);
+    }
+  }
+
+  if (window.SPMLiveStream) {
+    ["scan_line", "scan_point", "status"].forEach((type) => {
+      window.SPMLiveStream.on(type, (data) => {
+        if (type === "status" && data.source !== "scan") return;
+        handleRunEvent(type, data);
+      });
+    });
+  }
+
   function lineValues(line, variant) {
     if (!line) return [];
 
@@ -257,10 +409,59 @@
     ctx.fillText(title, 18, 24);
   }
 
+  function heightColor(normalized) {
+    // RGB of hsl(250 - 190n, 85%, 25 + 35n%), the colour scale of the per-cell drawing.
+    const hue = 250 - normalized * 190;
+    const light = (25 + normalized * 35) / 100;
+    const a = 0.85 * Math.min(light, 1 - light);
+    const channel = (n) => {
+      const k = (n + hue / 30) % 12;
+      return Math.round(255 * (light - a * Math.max(-1, Math.min(k - 3, 9 - k, 1))));
+    };
+    return [channel(0), channel(8), channel(4)];
+  }
+
+  function drawFrameTopography(canvas, variant, title) {
+    const ctx = canvas.getContext("2d");
+    const { header, planes, rows, columns } = state.frame;
+    const heights = planes.surface_height;
+    const [min, max] = header.value_range.surface_height;
+    const range = Math.max(max - min, 1e-9);
+    const image = new ImageData(columns, rows);
+    const palette = Array.from({ length: 256 }, (_, index) => heightColor(index / 255));
+
+    for (let index = 0; index < heights.length; index += 1) {
+      const normalized = Math.min(Math.max((heights[index] - min) / range, 0), 1);
+      const [r, g, b] = palette[Math.round(normalized * 255)];
+      image.data.set([r, g, b, 255], index * 4);
+    }
+
+    const source = document.createElement("canvas");
+    source.width = columns;
+    source.height = rows;
+    source.getContext("2d").putImageData(image, 0, 0);
+
+    ctx.save();
+    ctx.imageSmoothingEnabled = false;
+    ctx.translate(variant.includes("x-minus") ? canvas.width : 0, variant.includes("y-minus") ? canvas.height : 0);
+    ctx.scale(variant.includes("x-minus") ? -1 : 1, variant.includes("y-minus") ? -1 : 1);
+    ctx.drawImage(source, 0, 0, canvas.width, canvas.height);
+    ctx.restore();
+
+    ctx.fillStyle = "#e5e7eb";
+    ctx.font = "15px Segoe UI";
+    ctx.fillText(`${title}: ${rows}/${header.y_points} lines`, 18, 24);
+  }
+
   function drawTopography(canvasId, variant, title) {
     const canvas = byId(canvasId);
     if (!canvas) return;
 
+    if (state.frame) {
+      drawFrameTopography(canvas, variant, title);
+      return;
+    }
+
     const ctx = canvas.getContext("2d");
     const w = canvas.width;
     const h = canvas.height;
@@ -306,7 +507,7 @@
   }
 
   function redrawAll() {
-    const latestLine = state.rasterLines[state.rasterLines.length - 1];
+    const latestLine = state.frame ? frameLine(state.frame.rows - 1) : state.rasterLines[state.rasterLines.length - 1];
 
     drawLine(latestLine, "line-x-plus-canvas", "x-plus", "X+ line scan");
     drawLine(latestLine, "line-x-minus-canvas", "x-minus", "X- line scan");
@@ -328,6 +529,7 @@
     defaultCenter,
     markApproachReady,
     resetRaster,
+    loadFrame,
     stepOneLine: () => stepOneLine({ manual: true }),
     runRasterSimulation,
     pauseRaster,
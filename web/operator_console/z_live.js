@@ -2,7 +2,9 @@
   "use strict";
 
   const state = {
-    samples: []
+    samples: [],
+    latest: null,
+    redrawQueued: false
   };
 
   function byId(id) {
@@ -24,17 +26,33 @@
     }
   }
 
+  function addSample(value) {
+    const z = Number(value);
+    if (!Number.isFinite(z)) return;
+
+    pushSample(z);
+    state.latest = z;
+    scheduleRedraw();
+  }
+
+  function scheduleRedraw() {
+    if (state.redrawQueued || document.hidden || byId("live-window")?.hidden) return;
+
+    state.redrawQueued = true;
+    requestAnimationFrame(() => {
+      state.redrawQueued = false;
+      redraw();
+    });
+  }
+
   function redraw() {
     const canvas = byId("z-live-canvas");
     if (!canvas) return;
 
     const setpoint = readSetpoint();
-    const simulated = setpoint + 0.015 * Math.sin(Date.now() / 700);
-
-    pushSample(simulated);
 
     const readout = byId("z-live-readout");
-    if (readout) readout.textContent = `${simulated.toFixed(3)} mm`;
+    if (readout && state.latest !== null) readout.textContent = `${state.latest.toFixed(3)} mm`;
 
     const setpointEl = byId("z-live-setpoint");
     if (setpointEl) setpointEl.textContent = `${setpoint.toFixed(3)} mm`;
@@ -84,13 +102,17 @@
     ctx.fillText("Z feedback / fixed-distance setpoint monitor", 20, 28);
   }
 
-  setInterval(() => {
-    if (!document.hidden && !byId("live-window")?.hidden) {
-      redraw();
-    }
-  }, 500);
+  // Samples arrive on the live stream: Z readbacks and scan feedback.
+  if (window.SPMLiveStream) {
+    window.SPMLiveStream.on("z_sample", (data) => addSample(data.z));
+    window.SPMLiveStream.on("scan_point", (data) => addSample(data.point.z_feedback));
+    window.SPMLiveStream.on("scan_line", (data) => data.points.forEach((point) => addSample(point.z_feedback)));
+  }
+
+  document.addEventListener("visibilitychange", scheduleRedraw);
 
   window.SPMZLive = {
-    redraw
+    redraw,
+    addSample
   };
 })();